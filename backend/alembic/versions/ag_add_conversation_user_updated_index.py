@@ -0,0 +1,31 @@
+"""add (user_id, updated_at, id) index to conversations
+
+Revision ID: ag_conversation_user_updated_idx
+Revises: af_add_apple_endor_verify_ssl
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'ag_conversation_user_updated_idx'
+down_revision: Union[str, Sequence[str], None] = 'af_add_apple_endor_verify_ssl'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Supports keyset pagination of conversation listings (newest first)
+    op.create_index(
+        'idx_conversation_user_updated',
+        'conversations',
+        ['user_id', 'updated_at', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conversation_user_updated', table_name='conversations', if_exists=True)
@@ -16,6 +16,7 @@ from app.models.agent_config import AgentConfig
 from app.services.auth_config_service import get_auth_config, update_auth_config
 from app.services.agent_config_service import AgentConfigService
 from app.services.pat_encryption import encrypt_secret
+from app.services.gateway.auth.registry import invalidate_provider_configs
 from app.api.models import (
     AgentConfigResponse, AgentVersionResponse, AgentVersionUpdate,
     AgentSettingsResponse, AgentSettingsUpdate
@@ -844,6 +845,7 @@ async def create_provider_config(
     )
     db.add(new_config)
     safe_commit(db)
+    invalidate_provider_configs()
     db.refresh(new_config)
     
     return ProviderConfigResponse(
@@ -971,6 +973,7 @@ async def update_provider_config(
         config.is_active = config_data.is_active
     
     safe_commit(db)
+    invalidate_provider_configs()
     db.refresh(config)
     
     return ProviderConfigResponse(
@@ -1014,6 +1017,7 @@ async def delete_provider_config(
     
     config.is_active = False
     safe_commit(db)
+    invalidate_provider_configs()
 
 
 @router.get("/admin/provider-configs/{config_id}/test")
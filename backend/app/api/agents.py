@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from app.services.agents.vds_agent import VDSAgent
 from app.services.agents.summary_agent import SummaryAgent
 from app.services.agents.router import AgentRouter
+from app.services import export_stream
 from app.services.tableau.client import TableauClient
 from app.core.config import settings
 
@@ -63,6 +64,12 @@ class ExportViewsRequest(BaseModel):
     format: str = Field(default="json", description="Export format (json, csv, excel)")
 
 
+class StreamExportRequest(BaseModel):
+    """Request model for a streamed view export."""
+    view_ids: List[str] = Field(..., description="List of view IDs to export")
+    format: str = Field(default="csv", description="Export format (csv, ndjson, arrow; arrow takes one view)")
+
+
 class ExportViewsResponse(BaseModel):
     """Response model for view export."""
     datasets: List[Dict[str, Any]] = Field(default_factory=list)
@@ -226,6 +233,22 @@ async def export_views(request: ExportViewsRequest):
         )
 
 
+@router.post("/summary/export-views/stream")
+async def stream_export_views(request: StreamExportRequest):
+    """Stream view data as chunked CSV, NDJSON or Arrow IPC, without buffering the export."""
+    try:
+        export_format = export_stream.check_format(request.format, len(request.view_ids))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    extension = {"csv": "csv", "ndjson": "ndjson", "arrow": "arrows"}[export_format]
+    return StreamingResponse(
+        export_stream.stream_export(get_tableau_client(), request.view_ids, export_format),
+        media_type=export_stream.EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="export.{extension}"'}
+    )
+
+
 @router.post("/summary/generate-summary", response_model=GenerateSummaryResponse)
 async def generate_summary(request: GenerateSummaryRequest):
     """Generate a summary report from multiple views."""
@@ -1,25 +1,28 @@
 """Chat API endpoints."""
+import base64
 import logging
 from typing import List, Optional, Dict
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, status, Header, Query, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Header, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field, field_serializer, model_validator
-from app.core.database import get_db, safe_commit
+from app.core.database import get_db, get_async_db, safe_commit_async
 from app.models.chat import Conversation, Message, MessageRole, ChatContext
 from app.api.auth import get_current_user
 from app.models.user import User
-from app.services.ai.client import UnifiedAIClient, AIClientError
+from app.services.ai.client import AIClientError, get_ai_client
 from app.services.ai.tools import get_tools, execute_tool, format_tool_result
 from app.services.tableau.client import TableauClient
+from app.services.columnar import count_rows
 from app.api.tableau import get_tableau_client
 from app.core.config import settings
 from fastapi import Request
 from app.services.memory import get_conversation_memory
 from app.services.metrics import get_metrics
-from app.api.chat_helpers import prepare_chat_context
+from app.api.chat_helpers import invalidate_chat_context, prepare_chat_context
 from app.services.debug import get_debugger
 from app.api.models import AgentMessageChunk, AgentMessageContent
 import time
@@ -131,18 +134,41 @@ def get_current_user_optional(
         return None
 
 
+def _message_count_column():
+    """Correlated COUNT of a conversation's messages, for selecting alongside Conversation rows."""
+    return (
+        select(func.count(Message.id))
+        .where(Message.conversation_id == Conversation.id)
+        .correlate(Conversation)
+        .scalar_subquery()
+    )
+
+
+async def _get_conversation_with_count(db: AsyncSession, conversation_id: int) -> Optional[Conversation]:
+    """Load a conversation with message_count populated in the same query."""
+    row = (await db.execute(
+        select(Conversation, _message_count_column().label("message_count"))
+        .where(Conversation.id == conversation_id)
+    )).first()
+    if row is None:
+        return None
+    conversation = row[0]
+    conversation.message_count = row[1]
+    return conversation
+
+
 @router.post("/conversations", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     request: Request,
     agent_type: Optional[str] = Query(None, description="Agent type for personalized greeting: 'vizql' or 'summary'"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Create a new conversation with personalized greeting based on agent type."""
     conversation = Conversation(user_id=current_user.id if current_user else None)
     db.add(conversation)
-    safe_commit(db)
-    db.refresh(conversation)
+    await safe_commit_async(db)
+    await db.refresh(conversation)
     
     # Personalized greetings per agent type
     greeting_messages = {
@@ -167,11 +193,11 @@ async def create_conversation(
         extra_metadata=extra_meta
     )
     db.add(greeting_message)
-    safe_commit(db)
-    db.refresh(conversation)
+    await safe_commit_async(db)
+    await db.refresh(conversation)
     
-    # Compute message count (should be 1 after adding greeting)
-    conversation.message_count = db.query(Message).filter(Message.conversation_id == conversation.id).count()
+    # New conversation: the greeting is its only message
+    conversation.message_count = 1
     
     logger.info(f"Created conversation {conversation.id} with initial greeting for agent type: {agent_type_normalized}")
     return conversation
@@ -181,12 +207,12 @@ async def create_conversation(
 async def create_greeting_message(
     conversation_id: int,
     agent_type: str = Query(..., description="Agent type for personalized greeting: 'vizql' or 'summary'"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Create a greeting message for an existing conversation when agent type changes."""
     # Verify conversation exists
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -212,8 +238,8 @@ async def create_greeting_message(
         extra_metadata=extra_meta
     )
     db.add(greeting_message)
-    safe_commit(db)
-    db.refresh(greeting_message)
+    await safe_commit_async(db)
+    await db.refresh(greeting_message)
     
     logger.info(f"Created greeting message {greeting_message.id} for conversation {conversation_id} with agent type: {agent_type_normalized}")
     
@@ -234,32 +260,68 @@ async def create_greeting_message(
     )
 
 
+def _encode_conversation_cursor(conversation: Conversation) -> str:
+    """Opaque keyset cursor for the position after a conversation (updated_at, id)."""
+    raw = f"{conversation.updated_at.isoformat()}|{conversation.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_conversation_cursor(cursor: str) -> tuple:
+    """Inverse of _encode_conversation_cursor; raises HTTPException 400 on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, conversation_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), int(conversation_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/conversations", response_model=List[ConversationResponse])
 async def list_conversations(
-    skip: int = 0,
-    limit: int = 50,
-    db: Session = Depends(get_db),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging for older clients; ignored when cursor is set"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    """List conversations for the current user (or unauthenticated sessions)."""
+    """
+    List conversations for the current user (or unauthenticated sessions), newest first.
+    
+    Uses keyset pagination on (updated_at, id); when more rows may follow, the
+    cursor for the next page is returned in the X-Next-Cursor header. The old
+    skip offset is still accepted when no cursor is given.
+    """
     try:
-        q = db.query(Conversation).order_by(desc(Conversation.updated_at))
+        q = (
+            select(Conversation, _message_count_column().label("message_count"))
+            .order_by(desc(Conversation.updated_at), desc(Conversation.id))
+        )
         if current_user:
-            q = q.filter(Conversation.user_id == current_user.id)
+            q = q.where(Conversation.user_id == current_user.id)
         else:
-            q = q.filter(Conversation.user_id.is_(None))
-        conversations = q.offset(skip).limit(limit).all()
+            q = q.where(Conversation.user_id.is_(None))
+        if cursor:
+            updated_at, conversation_id = _decode_conversation_cursor(cursor)
+            q = q.where(or_(
+                Conversation.updated_at < updated_at,
+                and_(Conversation.updated_at == updated_at, Conversation.id < conversation_id),
+            ))
+        elif skip:
+            q = q.offset(skip)
+        rows = (await db.execute(q.limit(limit))).all()
+        
+        conversations = []
+        for conv, message_count in rows:
+            conv.message_count = message_count
+            conversations.append(conv)
         
-        # Eager load messages to compute counts efficiently
-        for conv in conversations:
-            try:
-                # Load messages count
-                conv.message_count = db.query(Message).filter(Message.conversation_id == conv.id).count()
-            except Exception as e:
-                logger.error(f"Error computing message count for conversation {conv.id}: {e}")
-                conv.message_count = 0
+        if len(conversations) == limit:
+            response.headers["X-Next-Cursor"] = _encode_conversation_cursor(conversations[-1])
         
         return conversations
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing conversations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to list conversations: {str(e)}")
@@ -268,11 +330,11 @@ async def list_conversations(
 @router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Get a conversation by ID."""
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await _get_conversation_with_count(db, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -285,9 +347,6 @@ async def get_conversation(
         if conversation.user_id is not None:
             raise HTTPException(status_code=403, detail="Authentication required to access this conversation")
     
-    # Compute message count
-    conversation.message_count = db.query(Message).filter(Message.conversation_id == conversation_id).count()
-    
     return conversation
 
 
@@ -300,11 +359,11 @@ class ConversationRenameRequest(BaseModel):
 async def rename_conversation(
     conversation_id: int,
     request: ConversationRenameRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Rename a conversation."""
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await _get_conversation_with_count(db, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -317,11 +376,8 @@ async def rename_conversation(
             raise HTTPException(status_code=403, detail="Authentication required to rename this conversation")
     
     conversation.name = request.name.strip()
-    safe_commit(db)
-    db.refresh(conversation)
-    
-    # Compute message count
-    conversation.message_count = db.query(Message).filter(Message.conversation_id == conversation_id).count()
+    await safe_commit_async(db)
+    await db.refresh(conversation)
     
     logger.info(f"Renamed conversation {conversation_id} to '{conversation.name}'")
     return conversation
@@ -330,11 +386,11 @@ async def rename_conversation(
 @router.get("/conversations/{conversation_id}/messages", response_model=List[MessageResponse])
 async def get_conversation_messages(
     conversation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Get all messages for a conversation."""
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -346,7 +402,9 @@ async def get_conversation_messages(
         if conversation.user_id is not None:
             raise HTTPException(status_code=403, detail="Authentication required to access this conversation")
     
-    messages = db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at).all()
+    messages = (await db.scalars(
+        select(Message).where(Message.conversation_id == conversation_id).order_by(Message.created_at)
+    )).all()
     # Return messages with uppercase roles (as stored in database)
     result = []
     for msg in messages:
@@ -472,7 +530,7 @@ async def get_tableau_client_optional(
 @router.post("/message", response_model=ChatResponse)
 async def send_message(
     request: MessageRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = Header(None, alias="Authorization"),
     current_user: User = Depends(get_current_user),
     tableau_client: Optional[TableauClient] = Depends(get_tableau_client_optional)
@@ -483,7 +541,7 @@ async def send_message(
     If stream=True, returns a streaming response.
     Supports agent routing via agent_type parameter.
     """
-    conversation = db.query(Conversation).filter(Conversation.id == request.conversation_id).first()
+    conversation = await db.get(Conversation, request.conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -500,9 +558,9 @@ async def send_message(
             truncated = name.rsplit(" ", 1)[0]
             name = truncated if len(truncated) > 30 else name
         conversation.name = name
-    safe_commit(db)
+    await safe_commit_async(db)
 
-    ctx = prepare_chat_context(db, request.conversation_id)
+    ctx = await prepare_chat_context(db, request.conversation_id)
     conversation = ctx["conversation"]
     datasource_ids = ctx["datasource_ids"]
     view_ids = ctx["view_ids"]
@@ -558,12 +616,13 @@ async def send_message(
                     "views": view_ids,
                     "conversation_history": history_messages[-5:] if history_messages else []
                 },
-                available_agents=["vizql", "summary", "multi_agent"]  # Remove general from available agents
+                available_agents=["vizql", "summary", "multi_agent"],  # Remove general from available agents
+                conversation_id=request.conversation_id
             )
             if selection.get("requires_multi_agent") or selection.get("selected_agent") == "multi_agent":
                 use_multi_agent = True
                 agent_type = "multi_agent"
-                logger.info(f"Meta-agent detected multi-agent workflow needed: {selection.get('reasoning')}")
+                logger.info(f"Meta-agent detected multi-agent workflow needed ({selection.get('decision_source')}): {selection.get('reasoning')}")
         
         # Route to Multi-Agent Orchestrator
         if use_multi_agent:
@@ -642,7 +701,7 @@ async def send_message(
                         )
                         db.add(assistant_message)
                         conversation.updated_at = conversation.updated_at
-                        safe_commit(db)
+                        await safe_commit_async(db)
                         
                     except Exception as e:
                         logger.error(f"Error in multi-agent workflow: {e}", exc_info=True)
@@ -693,8 +752,8 @@ async def send_message(
                 )
                 db.add(assistant_message)
                 conversation.updated_at = conversation.updated_at
-                safe_commit(db)
-                db.refresh(assistant_message)
+                await safe_commit_async(db)
+                await db.refresh(assistant_message)
                 
                 return ChatResponse(
                     message=MessageResponse(
@@ -743,22 +802,26 @@ async def send_message(
             
             # Get agent version and retry settings from DB config
             from app.services.agent_config_service import AgentConfigService
-            agent_config_service = AgentConfigService(db)
             
-            # Get version (use request param or DB default)
-            agent_version = request.agent_version
-            if not agent_version:
-                agent_version = agent_config_service.get_default_version('vizql') or 'v3'
+            def _load_vizql_config(session: Session):
+                """Resolve version, enabled versions and retry settings (sync service via run_sync)."""
+                agent_config_service = AgentConfigService(session)
+                # Get version (use request param or DB default)
+                version = request.agent_version or agent_config_service.get_default_version('vizql') or 'v3'
+                enabled = agent_config_service.is_version_enabled('vizql', version)
+                available = [] if enabled else agent_config_service.get_enabled_versions('vizql')
+                # Get retry settings from DB (with fallback to env vars)
+                return version, enabled, available, agent_config_service.get_agent_settings('vizql')
+            
+            agent_version, version_enabled, available_versions, retry_settings = await db.run_sync(_load_vizql_config)
             
             # Validate version is enabled
-            if not agent_config_service.is_version_enabled('vizql', agent_version):
+            if not version_enabled:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"VizQL version '{agent_version}' is not enabled. Available versions: {', '.join(agent_config_service.get_enabled_versions('vizql'))}"
+                    detail=f"VizQL version '{agent_version}' is not enabled. Available versions: {', '.join(available_versions)}"
                 )
             
-            # Get retry settings from DB (with fallback to env vars)
-            retry_settings = agent_config_service.get_agent_settings('vizql')
             max_build_retries = retry_settings.get('max_build_retries')
             max_execution_retries = retry_settings.get('max_execution_retries')
             
@@ -899,8 +962,8 @@ async def send_message(
                         pre_graph_time = time.time()
                         logger.info(f"About to start graph execution. Time since stream_start: {(pre_graph_time - stream_start_time) * 1000:.2f}ms")
                         
-                        # Provide config with thread_id + tableau_client (not in state - not serializable)
-                        config = {"configurable": {"thread_id": f"vizql-{request.conversation_id}", "tableau_client": tableau_client}}
+                        # Provide config with a per-run thread_id + tableau_client (not in state - not serializable)
+                        config = AgentGraphFactory.thread_config(graph, f"vizql-{request.conversation_id}", tableau_client=tableau_client)
                         
                         # Log timing right before astream
                         pre_astream_time = time.time()
@@ -1143,7 +1206,7 @@ async def send_message(
                                         raw_data = last_state.get("raw_data")
                                         if raw_data and isinstance(raw_data, dict):
                                             if "columns" in raw_data and "data" in raw_data:
-                                                row_count = raw_data.get("row_count", len(raw_data.get("data", [])))
+                                                row_count = count_rows(raw_data)
                                                 # Only extract if dataset is small (< 100 rows) to avoid 4,703 city problem
                                                 if row_count < 100:
                                                     from app.services.agents.vizql_tool_use.context_extractor import extract_dimension_values
@@ -1158,7 +1221,7 @@ async def send_message(
                                         if "columns" in raw_data and "data" in raw_data:
                                             stored_query_results = {
                                                 "columns": raw_data.get("columns"),
-                                                "row_count": raw_data.get("row_count", len(raw_data.get("data", []))),
+                                                "row_count": count_rows(raw_data),
                                                 "dimension_values": dimension_values  # Store dimension values (from summarizer or extracted)
                                                 # NOTE: NOT storing full "data" array - only metadata + dimension values
                                             }
@@ -1173,7 +1236,7 @@ async def send_message(
                                                         # Extract dimension values for context
                                                         # Only extract if small dataset to avoid 4,703 city problem
                                                         dimension_values = {}
-                                                        row_count = result.get("row_count", len(result.get("data", [])))
+                                                        row_count = count_rows(result)
                                                         
                                                         if row_count < 100:
                                                             from app.services.agents.vizql_tool_use.context_extractor import extract_dimension_values
@@ -1205,7 +1268,7 @@ async def send_message(
                                 )
                                 db.add(assistant_message)
                                 conversation.updated_at = conversation.updated_at
-                                safe_commit(db)
+                                await safe_commit_async(db)
                                 logger.info(f"Saved assistant message with {len(full_content)} chars, total_time_ms: {total_time_ms:.2f}")
                             except Exception as e:
                                 logger.error(f"Failed to save assistant message: {e}", exc_info=True)
@@ -1287,8 +1350,8 @@ async def send_message(
                 )
             else:
                 # Non-streaming: execute graph and return result
-                # Provide config with thread_id + tableau_client (not in state - not serializable)
-                config = {"configurable": {"thread_id": f"vizql-{request.conversation_id}", "tableau_client": tableau_client}}
+                # Provide config with a per-run thread_id + tableau_client (not in state - not serializable)
+                config = AgentGraphFactory.thread_config(graph, f"vizql-{request.conversation_id}", tableau_client=tableau_client)
                 
                 try:
                     logger.info(f"Executing VizQL graph for conversation {request.conversation_id} (execution_id: {execution_id})")
@@ -1384,7 +1447,7 @@ async def send_message(
                             raw_data = final_state.get("raw_data")
                             if raw_data and isinstance(raw_data, dict):
                                 if "columns" in raw_data and "data" in raw_data:
-                                    row_count = raw_data.get("row_count", len(raw_data.get("data", [])))
+                                    row_count = count_rows(raw_data)
                                     if row_count < 100:
                                         from app.services.agents.vizql_tool_use.context_extractor import extract_dimension_values
                                         dimension_values = extract_dimension_values(raw_data, max_values_per_dimension=50)
@@ -1397,7 +1460,7 @@ async def send_message(
                             if "columns" in raw_data and "data" in raw_data:
                                 query_results = {
                                     "columns": raw_data.get("columns"),
-                                    "row_count": raw_data.get("row_count", len(raw_data.get("data", []))),
+                                    "row_count": count_rows(raw_data),
                                     "dimension_values": dimension_values  # Store dimension values (from summarizer or extracted)
                                     # NOTE: NOT storing full "data" array - only metadata + dimension values
                                 }
@@ -1423,7 +1486,7 @@ async def send_message(
                                     if isinstance(result, dict) and "data" in result:
                                         # Extract dimension values only if small dataset
                                         dimension_values = {}
-                                        row_count = result.get("row_count", len(result.get("data", [])))
+                                        row_count = count_rows(result)
                                         
                                         if row_count < 100:
                                             from app.services.agents.vizql_tool_use.context_extractor import extract_dimension_values
@@ -1477,8 +1540,8 @@ async def send_message(
                 )
                 db.add(assistant_message)
                 conversation.updated_at = conversation.updated_at
-                safe_commit(db)
-                db.refresh(assistant_message)
+                await safe_commit_async(db)
+                await db.refresh(assistant_message)
                 
                 return ChatResponse(
                     message=MessageResponse(
@@ -1569,12 +1632,7 @@ async def send_message(
                     stream_start_time = time.time()  # Track when streaming starts
                     stream_graph._streamed_node_thoughts = set()  # Track which node thoughts we've already streamed
                     try:
-                        config = {
-                            "configurable": {
-                                "thread_id": f"summary-{request.conversation_id}",
-                                "tableau_client": tableau_client,
-                            }
-                        }
+                        config = AgentGraphFactory.thread_config(graph, f"summary-{request.conversation_id}", tableau_client=tableau_client)
                         async for state_update in graph.astream(initial_state, config=config):
                             # LangGraph astream returns updates keyed by node name
                             # Each update contains the state dictionary for that node
@@ -1733,7 +1791,7 @@ async def send_message(
                                 )
                                 db.add(assistant_message)
                                 conversation.updated_at = conversation.updated_at
-                                safe_commit(db)
+                                await safe_commit_async(db)
                                 logger.info(f"Saved assistant message with {len(full_content)} chars, total_time_ms: {total_time_ms:.2f}")
                             except Exception as e:
                                 logger.error(f"Failed to save assistant message: {e}", exc_info=True)
@@ -1794,12 +1852,7 @@ async def send_message(
                 )
             else:
                 # Non-streaming: execute graph and return result
-                config = {
-                    "configurable": {
-                        "thread_id": f"summary-{request.conversation_id}",
-                        "tableau_client": tableau_client,
-                    }
-                }
+                config = AgentGraphFactory.thread_config(graph, f"summary-{request.conversation_id}", tableau_client=tableau_client)
                 final_state = await graph.ainvoke(initial_state, config=config)
                 execution_time = time.time() - execution_start
                 
@@ -1833,8 +1886,8 @@ async def send_message(
                 )
                 db.add(assistant_message)
                 conversation.updated_at = conversation.updated_at
-                safe_commit(db)
-                db.refresh(assistant_message)
+                await safe_commit_async(db)
+                await db.refresh(assistant_message)
                 
                 return ChatResponse(
                     message=MessageResponse(
@@ -1865,9 +1918,7 @@ async def send_message(
         )
         
         # Initialize AI client
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         try:
             if request.stream:
@@ -1910,7 +1961,7 @@ async def send_message(
                             )
                             db.add(assistant_message)
                             conversation.updated_at = conversation.updated_at  # Trigger update
-                            safe_commit(db)
+                            await safe_commit_async(db)
                         
                         # Send completion marker
                         done_chunk = AgentMessageChunk(
@@ -2044,8 +2095,8 @@ async def send_message(
                 )
                 db.add(assistant_message)
                 conversation.updated_at = conversation.updated_at  # Trigger update
-                safe_commit(db)
-                db.refresh(assistant_message)
+                await safe_commit_async(db)
+                await db.refresh(assistant_message)
                 
                 return ChatResponse(
                     message=MessageResponse(
@@ -2092,11 +2143,11 @@ class MessageFeedbackRequest(BaseModel):
 async def update_message_feedback(
     message_id: int,
     request: MessageFeedbackRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Update feedback for a message."""
-    message = db.query(Message).filter(Message.id == message_id).first()
+    message = await db.get(Message, message_id)
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2104,7 +2155,7 @@ async def update_message_feedback(
         )
     
     # Validate ownership via conversation
-    conversation = db.query(Conversation).filter(Conversation.id == message.conversation_id).first()
+    conversation = await db.get(Conversation, message.conversation_id)
     if conversation:
         if current_user:
             if conversation.user_id is not None and conversation.user_id != current_user.id:
@@ -2122,8 +2173,8 @@ async def update_message_feedback(
     
     message.feedback = request.feedback
     message.feedback_text = request.feedback_text
-    safe_commit(db)
-    db.refresh(message)
+    await safe_commit_async(db)
+    await db.refresh(message)
     
     return MessageResponse(
         id=message.id,
@@ -2144,35 +2195,36 @@ async def update_message_feedback(
 async def delete_message(
     conversation_id: int,
     message_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Delete a single message from a conversation."""
-    message = db.query(Message).filter(
+    message = await db.scalar(select(Message).where(
         Message.id == message_id,
         Message.conversation_id == conversation_id
-    ).first()
+    ))
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if conversation:
         if current_user and conversation.user_id is not None and conversation.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="You don't have permission to delete this message")
         if conversation.user_id is not None and not current_user:
             raise HTTPException(status_code=403, detail="Authentication required to delete this message")
-    db.delete(message)
-    safe_commit(db)
+    await db.delete(message)
+    await safe_commit_async(db)
+    invalidate_chat_context(conversation_id)
     logger.info(f"Deleted message {message_id} from conversation {conversation_id}")
 
 
 @router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conversation(
     conversation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Delete a conversation and all its messages."""
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -2184,8 +2236,9 @@ async def delete_conversation(
         if conversation.user_id is not None:
             raise HTTPException(status_code=403, detail="Authentication required to delete this conversation")
     
-    db.delete(conversation)
-    safe_commit(db)
+    await db.delete(conversation)
+    await safe_commit_async(db)
+    invalidate_chat_context(conversation_id)
     logger.info(f"Deleted conversation {conversation_id}")
 
 
@@ -2197,12 +2250,12 @@ class DeleteAllConversationsResponse(BaseModel):
 
 @router.delete("/conversations", status_code=status.HTTP_200_OK, response_model=DeleteAllConversationsResponse)
 async def delete_all_conversations(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete all conversations and their messages for the current user."""
     # Find all conversations for this user
-    conversations = db.query(Conversation).filter(Conversation.user_id == current_user.id).all()
+    conversations = (await db.scalars(select(Conversation).where(Conversation.user_id == current_user.id))).all()
     
     deleted_count = len(conversations)
     
@@ -2214,9 +2267,11 @@ async def delete_all_conversations(
     
     # Delete all conversations (cascade will handle messages and chat_contexts)
     for conversation in conversations:
-        db.delete(conversation)
+        await db.delete(conversation)
     
-    safe_commit(db)
+    await safe_commit_async(db)
+    for conversation in conversations:
+        invalidate_chat_context(conversation.id)
     logger.info(f"User {current_user.id} deleted {deleted_count} conversation(s)")
     
     return DeleteAllConversationsResponse(
@@ -2237,12 +2292,12 @@ from app.api.models import (
 @router.post("/context/add", response_model=ChatContextObject, status_code=status.HTTP_201_CREATED)
 async def add_context_object(
     request: AddContextRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Add an object (datasource or view) to chat context."""
     # Verify conversation exists
-    conversation = db.query(Conversation).filter(Conversation.id == request.conversation_id).first()
+    conversation = await db.get(Conversation, request.conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -2259,18 +2314,18 @@ async def add_context_object(
         raise HTTPException(status_code=400, detail="object_type must be 'datasource' or 'view'")
     
     # Check if object already in context
-    existing = db.query(ChatContext).filter(
+    existing = await db.scalar(select(ChatContext).where(
         ChatContext.conversation_id == request.conversation_id,
         ChatContext.object_id == request.object_id,
         ChatContext.object_type == request.object_type,
-    ).first()
+    ))
     
     if existing:
         # Update existing context object
         if request.object_name:
             existing.object_name = request.object_name
-        safe_commit(db)
-        db.refresh(existing)
+        await safe_commit_async(db)
+        await db.refresh(existing)
         logger.info(f"Updated context object {request.object_id} for conversation {request.conversation_id}")
         return ChatContextObject(
             object_id=existing.object_id,
@@ -2287,8 +2342,8 @@ async def add_context_object(
         object_name=request.object_name,
     )
     db.add(context_obj)
-    safe_commit(db)
-    db.refresh(context_obj)
+    await safe_commit_async(db)
+    await db.refresh(context_obj)
     
     logger.info(f"Added context object {request.object_id} ({request.object_type}) to conversation {request.conversation_id}")
     
@@ -2304,12 +2359,12 @@ async def add_context_object(
 async def remove_context_object(
     conversation_id: int = Query(..., description="Conversation ID"),
     object_id: str = Query(..., description="Object ID to remove"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """Remove an object from chat context."""
     # Verify conversation exists
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -2322,16 +2377,16 @@ async def remove_context_object(
             raise HTTPException(status_code=403, detail="Authentication required to modify this conversation")
     
     # Find and delete context object
-    context_obj = db.query(ChatContext).filter(
+    context_obj = await db.scalar(select(ChatContext).where(
         ChatContext.conversation_id == conversation_id,
         ChatContext.object_id == object_id,
-    ).first()
+    ))
     
     if not context_obj:
         raise HTTPException(status_code=404, detail="Context object not found")
     
-    db.delete(context_obj)
-    safe_commit(db)
+    await db.delete(context_obj)
+    await safe_commit_async(db)
     
     logger.info(f"Removed context object {object_id} from conversation {conversation_id}")
 
@@ -2339,18 +2394,18 @@ async def remove_context_object(
 @router.get("/context/{conversation_id}", response_model=ChatContextResponse)
 async def get_context(
     conversation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get chat context for a conversation."""
     # Verify conversation exists
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
     # Get all context objects for this conversation
-    context_objects = db.query(ChatContext).filter(
-        ChatContext.conversation_id == conversation_id
-    ).order_by(ChatContext.added_at).all()
+    context_objects = (await db.scalars(
+        select(ChatContext).where(ChatContext.conversation_id == conversation_id).order_by(ChatContext.added_at)
+    )).all()
     
     return ChatContextResponse(
         conversation_id=conversation_id,
@@ -1,37 +1,150 @@
 """Helper functions for chat API - context preparation and message formatting."""
+import json
+from collections import deque
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.chat import Conversation, Message, MessageRole, ChatContext
+from app.services.cache import get_cache
 from app.services.memory import get_conversation_memory
 
 
-def prepare_chat_context(db: Session, conversation_id: int) -> Dict[str, Any]:
+class ContextMessage:
+    """Detached snapshot of a Message row kept in the cached context window."""
+
+    __slots__ = ("id", "role", "content", "model_used", "extra_metadata", "created_at", "nbytes")
+
+    def __init__(self, msg: Message):
+        self.id = msg.id
+        self.role = msg.role
+        self.content = msg.content
+        self.model_used = msg.model_used
+        self.extra_metadata = msg.extra_metadata
+        self.created_at = msg.created_at
+        # Approximate footprint, computed once (metadata can carry query results)
+        self.nbytes = len(self.content or "") + (len(json.dumps(self.extra_metadata, default=str)) if self.extra_metadata else 0) + 200
+
+
+class _ContextWindow:
+    """Rolling window of a conversation's most recent messages."""
+
+    __slots__ = ("messages", "last_message_id", "total_messages")
+
+    def __init__(self, messages: List[ContextMessage], total_messages: int, size: int):
+        self.messages: deque = deque(messages, maxlen=size)
+        self.last_message_id = max((m.id for m in messages), default=0)
+        self.total_messages = total_messages
+
+    def append(self, messages: List[ContextMessage]) -> None:
+        # Concurrent turns may both fetch the same new rows
+        messages = [m for m in messages if m.id > self.last_message_id]
+        if not messages:
+            return
+        self.messages.extend(messages)
+        self.total_messages += len(messages)
+        self.last_message_id = max(m.id for m in messages)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size for the agent cache's byte budget."""
+        return sum(m.nbytes for m in self.messages)
+
+
+def _context_cache_key(conversation_id: int) -> str:
+    return f"chat_context:{conversation_id}"
+
+
+def invalidate_chat_context(conversation_id: int) -> None:
+    """Drop this process's cached window (after deleting messages or the conversation).
+
+    Other workers notice the change on their next turn through the message
+    count check in _get_context_window.
+    """
+    get_cache().delete(_context_cache_key(conversation_id))
+
+
+async def _load_context_window(db: AsyncSession, conversation_id: int) -> _ContextWindow:
+    """Cache miss: read only the newest CHAT_CONTEXT_WINDOW messages plus the total count."""
+    size = settings.CHAT_CONTEXT_WINDOW
+    recent = (
+        await db.scalars(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .limit(size)
+        )
+    ).all()
+    total = await db.scalar(
+        select(func.count(Message.id)).where(Message.conversation_id == conversation_id)
+    )
+    return _ContextWindow([ContextMessage(m) for m in reversed(recent)], total or 0, size)
+
+
+async def _get_context_window(db: AsyncSession, conversation_id: int) -> _ContextWindow:
+    """Cached window for a conversation, topped up with messages saved since it was built.
+
+    Messages are only ever added or deleted, so a cached window is still valid
+    when the conversation's message count equals the window's count plus the
+    newly read rows. A mismatch means messages were deleted (possibly by
+    another worker, whose invalidate_chat_context did not reach this cache),
+    and the window is rebuilt.
+    """
+    cache = get_cache()
+    key = _context_cache_key(conversation_id)
+    window = cache.get(key)
+    if window is not None:
+        total = await db.scalar(
+            select(func.count(Message.id)).where(Message.conversation_id == conversation_id)
+        )
+        # Only the turn(s) added since the last call, e.g. the previous reply and the new question
+        new_messages = (
+            await db.scalars(
+                select(Message)
+                .where(Message.conversation_id == conversation_id, Message.id > window.last_message_id)
+                .order_by(Message.created_at, Message.id)
+            )
+        ).all()
+        if new_messages:
+            window.append([ContextMessage(m) for m in new_messages])
+        if window.total_messages != (total or 0):
+            window = None
+    if window is None:
+        window = await _load_context_window(db, conversation_id)
+    cache.set(key, window, settings.CHAT_CONTEXT_CACHE_TTL)
+    return window
+
+
+async def prepare_chat_context(db: AsyncSession, conversation_id: int) -> Dict[str, Any]:
     """
     Load conversation, context objects, and message history.
     Returns a dict with: conversation, context_objects, datasource_ids, view_ids,
-    history_messages, messages (OpenAI format), context_summary.
+    history_messages, messages (OpenAI format), context_summary, message_count.
+
+    history_messages is a rolling window of the newest CHAT_CONTEXT_WINDOW
+    messages (ContextMessage snapshots). It is cached per conversation and
+    each turn only reads the message count and messages newer than the cached
+    window, so cost does not grow with conversation length.
     """
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
+        invalidate_chat_context(conversation_id)
         return {"conversation": None}
 
     context_objects = (
-        db.query(ChatContext)
-        .filter(ChatContext.conversation_id == conversation_id)
-        .order_by(ChatContext.added_at)
-        .all()
-    )
+        await db.scalars(
+            select(ChatContext)
+            .where(ChatContext.conversation_id == conversation_id)
+            .order_by(ChatContext.added_at)
+        )
+    ).all()
     datasource_ids = [ctx.object_id for ctx in context_objects if ctx.object_type == "datasource"]
     view_ids = [ctx.object_id for ctx in context_objects if ctx.object_type == "view"]
 
-    history_messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
-        .all()
-    )
+    window = await _get_context_window(db, conversation_id)
+    history_messages = list(window.messages)
     conversation_memory = get_conversation_memory(conversation_id)
     context_summary = conversation_memory.get_context_summary()
 
@@ -42,7 +155,7 @@ def prepare_chat_context(db: Session, conversation_id: int) -> Dict[str, Any]:
         }
         for msg in history_messages
     ]
-    if len(history_messages) > 10 and context_summary:
+    if window.total_messages > 10 and context_summary:
         messages.insert(
             0,
             {"role": "system", "content": f"Conversation context: {context_summary}"},
@@ -56,6 +169,5 @@ def prepare_chat_context(db: Session, conversation_id: int) -> Dict[str, Any]:
         "history_messages": history_messages,
         "messages": messages,
         "context_summary": context_summary,
+        "message_count": window.total_messages,
     }
-
-
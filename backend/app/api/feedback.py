@@ -3,8 +3,8 @@ import logging
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.services.agents.feedback import FeedbackManager
 
 logger = logging.getLogger(__name__)
@@ -44,7 +44,7 @@ class PreferenceResponse(BaseModel):
 @router.post("/correction", response_model=CorrectionResponse, status_code=status.HTTP_201_CREATED)
 async def record_correction(
     request: CorrectionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = None
 ):
     """Record a user correction to improve future queries.
@@ -81,7 +81,7 @@ async def record_correction(
 @router.post("/preferences", response_model=PreferenceResponse, status_code=status.HTTP_201_CREATED)
 async def record_preferences(
     request: PreferenceRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: Optional[str] = None
 ):
     """Record user preferences for future query refinement.
@@ -1,7 +1,14 @@
 """Metrics API endpoints."""
 from fastapi import APIRouter
+from app.core.auth import get_auth0_cache_stats
+from app.core.cache import get_cache_latency_stats, reset_cache_latency_stats
+from app.services.ai.client import get_ai_client_stats
 from app.services.metrics import get_metrics
 from app.services.cache import get_cache
+from app.services.gateway import transport as gateway_transport
+from app.services.gateway.auth import registry as auth_registry
+from app.services.tableau import transport as tableau_transport
+from app.services.vds_result_cache import get_vds_result_cache
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -13,6 +20,13 @@ async def get_agent_metrics():
     return metrics.get_summary()
 
 
+@router.get("/graphs")
+async def get_graph_metrics():
+    """Get compiled agent graph metrics (compile time, checkpointer memory)."""
+    metrics = get_metrics()
+    return metrics.get_graph_summary()
+
+
 @router.get("/cache")
 async def get_cache_stats():
     """Get cache statistics."""
@@ -20,6 +34,48 @@ async def get_cache_stats():
     return cache.get_stats()
 
 
+@router.get("/vds-cache")
+async def get_vds_cache_stats():
+    """Get shared VDS query result cache statistics (L1/Redis hits, compression)."""
+    return get_vds_result_cache().get_stats()
+
+
+@router.get("/redis")
+async def get_redis_latency_stats():
+    """Get async Redis command latency histograms (count, p50/p95/p99, bucket counts)."""
+    return get_cache_latency_stats()
+
+
+@router.get("/tableau-transport")
+async def get_tableau_transport_stats():
+    """Get shared Tableau HTTP pool statistics (hits, misses, connection reuse)."""
+    return tableau_transport.get_stats()
+
+
+@router.get("/gateway-transport")
+async def get_gateway_transport_stats():
+    """Get shared LLM provider HTTP pool statistics per provider (hits, misses, connection reuse)."""
+    return gateway_transport.get_stats()
+
+
+@router.get("/gateway-auth")
+async def get_gateway_auth_stats():
+    """Get provider token registry statistics (local/shared hits, fetches, background refreshes)."""
+    return auth_registry.get_stats()
+
+
+@router.get("/auth0")
+async def get_auth0_stats():
+    """Get Auth0 signing key and verified-claims cache statistics."""
+    return get_auth0_cache_stats()
+
+
+@router.get("/ai-client")
+async def get_ai_client_metrics():
+    """Get shared AI client statistics (clients, open gateway connections, in-flight requests)."""
+    return get_ai_client_stats()
+
+
 @router.post("/cache/clear")
 async def clear_cache():
     """Clear all cache entries."""
@@ -33,4 +89,5 @@ async def reset_metrics():
     """Reset all metrics."""
     metrics = get_metrics()
     metrics.reset()
+    reset_cache_latency_stats()
     return {"message": "Metrics reset"}
@@ -120,7 +120,7 @@ async def get_tableau_client(
             invalidate_cb = lambda: token_store.invalidate(current_user.id, config.id, auth_type)
 
             # Check token store first
-            token_entry = token_store.get(current_user.id, config.id, auth_type)
+            token_entry = await token_store.get(current_user.id, config.id, auth_type)
             if token_entry:
                 return create_tableau_client_from_token(
                     config, token_entry, auth_type,
@@ -189,7 +189,7 @@ async def get_tableau_client(
                     site_id=client.site_id,
                     site_content_url=client.site_content_url,
                 )
-                token_store.set(current_user.id, config.id, auth_type, token_entry)
+                await token_store.set(current_user.id, config.id, auth_type, token_entry)
                 client._pat_auth = True
                 logger.info(f"Restored PAT session for user={current_user.id} config={config.id}")
                 return client
@@ -247,14 +247,14 @@ async def get_tableau_client(
                     site_id=client.site_id,
                     site_content_url=client.site_content_url,
                 )
-                token_store.set(current_user.id, config.id, auth_type, token_entry)
+                await token_store.set(current_user.id, config.id, auth_type, token_entry)
                 client._standard_auth = True
                 logger.info(f"Restored standard auth session for user={current_user.id} config={config.id}")
                 return client
 
             # For Connected App: sign in with lock to prevent parallel sign-ins
             async with token_cache_lock(current_user.id, config.id, auth_type):
-                token_entry = token_store.get(current_user.id, config.id, auth_type)
+                token_entry = await token_store.get(current_user.id, config.id, auth_type)
                 if token_entry:
                     return create_tableau_client_from_token(
                         config, token_entry, auth_type,
@@ -283,7 +283,7 @@ async def get_tableau_client(
                     site_id=client.site_id,
                     site_content_url=client.site_content_url,
                 )
-                token_store.set(current_user.id, config.id, auth_type, token_entry)
+                await token_store.set(current_user.id, config.id, auth_type, token_entry)
                 return client
         else:
             # Fallback to environment variables (legacy behavior)
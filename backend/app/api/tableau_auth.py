@@ -185,7 +185,7 @@ async def authenticate_tableau(
             site_id=client.site_id,
             site_content_url=client.site_content_url,
         )
-        token_store.set(current_user.id, config.id, "pat", token_entry)
+        await token_store.set(current_user.id, config.id, "pat", token_entry)
         logger.info(f"Cached PAT token for user={current_user.id} config={config.id}")
         
         return TableauAuthResponse(
@@ -245,7 +245,7 @@ async def authenticate_tableau(
             site_id=client.site_id,
             site_content_url=client.site_content_url,
         )
-        token_store.set(current_user.id, config.id, "standard", token_entry)
+        await token_store.set(current_user.id, config.id, "standard", token_entry)
         logger.info(f"Cached standard auth token for user={current_user.id} config={config.id}")
         return TableauAuthResponse(
             authenticated=True,
@@ -298,7 +298,7 @@ async def authenticate_tableau(
             site_id=client.site_id,
             site_content_url=client.site_content_url,
         )
-        token_store.set(current_user.id, config.id, "connected_app", token_entry)
+        await token_store.set(current_user.id, config.id, "connected_app", token_entry)
         logger.info(f"Cached Connected App token for user={current_user.id} config={config.id}")
         
         return TableauAuthResponse(
@@ -374,14 +374,14 @@ async def switch_site(
             detail="Tableau server configuration not found or inactive",
         )
     token_store = get_token_store(auth_type)
-    token_entry = token_store.get(current_user.id, config.id, auth_type)
+    token_entry = await token_store.get(current_user.id, config.id, auth_type)
     if not token_entry:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated. Please connect first.",
         )
     async with token_cache_lock(current_user.id, config.id, auth_type):
-        token_entry = token_store.get(current_user.id, config.id, auth_type)
+        token_entry = await token_store.get(current_user.id, config.id, auth_type)
         if not token_entry:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -396,14 +396,14 @@ async def switch_site(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e),
             )
-        token_store.invalidate(current_user.id, config.id, auth_type)
+        await token_store.invalidate(current_user.id, config.id, auth_type)
         new_entry = TokenEntry(
             token=client.auth_token,
             expires_at=client.token_expires_at or datetime.now(timezone.utc) + timedelta(minutes=240),
             site_id=client.site_id,
             site_content_url=client.site_content_url,
         )
-        token_store.set(current_user.id, config.id, auth_type, new_entry)
+        await token_store.set(current_user.id, config.id, auth_type, new_entry)
         site_info = result.get("site", {})
         return TableauAuthResponse(
             authenticated=True,
@@ -446,7 +446,7 @@ async def list_sites(
             detail="Tableau server configuration not found or inactive",
         )
     token_store = get_token_store(auth_type)
-    token_entry = token_store.get(current_user.id, config.id, auth_type)
+    token_entry = await token_store.get(current_user.id, config.id, auth_type)
     if not token_entry:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -576,7 +576,7 @@ async def get_oauth_authorize_url(
         )
     state = generate_state()
     redirect_uri = _oauth_callback_url(db)
-    store_oauth_state(state, config_id, current_user.id)
+    await store_oauth_state(state, config_id, current_user.id)
     authorize_url = await get_authorization_url(config, redirect_uri, state)
     return OAuthAuthorizeUrlResponse(authorize_url=authorize_url)
 
@@ -598,7 +598,7 @@ async def oauth_callback(
     if not code or not state:
         logger.warning("OAuth callback missing code or state")
         return RedirectResponse(url=_frontend_redirect_url(False, db, error="missing_code_or_state"))
-    state_data = get_and_clear_oauth_state(state)
+    state_data = await get_and_clear_oauth_state(state)
     if not state_data:
         logger.warning("OAuth callback invalid or expired state (Redis)")
         return RedirectResponse(url=_frontend_redirect_url(False, db, error="invalid_state"))
@@ -694,7 +694,7 @@ async def oauth_callback(
         site_id=client.site_id,
         site_content_url=client.site_content_url,
     )
-    token_store.set(user_id, config_id, "connected_app_oauth", token_entry)
+    await token_store.set(user_id, config_id, "connected_app_oauth", token_entry)
     logger.info(f"Cached OAuth 2.0 Trust token for user={user_id} config={config_id}")
     redirect_url = _frontend_redirect_url(True, db, config_id=config_id)
     return RedirectResponse(url=redirect_url)
@@ -1,5 +1,5 @@
 """Tableau client factory - shared logic for building TableauClient from config/token."""
-from typing import Optional, Callable, Any
+from typing import Optional, Awaitable, Callable, Any
 
 from sqlalchemy.orm import Session
 
@@ -33,7 +33,7 @@ def create_tableau_client_from_token(
     token_entry: TokenEntry,
     auth_type: str,
     tableau_username: Optional[str] = None,
-    on_401_invalidate: Optional[Callable[[], None]] = None,
+    on_401_invalidate: Optional[Callable[[], Awaitable[None]]] = None,
 ) -> TableauClient:
     """
     Build TableauClient from cached token.
@@ -1,8 +1,12 @@
 """Authentication utilities."""
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Any, Dict, Optional, Tuple
+from jose import JWTError, jwk, jwt
 import bcrypt
 import requests
 from app.core.config import settings
@@ -121,10 +125,172 @@ def get_auth0_jwks(auth0_domain: Optional[str] = None) -> dict:
         raise
 
 
+# Auth0 signing keys and verified claims are cached so validating a token does
+# not fetch the JWKS or re-check an RS256 signature on every request. Token
+# validation runs in sync dependencies (FastAPI's threadpool), so the caches
+# are guarded by threading locks and background refreshes use a daemon thread.
+
+# Verified claims kept at most (least recently used dropped first)
+AUTH0_CLAIMS_CACHE_MAX_ENTRIES = 10_000
+
+
+class _JWKSEntry:
+    """Parsed signing keys for one Auth0 domain."""
+    
+    def __init__(self):
+        self.keys: Dict[str, Any] = {}  # kid -> jose RSAKey
+        self.fetched_at = 0.0  # When keys were last loaded (0: never)
+        self.last_fetch_attempt = 0.0
+        self.refreshing = False
+        self.lock = threading.Lock()
+
+
+_jwks: Dict[str, _JWKSEntry] = {}
+_jwks_lock = threading.Lock()
+# (token hash, domain, audience, issuer) -> (claims, expires_at)
+_claims: "OrderedDict[Tuple[str, ...], Tuple[dict, float]]" = OrderedDict()
+_claims_lock = threading.Lock()
+_auth0_stats = {"claims_hits": 0, "claims_misses": 0, "jwks_fetches": 0, "background_refreshes": 0}
+
+
+def _jwks_entry(domain: str) -> _JWKSEntry:
+    with _jwks_lock:
+        return _jwks.setdefault(domain, _JWKSEntry())
+
+
+def _load_jwks(domain: str, entry: _JWKSEntry) -> None:
+    """Fetch the domain's JWKS and replace its parsed keys (caller holds entry.lock)."""
+    entry.last_fetch_attempt = time.monotonic()
+    _auth0_stats["jwks_fetches"] += 1
+    jwks = get_auth0_jwks(domain)
+    keys = {}
+    for key in jwks.get('keys', []):
+        if key.get('kty') != 'RSA' or not key.get('kid'):
+            continue
+        try:
+            keys[key['kid']] = jwk.construct(key, algorithm='RS256')
+        except Exception as e:
+            logger.warning(f"Skipping unusable Auth0 signing key {key.get('kid')}: {e}")
+    entry.keys = keys
+    entry.fetched_at = time.monotonic()
+    logger.debug(f"Loaded {len(keys)} Auth0 signing keys for {domain}")
+
+
+def _refresh_in_background(domain: str, entry: _JWKSEntry) -> None:
+    with entry.lock:
+        if entry.refreshing:
+            return
+        entry.refreshing = True
+    
+    def refresh():
+        try:
+            with entry.lock:
+                _load_jwks(domain, entry)
+            _auth0_stats["background_refreshes"] += 1
+        except Exception as e:
+            # Keep serving the keys we have; the next stale lookup retries
+            logger.warning(f"Background Auth0 JWKS refresh failed for {domain}: {e}")
+        finally:
+            entry.refreshing = False
+    
+    threading.Thread(target=refresh, name="auth0-jwks-refresh", daemon=True).start()
+
+
+def get_auth0_signing_key(kid: str, auth0_domain: Optional[str] = None) -> Optional[Any]:
+    """
+    Get the parsed RSA key for a kid from the cached JWKS.
+    
+    Keys are loaded on first use and refreshed in the background once older
+    than AUTH0_JWKS_REFRESH_INTERVAL (or refetched inline past
+    AUTH0_JWKS_MAX_AGE). An unknown kid (e.g. after key rotation) triggers a
+    refetch at most once per AUTH0_JWKS_MIN_REFETCH_INTERVAL.
+    
+    Returns:
+        jose RSAKey, or None if the kid is unknown
+    
+    Raises:
+        ValueError: If no domain is configured
+        Exception: If the JWKS cannot be fetched and no keys are cached
+    """
+    domain = auth0_domain or settings.AUTH0_DOMAIN
+    if not domain:
+        raise ValueError("AUTH0_DOMAIN not configured")
+    entry = _jwks_entry(domain)
+    
+    age = time.monotonic() - entry.fetched_at
+    if not entry.fetched_at or age > settings.AUTH0_JWKS_MAX_AGE:
+        with entry.lock:
+            if not entry.fetched_at or time.monotonic() - entry.fetched_at > settings.AUTH0_JWKS_MAX_AGE:
+                _load_jwks(domain, entry)
+    elif age > settings.AUTH0_JWKS_REFRESH_INTERVAL:
+        _refresh_in_background(domain, entry)
+    
+    key = entry.keys.get(kid)
+    if key is not None:
+        return key
+    
+    with entry.lock:
+        key = entry.keys.get(kid)
+        if key is None and time.monotonic() - entry.last_fetch_attempt >= settings.AUTH0_JWKS_MIN_REFETCH_INTERVAL:
+            logger.info(f"Unknown Auth0 kid {kid}, refetching JWKS for {domain}")
+            _load_jwks(domain, entry)
+            key = entry.keys.get(kid)
+    return key
+
+
+def _cached_claims(cache_key: Tuple[str, ...]) -> Optional[dict]:
+    with _claims_lock:
+        cached = _claims.get(cache_key)
+        if cached is not None and cached[1] > time.time():
+            _claims.move_to_end(cache_key)
+            _auth0_stats["claims_hits"] += 1
+            return dict(cached[0])
+        if cached is not None:
+            del _claims[cache_key]
+        _auth0_stats["claims_misses"] += 1
+        return None
+
+
+def _cache_claims(cache_key: Tuple[str, ...], claims: dict) -> None:
+    expires_at = time.time() + settings.AUTH0_CLAIMS_CACHE_TTL
+    if isinstance(claims.get('exp'), (int, float)):
+        expires_at = min(expires_at, claims['exp'])
+    with _claims_lock:
+        _claims[cache_key] = (dict(claims), expires_at)
+        _claims.move_to_end(cache_key)
+        while len(_claims) > AUTH0_CLAIMS_CACHE_MAX_ENTRIES:
+            _claims.popitem(last=False)
+
+
+def get_auth0_cache_stats() -> Dict[str, Any]:
+    """Get Auth0 key and verified-claims cache counters."""
+    lookups = _auth0_stats["claims_hits"] + _auth0_stats["claims_misses"]
+    return {
+        **_auth0_stats,
+        "claims_cached": len(_claims),
+        "claims_hit_rate": (_auth0_stats["claims_hits"] / lookups * 100) if lookups > 0 else 0.0,
+        "domains": {domain: len(entry.keys) for domain, entry in list(_jwks.items())},
+    }
+
+
+def clear_auth0_caches() -> None:
+    """Drop cached signing keys and verified claims (tests, auth config changes)."""
+    with _jwks_lock:
+        _jwks.clear()
+    with _claims_lock:
+        _claims.clear()
+    for name in _auth0_stats:
+        _auth0_stats[name] = 0
+
+
 def validate_auth0_token(token: str, auth0_domain: Optional[str] = None, auth0_audience: Optional[str] = None, auth0_issuer: Optional[str] = None) -> Optional[dict]:
     """
     Validate Auth0 JWT token (RS256 signature verification).
     
+    Signing keys come from the cached JWKS, and claims verified for the same
+    token are reused for up to AUTH0_CLAIMS_CACHE_TTL seconds (never past
+    the token's exp).
+    
     Args:
         token: JWT token to validate
         auth0_domain: Auth0 domain (if None, uses settings or database config)
@@ -143,6 +309,12 @@ def validate_auth0_token(token: str, auth0_domain: Optional[str] = None, auth0_a
         logger.warning("Auth0 not configured, skipping Auth0 token validation")
         return None
     
+    final_issuer = issuer or f"https://{domain}/"
+    cache_key = (hashlib.sha256(token.encode()).hexdigest(), domain, audience, final_issuer)
+    claims = _cached_claims(cache_key)
+    if claims is not None:
+        return claims
+    
     try:
         # Get unverified header to find the key ID (kid)
         unverified_header = jwt.get_unverified_header(token)
@@ -152,28 +324,12 @@ def validate_auth0_token(token: str, auth0_domain: Optional[str] = None, auth0_a
             logger.warning("Token missing 'kid' in header")
             return None
         
-        # Fetch JWKS
-        jwks = get_auth0_jwks(domain)
-        
-        # Find the key with matching kid
-        rsa_key = None
-        for key in jwks.get('keys', []):
-            if key.get('kid') == kid:
-                rsa_key = {
-                    'kty': key['kty'],
-                    'kid': key['kid'],
-                    'use': key['use'],
-                    'n': key['n'],
-                    'e': key['e']
-                }
-                break
-        
+        rsa_key = get_auth0_signing_key(kid, domain)
         if not rsa_key:
             logger.warning(f"Unable to find key with kid: {kid}")
             return None
         
         # Decode and verify token
-        final_issuer = issuer or f"https://{domain}/"
         payload = jwt.decode(
             token,
             rsa_key,
@@ -182,6 +338,7 @@ def validate_auth0_token(token: str, auth0_domain: Optional[str] = None, auth0_a
             issuer=final_issuer
         )
         
+        _cache_claims(cache_key, payload)
         logger.debug(f"Auth0 token validated successfully: sub={payload.get('sub')}")
         return payload
         
@@ -1,10 +1,24 @@
-"""Redis cache configuration."""
+"""Redis cache configuration.
+
+redis_client is the synchronous client for code that runs outside the event
+loop. Request handlers, agents and other async code use get_async_redis(),
+which has its own connection pool and records per-command latency histograms
+(see get_cache_latency_stats()).
+"""
+import asyncio
+import logging
 import time
+from typing import Any, Dict, List, Optional
+
 import redis
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline as AsyncPipeline
 from redis.exceptions import ConnectionError, TimeoutError
 from redis.connection import ConnectionPool
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -64,3 +78,160 @@ def check_cache_health() -> bool:
         return True
     except Exception:
         return False
+
+
+# --- async client -------------------------------------------------------------
+
+# Latency histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram for one Redis command."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def observe(self, elapsed_ms: float, failed: bool = False) -> None:
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound), len(LATENCY_BUCKETS_MS))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if failed:
+            self.errors += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max_ms for the open-ended bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+# Command name (or "pipeline") -> latency histogram
+_latency: Dict[str, LatencyHistogram] = {}
+
+
+def _observe(command: str, started: float, failed: bool) -> None:
+    histogram = _latency.get(command)
+    if histogram is None:
+        histogram = _latency[command] = LatencyHistogram()
+    histogram.observe((time.perf_counter() - started) * 1000, failed)
+
+
+class _TimedPipeline(AsyncPipeline):
+    """Pipeline whose round trips are recorded under "pipeline"."""
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _observe("pipeline", started, failed)
+
+
+class _TimedRedis(aioredis.Redis):
+    """Async Redis client that records command latency."""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _observe(str(args[0]).lower(), started, failed)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> _TimedPipeline:
+        return _TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+# Async clients per event loop (asyncio connections are bound to the loop that opened them)
+_async_clients: Dict[asyncio.AbstractEventLoop, aioredis.Redis] = {}
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Async Redis client for the running event loop.
+
+    Uses its own pool (REDIS_POOL_SIZE connections) and the same timeouts as
+    redis_client, but waits without blocking the loop. Must be called from a
+    coroutine; clients live until close_async_redis() at shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        for stale in [l for l in _async_clients if l.is_closed()]:
+            _async_clients.pop(stale, None)
+        pool = aioredis.ConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_POOL_SIZE,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+        )
+        client = _async_clients[loop] = _TimedRedis(connection_pool=pool, decode_responses=False)
+    return client
+
+
+async def close_async_redis() -> None:
+    """Close the async Redis clients (application shutdown)."""
+    while _async_clients:
+        _, client = _async_clients.popitem()
+        try:
+            await client.aclose(close_connection_pool=True)
+        except Exception as e:
+            logger.warning(f"Error closing async Redis client: {e}")
+
+
+async def check_async_cache_health() -> bool:
+    """Check Redis connection health without blocking the event loop."""
+    try:
+        await get_async_redis().ping()
+        return True
+    except Exception:
+        return False
+
+
+def get_cache_latency_stats() -> Dict[str, Any]:
+    """Get async Redis latency histograms per command (milliseconds)."""
+    return {
+        "clients": len(_async_clients),
+        "commands": {command: h.summary() for command, h in sorted(_latency.items())},
+    }
+
+
+def reset_cache_latency_stats() -> None:
+    """Clear the latency histograms."""
+    _latency.clear()
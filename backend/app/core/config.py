@@ -42,6 +42,18 @@ class Settings(BaseSettings):
     REDIS_TOKEN_TTL: int = 3600
     REDIS_POOL_SIZE: int = 10
     
+    # In-process agent cache (app.services.cache)
+    AGENT_CACHE_MAX_ENTRIES: int = 10000
+    AGENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # Approximate size budget; least recently used entries are evicted first
+    AGENT_CACHE_SWEEP_INTERVAL: int = 60  # Seconds between background sweeps of expired entries
+    CHAT_CONTEXT_WINDOW: int = 50  # Most recent messages passed to agents each turn
+    CHAT_CONTEXT_CACHE_TTL: int = 1800  # Seconds a conversation's cached message window is kept
+    AGENT_GRAPH_CHECKPOINTING: bool = False  # Compile agent graphs with an in-memory checkpointer (nothing reads checkpoints back yet; debugging only)
+    AGENT_GRAPH_CHECKPOINT_THREADS: int = 500  # Most recent agent runs whose checkpoints are kept
+    META_AGENT_FAST_PATH: bool = True  # Classify clear queries locally before asking the LLM for an agent
+    META_AGENT_FAST_PATH_CONFIDENCE: float = 0.8  # Local confidence needed to skip the LLM selection call
+    META_AGENT_DECISION_TTL: int = 1800  # Seconds an agent selection is cached per conversation and query
+    
     # Tableau
     TABLEAU_SERVER_URL: str = ""
     TABLEAU_PAT_ENCRYPTION_KEY: Optional[str] = None  # Base64-encoded Fernet key for PAT storage
@@ -51,9 +63,34 @@ class Settings(BaseSettings):
     TABLEAU_SECRET_ID: Optional[str] = None  # Optional: Secret ID for JWT 'kid' header (defaults to client_id if not provided)
     TABLEAU_USERNAME: Optional[str] = None  # Optional: Username for JWT 'sub' claim (defaults to client_id)
     TABLEAU_API_VERSION: str = "3.21"  # Tableau REST API version (e.g., "3.21", "3.27")
+    TABLEAU_MAX_CONCURRENT_VIEW_FETCHES: int = 4  # Per-server cap on parallel view data requests (dashboard sheet fan-out)
+    TABLEAU_MAX_CONCURRENT_PAGE_FETCHES: int = 4  # Per-server cap on parallel REST listing page requests (catalog crawls)
+    SUMMARY_EXPORT_VIEW_TIMEOUT: float = 60.0  # Per-view timeout in seconds for multi-view exports
+    # Shared HTTP transport (connection pool reused by all TableauClient instances)
+    TABLEAU_HTTP2: bool = True  # Use HTTP/2 when the h2 package is installed
+    TABLEAU_HTTP_MAX_CONNECTIONS: int = 100
+    TABLEAU_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    TABLEAU_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection stays in the pool
+    # VDS query result cache (Redis shared across workers, plus an in-process L1)
+    VDS_RESULT_CACHE_ENABLED: bool = True
+    VDS_RESULT_CACHE_LIVE_TTL: int = 300  # Seconds results from live-connection datasources are kept
+    VDS_RESULT_CACHE_MAX_TTL: int = 86400  # Upper bound for extract datasources (entries are keyed by last refresh)
+    VDS_RESULT_CACHE_REFRESH_CHECK: int = 60  # Seconds a datasource's last-refresh time is reused before asking the REST API again
+    VDS_RESULT_CACHE_L1_ENTRIES: int = 256  # Decoded results kept in process
+    VDS_RESULT_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # Larger compressed results are not stored in Redis
+    VDS_RESULT_CACHE_ROLLUP: bool = True  # Answer coarser queries by re-aggregating cached finer-grained results
     
     # Gateway (embedded in backend; uses BACKEND_API_URL)
     GATEWAY_ENABLED: bool = True
+    AI_GATEWAY_TRANSPORT: str = "inprocess"  # "inprocess" calls the embedded gateway directly; "http" posts to BACKEND_API_URL
+    GATEWAY_HTTP2: bool = True  # Use HTTP/2 to providers when the h2 package is installed
+    GATEWAY_HTTP_TIMEOUT: float = 60.0  # Default provider request timeout in seconds
+    GATEWAY_HTTP_MAX_CONNECTIONS: int = 100  # Per provider host
+    GATEWAY_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GATEWAY_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle provider connection stays in the pool
+    GATEWAY_TOKEN_REFRESH_LEAD_SECONDS: int = 300  # Refresh provider tokens in the background this long before they would leave the token cache
+    GATEWAY_PROVIDER_CONFIG_TTL: int = 60  # Seconds the gateway reuses a ProviderConfig lookup
+    GATEWAY_STREAM_LOG_EVERY: int = 0  # Debug-log every Nth streamed chunk (0 = no per-chunk logging)
     MODEL_MAPPING: Optional[str] = None  # JSON string for custom model-to-provider mapping
     
     # SSL/TLS Configuration
@@ -94,6 +131,10 @@ class Settings(BaseSettings):
     AUTH0_DOMAIN: str = ""
     AUTH0_AUDIENCE: str = ""
     AUTH0_ISSUER: str = ""
+    AUTH0_JWKS_REFRESH_INTERVAL: int = 600  # Seconds before cached Auth0 signing keys are refreshed in the background
+    AUTH0_JWKS_MAX_AGE: int = 86400  # Cached signing keys older than this are refetched before use
+    AUTH0_JWKS_MIN_REFETCH_INTERVAL: int = 30  # Minimum seconds between JWKS refetches triggered by an unknown kid
+    AUTH0_CLAIMS_CACHE_TTL: int = 60  # Seconds verified Auth0 claims are reused per token (capped at token expiry)
     BACKEND_API_URL: str = "http://localhost:8000"  # Backend API URL for MCP Server
     TABLEAU_OAUTH_FRONTEND_REDIRECT: str = "http://localhost:3000"  # Frontend URL for OAuth callback redirect
 
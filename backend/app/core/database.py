@@ -2,6 +2,7 @@
 import time
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError, DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.pool import QueuePool
 from app.core.config import settings
@@ -43,6 +44,30 @@ engine = create_engine_with_retry()
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync DATABASE_URL onto its asyncio driver (asyncpg for PostgreSQL, aiosqlite for SQLite)."""
+    scheme, sep, rest = database_url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    if backend in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if backend == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return database_url
+
+
+# Async engine for request paths that run on the event loop (chat, context, feedback).
+# The sync engine above stays in use for admin endpoints, services and scripts.
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)
+
+# Objects stay readable after commit; lazy attribute loads are not available on async sessions
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -56,6 +81,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def check_database_health() -> bool:
     """Check database connection health."""
     try:
@@ -81,3 +112,20 @@ def safe_commit(db: Session) -> None:
     except Exception as e:
         db.rollback()
         raise
+
+
+async def safe_commit_async(db: AsyncSession) -> None:
+    """
+    Async counterpart of safe_commit.
+    
+    Args:
+        db: SQLAlchemy async session
+        
+    Raises:
+        Exception: Re-raises the original exception after rollback
+    """
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
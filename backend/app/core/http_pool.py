@@ -0,0 +1,164 @@
+"""Event-loop-scoped registry of shared httpx clients.
+
+Opening an httpx.AsyncClient per request means a new TCP + TLS handshake every
+time. Services instead borrow long-lived clients from an HTTPClientPool, which
+owns them until shutdown; callers must never close a borrowed client.
+
+httpx clients are bound to the event loop that opened their connections, so
+every entry is scoped to the running loop and entries for closed loops (e.g.
+after asyncio.run) are dropped. Pooled clients are shared between users, so
+they never keep response cookies. Each pool counts lookups, requests and newly
+opened connections per group (a provider, or a single group for Tableau) so
+/metrics can report connection reuse.
+
+The Tableau and LLM gateway transports wrap one pool each and only decide the
+key, limits and timeouts of their clients.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from http.cookiejar import CookieJar
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _DiscardingCookieJar(CookieJar):
+    """Cookie jar that never stores cookies.
+
+    A pooled client serves every user and site on a server, so a Set-Cookie
+    from one tenant's sign-in (e.g. Tableau's workgroup_session_id) must not
+    be replayed on another tenant's requests.
+    """
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+
+def _counters() -> Dict[str, int]:
+    return {"hits": 0, "misses": 0, "requests": 0, "connections_opened": 0}
+
+
+class HTTPClientPool:
+    """Shared httpx clients keyed by (event loop, *key), with per-group counters."""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Pool name for log messages (e.g. "Tableau")
+        """
+        self.name = name
+        self._clients: Dict[Tuple[Any, ...], httpx.AsyncClient] = {}
+        self._stats: Dict[Hashable, Dict[str, int]] = defaultdict(_counters)
+
+    @staticmethod
+    def http2_available(enabled: bool = True) -> bool:
+        """HTTP/2 needs the optional h2 package (httpx[http2])."""
+        if not enabled:
+            return False
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _request_hook(self, group: Hashable):
+        """Request hook and httpcore trace that count requests and new connections for a group."""
+        stats = self._stats[group]
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats["connections_opened"] += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            stats["requests"] += 1
+            request.extensions["trace"] = trace
+
+        return on_request
+
+    def _prune_closed_loops(self) -> None:
+        """Drop entries whose event loop has been closed."""
+        for key in [k for k in self._clients if k[0].is_closed()]:
+            self._clients.pop(key, None)
+
+    def get_client(
+        self,
+        key: Tuple[Any, ...],
+        group: Hashable,
+        *,
+        verify: Any,
+        timeout: float,
+        limits: httpx.Limits,
+        http2: bool,
+        label: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        """
+        Borrow the shared client for a key on the running loop, creating it on a miss.
+
+        Args:
+            key: Hashable client identity (without the loop)
+            group: Counter group the lookup and its requests are recorded under
+            verify: httpx verify value
+            timeout: Default request timeout in seconds
+            limits: Connection pool limits for a new client
+            http2: Whether a new client should negotiate HTTP/2
+            label: What the client talks to, for log messages
+
+        Returns:
+            Shared httpx.AsyncClient; callers must not close it
+        """
+        full_key = (asyncio.get_running_loop(), *key)
+        client = self._clients.get(full_key)
+        if client is not None and not client.is_closed:
+            self._stats[group]["hits"] += 1
+            return client
+
+        self._stats[group]["misses"] += 1
+        self._prune_closed_loops()
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            verify=verify,
+            http2=http2,
+            limits=limits,
+            cookies=_DiscardingCookieJar(),
+            event_hooks={"request": [self._request_hook(group)]},
+        )
+        self._clients[full_key] = client
+        logger.debug(f"Opened shared {self.name} HTTP client for {label or key} (pool size: {len(self._clients)})")
+        return client
+
+    def client_count(self, group: Optional[Hashable] = None, position: int = 0) -> int:
+        """Open clients, optionally only those whose key has `group` at `position`."""
+        if group is None:
+            return len(self._clients)
+        return sum(1 for k in self._clients if k[1 + position] == group)
+
+    def groups(self) -> Dict[Hashable, Dict[str, int]]:
+        """Raw counters per group."""
+        return dict(self._stats)
+
+    def group_stats(self, group: Hashable) -> Dict[str, Any]:
+        """Hit/miss and connection reuse counters for one group."""
+        stats = self._stats[group]
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": (stats["hits"] / lookups * 100) if lookups > 0 else 0.0,
+            "requests": stats["requests"],
+            "connections_opened": stats["connections_opened"],
+            "connections_reused": max(0, stats["requests"] - stats["connections_opened"]),
+        }
+
+    async def close_all(self) -> None:
+        """Close every shared client on the running loop (application shutdown)."""
+        loop = asyncio.get_running_loop()
+        for key in [k for k in self._clients if k[0] is loop]:
+            client = self._clients.pop(key)
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing shared {self.name} HTTP client for {key[1:]}: {e}")
+        self._prune_closed_loops()
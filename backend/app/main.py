@@ -10,7 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.core.config import settings, PROJECT_ROOT
 from app.core.database import check_database_health
-from app.core.cache import check_cache_health
+from app.core.cache import check_async_cache_health
 from app.services.gateway.router import get_available_models
 from app.services.gateway.api import get_configured_providers
 from app.core.database import get_db
@@ -91,7 +91,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # "*" is not honoured for credentialed requests, so name the headers the frontend reads
+    expose_headers=["X-Next-Cursor", "X-Error-Code"],
     max_age=3600,
 )
 
@@ -100,12 +101,35 @@ app.add_middleware(
 async def startup_event():
     """Run bootstrap logic on startup."""
     from app.core.bootstrap import bootstrap_admin_user
+    from app.services.ai.client import get_ai_client
+    from app.services.cache import get_cache
 
     try:
         bootstrap_admin_user()
     except Exception as e:
         logger.error(f"Error during startup bootstrap: {e}")
 
+    get_cache().start_sweeper()
+    get_ai_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and close shared AI clients, outbound HTTP and Redis connection pools and open export streams."""
+    from app.core.cache import close_async_redis
+    from app.services import export_stream
+    from app.services.ai.client import close_ai_clients
+    from app.services.cache import get_cache
+    from app.services.gateway import transport as gateway_transport
+    from app.services.tableau import transport as tableau_transport
+
+    await get_cache().stop_sweeper()
+    await close_ai_clients()
+    await tableau_transport.close_all()
+    await gateway_transport.close_all()
+    await export_stream.close_cursors()
+    await close_async_redis()
+
 # Global exception handler to ensure CORS headers on errors
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -180,7 +204,7 @@ async def database_health_check():
 @api_router.get("/health/cache", tags=["health"])
 async def cache_health_check():
     """Cache health check endpoint."""
-    is_healthy = check_cache_health()
+    is_healthy = await check_async_cache_health()
     if is_healthy:
         return {"status": "healthy", "service": "cache"}
     else:
@@ -194,7 +218,7 @@ async def cache_health_check():
 async def all_health_checks():
     """Comprehensive health check for all services."""
     db_healthy = check_database_health()
-    cache_healthy = check_cache_health()
+    cache_healthy = await check_async_cache_health()
     
     all_healthy = db_healthy and cache_healthy
     
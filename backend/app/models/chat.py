@@ -71,6 +71,12 @@ class Conversation(Base):
     context_objects = relationship("ChatContext", back_populates="conversation", cascade="all, delete-orphan")
     user = relationship("User", foreign_keys=[user_id])
     
+    # Indexes
+    __table_args__ = (
+        # Keyset pagination of a user's threads by recency
+        Index("idx_conversation_user_updated", "user_id", "updated_at", "id"),
+    )
+    
     def get_message_count(self) -> int:
         """Get the count of messages in this conversation."""
         return len(self.messages) if self.messages else 0
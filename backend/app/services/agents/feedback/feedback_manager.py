@@ -2,10 +2,11 @@
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import safe_commit_async
 from app.models.chat import Message, MessageRole
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 
 logger = logging.getLogger(__name__)
 
@@ -13,20 +14,18 @@ logger = logging.getLogger(__name__)
 class FeedbackManager:
     """Manages user feedback and learning for agents."""
     
-    def __init__(self, db: Session, model: str = "gpt-4", provider: str = "openai"):
+    def __init__(self, db: AsyncSession, model: str = "gpt-4", provider: str = "openai"):
         """Initialize feedback manager.
         
         Args:
-            db: Database session
+            db: Async database session
             model: Model to use for learning
             provider: Provider name (e.g., "openai", "apple", "vertex")
         """
         self.db = db
         self.model = model
         self.provider = provider
-        self.ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        self.ai_client = get_ai_client()
     
     async def record_correction(
         self,
@@ -62,7 +61,8 @@ class FeedbackManager:
             }
         )
         self.db.add(correction_message)
-        safe_commit(self.db)
+        await safe_commit_async(self.db)
+        await self.db.refresh(correction_message)
         
         # Extract learning from correction
         learning = await self._extract_learning(
@@ -94,7 +94,7 @@ class FeedbackManager:
             Refined query with feedback applied
         """
         # Get feedback history for this conversation
-        feedback_history = self._get_feedback_history(conversation_id, agent_type)
+        feedback_history = await self._get_feedback_history(conversation_id, agent_type)
         
         if not feedback_history:
             return {"refined_query": query, "changes": []}
@@ -149,7 +149,8 @@ class FeedbackManager:
             }
         )
         self.db.add(preference_message)
-        safe_commit(self.db)
+        await safe_commit_async(self.db)
+        await self.db.refresh(preference_message)
         
         return {
             "preferences_id": preference_message.id,
@@ -157,7 +158,7 @@ class FeedbackManager:
             "recorded_at": preference_message.created_at.isoformat()
         }
     
-    def _get_feedback_history(
+    async def _get_feedback_history(
         self,
         conversation_id: int,
         agent_type: Optional[str] = None
@@ -165,13 +166,12 @@ class FeedbackManager:
         """Get feedback history for conversation."""
         # Query messages with non-null extra_metadata
         # Filter in Python for JSON key existence (more reliable across databases)
-        query = self.db.query(Message).filter_by(
-            conversation_id=conversation_id
-        ).filter(
+        query = select(Message).where(
+            Message.conversation_id == conversation_id,
             Message.extra_metadata.isnot(None)
         )
         
-        messages = query.order_by(Message.created_at.desc()).limit(50).all()  # Get more, filter in Python
+        messages = (await self.db.scalars(query.order_by(Message.created_at.desc()).limit(50))).all()  # Get more, filter in Python
         
         # Filter messages that have "type" key in extra_metadata
         feedback_messages = []
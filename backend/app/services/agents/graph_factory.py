@@ -1,13 +1,101 @@
 """Factory for creating LangGraph agent graphs."""
 import logging
-from typing import Optional
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.graph import StateGraph
 
+from app.core.config import settings
+from app.services.columnar import to_plain
+from app.services.metrics import get_metrics
+
 logger = logging.getLogger(__name__)
 
+# Compiled graphs are immutable and safe to share, so each one is built once per process
+_compiled_graphs: Dict[Tuple, StateGraph] = {}
+_compile_lock = threading.Lock()
+
+# thread_id -> checkpointer for recent runs; the oldest threads are dropped past the limit
+_checkpoint_threads: "OrderedDict[str, Any]" = OrderedDict()
+_threads_lock = threading.Lock()
+
+
+def _get_or_compile(key: Tuple, build: Callable[[], StateGraph]) -> StateGraph:
+    """Return the cached graph for key, compiling it on first use."""
+    graph = _compiled_graphs.get(key)
+    if graph is not None:
+        return graph
+    with _compile_lock:
+        graph = _compiled_graphs.get(key)
+        if graph is None:
+            start_time = time.perf_counter()
+            graph = build()
+            get_metrics().record_graph_compile(
+                ":".join(str(part) for part in key),
+                time.perf_counter() - start_time,
+                checkpointer=getattr(graph, "checkpointer", None)
+            )
+            _compiled_graphs[key] = graph
+    return graph
+
+
+class _CheckpointSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer that writes query results with their rows.
+
+    msgpack reads dict storage, where a ColumnarResult keeps no "data".
+    """
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        return super().dumps_typed(to_plain(obj))
+
+
+def memory_checkpointer() -> MemorySaver:
+    """In-memory checkpointer for agent graphs compiled with checkpointing."""
+    return MemorySaver(serde=_CheckpointSerializer())
+
+
+def clear_graph_cache() -> None:
+    """Drop compiled graphs and their checkpoints (e.g. after changing agent settings in tests)."""
+    with _compile_lock:
+        _compiled_graphs.clear()
+    with _threads_lock:
+        _checkpoint_threads.clear()
+
 
 class AgentGraphFactory:
-    """Factory for creating agent graphs."""
+    """Factory for creating agent graphs.
+    
+    Graphs are compiled once per process per (agent type, version, retry
+    settings, checkpointing) and shared between requests. Each run must use
+    its own thread ID (see thread_config) so runs never see each other's
+    checkpoints.
+    """
+    
+    @staticmethod
+    def thread_config(graph: StateGraph, prefix: str, **configurable: Any) -> Dict[str, Any]:
+        """Build a run config with a fresh thread_id.
+        
+        Args:
+            graph: Graph the config will be used with
+            prefix: Thread ID prefix, e.g. "vizql-<conversation_id>"
+            **configurable: Extra configurable values (e.g. tableau_client)
+        
+        Returns:
+            Config dict for astream/ainvoke
+        """
+        thread_id = f"{prefix}-{uuid.uuid4().hex}"
+        checkpointer = getattr(graph, "checkpointer", None)
+        if checkpointer is not None and hasattr(checkpointer, "delete_thread"):
+            with _threads_lock:
+                _checkpoint_threads[thread_id] = checkpointer
+                while len(_checkpoint_threads) > settings.AGENT_GRAPH_CHECKPOINT_THREADS:
+                    old_thread_id, old_checkpointer = _checkpoint_threads.popitem(last=False)
+                    old_checkpointer.delete_thread(old_thread_id)
+        return {"configurable": {"thread_id": thread_id, **configurable}}
     
     @staticmethod
     def create_vizql_graph(
@@ -23,24 +111,36 @@ class AgentGraphFactory:
             max_execution_retries: Optional max execution retries (for v3). Falls back to settings if not provided.
         
         Returns:
-            Compiled StateGraph for VizQL agent
+            Compiled StateGraph for VizQL agent (shared, cached per process)
             
         Raises:
             ValueError: If version is not recognized
         """
+        checkpoint = settings.AGENT_GRAPH_CHECKPOINTING
         if version == "v3":
             from app.services.agents.vizql_streamlined.graph import create_streamlined_vizql_graph
-            # Pass retry config to graph creation
-            return create_streamlined_vizql_graph(
-                max_build_retries=max_build_retries,
-                max_execution_retries=max_execution_retries
+            # Resolve defaults first so explicit and fallback settings share one graph
+            if max_build_retries is None:
+                max_build_retries = settings.VIZQL_MAX_BUILD_RETRIES
+            if max_execution_retries is None:
+                max_execution_retries = settings.VIZQL_MAX_EXECUTION_RETRIES
+            return _get_or_compile(
+                ("vizql", version, max_build_retries, max_execution_retries, checkpoint),
+                lambda: create_streamlined_vizql_graph(
+                    max_build_retries=max_build_retries,
+                    max_execution_retries=max_execution_retries,
+                    checkpoint=checkpoint
+                )
             )
         elif version == "v2":
             from app.services.agents.vizql_tool_use.graph import get_vizql_tool_use_agent
-            return get_vizql_tool_use_agent()
+            return _get_or_compile(("vizql", version), get_vizql_tool_use_agent)
         elif version == "v1":
             from app.services.agents.vizql.graph import create_vizql_graph
-            return create_vizql_graph()
+            return _get_or_compile(
+                ("vizql", version, checkpoint),
+                lambda: create_vizql_graph(checkpoint=checkpoint)
+            )
         else:
             raise ValueError(f"Unknown VizQL version: {version}. Valid versions: v1, v2, v3")
     
@@ -52,7 +152,11 @@ class AgentGraphFactory:
             Compiled StateGraph for Summary agent
         """
         from app.services.agents.summary.graph import create_summary_graph
-        return create_summary_graph()
+        checkpoint = settings.AGENT_GRAPH_CHECKPOINTING
+        return _get_or_compile(
+            ("summary", checkpoint),
+            lambda: create_summary_graph(checkpoint=checkpoint)
+        )
     
     @staticmethod
     def create_multi_agent_graph() -> StateGraph:
@@ -62,7 +166,11 @@ class AgentGraphFactory:
             Compiled StateGraph for multi-agent orchestration
         """
         from app.services.agents.multi_agent.orchestrator import create_multi_agent_graph
-        return create_multi_agent_graph()
+        checkpoint = settings.AGENT_GRAPH_CHECKPOINTING
+        return _get_or_compile(
+            ("multi_agent", checkpoint),
+            lambda: create_multi_agent_graph(checkpoint=checkpoint)
+        )
     
     @staticmethod
     def create_graph(
@@ -1,4 +1,5 @@
 """Meta-agent for intelligent agent selection."""
+from app.services.agents.meta_agent.classifier import FastAgentClassifier
 from app.services.agents.meta_agent.selector import MetaAgentSelector
 
-__all__ = ["MetaAgentSelector"]
+__all__ = ["FastAgentClassifier", "MetaAgentSelector"]
@@ -0,0 +1,147 @@
+"""Fast local agent classifier (no LLM required).
+
+Most chat turns are a single data question ("sales by region last quarter") or
+a single summary request, and only need MetaAgentSelector to confirm that no
+multi-agent workflow is involved. This classifier settles those cases with
+keyword and pattern rules, building on RuleBasedRouter for schema and
+reformat questions, and reports a confidence so the selector can escalate
+ambiguous queries to the LLM.
+"""
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.services.agents.vizql.rule_based_router import get_rule_based_router
+
+logger = logging.getLogger(__name__)
+
+# Explicit multi-agent requests (same phrases AgentRouter treats as multi-agent)
+MULTI_KEYWORDS = [
+    "query and summarize", "export and analyze",
+    "construct query and execute", "build query then summarize",
+]
+
+# Actions served by the VizQL agent
+QUERY_ACTIONS = [
+    "query", "show", "list", "get", "find", "fetch", "compare", "plot", "chart",
+    "graph", "filter", "calculate", "compute", "build", "break down", "rank",
+]
+# Actions served by the summary agent
+SUMMARY_ACTIONS = [
+    "summarize", "summarise", "summary", "export", "report", "insights",
+    "analyze", "analyse", "explain", "describe", "download",
+]
+
+# Clause boundaries that introduce a follow-up step
+STEP_CONNECTORS = r"\b(?:and\s+then|then|after\s+that|afterwards|followed\s+by|and\s+also|next)\b|[;]"
+
+# Signals that a single clause is a data question
+QUESTION_PATTERNS = [
+    r"^(?:what|which|who|when|where|how|is|are|do|does|did)\b",
+    r"\b(?:by|per|for\s+each|top\s+\d+|bottom\s+\d+)\b",
+    r"\b(?:total|sum|average|avg|count|min|max|minimum|maximum|trend|growth|share)\b",
+]
+
+
+def normalize_query(user_query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation (cache key form)."""
+    return re.sub(r"\s+", " ", user_query.lower()).strip().rstrip("?.! ")
+
+
+def _mentions(text: str, words: List[str]) -> bool:
+    return any(re.search(rf"\b{re.escape(word)}\b", text) for word in words)
+
+
+class FastAgentClassifier:
+    """Rule-based agent selection for MetaAgentSelector.
+
+    classify() returns a selection shaped like MetaAgentSelector.select_agent's
+    result. Confidence is high (>= 0.85) only for clear cases; callers escalate
+    anything lower to the LLM.
+    """
+
+    def classify(
+        self,
+        user_query: str,
+        context: Optional[Dict[str, Any]] = None,
+        available_agents: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Classify a query locally.
+
+        Args:
+            user_query: User's query
+            context: Optional context (datasources, views, conversation history)
+            available_agents: Agents the caller may select
+
+        Returns:
+            Dictionary with selected agent, confidence, and reasoning
+        """
+        available_agents = available_agents or ["vizql", "summary", "multi_agent"]
+        context = context or {}
+        query = normalize_query(user_query)
+
+        def selection(agent: str, confidence: float, reasoning: str) -> Dict[str, Any]:
+            if agent not in available_agents:
+                # The rule picked an agent the caller cannot use; let the LLM choose
+                confidence = min(confidence, 0.5)
+            return {
+                "selected_agent": agent,
+                "confidence": confidence,
+                "reasoning": reasoning,
+                "alternative_agents": [],
+                "requires_multi_agent": agent == "multi_agent",
+            }
+
+        if not query:
+            return selection("vizql", 0.0, "Empty query")
+
+        if any(keyword in query for keyword in MULTI_KEYWORDS):
+            return selection("multi_agent", 0.95, "Explicit multi-agent request")
+
+        # Schema lookups and reformatting of previous results stay with the VizQL agent
+        query_type, reasoning, _ = get_rule_based_router().classify(
+            query, has_previous_results=bool(context.get("conversation_history"))
+        )
+        if query_type != "new_query":
+            return selection("vizql", 0.9, reasoning)
+
+        clauses = [c.strip() for c in re.split(STEP_CONNECTORS, query) if c and c.strip()]
+        # "... and summarize it" also starts a new step
+        clauses = [
+            part.strip()
+            for clause in clauses
+            for part in re.split(rf"\band\s+(?=(?:{'|'.join(SUMMARY_ACTIONS + QUERY_ACTIONS)})\b)", clause)
+            if part.strip()
+        ]
+        steps = [
+            ("query" if _mentions(c, QUERY_ACTIONS) else None, "summary" if _mentions(c, SUMMARY_ACTIONS) else None)
+            for c in clauses
+        ]
+        wants_query = any(q for q, _ in steps)
+        wants_summary = any(s for _, s in steps)
+
+        if len(clauses) > 1 and wants_query and wants_summary:
+            return selection("multi_agent", 0.9, "Query step followed by a summary step")
+
+        is_question = any(re.search(p, query) for p in QUESTION_PATTERNS)
+        if wants_summary and not wants_query:
+            if is_question:
+                return selection("summary", 0.6, "Summary request that also asks a data question")
+            return selection("summary", 0.85, "Summary or export request")
+        if wants_summary:
+            return selection("vizql", 0.6, "Mixes query and summary wording in one step")
+        if wants_query or is_question:
+            return selection("vizql", 0.9, "Single data question")
+        return selection("vizql", 0.5, "No clear signal")
+
+
+# Global instance for reuse
+_classifier_instance = None
+
+
+def get_fast_agent_classifier() -> FastAgentClassifier:
+    """Get singleton instance of the fast agent classifier."""
+    global _classifier_instance
+    if _classifier_instance is None:
+        _classifier_instance = FastAgentClassifier()
+    return _classifier_instance
@@ -1,7 +1,13 @@
 """Meta-agent for intelligent agent selection."""
+import hashlib
+import json
 import logging
+import time
 from typing import Dict, Any, Optional, List
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import get_ai_client
+from app.services.agents.meta_agent.classifier import get_fast_agent_classifier, normalize_query
+from app.services.cache import get_cache
+from app.services.metrics import get_metrics
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,29 +25,82 @@ class MetaAgentSelector:
         """
         self.model = model
         self.provider = provider
-        self.ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        self.ai_client = get_ai_client()
     
     async def select_agent(
         self,
         user_query: str,
         context: Optional[Dict[str, Any]] = None,
-        available_agents: Optional[List[str]] = None
+        available_agents: Optional[List[str]] = None,
+        conversation_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Select the best agent for a query using AI reasoning.
+        """Select the best agent for a query.
+        
+        Decisions are cached per (conversation, normalized query). On a miss
+        the fast local classifier answers clear cases; only queries it is
+        unsure about go to the LLM. The result's decision_source ("cache",
+        "rules" or "llm") is recorded in metrics.
         
         Args:
             user_query: User's query
             context: Optional context (datasources, views, conversation history)
             available_agents: Optional list of available agent types
+            conversation_id: Conversation the query belongs to (scopes the decision cache)
             
         Returns:
-            Dictionary with selected agent, confidence, and reasoning
+            Dictionary with selected agent, confidence, reasoning and decision_source
         """
         if available_agents is None:
             available_agents = ["vizql", "summary", "multi_agent"]
         
+        start = time.perf_counter()
+        cache = get_cache()
+        cache_key = self._decision_cache_key(user_query, context, available_agents, conversation_id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            get_metrics().record_agent_selection("cache", time.perf_counter() - start)
+            return {**cached, "decision_source": "cache"}
+        
+        selection = None
+        if settings.META_AGENT_FAST_PATH:
+            local = get_fast_agent_classifier().classify(user_query, context, available_agents)
+            if local["confidence"] >= settings.META_AGENT_FAST_PATH_CONFIDENCE:
+                selection = {**local, "decision_source": "rules"}
+            else:
+                logger.debug(f"Fast classifier unsure ({local['confidence']:.2f}: {local['reasoning']}), asking LLM")
+        if selection is None:
+            selection = {**await self._select_with_llm(user_query, context, available_agents), "decision_source": "llm"}
+        
+        get_metrics().record_agent_selection(selection["decision_source"], time.perf_counter() - start)
+        cache.set(cache_key, selection, settings.META_AGENT_DECISION_TTL)
+        return selection
+    
+    def _decision_cache_key(
+        self,
+        user_query: str,
+        context: Optional[Dict[str, Any]],
+        available_agents: List[str],
+        conversation_id: Optional[int]
+    ) -> str:
+        """Cache key for a decision; the model and the datasources/views in context are part of it."""
+        context = context or {}
+        key_data = [
+            normalize_query(user_query),
+            self.model,
+            sorted(available_agents),
+            sorted(map(str, context.get("datasources") or [])),
+            sorted(map(str, context.get("views") or [])),
+        ]
+        key_hash = hashlib.md5(json.dumps(key_data).encode()).hexdigest()
+        return f"meta_agent:{conversation_id}:{key_hash}"
+    
+    async def _select_with_llm(
+        self,
+        user_query: str,
+        context: Optional[Dict[str, Any]],
+        available_agents: List[str]
+    ) -> Dict[str, Any]:
+        """Select the best agent for a query using AI reasoning."""
         selection_prompt = self._build_selection_prompt(
             user_query=user_query,
             context=context,
@@ -2,9 +2,8 @@
 import logging
 from typing import Dict, Any, List, Optional, TypedDict, Annotated, Sequence, TYPE_CHECKING
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
-from app.services.agents.graph_factory import AgentGraphFactory
+from app.services.agents.graph_factory import AgentGraphFactory, memory_checkpointer
 from app.services.agents.base_state import BaseAgentState
 
 if TYPE_CHECKING:
@@ -72,12 +71,9 @@ class MultiAgentOrchestrator:
         Returns:
             List of workflow steps, each with agent_type and action
         """
-        from app.services.ai.client import UnifiedAIClient
-        from app.core.config import settings
+        from app.services.ai.client import get_ai_client
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         planning_prompt = f"""Analyze this user query and determine if it requires multiple agents to complete.
 
@@ -262,7 +258,8 @@ Return ONLY the JSON array, no other text."""
                     "execution_error": None,
                 }
             
-            result = await graph.ainvoke(state)
+            config = AgentGraphFactory.thread_config(graph, "vizql", tableau_client=tableau_client)
+            result = await graph.ainvoke(state, config=config)
             return {
                 "agent_type": "vizql",
                 "result": result.get("final_answer"),
@@ -293,7 +290,7 @@ Return ONLY the JSON array, no other text."""
             if input_data and "query_results" in input_data:
                 state["view_data"] = input_data["query_results"]
             
-            config = {"configurable": {"thread_id": f"summary-{id(self)}", "tableau_client": tableau_client}}
+            config = AgentGraphFactory.thread_config(graph, "summary", tableau_client=tableau_client)
             result = await graph.ainvoke(state, config=config)
             return {
                 "agent_type": "summary",
@@ -304,12 +301,10 @@ Return ONLY the JSON array, no other text."""
         
         else:
             # LLM fallback for non-vizql/summary steps (internal use only, not user-selectable)
-            from app.services.ai.client import UnifiedAIClient
+            from app.services.ai.client import get_ai_client
             from app.core.config import settings
             
-            ai_client = UnifiedAIClient(
-                gateway_url=settings.BACKEND_API_URL
-            )
+            ai_client = get_ai_client()
             
             messages = [{"role": "user", "content": action}]
             if input_data:
@@ -474,7 +469,7 @@ Return ONLY the JSON array, no other text."""
         return "\n\n".join(combined_parts)
 
 
-def create_multi_agent_graph() -> StateGraph:
+def create_multi_agent_graph(checkpoint: bool = True) -> StateGraph:
     """Create multi-agent orchestration graph.
     
     Returns:
@@ -625,5 +620,5 @@ def create_multi_agent_graph() -> StateGraph:
     workflow.add_edge("combine_results", END)
     
     # Compile with checkpointing
-    memory = MemorySaver()
+    memory = memory_checkpointer() if checkpoint else None
     return workflow.compile(checkpointer=memory)
@@ -1,24 +1,31 @@
 """Shared query execution with retry and caching."""
-import json
 import logging
 from typing import Dict, Any
 
+from app.core.config import settings
 from app.services.tableau.client import TableauClient, TableauAPIError
 from app.services.retry import retry_with_backoff, RetryConfig
-from app.services.cache import get_cache
+from app.services.vds_result_cache import get_vds_result_cache
 from app.services.query_optimizer import simplify_query_for_large_dataset
 
 logger = logging.getLogger(__name__)
 
 
 async def execute_query_with_retry(tableau_client: TableauClient, query: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute query with retry logic and graceful degradation."""
-    cache = get_cache()
-    query_key = f"query_result:{json.dumps(query, sort_keys=True)}"
-    cached_result = cache.get(query_key)
-    if cached_result:
+    """Execute query with retry logic and graceful degradation.
+
+    Results answered from a cached finer-grained result carry a "rollup" entry.
+    """
+    cache = get_vds_result_cache() if settings.VDS_RESULT_CACHE_ENABLED else None
+    cached_result = await cache.get(tableau_client, query) if cache else None
+    if cached_result is not None:
         logger.info("Using cached query result")
         return cached_result
+    if cache and settings.VDS_RESULT_CACHE_ROLLUP:
+        rolled_up = await cache.rollup(tableau_client, query)
+        if rolled_up is not None:
+            logger.info("Answered query by rolling up a cached result")
+            return rolled_up
 
     retry_config = RetryConfig(
         max_attempts=3,
@@ -33,16 +40,16 @@ async def execute_query_with_retry(tableau_client: TableauClient, query: Dict[st
             config=retry_config,
             retryable_exceptions=(TableauAPIError, TimeoutError, ConnectionError),
         )
-        cache.set(query_key, results, ttl_seconds=300)
+        if cache:
+            await cache.set(tableau_client, query, results)
         return results
     except Exception as e:
         logger.error(f"Query execution failed after retries: {e}")
         try:
             logger.info("Attempting graceful degradation with simplified query")
             simplified_query = simplify_query_for_large_dataset(query, estimated_rows=100000)
-            simplified_key = f"query_result:{json.dumps(simplified_query, sort_keys=True)}"
-            cached_simplified = cache.get(simplified_key)
-            if cached_simplified:
+            cached_simplified = await cache.get(tableau_client, simplified_query) if cache else None
+            if cached_simplified is not None:
                 logger.info("Using cached simplified query result")
                 return cached_simplified
             simple_retry_config = RetryConfig(max_attempts=1, initial_delay=1.0)
@@ -53,7 +60,8 @@ async def execute_query_with_retry(tableau_client: TableauClient, query: Dict[st
                 retryable_exceptions=(TableauAPIError, TimeoutError, ConnectionError),
             )
             logger.info("Simplified query executed successfully")
-            cache.set(simplified_key, results, ttl_seconds=300)
+            if cache:
+                await cache.set(tableau_client, simplified_query, results)
             return results
         except Exception as degrade_error:
             logger.error(f"Graceful degradation also failed: {degrade_error}")
@@ -1,8 +1,7 @@
 """Self-reflection and critique utilities for agents."""
 import logging
 from typing import Dict, Any, List, Optional
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +18,7 @@ class SelfReflectionCritic:
         """
         self.api_key = api_key
         self.model = model
-        self.ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL,
-            api_key=api_key
-        )
+        self.ai_client = get_ai_client()
     
     async def critique_output(
         self,
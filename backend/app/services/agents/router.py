@@ -7,6 +7,7 @@ from app.services.agents.vds_agent import VDSAgent
 from app.services.agents.summary_agent import SummaryAgent
 from app.services.ai.agent import Agent as AnalystAgent
 from app.services.ai.client import UnifiedAIClient
+from app.services.columnar import count_rows
 from app.services.tableau.client import TableauClient
 
 logger = logging.getLogger(__name__)
@@ -198,9 +199,10 @@ class AgentRouter:
                         }
                     else:
                         # Summarize data directly
+                        rows = count_rows(previous_result)
                         summary_text = await agent._generate_summary_text({
-                            "datasets": [{"data": previous_result.get("data", []), "row_count": len(previous_result.get("data", []))}],
-                            "total_rows": len(previous_result.get("data", [])),
+                            "datasets": [{"data": previous_result.get("data", []), "row_count": rows}],
+                            "total_rows": rows,
                             "view_count": 1
                         })
                         results["summary"] = {"text": summary_text}
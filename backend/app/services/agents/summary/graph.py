@@ -1,8 +1,8 @@
 """Summary agent graph implementation."""
 import logging
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from app.services.agents.graph_factory import memory_checkpointer
 from app.services.agents.summary.state import SummaryAgentState
 from app.services.agents.summary.nodes.start import start_node
 from app.services.agents.summary.nodes.get_data import get_data_node
@@ -11,7 +11,7 @@ from app.services.agents.summary.nodes.summarizer import summarize_node
 logger = logging.getLogger(__name__)
 
 
-def create_summary_graph() -> StateGraph:
+def create_summary_graph(checkpoint: bool = True) -> StateGraph:
     """
     Create Summary agent graph with tool-based data pipeline.
     Graph flow: start -> get_data (tools) -> summarizer -> END
@@ -24,5 +24,5 @@ def create_summary_graph() -> StateGraph:
     workflow.add_edge("start", "get_data")
     workflow.add_edge("get_data", "summarizer")
     workflow.add_edge("summarizer", END)
-    memory = MemorySaver()
+    memory = memory_checkpointer() if checkpoint else None
     return workflow.compile(checkpointer=memory)
@@ -1,15 +1,83 @@
 """Analyzer node for statistical analysis."""
+import hashlib
+import json
 import logging
+import warnings
 from typing import Dict, Any, List
 import pandas as pd
 import numpy as np
 
 from app.services.agents.summary.state import SummaryAgentState
+from app.services.cache import get_cache
+from app.services.columnar import as_dataframe
 from app.services.metrics import track_node_execution
 
 logger = logging.getLogger(__name__)
 
 
+# Currency symbols, thousands separators and percent signs stripped before parsing
+_NUMERIC_NOISE = r"[,$%€£¥]"
+
+# Parsed frames are cached per view so follow-up questions skip re-parsing
+PARSED_FRAME_TTL_SECONDS = 900
+
+
+def _convert_to_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce every column to float64 in bulk.
+    
+    Numeric columns are cast directly. Text columns have currency symbols,
+    thousands separators and percent signs stripped with one vectorised string
+    replace before pd.to_numeric; unparseable values become NaN. Categorical
+    columns only parse their distinct values.
+    """
+    parsed = []
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            categories = _parse_numeric_strings(pd.Series(col.cat.categories, dtype=object)).to_numpy()
+            codes = col.cat.codes.to_numpy()
+            values = np.where(codes >= 0, categories[codes] if len(categories) else np.nan, np.nan)
+            parsed.append(pd.Series(values, index=df.index, dtype="float64"))
+        elif pd.api.types.is_numeric_dtype(col):
+            parsed.append(col.astype("float64"))
+        else:
+            parsed.append(_parse_numeric_strings(col))
+    numeric = pd.concat(parsed, axis=1, ignore_index=True) if parsed else pd.DataFrame(index=df.index)
+    numeric.columns = df.columns
+    return numeric
+
+
+def _parse_numeric_strings(values: pd.Series) -> pd.Series:
+    """Strip formatting from a column of values and parse to float64 (NaN when unparseable)."""
+    cleaned = values.astype(str).str.replace(_NUMERIC_NOISE, "", regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce").astype("float64")
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame (vectorised row hashing plus column names)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _get_numeric_frame(df: pd.DataFrame, view_id: str) -> pd.DataFrame:
+    """Parse a view's frame to numeric columns, reusing a cached parse of identical data."""
+    cache = get_cache()
+    try:
+        cache_key = f"summary_numeric_frame:{view_id}:{_frame_fingerprint(df)}"
+    except Exception as e:
+        logger.debug(f"Could not fingerprint frame for view {view_id}: {e}")
+        return _convert_to_numeric(df)
+    
+    numeric = cache.get(cache_key)
+    if numeric is None:
+        numeric = _convert_to_numeric(df)
+        cache.set(cache_key, numeric, PARSED_FRAME_TTL_SECONDS)
+    return numeric
+
+
 def _analyze_single_view(df: pd.DataFrame, view_id: str, view_name: str) -> tuple:
     """
     Analyze a single view's data.
@@ -17,34 +85,46 @@ def _analyze_single_view(df: pd.DataFrame, view_id: str, view_name: str) -> tupl
     Returns:
         Tuple of (column_stats, trends, outliers, correlations)
     """
-    # Convert columns to numeric where possible
-    for col in df.columns:
-        df[col] = df[col].apply(_convert_to_numeric)
+    numeric = _get_numeric_frame(df, view_id)
+    # Columns where nothing parsed carry no numeric signal
+    numeric = numeric.loc[:, numeric.notna().any().to_numpy()]
+    numeric_cols = list(numeric.columns)
     
-    # Calculate statistics for numeric columns
+    # Calculate statistics for all numeric columns in one pass over the 2-D block
     column_stats = {}
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    
-    for col in numeric_cols:
-        col_data = df[col].dropna()
-        if len(col_data) > 0:
-            column_stats[col] = {
-                "mean": float(col_data.mean()) if not col_data.empty else None,
-                "median": float(col_data.median()) if not col_data.empty else None,
-                "std": float(col_data.std()) if len(col_data) > 1 else None,
-                "min": float(col_data.min()) if not col_data.empty else None,
-                "max": float(col_data.max()) if not col_data.empty else None,
-                "missing": int(df[col].isna().sum()),
-                "count": int(len(col_data))
-            }
+    block = numeric.to_numpy(dtype="float64")
+    counts = (~np.isnan(block)).sum(axis=0)
+    if numeric_cols:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # std of single-value columns
+            means = np.nanmean(block, axis=0)
+            stds = np.nanstd(block, axis=0, ddof=1)
+            mins = np.nanmin(block, axis=0)
+            maxs = np.nanmax(block, axis=0)
+            q1s, medians, q3s = np.nanquantile(block, [0.25, 0.5, 0.75], axis=0)
+    for i, col in enumerate(numeric_cols):
+        count = int(counts[i])
+        column_stats[col] = {
+            "mean": float(means[i]),
+            "median": float(medians[i]),
+            "std": float(stds[i]) if count > 1 else None,
+            "min": float(mins[i]),
+            "max": float(maxs[i]),
+            "missing": len(block) - count,
+            "count": count
+        }
     
-    # Detect trends (check for monotonic patterns)
     trends = []
-    for col in numeric_cols:
-        col_data = df[col].dropna()
-        if len(col_data) > 2:
-            # Check for monotonic increase/decrease
-            if col_data.is_monotonic_increasing:
+    outliers = []
+    for i, col in enumerate(numeric_cols):
+        values = block[:, i]
+        values = values[~np.isnan(values)]
+        n = len(values)
+        
+        # Detect trends (monotonic patterns, else least-squares slope)
+        if n > 2:
+            steps = np.diff(values)
+            if (steps >= 0).all():
                 trends.append({
                     "view_id": view_id,
                     "view_name": view_name,
@@ -52,7 +132,7 @@ def _analyze_single_view(df: pd.DataFrame, view_id: str, view_name: str) -> tupl
                     "trend": "increasing",
                     "description": f"{col} shows a consistent increasing trend"
                 })
-            elif col_data.is_monotonic_decreasing:
+            elif (steps <= 0).all():
                 trends.append({
                     "view_id": view_id,
                     "view_name": view_name,
@@ -61,64 +141,49 @@ def _analyze_single_view(df: pd.DataFrame, view_id: str, view_name: str) -> tupl
                     "description": f"{col} shows a consistent decreasing trend"
                 })
             else:
-                # Check for overall trend using linear regression
-                try:
-                    x = np.arange(len(col_data))
-                    slope = np.polyfit(x, col_data.values, 1)[0]
-                    if abs(slope) > 0.01:  # Significant slope
-                        trends.append({
-                            "view_id": view_id,
-                            "view_name": view_name,
-                            "column": col,
-                            "trend": "increasing" if slope > 0 else "decreasing",
-                            "description": f"{col} shows an overall {'increasing' if slope > 0 else 'decreasing'} trend",
-                            "slope": float(slope)
-                        })
-                except Exception:
-                    pass
-    
-    # Detect outliers using IQR method
-    outliers = []
-    for col in numeric_cols:
-        col_data = df[col].dropna()
-        if len(col_data) > 4:  # Need at least 4 points for IQR
-            Q1 = col_data.quantile(0.25)
-            Q3 = col_data.quantile(0.75)
+                x = np.arange(n) - (n - 1) / 2
+                slope = float(np.dot(x, values - values.mean()) / np.dot(x, x))
+                if abs(slope) > 0.01:  # Significant slope
+                    trends.append({
+                        "view_id": view_id,
+                        "view_name": view_name,
+                        "column": col,
+                        "trend": "increasing" if slope > 0 else "decreasing",
+                        "description": f"{col} shows an overall {'increasing' if slope > 0 else 'decreasing'} trend",
+                        "slope": slope
+                    })
+        
+        # Detect outliers using IQR method (quartiles from the stats pass)
+        if n > 4:  # Need at least 4 points for IQR
+            Q1, Q3 = q1s[i], q3s[i]
             IQR = Q3 - Q1
-            
             if IQR > 0:  # Avoid division by zero
                 lower_bound = Q1 - 1.5 * IQR
                 upper_bound = Q3 + 1.5 * IQR
-                outlier_mask = (col_data < lower_bound) | (col_data > upper_bound)
-                
-                if outlier_mask.any():
-                    outlier_values = col_data[outlier_mask].tolist()
+                outlier_mask = (values < lower_bound) | (values > upper_bound)
+                outlier_count = int(outlier_mask.sum())
+                if outlier_count:
                     outliers.append({
                         "view_id": view_id,
                         "view_name": view_name,
                         "column": col,
-                        "count": int(outlier_mask.sum()),
-                        "percentage": float(outlier_mask.sum() / len(col_data) * 100),
+                        "count": outlier_count,
+                        "percentage": float(outlier_count / n * 100),
                         "lower_bound": float(lower_bound),
                         "upper_bound": float(upper_bound),
-                        "sample_values": [float(v) for v in outlier_values[:5]]  # Sample of outlier values
+                        "sample_values": [float(v) for v in values[outlier_mask][:5]]  # Sample of outlier values
                     })
     
     # Calculate correlations between numeric columns
     correlations = None
     if len(numeric_cols) > 1:
         try:
-            corr_matrix = df[numeric_cols].corr()
-            # Convert to dict format (only strong correlations > 0.5 or < -0.5)
+            corr = numeric.corr().to_numpy(copy=True)
+            np.fill_diagonal(corr, np.nan)
+            # Only strong correlations (> 0.5 or < -0.5)
             correlations = {}
-            for col1 in numeric_cols:
-                for col2 in numeric_cols:
-                    if col1 != col2:
-                        corr_value = corr_matrix.loc[col1, col2]
-                        if abs(corr_value) > 0.5:
-                            if col1 not in correlations:
-                                correlations[col1] = {}
-                            correlations[col1][col2] = float(corr_value)
+            for r, c in zip(*np.nonzero(np.abs(np.nan_to_num(corr)) > 0.5)):
+                correlations.setdefault(numeric_cols[r], {})[numeric_cols[c]] = float(corr[r, c])
         except Exception as e:
             logger.warning(f"Error calculating correlations: {e}")
             correlations = {}
@@ -126,23 +191,6 @@ def _analyze_single_view(df: pd.DataFrame, view_id: str, view_name: str) -> tupl
     return column_stats, trends, outliers, correlations
 
 
-def _convert_to_numeric(value: Any) -> float:
-    """Convert value to numeric, handling various formats."""
-    if value is None:
-        return np.nan
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        # Try to parse string numbers
-        try:
-            # Remove common formatting (commas, currency symbols, etc.)
-            cleaned = value.replace(",", "").replace("$", "").replace("%", "").strip()
-            return float(cleaned)
-        except (ValueError, AttributeError):
-            return np.nan
-    return np.nan
-
-
 @track_node_execution("summary", "analyzer")
 async def analyze_data_node(state: SummaryAgentState) -> Dict[str, Any]:
     """
@@ -171,15 +219,14 @@ async def analyze_data_node(state: SummaryAgentState) -> Dict[str, Any]:
                 view_name = views_metadata.get(view_id, {}).get("name", view_id)
                 logger.info(f"Analyzing view: {view_name} ({view_id})")
                 
-                data_rows = v_data.get("data", [])
                 columns = v_data.get("columns", [])
                 
-                if not data_rows or not columns:
+                if not (v_data.get("row_count") or len(v_data.get("data", []))) or not columns:
                     logger.warning(f"View {view_id} has no data")
                     continue
                 
                 try:
-                    df = pd.DataFrame(data_rows, columns=columns)
+                    df = as_dataframe(v_data, categorical=True)
                 except Exception as e:
                     logger.error(f"Error creating DataFrame for view {view_id}: {e}")
                     continue
@@ -214,10 +261,9 @@ async def analyze_data_node(state: SummaryAgentState) -> Dict[str, Any]:
                 "correlations": None
             }
         
-        data_rows = view_data.get("data", [])
         columns = view_data.get("columns", [])
         
-        if not data_rows or not columns:
+        if not (view_data.get("row_count") or len(view_data.get("data", []))) or not columns:
             return {
                 **state,
                 "error": "View data is empty",
@@ -229,7 +275,7 @@ async def analyze_data_node(state: SummaryAgentState) -> Dict[str, Any]:
         
         # Convert to pandas DataFrame
         try:
-            df = pd.DataFrame(data_rows, columns=columns)
+            df = as_dataframe(view_data, categorical=True)
         except Exception as e:
             logger.error(f"Error creating DataFrame: {e}")
             return {
@@ -250,7 +296,7 @@ async def analyze_data_node(state: SummaryAgentState) -> Dict[str, Any]:
             "trends": trends,
             "outliers": outliers,
             "correlations": correlations,
-            "current_thought": f"Analyzed {len(df.select_dtypes(include=[np.number]).columns)} numeric columns, found {len(trends)} trends and {len(outliers)} columns with outliers"
+            "current_thought": f"Analyzed {len(column_stats)} numeric columns, found {len(trends)} trends and {len(outliers)} columns with outliers"
         }
         
     except Exception as e:
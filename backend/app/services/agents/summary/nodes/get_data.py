@@ -7,9 +7,9 @@ from langchain_core.runnables.config import ensure_config
 
 from app.services.agents.summary.state import SummaryAgentState
 from app.services.agents.summary.tools import SummaryTools, _extract_embedded_to_views_data, _sanitize_view_id
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import get_ai_client
 from app.prompts.registry import prompt_registry
-from app.core.config import settings
+from app.services.columnar import result_view
 from app.services.tableau.client import TableauClient
 
 logger = logging.getLogger(__name__)
@@ -118,10 +118,10 @@ async def get_data_node(state: SummaryAgentState) -> Dict[str, Any]:
                     if "error" not in res:
                         if "sheets" in res:
                             for k, d in res["sheets"].items():
-                                views_data[k] = {"columns": d.get("columns", []), "data": d.get("data", []), "row_count": d.get("row_count", 0)}
+                                views_data[k] = result_view(d)
                                 views_metadata[k] = {"id": k, "name": d.get("name", k)}
                         else:
-                            views_data[cid] = {"columns": res.get("columns", []), "data": res.get("data", []), "row_count": res.get("row_count", 0)}
+                            views_data[cid] = result_view(res)
                             views_metadata[cid] = {"id": cid, "name": res.get("name", cid)}
                 logger.info(f"REST fallback for {vid} ({vt})")
             except Exception as e:
@@ -152,7 +152,7 @@ async def get_data_node(state: SummaryAgentState) -> Dict[str, Any]:
         tool_defs = tools.get_tool_definitions()
         tools_payload = [{"type": "function", "function": f} for f in tool_defs] if use_tools_format else tool_defs
 
-        ai_client = UnifiedAIClient(gateway_url=settings.BACKEND_API_URL, timeout=120)
+        ai_client = get_ai_client(timeout=120)
         tool_calls_made = []
         iteration = 0
 
@@ -205,10 +205,10 @@ async def get_data_node(state: SummaryAgentState) -> Dict[str, Any]:
             if tool_name in ("get_embed_data", "get_rest_summary_data") and "error" not in result:
                 if "sheets" in result:
                     for k, d in result["sheets"].items():
-                        views_data[k] = {"columns": d.get("columns", []), "data": d.get("data", []), "row_count": d.get("row_count", 0)}
+                        views_data[k] = result_view(d)
                         views_metadata[k] = {"id": k, "name": d.get("name", k)}
                 else:
-                    views_data[view_id] = {"columns": result.get("columns", []), "data": result.get("data", []), "row_count": result.get("row_count", 0)}
+                    views_data[view_id] = result_view(result)
                     views_metadata[view_id] = {"id": view_id, "name": result.get("name", view_id)}
             elif tool_name == "get_exported_image" and "error" not in result:
                 b64 = result.get("image_base64")
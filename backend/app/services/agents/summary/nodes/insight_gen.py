@@ -5,8 +5,7 @@ from typing import Dict, Any
 
 from app.services.agents.summary.state import SummaryAgentState
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 
 logger = logging.getLogger(__name__)
 
@@ -85,9 +84,7 @@ async def generate_insights_node(state: SummaryAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         messages = [
             {"role": "system", "content": system_prompt},
@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Any
 
 from app.services.agents.summary.state import SummaryAgentState
+from app.services.columnar import head_rows, result_view
 
 MAX_DATA_ROWS = 50  # Limit rows per view to avoid token overflow
 MAX_WORDS_CUSTOM = 300  # Hard limit for custom mode (failsafe if API ignores max_tokens)
@@ -19,7 +20,7 @@ def _format_view_data(views_data: Dict[str, Any], views_metadata: Dict[str, Any]
         if not v_data:
             continue
         cols = v_data.get("columns", [])
-        rows = v_data.get("data", [])[:MAX_DATA_ROWS]
+        rows = head_rows(v_data, MAX_DATA_ROWS)
         meta = views_metadata.get(view_id, {})
         name = meta.get("name") or meta.get("id") or view_id
         row_count = v_data.get("row_count", 0)
@@ -42,8 +43,7 @@ def _format_view_data(views_data: Dict[str, Any], views_metadata: Dict[str, Any]
     header_block = "\n".join(sheet_summaries) + f"\nTotal: {sum(v.get('row_count', 0) for v in views_data.values() if v)} rows across {len(sheet_summaries)} sheet(s)"
     return header_block + "\n\n## Data Tables\n\n" + ("\n\n".join(parts) if parts else "(No data)")
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 
 logger = logging.getLogger(__name__)
 
@@ -108,7 +108,7 @@ async def summarize_node(state: SummaryAgentState) -> Dict[str, Any]:
         v_data = views_data or {}
         if not v_data and state.get("view_data"):
             vd = state["view_data"]
-            v_data = {"single": {"columns": vd.get("columns", []), "data": vd.get("data", []), "row_count": vd.get("row_count", 0)}}
+            v_data = {"single": result_view(vd)}
         v_meta = views_metadata or {}
         if not v_meta and state.get("view_metadata"):
             v_meta = {"single": state.get("view_metadata", {})}
@@ -172,7 +172,7 @@ async def summarize_node(state: SummaryAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
 
-        ai_client = UnifiedAIClient(gateway_url=settings.BACKEND_API_URL)
+        ai_client = get_ai_client()
 
         if view_images:
             user_content = [{"type": "text", "text": user_message + "\n\n" + view_data_str}]
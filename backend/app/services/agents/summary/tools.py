@@ -3,6 +3,7 @@ import base64
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 
+from app.services.columnar import result_view
 from app.services.tableau.client import TableauClient
 
 logger = logging.getLogger(__name__)
@@ -193,11 +194,11 @@ class SummaryTools:
                 return {"error": "No data returned from REST API"}
             if len(views) == 1:
                 v = views[0]
-                return {"columns": v.get("columns", []), "data": v.get("data", []), "row_count": v.get("row_count", 0), "name": v.get("name", view_id)}
+                return result_view(v, name=v.get("name", view_id))
             sheets = {}
             for i, v in enumerate(views):
                 key = f"{view_id}_sheet_{i}"
-                sheets[key] = {"columns": v.get("columns", []), "data": v.get("data", []), "row_count": v.get("row_count", 0), "name": v.get("name", key)}
+                sheets[key] = result_view(v, name=v.get("name", key))
             return {"sheets": sheets}
         except Exception as e:
             logger.warning(f"get_rest_summary_data failed: {e}")
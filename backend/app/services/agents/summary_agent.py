@@ -1,10 +1,12 @@
 """Summary Agent for multi-view data export and summarization."""
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 import json
 
-from app.services.ai.client import UnifiedAIClient
-from app.services.tableau.client import TableauClient
+from app.core.config import settings
+from app.services.ai.client import UnifiedAIClient, get_ai_client
+from app.services.tableau.client import TableauClient, _get_view_fetch_semaphore
 
 logger = logging.getLogger(__name__)
 
@@ -33,52 +35,95 @@ class SummaryAgent:
         self.api_key = api_key
         self.name = "summary_agent"
     
-    async def export_views(
+    async def iter_view_exports(
         self,
         view_ids: List[str],
-        format: str = "json"
-    ) -> Dict[str, Any]:
-        """Export data from multiple views.
+        format: str = "json",
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Export views concurrently, yielding each dataset as soon as it is ready.
+        
+        Fetches are bounded by the per-server TABLEAU_MAX_CONCURRENT_VIEW_FETCHES
+        limit and each view gets its own timeout, so one slow view neither
+        blocks the others nor the caller. Datasets arrive in completion order;
+        each carries its position in view_ids as "index".
         
         Args:
             view_ids: List of view IDs to export
             format: Export format (json, csv, excel)
+            timeout: Per-view timeout in seconds (default: SUMMARY_EXPORT_VIEW_TIMEOUT)
             
-        Returns:
-            Dictionary with exported datasets and metadata
+        Yields:
+            Dataset dicts (view_id, index, data, columns, row_count, format; error on failure)
         """
+        if not view_ids:
+            return
         if not self.tableau_client:
             from app.services.tableau.client import TableauClient
             self.tableau_client = TableauClient()
         
-        datasets = []
-        total_rows = 0
+        # Sign in once up front rather than racing sign-ins from every fetch
+        await self.tableau_client._ensure_authenticated()
+        semaphore = _get_view_fetch_semaphore(self.tableau_client.server_url)
+        view_timeout = timeout if timeout is not None else settings.SUMMARY_EXPORT_VIEW_TIMEOUT
         
-        for view_id in view_ids:
+        async def export_one(index: int, view_id: str) -> Dict[str, Any]:
             try:
-                # Get view data using Tableau Data API
-                # Note: This would use the actual Tableau Data API endpoint
-                # For now, we'll structure the response
-                view_data = await self._get_view_data(view_id)
-                
-                datasets.append({
-                    "view_id": view_id,
-                    "data": view_data.get("data", []),
-                    "columns": view_data.get("columns", []),
-                    "row_count": view_data.get("row_count", 0),
-                    "format": format
-                })
-                
-                total_rows += view_data.get("row_count", 0)
+                async with semaphore:
+                    view_data = await asyncio.wait_for(self._get_view_data(view_id), view_timeout)
             except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = TimeoutError(f"View export timed out after {view_timeout}s")
                 logger.error(f"Error exporting view {view_id}: {e}")
-                datasets.append({
+                return {
                     "view_id": view_id,
+                    "index": index,
                     "error": str(e),
                     "data": [],
                     "columns": [],
                     "row_count": 0
-                })
+                }
+            return {
+                "view_id": view_id,
+                "index": index,
+                "data": view_data.get("data", []),
+                "columns": view_data.get("columns", []),
+                "row_count": view_data.get("row_count", 0),
+                "format": format
+            }
+        
+        tasks = [asyncio.create_task(export_one(i, view_id)) for i, view_id in enumerate(view_ids)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Caller stopped early (or was cancelled): don't leave fetches running
+            for task in tasks:
+                task.cancel()
+    
+    async def export_views(
+        self,
+        view_ids: List[str],
+        format: str = "json"
+    ) -> Dict[str, Any]:
+        """Export data from multiple views.
+        
+        Views are fetched concurrently (see iter_view_exports); datasets are
+        returned in view_ids order.
+        
+        Args:
+            view_ids: List of view IDs to export
+            format: Export format (json, csv, excel)
+            
+        Returns:
+            Dictionary with exported datasets and metadata
+        """
+        datasets: List[Optional[Dict[str, Any]]] = [None] * len(view_ids)
+        total_rows = 0
+        
+        async for dataset in self.iter_view_exports(view_ids, format):
+            datasets[dataset.pop("index")] = dataset
+            total_rows += dataset["row_count"]
         
         return {
             "datasets": datasets,
@@ -95,6 +140,9 @@ class SummaryAgent:
     ) -> Dict[str, Any]:
         """Aggregate data across multiple views.
         
+        Each view is folded into the running totals as soon as its export
+        completes, so rows are not held until every view has loaded.
+        
         Args:
             view_ids: List of view IDs to aggregate
             aggregation_type: Type of aggregation (sum, avg, count, max, min)
@@ -103,59 +151,65 @@ class SummaryAgent:
         Returns:
             Dictionary with aggregated results
         """
-        export_result = await self.export_views(view_ids)
-        
-        by_view = {}
+        view_totals: Dict[int, Any] = {}
         total = 0
         
-        for dataset in export_result["datasets"]:
-            view_id = dataset["view_id"]
+        async for dataset in self.iter_view_exports(view_ids):
             if dataset.get("error"):
                 continue
-            
-            data = dataset.get("data", [])
-            columns = dataset.get("columns", [])
-            
-            # Find numeric columns
-            if column:
-                target_columns = [column] if column in columns else []
-            else:
-                target_columns = [c for c in columns if self._is_numeric_column(c, data)]
-            
-            view_total = 0
-            for target_col in target_columns:
-                col_index = columns.index(target_col) if target_col in columns else None
-                if col_index is None:
-                    continue
-                
-                values = [row[col_index] for row in data if len(row) > col_index]
-                numeric_values = [v for v in values if isinstance(v, (int, float))]
-                
-                if aggregation_type.lower() == "sum":
-                    col_total = sum(numeric_values)
-                elif aggregation_type.lower() == "avg":
-                    col_total = sum(numeric_values) / len(numeric_values) if numeric_values else 0
-                elif aggregation_type.lower() == "count":
-                    col_total = len(numeric_values)
-                elif aggregation_type.lower() == "max":
-                    col_total = max(numeric_values) if numeric_values else 0
-                elif aggregation_type.lower() == "min":
-                    col_total = min(numeric_values) if numeric_values else 0
-                else:
-                    col_total = sum(numeric_values)
-                
-                view_total += col_total
-            
-            by_view[view_id] = view_total
+            view_total = self._aggregate_dataset(dataset, aggregation_type, column)
+            view_totals[dataset["index"]] = view_total
             total += view_total
         
         return {
             "total": total,
-            "by_view": by_view,
+            "by_view": {view_ids[i]: view_totals[i] for i in sorted(view_totals)},
             "aggregation_type": aggregation_type,
             "column": column or "all_numeric"
         }
     
+    def _aggregate_dataset(
+        self,
+        dataset: Dict[str, Any],
+        aggregation_type: str,
+        column: Optional[str]
+    ) -> Any:
+        """Aggregate one exported view (per-column aggregate, summed across target columns)."""
+        data = dataset.get("data", [])
+        columns = dataset.get("columns", [])
+        
+        # Find numeric columns
+        if column:
+            target_columns = [column] if column in columns else []
+        else:
+            target_columns = [c for c in columns if self._is_numeric_column(c, data)]
+        
+        view_total = 0
+        for target_col in target_columns:
+            col_index = columns.index(target_col) if target_col in columns else None
+            if col_index is None:
+                continue
+            
+            values = [row[col_index] for row in data if len(row) > col_index]
+            numeric_values = [v for v in values if isinstance(v, (int, float))]
+            
+            if aggregation_type.lower() == "sum":
+                col_total = sum(numeric_values)
+            elif aggregation_type.lower() == "avg":
+                col_total = sum(numeric_values) / len(numeric_values) if numeric_values else 0
+            elif aggregation_type.lower() == "count":
+                col_total = len(numeric_values)
+            elif aggregation_type.lower() == "max":
+                col_total = max(numeric_values) if numeric_values else 0
+            elif aggregation_type.lower() == "min":
+                col_total = min(numeric_values) if numeric_values else 0
+            else:
+                col_total = sum(numeric_values)
+            
+            view_total += col_total
+        
+        return view_total
+    
     async def generate_report(
         self,
         view_ids: List[str],
@@ -164,6 +218,8 @@ class SummaryAgent:
     ) -> Dict[str, Any]:
         """Generate a summary report from multiple views.
         
+        Embed URLs are resolved concurrently, alongside the view exports.
+        
         Args:
             view_ids: List of view IDs to include in report
             format: Report format (html, pdf, markdown)
@@ -172,7 +228,13 @@ class SummaryAgent:
         Returns:
             Dictionary with report content and metadata
         """
-        export_result = await self.export_views(view_ids)
+        if include_visualizations:
+            export_result, visualizations = await asyncio.gather(
+                self.export_views(view_ids),
+                self._get_visualizations(view_ids)
+            )
+        else:
+            export_result, visualizations = await self.export_views(view_ids), []
         
         # Generate summary using AI if available
         summary_text = await self._generate_summary_text(export_result)
@@ -184,18 +246,6 @@ class SummaryAgent:
         else:
             content = json.dumps(export_result, indent=2)
         
-        visualizations = []
-        if include_visualizations:
-            for view_id in view_ids:
-                try:
-                    embed_url = await self._get_view_embed_url(view_id)
-                    visualizations.append({
-                        "view_id": view_id,
-                        "embed_url": embed_url
-                    })
-                except Exception as e:
-                    logger.error(f"Error getting embed URL for view {view_id}: {e}")
-        
         return {
             "content": content,
             "format": format,
@@ -204,6 +254,27 @@ class SummaryAgent:
             "total_rows": export_result["total_rows"]
         }
     
+    async def _get_visualizations(self, view_ids: List[str]) -> List[Dict[str, str]]:
+        """Resolve embed URLs for all views concurrently; views that fail are left out."""
+        if not self.tableau_client:
+            from app.services.tableau.client import TableauClient
+            self.tableau_client = TableauClient()
+        semaphore = _get_view_fetch_semaphore(self.tableau_client.server_url)
+        
+        async def embed_one(view_id: str) -> Optional[Dict[str, str]]:
+            try:
+                async with semaphore:
+                    embed_url = await asyncio.wait_for(
+                        self._get_view_embed_url(view_id), settings.SUMMARY_EXPORT_VIEW_TIMEOUT
+                    )
+            except Exception as e:
+                logger.error(f"Error getting embed URL for view {view_id}: {e}")
+                return None
+            return {"view_id": view_id, "embed_url": embed_url}
+        
+        resolved = await asyncio.gather(*(embed_one(view_id) for view_id in view_ids))
+        return [v for v in resolved if v is not None]
+    
     async def _get_view_data(self, view_id: str) -> Dict[str, Any]:
         """Get data from a view using Tableau Data API."""
         if not self.tableau_client:
@@ -250,12 +321,7 @@ class SummaryAgent:
     async def _generate_summary_text(self, export_result: Dict[str, Any]) -> str:
         """Generate summary text using AI."""
         if not self.ai_client:
-            from app.services.ai.client import UnifiedAIClient
-            from app.core.config import settings
-            self.ai_client = UnifiedAIClient(
-                gateway_url=settings.BACKEND_API_URL,
-                api_key=self.api_key
-            )
+            self.ai_client = get_ai_client()
         
         # Prepare summary prompt
         datasets_summary = []
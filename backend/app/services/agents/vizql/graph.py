@@ -2,8 +2,8 @@
 import logging
 from typing import Dict, Any
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from app.services.agents.graph_factory import memory_checkpointer
 from app.services.agents.vizql.state import VizQLAgentState
 from app.services.agents.vizql.nodes.router import route_query_node
 from app.services.agents.vizql.nodes.schema_handler import handle_schema_query_node
@@ -20,7 +20,7 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
-def create_vizql_graph() -> StateGraph:
+def create_vizql_graph(checkpoint: bool = True) -> StateGraph:
     """
     Create VizQL agent graph with ReAct pattern and intelligent routing.
     
@@ -185,5 +185,5 @@ def create_vizql_graph() -> StateGraph:
     workflow.add_edge("error_handler", END)
     
     # Compile with checkpointing for resumability
-    memory = MemorySaver()
+    memory = memory_checkpointer() if checkpoint else None
     return workflow.compile(checkpointer=memory)
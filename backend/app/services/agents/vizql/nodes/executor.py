@@ -6,7 +6,7 @@ from app.services.agents.vizql.state import VizQLAgentState
 from app.services.agents.query_executor import execute_query_with_retry
 from app.services.tableau.client import TableauClient, TableauAPIError
 from app.services.metrics import track_node_execution
-from app.services.cache import get_cache
+from app.services.vds_result_cache import get_vds_result_cache
 from app.services.query_optimizer import simplify_query_for_large_dataset
 
 logger = logging.getLogger(__name__)
@@ -78,7 +78,8 @@ async def execute_query_node(state: VizQLAgentState) -> Dict[str, Any]:
                 "tool": "execute_vds_query",
                 "args": {"query": query},
                 "result": "success",
-                "row_count": row_count
+                "row_count": row_count,
+                "rollup": "rollup" in results
             }]
         }
     except Exception as e:
@@ -98,12 +99,9 @@ async def execute_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         
         # Try to get cached result as fallback
         try:
-            cache = get_cache()
-            import json
-            query_key = f"query_result:{json.dumps(query, sort_keys=True)}"
-            cached_result = cache.get(query_key)
+            cached_result = await get_vds_result_cache().get(tableau_client, query)
             
-            if cached_result:
+            if cached_result is not None:
                 logger.info("Using cached result as fallback after execution error")
                 return {
                     **state,
@@ -5,9 +5,10 @@ from typing import Dict, Any
 
 from app.services.agents.vizql.state import VizQLAgentState
 from app.services.agents.formatters import format_as_table
+from app.services.columnar import head_rows
 from app.services.metrics import track_node_execution
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import get_ai_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ async def format_results_node(state: VizQLAgentState) -> Dict[str, Any]:
         
         # Prepare data for AI formatting
         columns = results.get("columns", [])
-        data = results.get("data", [])
+        data = head_rows(results, 1000)
         row_count = results.get("row_count", 0)
         
         # Format data sample (first 1000 rows for context)
@@ -73,10 +74,7 @@ async def format_results_node(state: VizQLAgentState) -> Dict[str, Any]:
         
         # Call AI to generate natural language answer
         logger.info(f"Generating natural language answer for query results ({row_count} rows)")
-        from app.core.config import settings
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         messages = [
             {"role": "system", "content": "You are a helpful data analyst assistant that explains query results in clear, natural language."},
@@ -111,7 +109,7 @@ async def _format_basic_response(state: VizQLAgentState, results: Dict[str, Any]
     """Fallback basic formatting without AI."""
     row_count = results.get("row_count", 0)
     columns = results.get("columns", [])
-    data = results.get("data", [])
+    data = head_rows(results, 1000)
     
     response = f"✅ Query executed successfully!\n\n"
     response += f"**Results:** Found {row_count} row{'s' if row_count != 1 else ''}.\n\n"
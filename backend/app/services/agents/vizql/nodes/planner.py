@@ -6,8 +6,7 @@ from typing import Dict, Any
 
 from app.services.agents.vizql.state import VizQLAgentState
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 from app.services.metrics import track_node_execution
 
 logger = logging.getLogger(__name__)
@@ -33,9 +32,7 @@ async def plan_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         # Call LLM to parse intent
         messages = [
@@ -13,8 +13,7 @@ from app.services.agents.vizql.query_helpers import (
     adjust_calculated_field_names,
 )
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 from app.services.metrics import track_node_execution
 
 logger = logging.getLogger(__name__)
@@ -147,9 +146,7 @@ async def build_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         # Call AI
         response = await ai_client.chat(
@@ -6,7 +6,7 @@ from typing import Dict, Any
 
 from app.services.agents.vizql.state import VizQLAgentState
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import get_ai_client
 from app.core.config import settings
 from app.services.metrics import track_node_execution
 
@@ -106,9 +106,7 @@ async def refine_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         # Build user message with explicit instruction
         user_message = "Fix the query based on the errors and suggestions provided above. Apply ALL fixes."
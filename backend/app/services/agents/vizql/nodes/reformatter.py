@@ -5,8 +5,8 @@ from typing import Dict, Any
 
 from app.services.agents.vizql.state import VizQLAgentState
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
+from app.services.columnar import count_rows, head_rows
 from app.services.metrics import track_node_execution
 
 logger = logging.getLogger(__name__)
@@ -62,7 +62,7 @@ async def reformat_results_node(state: VizQLAgentState) -> Dict[str, Any]:
         user_query = state.get("user_query", "")
         previous_results = state.get("previous_results")
         
-        if not previous_results or not previous_results.get("data"):
+        if not previous_results or not count_rows(previous_results):
             return {
                 **state,
                 "final_answer": "I don't have any previous results to reformat. Please run a query first.",
@@ -71,8 +71,7 @@ async def reformat_results_node(state: VizQLAgentState) -> Dict[str, Any]:
         
         # Extract data from previous results
         columns = previous_results.get("columns", [])
-        data = previous_results.get("data", [])
-        row_count = len(data)
+        row_count = count_rows(previous_results)
         
         # Get query that generated these results (if available)
         original_query = state.get("query_draft", {})
@@ -80,7 +79,7 @@ async def reformat_results_node(state: VizQLAgentState) -> Dict[str, Any]:
         
         # Format data sample for prompt (up to 1000 rows)
         sample_size = min(1000, row_count)
-        data_sample = format_data_as_table(columns, data, max_rows=sample_size)
+        data_sample = format_data_as_table(columns, head_rows(previous_results, sample_size), max_rows=sample_size)
         
         # Get reformatter prompt
         system_prompt = prompt_registry.get_prompt(
@@ -99,9 +98,7 @@ async def reformat_results_node(state: VizQLAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         # Call LLM to reformat results
         messages = [
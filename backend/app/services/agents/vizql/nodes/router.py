@@ -7,8 +7,8 @@ from typing import Dict, Any
 from app.services.agents.vizql.state import VizQLAgentState
 from app.services.agents.vizql.rule_based_router import get_rule_based_router
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
+from app.services.columnar import count_rows
 from app.services.metrics import track_node_execution
 
 logger = logging.getLogger(__name__)
@@ -33,7 +33,7 @@ async def route_query_node(state: VizQLAgentState) -> Dict[str, Any]:
     try:
         user_query = state.get("user_query", "")
         previous_results = state.get("previous_results")
-        has_previous_results = previous_results is not None and len(previous_results.get("data", [])) > 0
+        has_previous_results = previous_results is not None and count_rows(previous_results) > 0
         
         if USE_RULE_BASED_ROUTER:
             # Use fast rule-based router (no LLM, < 1ms)
@@ -63,7 +63,7 @@ async def route_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         measures_count = len(enriched_schema.get("measures", [])) if has_schema else 0
         dimensions_count = len(enriched_schema.get("dimensions", [])) if has_schema else 0
         
-        previous_row_count = len(previous_results.get("data", [])) if has_previous_results else 0
+        previous_row_count = count_rows(previous_results) if has_previous_results else 0
         previous_columns = ", ".join(previous_results.get("columns", [])) if has_previous_results else ""
         
         # Get routing prompt
@@ -85,9 +85,7 @@ async def route_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         # Call LLM to classify query
         messages = [
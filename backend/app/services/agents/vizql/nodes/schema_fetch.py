@@ -50,12 +50,12 @@ async def fetch_schema_node(state: VizQLAgentState) -> Dict[str, Any]:
         enriched_schema = None
         try:
             # Check cache directly first for fastest access (avoids creating TableauClient)
-            from app.core.cache import redis_client
+            from app.core.cache import get_async_redis
             import json
             cache_key = f"enriched_schema:{datasource_id}"
             
             try:
-                cached_data = redis_client.get(cache_key)
+                cached_data = await get_async_redis().get(cache_key)
                 if cached_data:
                     if isinstance(cached_data, bytes):
                         cached_data = cached_data.decode('utf-8')
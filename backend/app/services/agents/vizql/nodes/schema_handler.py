@@ -5,8 +5,7 @@ from typing import Dict, Any
 
 from app.services.agents.vizql.state import VizQLAgentState
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 from app.services.metrics import track_node_execution
 from app.services.tableau.client import TableauClient
 from app.services.agents.vizql.schema_enrichment import SchemaEnrichmentService
@@ -129,9 +128,9 @@ async def handle_schema_query_node(state: VizQLAgentState) -> Dict[str, Any]:
             
             try:
                 # Try to get from cache first
-                from app.core.cache import redis_client
+                from app.core.cache import get_async_redis
                 cache_key = f"enriched_schema:{datasource_id}"
-                cached_data = redis_client.get(cache_key)
+                cached_data = await get_async_redis().get(cache_key)
                 
                 if cached_data:
                     if isinstance(cached_data, bytes):
@@ -224,9 +223,7 @@ async def handle_schema_query_node(state: VizQLAgentState) -> Dict[str, Any]:
         model = state.get("model", "gpt-4")
         provider = state.get("provider", "openai")
         
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         # Call LLM to generate answer
         messages = [
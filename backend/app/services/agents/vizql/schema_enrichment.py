@@ -6,12 +6,27 @@ from typing import Dict, Any, Optional, List
 from datetime import timedelta
 
 from app.services.tableau.client import TableauClient, TableauClientError
-from app.core.cache import redis_client
+from app.core.cache import get_async_redis
 from app.services.agents.vizql.semantic_rules import suggest_aggregation
 
 logger = logging.getLogger(__name__)
 
 CACHE_TTL_SECONDS = 3600  # 1 hour
+STATS_MEASURES_PER_QUERY = 25  # Measures profiled per batched MIN/MAX/COUNT/MEDIAN query
+STATS_MAX_CONCURRENCY = 8  # Concurrent stats queries per datasource
+NUMERIC_DATA_TYPES = ("INTEGER", "REAL", "DOUBLE", "FLOAT")
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {
+        "cardinality": None,
+        "sample_values": [],
+        "value_counts": [],
+        "min": None,
+        "max": None,
+        "median": None,
+        "null_percentage": None
+    }
 
 
 class SchemaEnrichmentService:
@@ -41,6 +56,18 @@ class SchemaEnrichmentService:
             Schema dictionary with fields, measures, dimensions, and field_map.
             If include_statistics=True, also includes stats (cardinality, sample_values, value_counts, min, max, median, null_percentage).
         """
+        if include_statistics and not force_refresh:
+            # Enriched and core schema in one round trip
+            enriched, core_schema = await self._read_cached_json(
+                [f"enriched_schema:{datasource_id}", f"schema:{datasource_id}"]
+            )
+            if enriched is not None:
+                logger.info(f"Using cached enriched schema (with stats) for {datasource_id}")
+                return enriched
+            if core_schema is None:
+                core_schema = await self._get_core_schema(datasource_id)
+            return await self._collect_schema_stats(datasource_id, core_schema)
+        
         # Step 1: Get core schema (metadata only)
         core_schema = await self._get_core_schema(datasource_id, force_refresh)
         
@@ -50,6 +77,22 @@ class SchemaEnrichmentService:
         
         return core_schema
     
+    @staticmethod
+    async def _read_cached_json(keys: List[str]) -> List[Optional[Any]]:
+        """Read and decode several cached JSON values with one MGET (None for misses or errors)."""
+        try:
+            values = await get_async_redis().mget(keys)
+        except Exception as e:
+            logger.warning(f"Cache read failed, fetching fresh: {e}")
+            return [None] * len(keys)
+        decoded: List[Optional[Any]] = []
+        for value in values:
+            try:
+                decoded.append(json.loads(value) if value else None)
+            except (ValueError, TypeError):
+                decoded.append(None)
+        return decoded
+    
     async def _get_core_schema(
         self,
         datasource_id: str,
@@ -72,7 +115,7 @@ class SchemaEnrichmentService:
         
         if not force_refresh:
             try:
-                cached_data = redis_client.get(cache_key)
+                cached_data = await get_async_redis().get(cache_key)
                 if cached_data:
                     if isinstance(cached_data, bytes):
                         cached_data = cached_data.decode('utf-8')
@@ -228,7 +271,7 @@ class SchemaEnrichmentService:
             # Cache core schema
             try:
                 cache_value = json.dumps(core_schema)
-                redis_client.setex(cache_key, CACHE_TTL_SECONDS, cache_value)
+                await get_async_redis().setex(cache_key, CACHE_TTL_SECONDS, cache_value)
                 logger.info(
                     f"Core schema cached: {len(core_schema['fields'])} fields "
                     f"({len(core_schema['measures'])} measures, {len(core_schema['dimensions'])} dimensions)"
@@ -268,7 +311,7 @@ class SchemaEnrichmentService:
         
         if not force_refresh:
             try:
-                cached_data = redis_client.get(cache_key)
+                cached_data = await get_async_redis().get(cache_key)
                 if cached_data:
                     if isinstance(cached_data, bytes):
                         cached_data = cached_data.decode('utf-8')
@@ -278,50 +321,33 @@ class SchemaEnrichmentService:
             except Exception as e:
                 logger.warning(f"Cache read failed, fetching fresh stats: {e}")
         
+        return await self._collect_schema_stats(datasource_id, core_schema, force_refresh)
+    
+    async def _collect_schema_stats(
+        self,
+        datasource_id: str,
+        core_schema: Dict[str, Any],
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Add field statistics to a copy of the core schema and cache the result."""
+        cache_key = f"enriched_schema:{datasource_id}"
         logger.info(f"Enriching schema with statistics for datasource {datasource_id}")
         
         # Create a copy of core schema to add stats to
         enriched = json.loads(json.dumps(core_schema))  # Deep copy
         
         # Initialize stats fields for all fields
+        fields_by_caption = {}
         for field_info in enriched["fields"]:
-            field_info["cardinality"] = None
-            field_info["sample_values"] = []
-            field_info["value_counts"] = []
-            field_info["min"] = None
-            field_info["max"] = None
-            field_info["median"] = None
-            field_info["null_percentage"] = None
+            field_info.update(_empty_stats())
+            fields_by_caption[field_info["fieldCaption"]] = field_info
         
-        # Fetch field statistics concurrently (sample datapoints, cardinality, min/max)
-        if enriched["fields"]:
-            async def fetch_stats(fi: Dict[str, Any]) -> tuple:
-                cap = fi["fieldCaption"]
-                try:
-                    s = await self.tableau_client.get_field_statistics(
-                        datasource_id, cap, fi.get("dataType", ""), fi.get("fieldRole") == "MEASURE"
-                    )
-                    return (cap, s)
-                except Exception as e:
-                    logger.debug(f"Stats for {cap}: {e}")
-                    return (cap, {})
-
-            tasks = [fetch_stats(f) for f in enriched["fields"]]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for r in results:
-                if isinstance(r, Exception):
-                    continue
-                cap, stats = r
-                for fi in enriched["fields"]:
-                    if fi["fieldCaption"] == cap:
-                        fi["cardinality"] = stats.get("cardinality")
-                        fi["sample_values"] = stats.get("sample_values", [])
-                        fi["value_counts"] = stats.get("value_counts", [])
-                        fi["min"] = stats.get("min")
-                        fi["max"] = stats.get("max")
-                        fi["median"] = stats.get("median")
-                        fi["null_percentage"] = stats.get("null_percentage")
-                        break
+        if fields_by_caption:
+            field_stats = await self._get_field_stats(
+                datasource_id, list(fields_by_caption.values()), force_refresh
+            )
+            for cap, stats in field_stats.items():
+                fields_by_caption[cap].update({key: stats.get(key, value) for key, value in _empty_stats().items()})
             
             stats_count = sum(1 for f in enriched["fields"] if f.get("cardinality") is not None or f.get("min") is not None)
             logger.info(f"Fetched statistics for {stats_count} fields (cardinality, min/max, sample values)")
@@ -329,7 +355,7 @@ class SchemaEnrichmentService:
         # Cache enriched schema (with stats)
         try:
             cache_value = json.dumps(enriched)
-            redis_client.setex(cache_key, CACHE_TTL_SECONDS, cache_value)
+            await get_async_redis().setex(cache_key, CACHE_TTL_SECONDS, cache_value)
             logger.info(
                 f"Enriched schema (with stats) cached: {len(enriched['fields'])} fields "
                 f"({len(enriched['measures'])} measures, {len(enriched['dimensions'])} dimensions)"
@@ -339,6 +365,119 @@ class SchemaEnrichmentService:
         
         return enriched
     
+    async def _get_field_stats(
+        self,
+        datasource_id: str,
+        fields: List[Dict[str, Any]],
+        force_refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect statistics for fields, reusing per-field cached stats.
+        
+        Numeric measures are profiled STATS_MEASURES_PER_QUERY at a time with
+        batched MIN/MAX/COUNT/MEDIAN queries; dimensions need their own TOP-N
+        and COUNTD queries. At most STATS_MAX_CONCURRENCY queries run at once.
+        Only fields missing from the cache are queried, so a new field does
+        not re-profile the whole datasource.
+        
+        Returns:
+            Dictionary of field caption -> stats
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if not force_refresh:
+            results = await self._read_cached_field_stats(datasource_id, [f["fieldCaption"] for f in fields])
+        missing = [f for f in fields if f["fieldCaption"] not in results]
+        if not missing:
+            logger.info(f"Using cached statistics for all {len(fields)} fields")
+            return results
+        
+        measures = []
+        dimensions = []
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for fi in missing:
+            if fi.get("fieldRole") != "MEASURE":
+                dimensions.append(fi)
+            elif (fi.get("dataType") or "").upper() in NUMERIC_DATA_TYPES:
+                measures.append(fi["fieldCaption"])
+            else:
+                # Non-numeric measures have no min/max/median to collect
+                fresh[fi["fieldCaption"]] = _empty_stats()
+        
+        semaphore = asyncio.Semaphore(STATS_MAX_CONCURRENCY)
+        
+        async def fetch_single(fi: Dict[str, Any]) -> None:
+            cap = fi["fieldCaption"]
+            async with semaphore:
+                try:
+                    fresh[cap] = await self.tableau_client.get_field_statistics(
+                        datasource_id, cap, fi.get("dataType", ""), fi.get("fieldRole") == "MEASURE"
+                    )
+                except Exception as e:
+                    logger.debug(f"Stats for {cap}: {e}")
+        
+        async def fetch_measure_batch(captions: List[str], total_rows: Optional[int]) -> None:
+            async with semaphore:
+                try:
+                    fresh.update(await self.tableau_client.get_measure_statistics(
+                        datasource_id, captions, total_rows=total_rows
+                    ))
+                    return
+                except Exception as e:
+                    logger.debug(f"Batched stats for {len(captions)} measures failed, querying per field: {e}")
+            # One unqueryable field fails the whole batch; isolate it
+            by_caption = {f["fieldCaption"]: f for f in missing}
+            await asyncio.gather(*(fetch_single(by_caption[cap]) for cap in captions))
+        
+        total_rows = await self.tableau_client.get_row_count(datasource_id) if measures else None
+        batches = [
+            measures[i:i + STATS_MEASURES_PER_QUERY]
+            for i in range(0, len(measures), STATS_MEASURES_PER_QUERY)
+        ]
+        await asyncio.gather(
+            *(fetch_measure_batch(batch, total_rows) for batch in batches),
+            *(fetch_single(fi) for fi in dimensions)
+        )
+        logger.info(
+            f"Profiled {len(fresh)} fields ({len(batches)} measure batches, {len(dimensions)} dimensions); "
+            f"{len(results)} from cache"
+        )
+        
+        await self._write_cached_field_stats(datasource_id, fresh)
+        results.update(fresh)
+        return results
+    
+    @staticmethod
+    def _field_stats_key(datasource_id: str, field_caption: str) -> str:
+        return f"field_stats:{datasource_id}:{field_caption}"
+    
+    async def _read_cached_field_stats(self, datasource_id: str, captions: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read per-field stats from Redis in one round trip."""
+        try:
+            values = await get_async_redis().mget([self._field_stats_key(datasource_id, cap) for cap in captions])
+        except Exception as e:
+            logger.warning(f"Field stats cache read failed: {e}")
+            return {}
+        cached = {}
+        for cap, value in zip(captions, values):
+            if value:
+                try:
+                    cached[cap] = json.loads(value)
+                except (ValueError, TypeError):
+                    pass
+        return cached
+    
+    async def _write_cached_field_stats(self, datasource_id: str, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Cache per-field stats in one pipelined round trip."""
+        if not stats:
+            return
+        try:
+            pipe = get_async_redis().pipeline(transaction=False)
+            for cap, field_stats in stats.items():
+                pipe.setex(self._field_stats_key(datasource_id, cap), CACHE_TTL_SECONDS, json.dumps(field_stats))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to cache field stats: {e}")
+    
     async def get_supported_functions(self, datasource_id: str) -> List[Dict[str, Any]]:
         """
         Fetch datasource-specific supported functions.
@@ -352,7 +491,7 @@ class SchemaEnrichmentService:
         cache_key = f"supported_functions:{datasource_id}"
         
         try:
-            cached_data = redis_client.get(cache_key)
+            cached_data = await get_async_redis().get(cache_key)
             if cached_data:
                 if isinstance(cached_data, bytes):
                     cached_data = cached_data.decode('utf-8')
@@ -366,7 +505,7 @@ class SchemaEnrichmentService:
             # Cache functions
             try:
                 cache_value = json.dumps(functions)
-                redis_client.setex(cache_key, CACHE_TTL_SECONDS, cache_value)
+                await get_async_redis().setex(cache_key, CACHE_TTL_SECONDS, cache_value)
             except Exception as e:
                 logger.warning(f"Failed to cache supported functions: {e}")
             
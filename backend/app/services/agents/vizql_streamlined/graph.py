@@ -2,8 +2,8 @@
 import logging
 from typing import Dict, Any, Optional
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from app.services.agents.graph_factory import memory_checkpointer
 from app.services.agents.vizql_streamlined.state import StreamlinedVizQLState
 from app.services.agents.vizql_streamlined.nodes import (
     start_node,
@@ -21,7 +21,8 @@ logger = logging.getLogger(__name__)
 
 def create_streamlined_vizql_graph(
     max_build_retries: Optional[int] = None,
-    max_execution_retries: Optional[int] = None
+    max_execution_retries: Optional[int] = None,
+    checkpoint: bool = True
 ) -> StateGraph:
     """
     Create streamlined VizQL agent graph.
@@ -37,6 +38,8 @@ def create_streamlined_vizql_graph(
     - If validation fails and build_attempt <= VIZQL_MAX_BUILD_RETRIES: retry build_query
     - If execution fails and execution_attempt <= VIZQL_MAX_EXECUTION_RETRIES: retry build_query (resets build_attempt)
     - After max attempts: route to error_handler
+    
+    Set checkpoint=False to compile without a MemorySaver.
     """
     workflow = StateGraph(StreamlinedVizQLState)
     
@@ -137,5 +140,5 @@ def create_streamlined_vizql_graph(
     workflow.add_edge("error_handler", END)
     
     # Compile with checkpointing for resumability
-    memory = MemorySaver()
+    memory = memory_checkpointer() if checkpoint else None
     return workflow.compile(checkpointer=memory)
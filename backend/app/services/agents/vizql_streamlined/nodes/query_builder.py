@@ -23,8 +23,7 @@ from app.services.agents.vizql.query_helpers import (
     validate_and_correct_filter_values,
 )
 from app.prompts.registry import prompt_registry
-from app.services.ai.client import UnifiedAIClient
-from app.core.config import settings
+from app.services.ai.client import get_ai_client
 from app.services.metrics import track_node_execution
 
 logger = logging.getLogger(__name__)
@@ -549,9 +548,7 @@ async def build_query_node(state: StreamlinedVizQLState) -> Dict[str, Any]:
         tool_result_summary = "; ".join(tool_result_summary_parts) if tool_result_summary_parts else None
         
         # Call LLM to build query
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         
         response = await ai_client.chat(
             model=model,
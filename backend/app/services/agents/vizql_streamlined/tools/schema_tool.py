@@ -3,7 +3,6 @@ import logging
 from typing import Dict, Any, Optional
 from app.services.tableau.client import TableauClient
 from app.services.agents.vizql.schema_enrichment import SchemaEnrichmentService
-from app.core.cache import redis_client
 import json
 
 logger = logging.getLogger(__name__)
@@ -5,9 +5,8 @@ from typing import Dict, Any
 
 from app.services.agents.vizql_tool_use.state import VizQLToolUseState
 from app.services.agents.vizql_tool_use.tools import VizQLTools
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import get_ai_client
 from app.prompts.registry import prompt_registry
-from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -150,10 +149,7 @@ Your action: Use filter with ["Houston", "Philadelphia", "Seattle"]"""
         
         # Call LLM with tools
         # Use longer timeout (5 minutes) for processing large data to avoid timeouts
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL,
-            timeout=300  # 5 minutes for large data processing
-        )
+        ai_client = get_ai_client(timeout=300)  # 5 minutes for large data processing
         tool_calls_made = []
         raw_data = None
         max_iterations = 3  # Prevent infinite loops
@@ -4,7 +4,7 @@ import logging
 from typing import Dict, Any
 
 from app.services.agents.vizql_tool_use.state import VizQLToolUseState
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import get_ai_client
 from app.prompts.registry import prompt_registry
 from app.core.config import settings
 
@@ -77,9 +77,7 @@ Please format this data into a clear, natural language response that answers the
         logger.info(f"Summarize using model: {model}, provider: {provider}")
         
         # Call LLM
-        ai_client = UnifiedAIClient(
-            gateway_url=settings.BACKEND_API_URL
-        )
+        ai_client = get_ai_client()
         response = await ai_client.chat(
             model=model,
             provider=provider,
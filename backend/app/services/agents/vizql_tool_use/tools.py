@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Any, List, Optional
 
 from app.services.tableau.client import TableauClient
+from app.services.columnar import result_view
 from app.services.agents.vizql.schema_enrichment import SchemaEnrichmentService
 from app.core.config import settings
 
@@ -307,22 +308,19 @@ class VizQLTools:
                     ["West", 23456],
                     ...
                 ],
-                "row_count": 10
+                "row_count": 10,
+                "rollup": False  # True when re-aggregated from a cached finer-grained result
             }
         """
         logger.info("Tool: query_datasource")
         
         try:
-            # Use executor's query execution logic
-            from app.services.agents.vizql.nodes.executor import _execute_query_with_retry
+            # Use the shared query execution logic (retry + result cache)
+            from app.services.agents.query_executor import execute_query_with_retry
             
-            results = await _execute_query_with_retry(self.tableau_client, query)
+            results = await execute_query_with_retry(self.tableau_client, query)
             
-            return {
-                "columns": results.get("columns", []),
-                "data": results.get("data", []),
-                "row_count": len(results.get("data", []))
-            }
+            return result_view(results, rollup="rollup" in results)
             
         except Exception as e:
             logger.error(f"Error in query_datasource: {e}", exc_info=True)
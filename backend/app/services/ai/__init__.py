@@ -1,11 +1,12 @@
 """AI service modules."""
-from app.services.ai.client import UnifiedAIClient, AIClientError, AIGatewayError, AINetworkError
+from app.services.ai.client import UnifiedAIClient, AIClientError, AIGatewayError, AINetworkError, get_ai_client
 from app.services.ai.models import ChatResponse, ChatMessage, FunctionCall, StreamChunk
 from app.services.ai.tools import get_tools, execute_tool, format_tool_result
 from app.services.ai.agent import Agent, Intent
 
 __all__ = [
     "UnifiedAIClient",
+    "get_ai_client",
     "AIClientError",
     "AIGatewayError",
     "AINetworkError",
@@ -4,7 +4,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 import re
 
-from app.services.ai.client import UnifiedAIClient
+from app.services.ai.client import UnifiedAIClient, get_ai_client
 from app.services.ai.tools import get_tools, execute_tool, format_tool_result, TOOL_REGISTRY
 from app.services.tableau.client import TableauClient
 
@@ -350,12 +350,7 @@ class Agent:
             elif action == "general_response":
                 # Use AI to respond to general question
                 if not self.ai_client:
-                    from app.services.ai.client import UnifiedAIClient
-                    from app.core.config import settings
-                    self.ai_client = UnifiedAIClient(
-                        gateway_url=settings.BACKEND_API_URL,
-                        api_key=self.api_key
-                    )
+                    self.ai_client = get_ai_client()
                 
                 query = arguments.get("query", "")
                 response = await self.ai_client.chat(
@@ -414,12 +409,7 @@ class Agent:
     async def _process_with_function_calling(self, query: str) -> Dict[str, Any]:
         """Process query using LLM function calling."""
         if not self.ai_client:
-            from app.services.ai.client import UnifiedAIClient
-            from app.core.config import settings
-            self.ai_client = UnifiedAIClient(
-                gateway_url=settings.BACKEND_API_URL,
-                api_key=self.api_key
-            )
+            self.ai_client = get_ai_client()
         
         tools = get_tools()
         messages = self.get_context()
@@ -2,9 +2,10 @@
 import asyncio
 import json
 import logging
-from typing import List, Dict, Any, Optional, AsyncIterator
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import httpx
 from app.services.ai.models import ChatResponse, ChatMessage, FunctionCall, StreamChunk
+from app.services.gateway import sse
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -30,14 +31,25 @@ class AINetworkError(AIClientError):
     pass
 
 
+# Request counters across all UnifiedAIClient instances
+_stats: Dict[str, int] = {"requests": 0, "streams": 0, "in_flight": 0}
+
+
 class UnifiedAIClient:
-    """Unified AI client that communicates with the gateway."""
+    """Unified AI client that communicates with the gateway.
+    
+    With the "inprocess" transport (default) requests go straight through the
+    gateway's resolve/authenticate/translate/forward pipeline in this process;
+    "http" posts to the gateway endpoint at gateway_url instead, for
+    deployments where the gateway runs elsewhere.
+    """
     
     def __init__(
         self,
         gateway_url: Optional[str] = None,
         timeout: int = 60,
-        max_retries: int = MAX_RETRIES
+        max_retries: int = MAX_RETRIES,
+        transport: Optional[str] = None
     ):
         """Initialize unified AI client.
         
@@ -45,16 +57,22 @@ class UnifiedAIClient:
             gateway_url: Gateway base URL (defaults to settings.BACKEND_API_URL; gateway is embedded)
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            transport: "inprocess" or "http" (defaults to settings.AI_GATEWAY_TRANSPORT)
         """
         self.gateway_url = (gateway_url or settings.BACKEND_API_URL).rstrip('/')
         self.timeout = timeout
         self.max_retries = max_retries
+        self.transport = (transport or settings.AI_GATEWAY_TRANSPORT).lower()
+        if self.transport not in ("inprocess", "http"):
+            raise ValueError(f"Unknown gateway transport: {self.transport}. Valid transports: inprocess, http")
         
-        # HTTP client
+        # HTTP client (only needed when the gateway is reached over HTTP)
         self._client = httpx.AsyncClient(
             timeout=timeout,
             follow_redirects=True
-        )
+        ) if self.transport == "http" else None
+        # Set on clients handed out by get_ai_client; callers must not close those
+        self._shared = False
     
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers.
@@ -156,6 +174,65 @@ class UnifiedAIClient:
         
         raise AINetworkError("Failed to complete request after retries")
     
+    async def _inprocess_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a completion through the in-process gateway with the same retry policy as HTTP.
+        
+        Raises:
+            AIGatewayError: For gateway errors
+            AINetworkError: For provider network errors and timeouts
+        """
+        from fastapi import HTTPException
+        from app.services.gateway.api import complete_inprocess
+        
+        for attempt in range(self.max_retries):
+            try:
+                return await asyncio.wait_for(complete_inprocess(payload), timeout=self.timeout)
+            except HTTPException as e:
+                # Don't retry on 4xx errors (client errors)
+                if e.status_code < 500:
+                    raise AIGatewayError(e.detail)
+                if attempt == self.max_retries - 1:
+                    if e.status_code == 503:
+                        raise AINetworkError(f"{e.detail} (after {self.max_retries} attempts)") from e
+                    raise AIGatewayError(f"{e.detail} (after {self.max_retries} attempts)")
+                delay = min(INITIAL_RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
+                logger.warning(f"Gateway error {e.status_code}, retrying in {delay}s (attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+            except asyncio.TimeoutError as e:
+                if attempt == self.max_retries - 1:
+                    raise AINetworkError(f"Request timeout after {self.max_retries} attempts") from e
+                delay = min(INITIAL_RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
+                logger.warning(f"Request timeout, retrying in {delay}s (attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+        
+        raise AINetworkError("Failed to complete request after retries")
+    
+    def _parse_stream_chunk(self, chunk_data: Dict[str, Any]) -> Optional[StreamChunk]:
+        """Parse a normalized gateway stream chunk into a StreamChunk (None if it has no choices)."""
+        choices = chunk_data.get("choices", [])
+        if not choices:
+            logger.warning(f"No choices in chunk: {chunk_data}")
+            return None
+        choice = choices[0]
+        delta = choice.get("delta", {})
+        content = delta.get("content", "")
+        
+        # Parse function call delta if present
+        function_call = None
+        if "function_call" in delta:
+            fc_data = delta["function_call"]
+            function_call = FunctionCall(
+                name=fc_data.get("name", ""),
+                arguments=fc_data.get("arguments", "")
+            )
+        
+        return StreamChunk(
+            content=content,
+            finish_reason=choice.get("finish_reason"),
+            function_call=function_call,
+            raw_chunk=chunk_data
+        )
+    
     def _parse_chat_response(self, response_data: Dict[str, Any]) -> ChatResponse:
         """Parse gateway response into ChatResponse.
         
@@ -282,18 +359,23 @@ class UnifiedAIClient:
         headers = self._get_headers()
         
         logger.debug(f"Sending chat request to gateway: model={model}, messages={len(messages)}")
-        logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
-        logger.debug(f"Request headers: {dict((k, v[:20] + '...' if len(v) > 20 else v) if k == 'Authorization' else (k, v) for k, v in headers.items())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
+            logger.debug(f"Request headers: {dict((k, v[:20] + '...' if len(v) > 20 else v) if k == 'Authorization' else (k, v) for k, v in headers.items())}")
         
+        _stats["requests"] += 1
+        _stats["in_flight"] += 1
         try:
-            response = await self._request_with_retry(
-                method="POST",
-                url=url,
-                json_data=payload,
-                headers=headers
-            )
-            
-            response_data = response.json()
+            if self.transport == "inprocess":
+                response_data = await self._inprocess_with_retry(payload)
+            else:
+                response = await self._request_with_retry(
+                    method="POST",
+                    url=url,
+                    json_data=payload,
+                    headers=headers
+                )
+                response_data = response.json()
             chat_response = self._parse_chat_response(response_data)
             
             logger.info(
@@ -306,6 +388,8 @@ class UnifiedAIClient:
             raise
         except Exception as e:
             raise AIClientError(f"Unexpected error in chat completion: {e}") from e
+        finally:
+            _stats["in_flight"] -= 1
     
     async def stream_chat(
         self,
@@ -365,10 +449,19 @@ class UnifiedAIClient:
         headers = self._get_headers()
         
         logger.debug(f"Sending streaming chat request to gateway: model={model}")
-        logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
-        logger.debug(f"Request headers: {dict((k, v[:20] + '...' if len(v) > 20 else v) if k == 'Authorization' else (k, v) for k, v in headers.items())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
+            logger.debug(f"Request headers: {dict((k, v[:20] + '...' if len(v) > 20 else v) if k == 'Authorization' else (k, v) for k, v in headers.items())}")
         
+        _stats["streams"] += 1
+        _stats["in_flight"] += 1
         try:
+            if self.transport == "inprocess":
+                async for chunk in self._stream_inprocess(payload):
+                    yield chunk
+                logger.info(f"Streaming chat completion finished: model={model}")
+                return
+            
             # Use httpx.stream() for streaming requests
             async with self._client.stream(
                 method="POST",
@@ -395,66 +488,29 @@ class UnifiedAIClient:
                         error_msg = f"{error_msg}"
                     raise AIGatewayError(error_msg)
                 
-                # Parse Server-Sent Events stream
-                line_count = 0
+                # Parse Server-Sent Events stream; each chunk is decoded once
                 chunk_count = 0
-                logger.info("Starting to parse SSE stream from gateway")
                 async for line in response.aiter_lines():
-                    line_count += 1
-                    if not line.strip():
+                    data_str = sse.data_payload(line)
+                    if not data_str:
                         continue
+                    if data_str == "[DONE]":
+                        break
                     
-                    logger.info(f"AI client received SSE line {line_count}: {line[:200]}")
+                    try:
+                        chunk_data = sse.loads(data_str)
+                    except ValueError as e:
+                        logger.warning(f"Failed to parse SSE chunk: {e}, line: {line[:100]}")
+                        continue
                     
-                    # SSE format: "data: {...}" or "data: [DONE]"
-                    if line.startswith("data: "):
-                        data_str = line[6:]  # Remove "data: " prefix
-                        
-                        if data_str.strip() == "[DONE]":
-                            logger.info("AI client received [DONE] marker")
-                            break
-                        
-                        try:
-                            chunk_data = json.loads(data_str)
-                            logger.info(f"AI client parsed chunk data {chunk_count + 1}: {json.dumps(chunk_data)[:300]}")
-                            
-                            # Parse chunk
-                            choices = chunk_data.get("choices", [])
-                            if choices:
-                                choice = choices[0]
-                                delta = choice.get("delta", {})
-                                content = delta.get("content", "")
-                                
-                                logger.info(f"AI client extracted content from chunk {chunk_count + 1}: '{content[:100]}' (length: {len(content)})")
-                                
-                                # Parse function call delta if present
-                                function_call = None
-                                if "function_call" in delta:
-                                    fc_data = delta["function_call"]
-                                    function_call = FunctionCall(
-                                        name=fc_data.get("name", ""),
-                                        arguments=fc_data.get("arguments", "")
-                                    )
-                                
-                                chunk = StreamChunk(
-                                    content=content,
-                                    finish_reason=choice.get("finish_reason"),
-                                    function_call=function_call,
-                                    raw_chunk=chunk_data
-                                )
-                                
-                                chunk_count += 1
-                                yield chunk
-                            else:
-                                logger.warning(f"No choices in chunk: {chunk_data}")
-                                
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse SSE chunk: {e}, line: {line[:100]}")
-                            continue
-                    else:
-                        logger.info(f"AI client non-data SSE line {line_count}: {line[:100]}")
+                    chunk = self._parse_stream_chunk(chunk_data)
+                    if chunk is not None:
+                        chunk_count += 1
+                        if sse.should_log_chunk(logger, chunk_count):
+                            logger.debug(f"AI client chunk {chunk_count}: {data_str[:300]}")
+                        yield chunk
                 
-                logger.info(f"AI client stream parsing complete: {line_count} lines processed, {chunk_count} chunks yielded")
+                logger.debug(f"AI client stream parsing complete: {chunk_count} chunks yielded")
             
             logger.info(f"Streaming chat completion finished: model={model}")
             
@@ -462,10 +518,35 @@ class UnifiedAIClient:
             raise
         except Exception as e:
             raise AIClientError(f"Unexpected error in streaming chat completion: {e}") from e
+        finally:
+            _stats["in_flight"] -= 1
+    
+    async def _stream_inprocess(self, payload: Dict[str, Any]) -> AsyncIterator[StreamChunk]:
+        """Stream through the in-process gateway; chunks arrive as dicts, no SSE framing."""
+        from fastapi import HTTPException
+        from app.services.gateway.api import stream_inprocess
+        
+        try:
+            async for chunk_data in stream_inprocess(payload):
+                chunk = self._parse_stream_chunk(chunk_data)
+                if chunk is not None:
+                    yield chunk
+        except HTTPException as e:
+            if e.status_code == 503:
+                raise AINetworkError(e.detail) from e
+            raise AIGatewayError(e.detail) from e
+    
+    def open_connections(self) -> int:
+        """Connections currently held by the HTTP pool (0 for the in-process transport)."""
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        return len(getattr(pool, "connections", None) or [])
     
     async def close(self):
-        """Close HTTP client."""
-        await self._client.aclose()
+        """Close HTTP client (no-op for shared clients; see close_ai_clients)."""
+        if self._shared:
+            return
+        if self._client is not None:
+            await self._client.aclose()
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -474,3 +555,70 @@ class UnifiedAIClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         await self.close()
+
+
+# Shared clients handed out by get_ai_client
+# (loop for the http transport, None for in-process; gateway_url; timeout; transport) -> client
+_shared_clients: Dict[Tuple[Any, ...], UnifiedAIClient] = {}
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_ai_client(timeout: int = 60, gateway_url: Optional[str] = None) -> UnifiedAIClient:
+    """
+    Borrow the shared AI client for a timeout.
+
+    Agents and nodes used to construct a UnifiedAIClient per call, each with its
+    own httpx pool that was rarely closed. Clients from here live until
+    close_ai_clients() at shutdown; close() and `async with` on them are no-ops.
+    With the http transport the httpx pool is bound to the event loop that
+    opened it, so those clients are also scoped to the running loop.
+
+    Args:
+        timeout: Request timeout in seconds (one shared client per distinct timeout)
+        gateway_url: Gateway base URL (defaults to settings.BACKEND_API_URL)
+
+    Returns:
+        Shared UnifiedAIClient; callers must not rely on closing it
+    """
+    gateway_url = (gateway_url or settings.BACKEND_API_URL).rstrip('/')
+    transport = settings.AI_GATEWAY_TRANSPORT.lower()
+    loop = _running_loop() if transport == "http" else None
+    key = (loop, gateway_url, timeout, transport)
+    client = _shared_clients.get(key)
+    if client is None:
+        for stale in [k for k in _shared_clients if k[0] is not None and k[0].is_closed()]:
+            _shared_clients.pop(stale, None)
+        client = UnifiedAIClient(gateway_url=gateway_url, timeout=timeout, transport=transport)
+        client._shared = True
+        _shared_clients[key] = client
+        logger.debug(f"Created shared AI client ({transport}, timeout={timeout}s, pool size: {len(_shared_clients)})")
+    return client
+
+
+def get_ai_client_stats() -> Dict[str, Any]:
+    """Get shared AI client counts, open gateway connections and in-flight requests."""
+    return {
+        "clients": len(_shared_clients),
+        "transport": settings.AI_GATEWAY_TRANSPORT.lower(),
+        "open_connections": sum(c.open_connections() for c in _shared_clients.values()),
+        "in_flight": _stats["in_flight"],
+        "requests": _stats["requests"],
+        "streams": _stats["streams"],
+    }
+
+
+async def close_ai_clients() -> None:
+    """Close every shared AI client (application shutdown)."""
+    while _shared_clients:
+        key, client = _shared_clients.popitem()
+        client._shared = False
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing shared AI client (timeout={key[2]}s): {e}")
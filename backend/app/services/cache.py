@@ -1,41 +1,92 @@
 """Caching service for expensive operations."""
+import asyncio
+import inspect
 import logging
+import sys
+import threading
 import time
 import hashlib
 import json
-from typing import Dict, Any, Optional, Callable
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
 from functools import wraps
-from datetime import datetime, timedelta
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Containers are sized from a sample of their items
+_SIZE_SAMPLE_ITEMS = 32
+_SIZE_MAX_DEPTH = 4
+
+
+def _estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    nbytes = getattr(value, "nbytes", None)  # ColumnarResult, NumPy arrays, pandas Series
+    if isinstance(nbytes, int):
+        return nbytes
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):  # pandas DataFrame
+        return int(value.memory_usage(index=False).sum())
+    
+    size = sys.getsizeof(value, 64)
+    if _depth >= _SIZE_MAX_DEPTH or isinstance(value, (str, bytes, bytearray)):
+        return size
+    if isinstance(value, dict):
+        items = list(value.items())
+        sample = items[:_SIZE_SAMPLE_ITEMS]
+        sampled = sum(_estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1) for k, v in sample)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value) if not isinstance(value, (list, tuple)) else value
+        sample = items[:_SIZE_SAMPLE_ITEMS]
+        sampled = sum(_estimate_size(v, _depth + 1) for v in sample)
+    else:
+        return size
+    if not sample:
+        return size
+    return size + sampled * len(items) // len(sample)
+
 
 class CacheEntry:
     """A cache entry with TTL."""
     
-    def __init__(self, value: Any, ttl_seconds: int = 300):
+    __slots__ = ("value", "created_at", "ttl_seconds", "expires_at", "size")
+    
+    def __init__(self, value: Any, ttl_seconds: int = 300, size: int = 0):
         self.value = value
-        self.created_at = datetime.now()
+        self.created_at = time.monotonic()
         self.ttl_seconds = ttl_seconds
+        self.expires_at = self.created_at + ttl_seconds
+        self.size = size
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if cache entry has expired."""
-        age = datetime.now() - self.created_at
-        return age.total_seconds() > self.ttl_seconds
+        return (now if now is not None else time.monotonic()) > self.expires_at
     
     def get_age_seconds(self) -> float:
         """Get age of cache entry in seconds."""
-        age = datetime.now() - self.created_at
-        return age.total_seconds()
+        return time.monotonic() - self.created_at
 
 
 class AgentCache:
-    """In-memory cache for agent operations."""
+    """
+    In-memory LRU cache with per-entry TTL for agent operations.
+    
+    Bounded by entry count and by approximate size in bytes; the least recently
+    used entries are evicted first. Expired entries are dropped on read and by
+    the background sweeper (start_sweeper). Stats are kept as running counters.
+    """
     
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else settings.AGENT_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.AGENT_CACHE_MAX_BYTES
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._sweeper: Optional[asyncio.Task] = None
     
     def _make_key(self, prefix: str, *args, **kwargs) -> str:
         """Create a cache key from prefix and arguments."""
@@ -49,40 +100,66 @@ class AgentCache:
         key_hash = hashlib.md5(key_str.encode()).hexdigest()
         return f"{prefix}:{key_hash}"
     
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        entry = self._cache.get(key)
-        
-        if entry is None:
-            self._misses += 1
-            return None
-        
-        if entry.is_expired():
-            logger.debug(f"Cache entry expired: {key}")
-            del self._cache[key]
-            self._misses += 1
-            return None
-        
-        self._hits += 1
+        with self._lock:
+            entry = self._cache.get(key)
+            
+            if entry is None:
+                self._misses += 1
+                return None
+            
+            if entry.is_expired():
+                logger.debug(f"Cache entry expired: {key}")
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self._hits += 1
         logger.debug(f"Cache hit: {key} (age: {entry.get_age_seconds():.1f}s)")
         return entry.value
     
     def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
-        """Set value in cache with TTL."""
-        self._cache[key] = CacheEntry(value, ttl_seconds)
-        logger.debug(f"Cache set: {key} (TTL: {ttl_seconds}s)")
+        """Set value in cache with TTL, evicting least recently used entries over the limits."""
+        size = _estimate_size(value)
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            if size > self.max_bytes:
+                logger.debug(f"Cache skip: {key} ({size} bytes exceeds the cache size limit)")
+                return
+            
+            self._cache[key] = CacheEntry(value, ttl_seconds, size)
+            self._bytes += size
+            while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, evicted = self._cache.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+                logger.debug(f"Cache evict: {evicted_key} ({evicted.size} bytes)")
+        logger.debug(f"Cache set: {key} (TTL: {ttl_seconds}s, ~{size} bytes)")
     
     def delete(self, key: str) -> None:
         """Delete a cache entry."""
-        if key in self._cache:
-            del self._cache[key]
-            logger.debug(f"Cache delete: {key}")
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+                logger.debug(f"Cache delete: {key}")
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        self._cache.clear()
-        self._hits = 0
-        self._misses = 0
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._expirations = 0
         logger.info("Cache cleared")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -90,37 +167,75 @@ class AgentCache:
         total_requests = self._hits + self._misses
         hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
         
-        # Count expired entries
-        expired_count = sum(1 for entry in self._cache.values() if entry.is_expired())
-        
         return {
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": hit_rate,
             "size": len(self._cache),
-            "expired_entries": expired_count
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+            "expirations": self._expirations
         }
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count removed."""
-        expired_keys = [key for key, entry in self._cache.items() if entry.is_expired()]
-        for key in expired_keys:
-            del self._cache[key]
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [key for key, entry in self._cache.items() if entry.is_expired(now)]
+            for key in expired_keys:
+                self._remove(key)
+            self._expirations += len(expired_keys)
         
         if expired_keys:
             logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
         
         return len(expired_keys)
+    
+    async def _sweep(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                logger.warning(f"Cache sweep failed: {e}")
+    
+    def start_sweeper(self, interval: Optional[float] = None) -> None:
+        """Start the background task that drops expired entries (call from a running loop)."""
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        interval = interval if interval is not None else settings.AGENT_CACHE_SWEEP_INTERVAL
+        self._sweeper = asyncio.get_running_loop().create_task(self._sweep(interval))
+    
+    async def stop_sweeper(self) -> None:
+        """Cancel the background sweeper."""
+        sweeper, self._sweeper = self._sweeper, None
+        if sweeper is None or sweeper.done():
+            return
+        sweeper.cancel()
+        try:
+            await sweeper
+        except asyncio.CancelledError:
+            pass
 
 
 # Global cache instance
 _global_cache = AgentCache()
 
+# In-flight computations for the cached decorator, so concurrent misses share one call
+_inflight_async: Dict[Tuple[Any, str], asyncio.Future] = {}
+_inflight_sync: Dict[str, threading.Lock] = {}
+_inflight_sync_guard = threading.Lock()
+
 
 def cached(prefix: str, ttl_seconds: int = 300):
     """
     Decorator to cache function results.
     
+    Concurrent misses for the same key wait for the first caller's result
+    instead of running the function again (single-flight).
+    
     Args:
         prefix: Cache key prefix
         ttl_seconds: Time to live in seconds (default: 5 minutes)
@@ -134,19 +249,45 @@ def cached(prefix: str, ttl_seconds: int = 300):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             cache_key = _global_cache._make_key(prefix, *args, **kwargs)
+            flight_key = (asyncio.get_running_loop(), cache_key)
             
-            # Try cache first
-            cached_value = _global_cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
+            while True:
+                # Try cache first
+                cached_value = _global_cache.get(cache_key)
+                if cached_value is not None:
+                    return cached_value
+                
+                # Another caller is already computing this key
+                pending = _inflight_async.get(flight_key)
+                if pending is None:
+                    break
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    # Only the computing caller was cancelled: start a new computation
+                    if not pending.cancelled() or asyncio.current_task().cancelling():
+                        raise
             
             # Cache miss - execute function
-            result = await func(*args, **kwargs)
-            
-            # Cache the result
-            _global_cache.set(cache_key, result, ttl_seconds)
-            
-            return result
+            pending = asyncio.get_running_loop().create_future()
+            _inflight_async[flight_key] = pending
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                # Waiters did not ask for this cancellation; wake them to retry
+                pending.cancel()
+                raise
+            except Exception as e:
+                pending.set_exception(e)
+                pending.exception()  # Mark retrieved when nobody else was waiting
+                raise
+            else:
+                # Cache the result
+                _global_cache.set(cache_key, result, ttl_seconds)
+                pending.set_result(result)
+                return result
+            finally:
+                _inflight_async.pop(flight_key, None)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -157,16 +298,27 @@ def cached(prefix: str, ttl_seconds: int = 300):
             if cached_value is not None:
                 return cached_value
             
-            # Cache miss - execute function
-            result = func(*args, **kwargs)
-            
-            # Cache the result
-            _global_cache.set(cache_key, result, ttl_seconds)
-            
-            return result
+            with _inflight_sync_guard:
+                key_lock = _inflight_sync.setdefault(cache_key, threading.Lock())
+            with key_lock:
+                # A concurrent caller may have filled the cache while we waited
+                cached_value = _global_cache.get(cache_key)
+                if cached_value is not None:
+                    return cached_value
+                
+                try:
+                    # Cache miss - execute function
+                    result = func(*args, **kwargs)
+                    
+                    # Cache the result
+                    _global_cache.set(cache_key, result, ttl_seconds)
+                    
+                    return result
+                finally:
+                    with _inflight_sync_guard:
+                        _inflight_sync.pop(cache_key, None)
         
         # Return appropriate wrapper based on whether function is async
-        import inspect
         if inspect.iscoroutinefunction(func):
             return async_wrapper
         else:
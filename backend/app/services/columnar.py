@@ -0,0 +1,423 @@
+"""Columnar representation for tabular query results.
+
+Results from TableauClient.execute_vds_query and get_view_data used to travel
+through the agents as lists of row lists. ColumnarResult keeps the familiar
+{"columns", "data", "row_count"} dict shape for existing callers, but stores
+values per column: numeric columns as NumPy arrays, everything else
+dictionary-encoded (int32 codes + unique values). "data" is a row view that is
+built on access and shared while anyone holds it.
+
+Serializers that read raw dict storage (orjson, msgpack checkpoints) only see
+"columns" and "row_count"; pass results through to_plain() before handing
+them to one.
+"""
+import json
+import weakref
+from array import array
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+_MISSING = -1
+
+
+class _NumericColumn:
+    """Int64/float64 values with an optional missing-value mask."""
+
+    __slots__ = ("values", "mask")
+
+    def __init__(self, values: np.ndarray, mask: Optional[np.ndarray] = None):
+        self.values = values
+        self.mask = mask
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + (self.mask.nbytes if self.mask is not None else 0)
+
+    def to_list(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        values = self.values[start:stop].tolist()
+        if self.mask is not None:
+            for i in np.flatnonzero(self.mask[start:stop]):
+                values[i] = None
+        return values
+
+    def to_numpy(self) -> np.ndarray:
+        if self.mask is None:
+            return self.values
+        return np.where(self.mask, np.nan, self.values.astype(np.float64))
+
+    def to_pandas(self, categorical: bool = False) -> Any:
+        return self.to_numpy()
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.array(self.values, mask=self.mask)
+
+
+class _DictColumn:
+    """Dictionary-encoded values: int32 codes into a list of unique values (-1 = missing)."""
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: List[Any]):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(str(v)) + 49 for v in self.categories)
+
+    def _lookup(self) -> np.ndarray:
+        # Trailing None lets code -1 index the missing value directly
+        lookup = np.empty(len(self.categories) + 1, dtype=object)
+        lookup[:-1] = self.categories
+        lookup[-1] = None
+        return lookup
+
+    def to_list(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        return self._lookup()[self.codes[start:stop]].tolist()
+
+    def to_numpy(self) -> np.ndarray:
+        return self._lookup()[self.codes]
+
+    def to_pandas(self, categorical: bool = False) -> Any:
+        if categorical:
+            try:
+                return pd.Categorical.from_codes(self.codes, categories=self.categories)
+            except (ValueError, TypeError):
+                pass  # Mixed-type values that compare equal (e.g. 1 and "1" are fine, 1 and 1.0 are not)
+        return self.to_numpy()
+
+    def to_arrow(self):
+        import pyarrow as pa
+        try:
+            dictionary = pa.array(self.categories)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            dictionary = pa.array([str(v) for v in self.categories], type=pa.string())
+        indices = pa.array(self.codes, mask=self.codes < 0, type=pa.int32())
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+
+class _ObjectColumn:
+    """Fallback for unhashable values (nested lists/dicts)."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: List[Any]):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * len(self.values)
+
+    def to_list(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        return self.values[start:stop]
+
+    def to_numpy(self) -> np.ndarray:
+        out = np.empty(len(self.values), dtype=object)
+        out[:] = self.values
+        return out
+
+    def to_pandas(self, categorical: bool = False) -> Any:
+        return self.to_numpy()
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.array([None if v is None else json.dumps(v, default=str) for v in self.values], type=pa.string())
+
+
+class _ColumnBuilder:
+    """Dictionary-encodes one column's values as rows are appended."""
+
+    __slots__ = ("codes", "index", "values", "objects")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.index: Dict[Any, int] = {}
+        self.values: List[Any] = []
+        self.objects: Optional[List[Any]] = None
+
+    def append(self, value: Any) -> None:
+        if self.objects is not None:
+            self.objects.append(value)
+            return
+        if value is None:
+            self.codes.append(_MISSING)
+            return
+        # Key on type too so 1, 1.0 and True stay distinct
+        key = (value.__class__, value)
+        try:
+            code = self.index.get(key)
+        except TypeError:
+            self.objects = [None if c == _MISSING else self.values[c] for c in self.codes]
+            self.objects.append(value)
+            return
+        if code is None:
+            code = len(self.values)
+            self.index[key] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def build(self):
+        if self.objects is not None:
+            return _ObjectColumn(self.objects)
+        codes = np.frombuffer(self.codes, dtype=np.int32) if self.codes else np.empty(0, dtype=np.int32)
+        kinds = {v.__class__ for v in self.values}
+        if kinds and kinds <= {int, float}:
+            dtype = np.int64 if kinds == {int} else np.float64
+            try:
+                categories = np.asarray(self.values, dtype=dtype)
+            except OverflowError:
+                return _DictColumn(codes.copy(), self.values)
+            missing = codes < 0
+            values = categories[np.where(missing, 0, codes)]
+            return _NumericColumn(values, missing if missing.any() else None)
+        return _DictColumn(codes.copy(), self.values)
+
+
+class ColumnarBuilder:
+    """Incrementally builds a ColumnarResult from rows (e.g. while streaming a CSV)."""
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self._builders = [_ColumnBuilder() for _ in self.columns]
+        self.row_count = 0
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Append one row; missing trailing values become None, extra values are dropped."""
+        row_len = len(row)
+        for i, builder in enumerate(self._builders):
+            builder.append(row[i] if i < row_len else None)
+        self.row_count += 1
+
+    def build(self) -> "ColumnarResult":
+        return ColumnarResult(self.columns, [b.build() for b in self._builders], self.row_count)
+
+
+class _RowView(list):
+    """Row-list view of a ColumnarResult (a list subclass so it can be weakly cached)."""
+
+
+class ColumnarResult(dict):
+    """
+    Compact, column-oriented query result.
+
+    Behaves like {"columns": [...], "data": [[...], ...], "row_count": n} for
+    existing callers (indexing, .get, iteration, json.dumps, FastAPI encoding).
+    Row lists are only built when "data" is read and are never stored, so the
+    columns are the single copy of the values; prefer head(), result_view(),
+    to_dataframe() or to_json() on hot paths. Treat "data" as read-only:
+    assign a new row list to result["data"] to change the rows.
+    """
+
+    def __init__(self, columns: Sequence[str], column_data: Sequence[Any], row_count: int):
+        super().__init__(columns=list(columns), row_count=row_count)
+        self._columns = list(column_data)
+        self._rows_ref: Optional[weakref.ref] = None
+
+    @classmethod
+    def from_rows(cls, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> "ColumnarResult":
+        """Build from row lists (missing trailing values become None)."""
+        builder = ColumnarBuilder(columns)
+        for row in rows:
+            builder.append(row)
+        return builder.build()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], columns: Optional[Sequence[str]] = None) -> "ColumnarResult":
+        """Build from row dicts (VDS OBJECTS format); columns default to the first record's keys."""
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return cls(list(columns or []), [_ColumnBuilder().build() for _ in (columns or [])], 0)
+        columns = list(columns) if columns is not None else list(first.keys())
+        builders = [_ColumnBuilder() for _ in columns]
+        pairs = list(zip(columns, builders))
+        row_count = 0
+        for record in chain([first], records):
+            if not isinstance(record, dict):
+                continue
+            for name, builder in pairs:
+                builder.append(record.get(name))
+            row_count += 1
+        return cls(columns, [b.build() for b in builders], row_count)
+
+    # --- dict protocol: expose "data" lazily ---------------------------------
+
+    def _rows(self) -> _RowView:
+        rows = self._rows_ref() if self._rows_ref is not None else None
+        if rows is None:
+            rows = _RowView(self.head(None))
+            self._rows_ref = weakref.ref(rows)
+        return rows
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "data":
+            return self._rows()
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "data":
+            rebuilt = ColumnarResult.from_rows(self["columns"], value)
+            self._columns = rebuilt._columns
+            self._rows_ref = None
+            dict.__setitem__(self, "row_count", rebuilt["row_count"])
+            return
+        dict.__setitem__(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __contains__(self, key: object) -> bool:
+        return key == "data" or dict.__contains__(self, key)
+
+    def __iter__(self):
+        yield from dict.__iter__(self)
+        yield "data"
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + 1
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def _shared(self, columns: Sequence[str]) -> "ColumnarResult":
+        # New result over the same column arrays and row view (nothing is copied)
+        clone = ColumnarResult(columns, self._columns, self["row_count"])
+        clone._rows_ref = self._rows_ref
+        return clone
+
+    def copy(self) -> "ColumnarResult":
+        clone = self._shared(self["columns"])
+        for key, value in dict.items(self):
+            dict.__setitem__(clone, key, value)
+        return clone
+
+    def __reduce__(self):
+        extras = [(k, v) for k, v in dict.items(self) if k not in ("columns", "row_count")]
+        return (ColumnarResult, (self["columns"], self._columns, self["row_count"]), None, None, iter(extras))
+
+    # --- conversions --------------------------------------------------------
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the column arrays."""
+        return sum(c.nbytes for c in self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of one column as a NumPy array (numeric dtype when the column is numeric)."""
+        return self._columns[self["columns"].index(name)].to_numpy()
+
+    def head(self, n: Optional[int] = 10) -> List[List[Any]]:
+        """First n rows as lists (all rows when n is None) without building the rest."""
+        if not self._columns:
+            return [[] for _ in range(self["row_count"] if n is None else min(n, self["row_count"]))]
+        return [list(row) for row in zip(*(c.to_list(0, n) for c in self._columns))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with row lists (for JSON columns, caches and API responses)."""
+        return {k: self[k] for k in self}
+
+    def to_json(self) -> str:
+        """Serialize as {"columns", "data", "row_count"} JSON."""
+        return json.dumps(self.to_dict(), default=str)
+
+    def to_dataframe(self, categorical: bool = False) -> pd.DataFrame:
+        """
+        Convert to a pandas DataFrame.
+
+        Numeric columns are passed through as NumPy arrays; dictionary-encoded
+        columns become object columns, or pandas Categoricals when categorical=True.
+        """
+        df = pd.DataFrame({i: c.to_pandas(categorical) for i, c in enumerate(self._columns)})
+        df.columns = self["columns"]
+        return df
+
+    def to_arrow_ipc(self) -> bytes:
+        """Serialize to the Arrow IPC stream format (requires pyarrow)."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow is required for Arrow IPC export: pip install pyarrow") from e
+        table = pa.Table.from_arrays([c.to_arrow() for c in self._columns], names=self["columns"])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def result_view(result: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+    """
+    {"columns", "data", "row_count"} view of a result plus extra fields.
+    
+    For ColumnarResult the view shares the column arrays, so no rows are copied.
+    """
+    if isinstance(result, ColumnarResult):
+        view: Dict[str, Any] = result._shared(result["columns"])
+    else:
+        view = {
+            "columns": result.get("columns", []),
+            "data": result.get("data", []),
+            "row_count": count_rows(result),
+        }
+    for key, value in fields.items():
+        view[key] = value
+    return view
+
+
+def as_dataframe(result: Dict[str, Any], categorical: bool = False) -> pd.DataFrame:
+    """DataFrame for a query result, avoiding row materialization for ColumnarResult."""
+    if isinstance(result, ColumnarResult):
+        return result.to_dataframe(categorical=categorical)
+    return pd.DataFrame(result.get("data", []), columns=result.get("columns", []))
+
+
+def head_rows(result: Dict[str, Any], n: int) -> List[List[Any]]:
+    """First n rows of a query result, building only those rows for ColumnarResult."""
+    if isinstance(result, ColumnarResult):
+        return result.head(n)
+    return result.get("data", [])[:n]
+
+
+def count_rows(result: Dict[str, Any]) -> int:
+    """Row count of a query result without building the rows of a ColumnarResult."""
+    if isinstance(result, ColumnarResult) or "row_count" in result:
+        return result["row_count"]
+    return len(result.get("data") or [])
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Replace ColumnarResults nested in dicts, lists and tuples with plain dicts.
+
+    For serializers that read dict storage directly and would otherwise drop
+    "data"; containers without a ColumnarResult are returned unchanged.
+    """
+    if isinstance(value, ColumnarResult):
+        return value.to_dict()
+    if isinstance(value, dict):
+        items = {k: to_plain(v) for k, v in value.items()}
+        return value if all(items[k] is v for k, v in value.items()) else items
+    if isinstance(value, (list, tuple)):
+        items = [to_plain(v) for v in value]
+        if all(a is b for a, b in zip(items, value)):
+            return value
+        return items if isinstance(value, list) else tuple(items)
+    return value
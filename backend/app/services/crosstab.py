@@ -0,0 +1,227 @@
+"""Vectorised crosstab (pivot table) aggregation over streamed view rows.
+
+Rows arrive in chunks (e.g. from TableauClient.iter_view_data_rows). Each chunk
+is reduced with a pandas groupby to per-cell partial aggregates (sum, count,
+min, max); partials are merged as chunks accumulate, so memory is bounded by
+the number of distinct cells rather than by view size. Any of sum, avg, count,
+min and max, plus row, column and grand totals, are derived from the merged
+partials, which keeps totals exact (an average total is sum / count over the
+underlying rows, not an average of cell averages).
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ("sum", "avg", "count", "min", "max")
+
+# Rows reduced per groupby call when streaming
+CROSSTAB_CHUNK_ROWS = 50_000
+# Merge accumulated partials once this many chunks are pending
+_COMPACT_EVERY = 8
+
+_PARTIAL_AGGS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+def _empty_crosstab() -> Dict[str, Any]:
+    return {
+        "rows": [],
+        "columns": [],
+        "data": [],
+        "row_totals": [],
+        "column_totals": [],
+        "grand_total": None,
+    }
+
+
+def _sorted_labels(keys: List[tuple]) -> List[tuple]:
+    """Distinct label tuples in sort order; mixed types (e.g. missing values) sort as text."""
+    unique = set(keys)
+    try:
+        return sorted(unique)
+    except TypeError:
+        return sorted(unique, key=lambda k: tuple("" if v is None or v != v else str(v) for v in k))
+
+
+class CrosstabAccumulator:
+    """Incrementally aggregates rows into crosstab cells.
+
+    Row and column fields missing from the view are treated as a constant ""
+    (one bucket), matching how the export tools have always keyed them; a
+    missing measure is an error. Measure values that are not numeric are
+    ignored by every aggregation.
+    """
+
+    def __init__(
+        self,
+        row_fields: Sequence[str],
+        col_fields: Sequence[str],
+        measure: str,
+        aggregation: str = "sum",
+    ):
+        aggregation = aggregation.lower()
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{aggregation}'. Use one of: {', '.join(AGGREGATIONS)}")
+        self.row_fields = list(row_fields)
+        self.col_fields = list(col_fields)
+        self.measure = measure
+        self.aggregation = aggregation
+        self.rows_seen = 0
+        self._keys = [f"r{i}" for i in range(len(self.row_fields))] + [f"c{i}" for i in range(len(self.col_fields))]
+        self._partials: List[pd.DataFrame] = []
+
+    def add_rows(self, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+        """Aggregate a chunk of row lists laid out as `columns`.
+
+        Raises:
+            ValueError: If the measure is not one of the columns
+        """
+        if not rows:
+            return
+        columns = list(columns)
+        if self.measure not in columns:
+            raise ValueError(f"Measure '{self.measure}' not found in columns")
+
+        fields = self.row_fields + self.col_fields
+        indices = [columns.index(f) if f in columns else None for f in fields]
+        measure_index = columns.index(self.measure)
+        needed = max([i for i in indices if i is not None] + [measure_index])
+        if min(map(len, rows)) <= needed:
+            rows = [row for row in rows if len(row) > needed]
+
+        frame = {
+            key: [row[i] for row in rows] if i is not None else ""
+            for key, i in zip(self._keys, indices)
+        }
+        frame["value"] = pd.to_numeric(pd.Series([row[measure_index] for row in rows]), errors="coerce")
+        self._add(pd.DataFrame(frame))
+
+    def add_frame(self, df: pd.DataFrame) -> None:
+        """Aggregate a chunk given as a DataFrame with the view's column names."""
+        if self.measure not in df.columns:
+            raise ValueError(f"Measure '{self.measure}' not found in columns")
+        frame = {
+            key: df[field].to_numpy() if field in df.columns else ""
+            for key, field in zip(self._keys, self.row_fields + self.col_fields)
+        }
+        frame["value"] = pd.to_numeric(df[self.measure], errors="coerce").to_numpy()
+        self._add(pd.DataFrame(frame, index=pd.RangeIndex(len(df))))
+
+    def _add(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        self.rows_seen += len(frame)
+        # A constant key keeps groupby valid when there are no row or column fields
+        keys = self._keys or [frame.assign(_all=0)["_all"]]
+        partial = frame.groupby(keys, sort=False, dropna=False)["value"].agg(["sum", "count", "min", "max"])
+        self._partials.append(partial)
+        if len(self._partials) >= _COMPACT_EVERY:
+            self._compact()
+
+    def _compact(self) -> Optional[pd.DataFrame]:
+        if not self._partials:
+            return None
+        if len(self._partials) > 1:
+            combined = pd.concat(self._partials)
+            levels = list(range(combined.index.nlevels))
+            self._partials = [combined.groupby(level=levels, sort=False, dropna=False).agg(_PARTIAL_AGGS)]
+        return self._partials[0]
+
+    def _finalize(self, stats: pd.DataFrame) -> np.ndarray:
+        """Final values for rows of partial stats (NaN where a cell has no numeric values)."""
+        count = stats["count"].to_numpy(dtype=np.float64)
+        if self.aggregation == "count":
+            return count
+        if self.aggregation == "avg":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = stats["sum"].to_numpy(dtype=np.float64) / count
+        else:
+            values = stats[self.aggregation].to_numpy(dtype=np.float64)
+        return np.where(count > 0, values, np.nan)
+
+    def _to_json(self, values: np.ndarray) -> List[Any]:
+        if self.aggregation == "count":
+            return values.astype(np.int64).tolist()
+        out = values.astype(object)
+        out[np.isnan(values)] = None
+        return out.tolist()
+
+    def result(self, include_totals: bool = True) -> Dict[str, Any]:
+        """The crosstab: sorted row/column labels, a rows x columns value matrix and totals.
+
+        Cells with no rows (or no numeric values) are None; for count they are 0.
+        """
+        stats = self._compact()
+        if stats is None:
+            return _empty_crosstab()
+
+        cells = stats.reset_index(drop=not self._keys)
+        n_row = len(self.row_fields)
+        row_keys = list(zip(*(cells[k] for k in self._keys[:n_row]))) if n_row else [()] * len(cells)
+        col_keys = list(zip(*(cells[k] for k in self._keys[n_row:]))) if self.col_fields else [()] * len(cells)
+
+        row_labels = _sorted_labels(row_keys)
+        col_labels = _sorted_labels(col_keys)
+        row_pos = {k: i for i, k in enumerate(row_labels)}
+        col_pos = {k: i for i, k in enumerate(col_labels)}
+        cells["row"] = np.fromiter((row_pos[k] for k in row_keys), dtype=np.int64, count=len(row_keys))
+        cells["col"] = np.fromiter((col_pos[k] for k in col_keys), dtype=np.int64, count=len(col_keys))
+
+        fill = 0.0 if self.aggregation == "count" else np.nan
+        matrix = np.full((len(row_labels), len(col_labels)), fill)
+        matrix[cells["row"].to_numpy(), cells["col"].to_numpy()] = self._finalize(cells)
+
+        crosstab = {
+            "rows": [list(k) for k in row_labels],
+            "columns": [list(k) for k in col_labels],
+            "data": [self._to_json(row) for row in matrix],
+        }
+        if include_totals:
+            by_row = cells.groupby("row", sort=True).agg(_PARTIAL_AGGS)
+            by_col = cells.groupby("col", sort=True).agg(_PARTIAL_AGGS)
+            grand = cells[list(_PARTIAL_AGGS)].agg(_PARTIAL_AGGS).to_frame().T
+            crosstab["row_totals"] = self._to_json(self._finalize(by_row))
+            crosstab["column_totals"] = self._to_json(self._finalize(by_col))
+            crosstab["grand_total"] = self._to_json(self._finalize(grand))[0]
+        return crosstab
+
+
+async def crosstab_from_rows(
+    rows: AsyncIterator[List[Any]],
+    row_fields: Sequence[str],
+    col_fields: Sequence[str],
+    measure: str,
+    aggregation: str = "sum",
+    include_totals: bool = True,
+    chunk_rows: int = CROSSTAB_CHUNK_ROWS,
+) -> Dict[str, Any]:
+    """Build a crosstab from a header-first row stream, aggregating chunk by chunk.
+
+    Args:
+        rows: Async iterator yielding the header row, then data rows
+        row_fields: Fields forming the crosstab rows
+        col_fields: Fields forming the crosstab columns
+        measure: Measure field to aggregate
+        aggregation: One of sum, avg, count, min, max
+        include_totals: Whether to add row, column and grand totals
+        chunk_rows: Rows aggregated per chunk
+
+    Returns:
+        Dictionary with 'crosstab' (see CrosstabAccumulator.result) and 'row_count'
+    """
+    accumulator = CrosstabAccumulator(row_fields, col_fields, measure, aggregation)
+    columns: Optional[List[str]] = None
+    chunk: List[List[Any]] = []
+    async for row in rows:
+        if columns is None:
+            columns = list(row)
+            if measure not in columns:
+                raise ValueError(f"Measure '{measure}' not found in columns")
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            accumulator.add_rows(columns, chunk)
+            chunk = []
+    if chunk:
+        accumulator.add_rows(columns, chunk)
+    return {"crosstab": accumulator.result(include_totals), "row_count": accumulator.rows_seen}
@@ -19,25 +19,27 @@ def _oauth_state_key(state: str) -> str:
     return f"oauth_state:{state}"
 
 
-def store_oauth_state(state: str, config_id: int, user_id: int) -> None:
+async def store_oauth_state(state: str, config_id: int, user_id: int) -> None:
     """Store OAuth state in Redis for CSRF validation."""
     try:
-        from app.core.cache import redis_client
+        from app.core.cache import get_async_redis
         payload = json.dumps({"config_id": config_id, "user_id": user_id})
         key = _oauth_state_key(state)
-        redis_client.setex(key, OAUTH_STATE_TTL, payload.encode())
+        await get_async_redis().setex(key, OAUTH_STATE_TTL, payload.encode())
     except Exception as e:
         logger.warning(f"Failed to store OAuth state (Redis): {e}")
         raise
 
 
-def get_and_clear_oauth_state(state: str) -> Optional[tuple[int, int]]:
-    """Get and delete OAuth state; return (config_id, user_id) or None."""
+async def get_and_clear_oauth_state(state: str) -> Optional[tuple[int, int]]:
+    """Get and delete OAuth state in one round trip; return (config_id, user_id) or None."""
     try:
-        from app.core.cache import redis_client
+        from app.core.cache import get_async_redis
         key = _oauth_state_key(state)
-        data = redis_client.get(key)
-        redis_client.delete(key)
+        pipe = get_async_redis().pipeline(transaction=True)
+        pipe.get(key)
+        pipe.delete(key)
+        data, _ = await pipe.execute()
         if not data:
             return None
         obj = json.loads(data.decode())
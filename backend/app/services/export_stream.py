@@ -0,0 +1,313 @@
+"""Streaming view exports as CSV, NDJSON or Arrow IPC chunks.
+
+Batch exports used to build every view's rows and the full CSV/JSON payload in
+memory before returning. Here rows are pulled from
+TableauClient.iter_view_data_rows (which parses the Data API CSV incrementally)
+and encoded EXPORT_CHUNK_ROWS at a time, so an export holds at most one chunk
+regardless of view size or view count.
+
+Two consumers:
+
+- stream_export() yields encoded byte chunks for a chunked HTTP response.
+- read_page() serves one page per call with a continuation token (MCP tools).
+  The open row stream is parked between pages; if it has expired or the next
+  page lands in another process, the view is re-streamed and skipped forward
+  to the token's offset.
+"""
+import base64
+import csv
+import io
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Rows encoded per chunk
+EXPORT_CHUNK_ROWS = 5_000
+# Parked page cursors (open view row streams) kept between MCP calls
+MAX_OPEN_CURSORS = 32
+CURSOR_TTL_SECONDS = 300
+
+
+def check_format(format: str, view_count: int = 1) -> str:
+    """Normalize and validate an export format.
+
+    Raises:
+        ValueError: For unknown formats, or Arrow with several views (one IPC stream has one schema)
+    """
+    format = format.lower()
+    if format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format '{format}'. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    if format == "arrow" and view_count > 1:
+        raise ValueError("Arrow exports stream one view at a time")
+    return format
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    """CSV lines for a chunk of rows."""
+    out = io.StringIO()
+    csv.writer(out).writerows(rows)
+    return out.getvalue().encode("utf-8")
+
+
+def encode_ndjson(view_id: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """One JSON object per row, keyed by column name and tagged with the view."""
+    return "".join(
+        json.dumps({"view_id": view_id, **dict(zip(columns, row))}, default=str) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+class ArrowStreamEncoder:
+    """Incremental Arrow IPC stream: schema on the first chunk, one record batch per chunk."""
+
+    def __init__(self, columns: Sequence[str]):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow is required for Arrow IPC export: pip install pyarrow") from e
+        self._pa = pa
+        # Data API values arrive as CSV text
+        self.schema = pa.schema([(name, pa.string()) for name in columns])
+        self._sink = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        pa = self._pa
+        arrays = [
+            pa.array([row[i] if i < len(row) else None for row in rows], type=pa.string())
+            for i in range(len(self.schema))
+        ]
+        self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        return self._drain()
+
+    def close(self) -> bytes:
+        """End-of-stream marker."""
+        self._writer.close()
+        return self._drain()
+
+
+async def _chunks(rows: AsyncIterator[List[Any]], size: int) -> AsyncIterator[List[List[Any]]]:
+    chunk: List[List[Any]] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def stream_export(
+    client,
+    view_ids: Sequence[str],
+    format: str = "csv",
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> AsyncIterator[bytes]:
+    """Encoded export chunks for one or more views, in view order.
+
+    CSV repeats a header (with a leading view_id column) at the start of each
+    view; NDJSON tags each row with its view_id; Arrow carries a single view.
+
+    Args:
+        client: TableauClient
+        view_ids: Views to export
+        format: csv, ndjson or arrow
+        chunk_rows: Rows encoded per chunk
+
+    Yields:
+        Byte chunks ready to write to the response
+    """
+    format = check_format(format, len(view_ids))
+    for view_id in view_ids:
+        rows = client.iter_view_data_rows(view_id)
+        try:
+            columns = await rows.__anext__()
+        except StopAsyncIteration:
+            continue
+        try:
+            arrow = ArrowStreamEncoder(columns) if format == "arrow" else None
+            if format == "csv":
+                yield encode_csv([["view_id", *columns]])
+            async for chunk in _chunks(rows, chunk_rows):
+                if arrow is not None:
+                    yield arrow.encode(chunk)
+                elif format == "csv":
+                    yield encode_csv([[view_id, *row] for row in chunk])
+                else:
+                    yield encode_ndjson(view_id, columns, chunk)
+            if arrow is not None:
+                yield arrow.close()
+        finally:
+            await rows.aclose()
+
+
+class _Cursor:
+    """A view row stream parked between pages."""
+
+    __slots__ = ("rows", "columns", "offset", "pending", "expires_at")
+
+    def __init__(self, rows: AsyncIterator[List[Any]], columns: List[str], offset: int):
+        self.rows = rows
+        self.columns = columns
+        self.offset = offset
+        # Row read ahead to learn whether the view has more rows
+        self.pending: Optional[List[Any]] = None
+        self.expires_at = time.monotonic() + CURSOR_TTL_SECONDS
+
+
+_cursors: "OrderedDict[str, _Cursor]" = OrderedDict()
+
+
+def encode_token(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Raises ValueError for malformed tokens."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return {"view": int(state["view"]), "offset": int(state["offset"]), "cursor": state.get("cursor")}
+    except Exception as e:
+        raise ValueError(f"Invalid continuation token: {e}")
+
+
+async def _close(cursor: _Cursor) -> None:
+    try:
+        await cursor.rows.aclose()
+    except Exception as e:
+        logger.debug(f"Error closing export cursor: {e}")
+
+
+async def _park(cursor_id: str, cursor: _Cursor) -> None:
+    _cursors[cursor_id] = cursor
+    now = time.monotonic()
+    stale = [cid for cid, c in _cursors.items() if c.expires_at <= now]
+    while len(_cursors) - len(stale) > MAX_OPEN_CURSORS:
+        stale.append(next(cid for cid in _cursors if cid not in stale))
+    for cid in stale:
+        await _close(_cursors.pop(cid))
+
+
+async def _open(client, view_id: str, offset: int) -> Optional[_Cursor]:
+    """Start a view's row stream and skip to offset (used when no parked cursor is available).
+
+    Returns None if the view has no rows past offset.
+    """
+    rows = client.iter_view_data_rows(view_id)
+    try:
+        columns = await rows.__anext__()
+        for _ in range(offset):
+            await rows.__anext__()
+        first = await rows.__anext__()
+    except StopAsyncIteration:
+        await rows.aclose()
+        return None
+    cursor = _Cursor(rows, columns, offset)
+    cursor.pending = first
+    return cursor
+
+
+async def read_page(
+    client,
+    view_ids: Sequence[str],
+    format: str = "csv",
+    page_size: int = EXPORT_CHUNK_ROWS,
+    continuation_token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One page of an export. Pages never span views.
+
+    Args:
+        client: TableauClient
+        view_ids: Views to export (pass the same list with every token)
+        format: csv, ndjson or arrow (a complete base64 IPC stream per page)
+        page_size: Maximum rows per page
+        continuation_token: Token from the previous page, None for the first
+
+    Returns:
+        Dict with view_id, columns, row_count, format, content and next_token
+        (None once every view is exhausted)
+
+    Raises:
+        ValueError: For unsupported formats or malformed tokens
+    """
+    format = check_format(format)
+    state = decode_token(continuation_token) if continuation_token else {"view": 0, "offset": 0, "cursor": None}
+    view_index, offset = state["view"], state["offset"]
+
+    cursor = _cursors.pop(state["cursor"], None) if state["cursor"] else None
+    if cursor is not None and cursor.offset != offset:
+        await _close(cursor)
+        cursor = None
+
+    # Skip empty (or vanished) views until one yields rows
+    while cursor is None and view_index < len(view_ids):
+        cursor = await _open(client, view_ids[view_index], offset)
+        if cursor is None:
+            view_index, offset = view_index + 1, 0
+    if cursor is None:
+        return {"view_id": None, "columns": [], "row_count": 0, "format": format, "content": "", "next_token": None}
+
+    rows: List[List[Any]] = [cursor.pending] if cursor.pending is not None else []
+    cursor.pending = None
+    exhausted = False
+    while len(rows) <= page_size:
+        try:
+            rows.append(await cursor.rows.__anext__())
+        except StopAsyncIteration:
+            exhausted = True
+            break
+    if not exhausted:
+        cursor.pending = rows.pop()
+
+    view_id = view_ids[view_index]
+    if format == "csv":
+        content = encode_csv([cursor.columns, *rows]).decode("utf-8")
+    elif format == "ndjson":
+        content = encode_ndjson(view_id, cursor.columns, rows).decode("utf-8")
+    else:
+        encoder = ArrowStreamEncoder(cursor.columns)
+        data = (encoder.encode(rows) if rows else b"") + encoder.close()
+        content = base64.b64encode(data).decode("ascii")
+
+    if exhausted:
+        await _close(cursor)
+        next_state = {"view": view_index + 1, "offset": 0} if view_index + 1 < len(view_ids) else None
+    else:
+        cursor.offset = offset + len(rows)
+        cursor.expires_at = time.monotonic() + CURSOR_TTL_SECONDS
+        cursor_id = uuid.uuid4().hex
+        await _park(cursor_id, cursor)
+        next_state = {"view": view_index, "offset": cursor.offset, "cursor": cursor_id}
+
+    return {
+        "view_id": view_id,
+        "columns": cursor.columns,
+        "row_count": len(rows),
+        "format": format,
+        "content": content,
+        "next_token": encode_token(next_state) if next_state else None,
+    }
+
+
+async def close_cursors() -> None:
+    """Close every parked cursor (shutdown)."""
+    while _cursors:
+        _, cursor = _cursors.popitem()
+        await _close(cursor)
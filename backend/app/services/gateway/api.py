@@ -1,21 +1,21 @@
 """Gateway API endpoints for unified LLM gateway."""
 import json
 import logging
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, AsyncIterator
 import httpx
 from fastapi import APIRouter, HTTPException, Header, Query, Depends, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
-from app.services.gateway.router import resolve_context, get_available_models
+from app.services.gateway.router import ProviderContext, resolve_context, get_available_models
 from app.services.gateway.auth.direct import DirectAuthenticator
-from app.services.gateway.auth.salesforce import SalesforceAuthenticator
-from app.services.gateway.auth.vertex import VertexAuthenticator
-from app.services.gateway.auth.endor import EndorAuthenticator
-from app.services.gateway.translators import get_translator, normalize_response, normalize_stream_chunk
-from app.core.cache import check_cache_health
+from app.services.gateway.auth import registry as auth_registry
+from app.services.gateway.translators import get_translator, normalize_response
+from app.services.gateway import sse, transport as gateway_transport
+from app.core.cache import check_async_cache_health
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.models.user import User, ProviderConfig
 from app.api.auth import get_current_user
 
@@ -86,21 +86,12 @@ async def get_endor_token(
     current_user: User = Depends(get_current_user)
 ):
     """Return a fresh A3 token for Endor. Frontend sends this with chat requests when provider=apple."""
-    config = db.query(ProviderConfig).filter(
-        ProviderConfig.provider_type == "apple_endor",
-        ProviderConfig.is_active == True
-    ).first()
-    if not config or not config.apple_endor_app_id or not config.apple_endor_app_password:
+    config = auth_registry.get_endor_config(db)
+    if not config or not config.app_id or not config.app_password:
         raise HTTPException(status_code=400, detail="Endor not configured")
-    auth = EndorAuthenticator(
-        app_id=config.apple_endor_app_id,
-        app_password=config.apple_endor_app_password,
-        other_app=config.apple_endor_other_app,
-        context=config.apple_endor_context,
-        one_time_token=config.apple_endor_one_time_token or False,
-        db=db
-    )
-    token = await auth.get_token()
+    context = ProviderContext(provider="apple", auth_type="endor_a3", model_name="", config_id=config.id)
+    auth = auth_registry.get_authenticator(context, config)
+    token = await auth_registry.get_token(auth, context)
     return {"token": token}
 
 
@@ -110,7 +101,7 @@ async def health_check(db: Session = Depends(get_db)):
     provider_configs = get_configured_providers(db)
     # Extract provider names for backward compatibility
     providers = [p["provider"] for p in provider_configs]
-    redis_connected = check_cache_health()
+    redis_connected = await check_async_cache_health()
     
     return HealthResponse(
         status="healthy",
@@ -119,180 +110,172 @@ async def health_check(db: Session = Depends(get_db)):
     )
 
 
-@router.post("/v1/chat/completions")
-async def chat_completions(
+@dataclass
+class PreparedCompletion:
+    """A provider request ready to send: translated payload, auth headers and TLS setting."""
+    context: ProviderContext
+    url: str
+    payload: Dict[str, Any]
+    headers: Dict[str, str]
+    verify_ssl: Any = True
+    translator: Any = None
+
+
+async def prepare_completion(
     request: ChatCompletionRequest,
-    authorization: Optional[str] = Header(None, alias="Authorization"),
-    x_apple_idms_a3_token: Optional[str] = Header(None, alias="X-Apple-IDMS-A3-Token"),
-    db: Session = Depends(get_db)
-):
+    db: Session,
+    authorization: Optional[str] = None,
+    a3_token: Optional[str] = None
+) -> PreparedCompletion:
     """
-    OpenAI-compatible chat completions endpoint.
+    Resolve the provider, authenticate and translate the request.
     
-    Routes requests to appropriate provider based on model name.
+    Raises:
+        HTTPException: For configuration/auth problems
+        ValueError: For unknown models or providers
     """
-    try:
-        logger.info(f"Gateway received chat completion request: provider={request.provider}, model={request.model}, messages={len(request.messages)}, stream={request.stream}, has_functions={bool(request.functions)}, max_tokens={request.max_tokens}")
-        # Resolve provider context
-        context = resolve_context(request.model, request.provider)
-        logger.info(f"Resolved context: provider={context.provider}, auth_type={context.auth_type}, model_name={context.model_name}, endpoint={context.endpoint}")
+    # Resolve provider context
+    context = resolve_context(request.model, request.provider)
+    logger.info(f"Resolved context: provider={context.provider}, auth_type={context.auth_type}, model_name={context.model_name}, endpoint={context.endpoint}")
+    
+    # Get authenticator and token; request_verify_ssl for outbound HTTP (Endor corp certs)
+    app_id = None  # For Endor
+    request_verify_ssl = True
+    if context.auth_type == "direct":
+        authenticator = DirectAuthenticator()
+        token = await authenticator.get_token(authorization, context, db=db)
+    elif context.auth_type in ("jwt_oauth", "service_account"):
+        # Shared authenticator; the token is normally already held and refreshed in the background
+        authenticator = auth_registry.get_authenticator(context)
+        token = await auth_registry.get_token(authenticator, context)
+    elif context.auth_type == "endor_a3":
+        endor_config = auth_registry.get_endor_config(db)
         
-        # Get authenticator and token; request_verify_ssl for outbound HTTP (Endor corp certs)
-        app_id = None  # For Endor
-        request_verify_ssl = True
-        if context.auth_type == "direct":
-            authenticator = DirectAuthenticator()
-            token = await authenticator.get_token(authorization, context, db=db)
-        elif context.auth_type == "jwt_oauth":
-            authenticator = SalesforceAuthenticator(
-                client_id=context.client_id,
-                private_key_path=context.private_key_path,
-                username=context.username
-            )
-            token = await authenticator.get_token(authorization, context)
-        elif context.auth_type == "service_account":
-            authenticator = VertexAuthenticator(
-                project_id=context.project_id,
-                location=context.location,
-                service_account_path=context.credentials_path
-            )
-            token = await authenticator.get_token(authorization, context)
-        elif context.auth_type == "endor_a3":
-            endor_config = db.query(ProviderConfig).filter(
-                ProviderConfig.provider_type == "apple_endor",
-                ProviderConfig.is_active == True
-            ).first()
-            
-            if not endor_config:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Endor provider configuration not found"
-                )
-            
-            authenticator = EndorAuthenticator(
-                app_id=endor_config.apple_endor_app_id,
-                app_password=endor_config.apple_endor_app_password,
-                other_app=endor_config.apple_endor_other_app,
-                context=endor_config.apple_endor_context,
-                one_time_token=endor_config.apple_endor_one_time_token or False,
-                verify_ssl=getattr(endor_config, 'apple_endor_verify_ssl', None),
-                db=db
-            )
-            # Use optional frontend-passed A3 token, or generate from app_id+app_password
-            token = await authenticator.get_token(authorization, context, optional_a3_token=x_apple_idms_a3_token)
-            app_id = authenticator.get_app_id()
-            request_verify_ssl = getattr(endor_config, 'apple_endor_verify_ssl', None)
-            if request_verify_ssl is None:
-                request_verify_ssl = getattr(settings, "APPLE_ENDOR_VERIFY_SSL", True)
-        else:
+        if not endor_config:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported auth type: {context.auth_type}"
+                detail="Endor provider configuration not found"
             )
         
-        # Get translator
-        translator = get_translator(context.provider, context)
-        
-        # Transform request
-        request_dict = request.model_dump(exclude_none=True)
-        url, payload, headers = translator.transform_request(request_dict, context)
-        
-        # Add authorization header
-        if context.auth_type == "endor_a3":
-            # Endor uses custom headers - ensure we have valid values
-            app_id_str = str(app_id).strip() if app_id else ""
-            token_str = str(token).strip() if token else ""
-            if not app_id_str or not token_str:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Endor auth failed: missing token or app_id (app_id={'present' if app_id_str else 'missing'}, token={'present' if token_str else 'missing'})"
-                )
-            headers["X-Apple-Client-App-ID"] = app_id_str
-            headers["X-Apple-IDMS-A3-Token"] = token_str
-            logger.info(f"Endor request: app_id={app_id_str[:8]}..., token_len={len(token_str)}")
-        elif context.auth_type == "direct":
-            headers["Authorization"] = f"Bearer {token}"
+        authenticator = auth_registry.get_authenticator(context, endor_config)
+        # Use optional frontend-passed A3 token, or the shared one generated from app_id+app_password
+        if a3_token and str(a3_token).strip():
+            token = str(a3_token).strip()
         else:
-            headers["Authorization"] = f"Bearer {token}"
+            token = await auth_registry.get_token(authenticator, context)
+        app_id = authenticator.get_app_id()
+        request_verify_ssl = endor_config.verify_ssl
+        if request_verify_ssl is None:
+            request_verify_ssl = getattr(settings, "APPLE_ENDOR_VERIFY_SSL", True)
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported auth type: {context.auth_type}"
+        )
+    
+    # Get translator
+    translator = get_translator(context.provider, context)
+    
+    # Transform request
+    request_dict = request.model_dump(exclude_none=True)
+    url, payload, headers = translator.transform_request(request_dict, context)
+    
+    # Add authorization header
+    if context.auth_type == "endor_a3":
+        # Endor uses custom headers - ensure we have valid values
+        app_id_str = str(app_id).strip() if app_id else ""
+        token_str = str(token).strip() if token else ""
+        if not app_id_str or not token_str:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Endor auth failed: missing token or app_id (app_id={'present' if app_id_str else 'missing'}, token={'present' if token_str else 'missing'})"
+            )
+        headers["X-Apple-Client-App-ID"] = app_id_str
+        headers["X-Apple-IDMS-A3-Token"] = token_str
+        logger.info(f"Endor request: app_id={app_id_str[:8]}..., token_len={len(token_str)}")
+    elif context.auth_type == "direct":
+        headers["Authorization"] = f"Bearer {token}"
+    else:
+        headers["Authorization"] = f"Bearer {token}"
+    
+    return PreparedCompletion(
+        context=context,
+        url=url,
+        payload=payload,
+        headers=headers,
+        verify_ssl=request_verify_ssl,
+        translator=translator
+    )
+
+
+async def complete(prepared: PreparedCompletion) -> Dict[str, Any]:
+    """Send a non-streaming request to the provider and return the normalized response."""
+    client = gateway_transport.get_client(prepared.context.provider, prepared.url, prepared.verify_ssl)
+    response = await client.post(prepared.url, json=prepared.payload, headers=prepared.headers)
+    response.raise_for_status()
+    response_data = response.json()
+    
+    # Normalize response
+    return normalize_response(
+        response_data,
+        prepared.context.provider,
+        prepared.context
+    )
+
+
+async def stream_completion(prepared: PreparedCompletion) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a request to the provider, yielding normalized OpenAI-format chunks.
+    
+    Each upstream chunk is parsed once and normalized by the request's translator.
+    """
+    context = prepared.context
+    normalize = prepared.translator.normalize_stream_chunk
+    client = gateway_transport.get_client(context.provider, prepared.url, prepared.verify_ssl)
+    async with client.stream(
+        "POST",
+        prepared.url,
+        json=prepared.payload,
+        headers=prepared.headers
+    ) as response:
+        response.raise_for_status()
         
-        # Make request to provider
-        if request.stream:
-            # Streaming response
-            async def generate_stream():
-                async with httpx.AsyncClient(timeout=60.0, verify=request_verify_ssl) as client:
-                    async with client.stream(
-                        "POST",
-                        url,
-                        json=payload,
-                        headers=headers
-                    ) as response:
-                        response.raise_for_status()
-                        
-                        line_count = 0
-                        chunk_count = 0
-                        logger.info(f"Starting to read stream from {context.provider} provider")
-                        async for line in response.aiter_lines():
-                            line_count += 1
-                            if not line.strip():
-                                continue
-                            
-                            logger.info(f"Gateway received SSE line {line_count}: {line[:200]}")
-                            
-                            # Handle SSE format
-                            if line.startswith("data: "):
-                                data_str = line[6:]
-                                if data_str.strip() == "[DONE]":
-                                    logger.info("Gateway received [DONE] marker")
-                                    yield "data: [DONE]\n\n"
-                                    break
-                                
-                                try:
-                                    import json
-                                    chunk_data = json.loads(data_str)
-                                    logger.info(f"Gateway parsed chunk {chunk_count + 1}: {json.dumps(chunk_data)[:300]}")
-                                    normalized = normalize_stream_chunk(
-                                        chunk_data,
-                                        context.provider,
-                                        context
-                                    )
-                                    logger.info(f"Gateway normalized chunk {chunk_count + 1}: {json.dumps(normalized)[:300]}")
-                                    chunk_count += 1
-                                    yield f"data: {json.dumps(normalized)}\n\n"
-                                except Exception as e:
-                                    logger.error(f"Error processing stream chunk: {e}", exc_info=True)
-                                    continue
-                            else:
-                                logger.info(f"Gateway non-data line {line_count}: {line[:100]}")
-                        
-                        logger.info(f"Gateway stream complete: {line_count} lines processed, {chunk_count} chunks yielded")
+        chunk_count = 0
+        logger.debug(f"Starting to read stream from {context.provider} provider")
+        async for line in response.aiter_lines():
+            data_str = sse.data_payload(line)
+            if not data_str:
+                continue
+            if data_str == "[DONE]":
+                break
             
-            return StreamingResponse(
-                generate_stream(),
-                media_type="text/event-stream"
-            )
-        else:
-            # Non-streaming response
-            async with httpx.AsyncClient(timeout=60.0, verify=request_verify_ssl) as client:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                
-                # Normalize response
-                normalized = normalize_response(
-                    response_data,
-                    context.provider,
-                    context
-                )
-                
-                return normalized
-                
-    except ValueError as e:
+            try:
+                normalized = normalize(sse.loads(data_str), context)
+            except Exception as e:
+                logger.error(f"Error processing stream chunk: {e}", exc_info=True)
+                continue
+            chunk_count += 1
+            if sse.should_log_chunk(logger, chunk_count):
+                logger.debug(f"Gateway chunk {chunk_count} from {context.provider}: {data_str[:300]}")
+            yield normalized
+        
+        logger.info(f"Gateway stream complete: {context.provider}, {chunk_count} chunks")
+
+
+def gateway_error(
+    e: Exception,
+    request: ChatCompletionRequest,
+    payload: Optional[Dict[str, Any]] = None
+) -> HTTPException:
+    """Map an exception from the completion pipeline to the HTTPException the endpoint returns."""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ValueError):
         logger.error(f"ValueError in chat_completions: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-    except httpx.HTTPStatusError as e:
+        return HTTPException(status_code=400, detail=str(e))
+    if isinstance(e, httpx.HTTPStatusError):
         error_text = e.response.text
         logger.error(f"Provider API error: {e.response.status_code} - {error_text}")
-        if "contents cannot be empty" in error_text:
+        if "contents cannot be empty" in error_text and payload:
             try:
                 summary = []
                 for m in payload.get("messages", []):
@@ -309,7 +292,6 @@ async def chat_completions(
         if "functions is not supported" in error_text.lower() or "function calling" in error_text.lower():
             # Try to parse the error to get model name
             try:
-                import json
                 error_data = json.loads(error_text)
                 model_name = request.model
                 error_detail = (
@@ -317,43 +299,133 @@ async def chat_completions(
                     f"Please select a different model that supports function calling. "
                     f"Error: {error_data.get('error', {}).get('message', error_text[:200])}"
                 )
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
+            except (json.JSONDecodeError, KeyError, TypeError) as parse_error:
                 # Expected errors when parsing error response JSON - use fallback
-                logger.debug(f"Could not parse error response JSON: {e}")
+                logger.debug(f"Could not parse error response JSON: {parse_error}")
                 error_detail = (
                     f"The selected model '{request.model}' does not support function calling. "
                     f"Please select a different model. Error: {error_text[:200]}"
                 )
-            except Exception as e:
+            except Exception as parse_error:
                 # Log unexpected errors but use fallback
-                logger.warning(f"Unexpected error parsing error response: {e}", exc_info=True)
+                logger.warning(f"Unexpected error parsing error response: {parse_error}", exc_info=True)
                 error_detail = (
                     f"The selected model '{request.model}' does not support function calling. "
                     f"Please select a different model. Error: {error_text[:200]}"
                 )
-            raise HTTPException(
+            return HTTPException(
                 status_code=400,
                 detail=error_detail
             )
         
-        raise HTTPException(
+        return HTTPException(
             status_code=e.response.status_code,
             detail=f"Provider API error: {error_text[:200]}"
         )
-    except httpx.RequestError as e:
+    if isinstance(e, httpx.RequestError):
         logger.error(f"Network error: {e}")
-        raise HTTPException(
+        return HTTPException(
             status_code=503,
             detail=f"Network error connecting to provider: {str(e)}"
         )
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=500, detail=f"Configuration error: {str(e)}")
+    if isinstance(e, FileNotFoundError):
+        return HTTPException(status_code=500, detail=f"Configuration error: {str(e)}")
+    logger.error(f"Unexpected error: {e}", exc_info=True)
+    return HTTPException(
+        status_code=500,
+        detail=f"Internal gateway error: {str(e)}"
+    )
+
+
+@router.post("/v1/chat/completions")
+async def chat_completions(
+    request: ChatCompletionRequest,
+    authorization: Optional[str] = Header(None, alias="Authorization"),
+    x_apple_idms_a3_token: Optional[str] = Header(None, alias="X-Apple-IDMS-A3-Token"),
+    db: Session = Depends(get_db)
+):
+    """
+    OpenAI-compatible chat completions endpoint.
+    
+    Routes requests to appropriate provider based on model name.
+    In-process callers use prepare_completion/complete/stream_completion directly.
+    """
+    prepared = None
+    try:
+        logger.info(f"Gateway received chat completion request: provider={request.provider}, model={request.model}, messages={len(request.messages)}, stream={request.stream}, has_functions={bool(request.functions)}, max_tokens={request.max_tokens}")
+        prepared = await prepare_completion(request, db, authorization, x_apple_idms_a3_token)
+        
+        # Make request to provider
+        if request.stream:
+            # Streaming response
+            # Chunks are encoded straight to SSE bytes, once each
+            async def generate_stream():
+                async for chunk in stream_completion(prepared):
+                    yield sse.encode_event(chunk)
+                yield sse.DONE_EVENT
+            
+            return StreamingResponse(
+                generate_stream(),
+                media_type="text/event-stream"
+            )
+        else:
+            # Non-streaming response
+            return await complete(prepared)
+                
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal gateway error: {str(e)}"
-        )
+        raise gateway_error(e, request, prepared.payload if prepared else None)
+
+
+async def _prepare_inprocess(payload: Dict[str, Any]) -> tuple[ChatCompletionRequest, PreparedCompletion]:
+    request = ChatCompletionRequest(**payload)
+    db = SessionLocal()
+    try:
+        return request, await prepare_completion(request, db)
+    finally:
+        db.close()
+
+
+async def complete_inprocess(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a chat completion without going through HTTP (used by UnifiedAIClient).
+    
+    Args:
+        payload: Same body as POST /v1/chat/completions
+    
+    Returns:
+        Normalized OpenAI-format response
+    
+    Raises:
+        HTTPException: With the status and detail the endpoint would return
+    """
+    request = None
+    prepared = None
+    try:
+        request, prepared = await _prepare_inprocess(payload)
+        return await complete(prepared)
+    except Exception as e:
+        if request is None:
+            raise HTTPException(status_code=422, detail=str(e))
+        raise gateway_error(e, request, prepared.payload if prepared else None)
+
+
+async def stream_inprocess(payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a chat completion without going through HTTP, yielding normalized chunks.
+    
+    Raises:
+        HTTPException: With the status and detail the endpoint would return
+    """
+    request = None
+    prepared = None
+    try:
+        request, prepared = await _prepare_inprocess(payload)
+        async for chunk in stream_completion(prepared):
+            yield chunk
+    except Exception as e:
+        if request is None:
+            raise HTTPException(status_code=422, detail=str(e))
+        raise gateway_error(e, request, prepared.payload if prepared else None)
 
 
 @router.get("/providers")
@@ -540,84 +612,84 @@ async def fetch_openai_models(authorization: Optional[str] = None) -> list[str]:
     
     logger.info(f"Fetching OpenAI models from {url}")
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+    client = gateway_transport.get_client("openai", url)
+    try:
+        response = await client.get(url, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        data = response.json()
+        
+        total_models = len(data.get("data", []))
+        logger.info(f"OpenAI API returned {total_models} total models")
+        
+        # Filter for chat completion models
+        # Strategy: Be inclusive - include all models except clearly non-chat ones
+        # Only exclude: embeddings, audio, image, deprecated, and legacy completion models
+        
+        excluded_prefixes = (
+            "ada-", "babbage-", "curie-", "davinci-",  # Legacy completion models (not chat)
+            "text-ada-", "text-babbage-", "text-curie-", "text-davinci-",  # Legacy text completion
+            "embedding-",  # Embedding models
+            "ft:",  # Fine-tuned base models (not the fine-tuned model itself)
+            "whisper-",  # Audio transcription models
+            "tts-",  # Text-to-speech models
+            "dall-e-",  # Image generation models
+        )
+        excluded_suffixes = ("-deprecated",)  # Only exclude explicitly deprecated
+        excluded_exact = ("davinci", "curie", "babbage", "ada")  # Legacy base models only
+        
+        models = []
+        excluded_models = []
+        included_by_pattern = {"gpt": [], "o1": [], "o3": [], "other": []}
+        
+        for model in data.get("data", []):
+            model_id = model["id"]
+            model_object = model.get("object", "")
             
-            total_models = len(data.get("data", []))
-            logger.info(f"OpenAI API returned {total_models} total models")
+            # Skip excluded prefixes (clearly non-chat models)
+            if any(model_id.startswith(prefix) for prefix in excluded_prefixes):
+                excluded_models.append(model_id)
+                continue
             
-            # Filter for chat completion models
-            # Strategy: Be inclusive - include all models except clearly non-chat ones
-            # Only exclude: embeddings, audio, image, deprecated, and legacy completion models
+            # Skip excluded suffixes (deprecated)
+            if any(model_id.endswith(suffix) for suffix in excluded_suffixes):
+                excluded_models.append(model_id)
+                continue
             
-            excluded_prefixes = (
-                "ada-", "babbage-", "curie-", "davinci-",  # Legacy completion models (not chat)
-                "text-ada-", "text-babbage-", "text-curie-", "text-davinci-",  # Legacy text completion
-                "embedding-",  # Embedding models
-                "ft:",  # Fine-tuned base models (not the fine-tuned model itself)
-                "whisper-",  # Audio transcription models
-                "tts-",  # Text-to-speech models
-                "dall-e-",  # Image generation models
-            )
-            excluded_suffixes = ("-deprecated",)  # Only exclude explicitly deprecated
-            excluded_exact = ("davinci", "curie", "babbage", "ada")  # Legacy base models only
+            # Skip exact matches (legacy base models)
+            if model_id.lower() in excluded_exact:
+                excluded_models.append(model_id)
+                continue
             
-            models = []
-            excluded_models = []
-            included_by_pattern = {"gpt": [], "o1": [], "o3": [], "other": []}
+            # Include the model - be inclusive!
+            models.append(model_id)
             
-            for model in data.get("data", []):
-                model_id = model["id"]
-                model_object = model.get("object", "")
-                
-                # Skip excluded prefixes (clearly non-chat models)
-                if any(model_id.startswith(prefix) for prefix in excluded_prefixes):
-                    excluded_models.append(model_id)
-                    continue
-                
-                # Skip excluded suffixes (deprecated)
-                if any(model_id.endswith(suffix) for suffix in excluded_suffixes):
-                    excluded_models.append(model_id)
-                    continue
-                
-                # Skip exact matches (legacy base models)
-                if model_id.lower() in excluded_exact:
-                    excluded_models.append(model_id)
-                    continue
-                
-                # Include the model - be inclusive!
-                models.append(model_id)
-                
-                # Track by pattern for logging
-                if model_id.startswith("gpt-"):
-                    included_by_pattern["gpt"].append(model_id)
-                elif model_id.startswith("o1-"):
-                    included_by_pattern["o1"].append(model_id)
-                elif model_id.startswith("o3-"):
-                    included_by_pattern["o3"].append(model_id)
-                else:
-                    included_by_pattern["other"].append(model_id)
-            
-            logger.info(f"Filtered to {len(models)} models from OpenAI API")
-            logger.info(f"  GPT models: {len(included_by_pattern['gpt'])}")
-            logger.info(f"  O1 models: {len(included_by_pattern['o1'])}")
-            logger.info(f"  O3 models: {len(included_by_pattern['o3'])}")
-            logger.info(f"  Other models: {len(included_by_pattern['other'])}")
-            if included_by_pattern["other"]:
-                logger.info(f"  Other models list: {included_by_pattern['other']}")
-            logger.debug(f"Excluded {len(excluded_models)} models. Sample: {excluded_models[:10]}")
-            
-            # Sort and return
-            return sorted(models)
-        except httpx.HTTPStatusError as e:
-            logger.error(f"OpenAI API returned error {e.response.status_code}: {e.response.text}")
-            raise
-        except Exception as e:
-            logger.error(f"Error fetching OpenAI models: {e}", exc_info=True)
-            raise
+            # Track by pattern for logging
+            if model_id.startswith("gpt-"):
+                included_by_pattern["gpt"].append(model_id)
+            elif model_id.startswith("o1-"):
+                included_by_pattern["o1"].append(model_id)
+            elif model_id.startswith("o3-"):
+                included_by_pattern["o3"].append(model_id)
+            else:
+                included_by_pattern["other"].append(model_id)
+        
+        logger.info(f"Filtered to {len(models)} models from OpenAI API")
+        logger.info(f"  GPT models: {len(included_by_pattern['gpt'])}")
+        logger.info(f"  O1 models: {len(included_by_pattern['o1'])}")
+        logger.info(f"  O3 models: {len(included_by_pattern['o3'])}")
+        logger.info(f"  Other models: {len(included_by_pattern['other'])}")
+        if included_by_pattern["other"]:
+            logger.info(f"  Other models list: {included_by_pattern['other']}")
+        logger.debug(f"Excluded {len(excluded_models)} models. Sample: {excluded_models[:10]}")
+        
+        # Sort and return
+        return sorted(models)
+    except httpx.HTTPStatusError as e:
+        logger.error(f"OpenAI API returned error {e.response.status_code}: {e.response.text}")
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching OpenAI models: {e}", exc_info=True)
+        raise
 
 
 async def fetch_anthropic_models(authorization: Optional[str] = None) -> list[str]:
@@ -714,19 +786,12 @@ async def fetch_endor_models(authorization: Optional[str] = None, db: Optional[S
                 "Endor App Password not configured. Edit this config and enter the App Password, then save."
             )
         
-        from app.services.gateway.auth.endor import EndorAuthenticator
-        from app.services.gateway.router import ProviderContext
-        authenticator = EndorAuthenticator(
-            app_id=provider_config.apple_endor_app_id,
-            app_password=provider_config.apple_endor_app_password,
-            other_app=provider_config.apple_endor_other_app,
-            context=provider_config.apple_endor_context,
-            one_time_token=provider_config.apple_endor_one_time_token or False,
-            verify_ssl=getattr(provider_config, 'apple_endor_verify_ssl', None),
-            db=db
-        )
         ctx = ProviderContext(provider="apple", auth_type="endor_a3", model_name="", config_id=provider_config.id)
-        a3_token = await authenticator.get_token(optional_a3_token=optional_a3_token, context=ctx)
+        authenticator = auth_registry.get_authenticator(ctx, auth_registry.EndorConfig.from_model(provider_config))
+        if optional_a3_token and str(optional_a3_token).strip():
+            a3_token = str(optional_a3_token).strip()
+        else:
+            a3_token = await auth_registry.get_token(authenticator, ctx)
         app_id = authenticator.get_app_id()
         
         # Validate token and app_id before request
@@ -753,54 +818,54 @@ async def fetch_endor_models(authorization: Optional[str] = None, db: Optional[S
             verify_ssl = getattr(settings, "APPLE_ENDOR_VERIFY_SSL", True)
         logger.info(f"Fetching Endor models from {url} (app_id={app_id_str[:8]}..., token_len={len(token_str)}, verify_ssl={verify_ssl})")
         
-        async with httpx.AsyncClient(timeout=30.0, verify=verify_ssl) as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                
-                logger.debug(f"Endor API response structure: {type(data)}, keys: {list(data.keys()) if isinstance(data, dict) else 'N/A'}")
-                
-                # Parse models from response
-                # Endor completions API expects model_id in payload. Prefer model_id over id
-                # (id may be UUID; model_id is the actual completions identifier).
-                models = []
-                models_list = None
-                if isinstance(data, dict):
-                    if "models" in data:
-                        models_list = data["models"]
-                    elif "data" in data and isinstance(data["data"], list):
-                        models_list = data["data"]
-                    elif "model" in data:
-                        models_list = [data["model"]] if isinstance(data["model"], (dict, str)) else data["model"]
-                elif isinstance(data, list):
-                    models_list = data
-
-                if models_list:
-                    if models_list and isinstance(models_list[0], dict):
-                        logger.info(f"Endor first model payload keys: {list(models_list[0].keys())}")
-                    for model in models_list:
-                        if isinstance(model, dict):
-                            # Prefer model_id (completions field) over id (may be UUID)
-                            model_id = model.get("model_id") or model.get("id") or model.get("name")
-                            if model_id:
-                                models.append(model_id)
-                        elif isinstance(model, str):
-                            models.append(model)
-                
-                logger.info(f"Endor API returned {len(models)} models: {models}")
-                if not models:
-                    logger.warning(f"Endor API response parsed but no models found. Raw response: {data}")
-                return sorted(models) if models else []
-                
-            except httpx.HTTPStatusError as e:
-                error_text = e.response.text[:500] if hasattr(e.response, 'text') else str(e)
-                logger.error(f"Endor API returned error {e.response.status_code}: {error_text}")
-                logger.error(f"Request URL: {url}")
-                raise
-            except Exception as e:
-                logger.error(f"Failed to fetch Endor models: {type(e).__name__}: {e}", exc_info=True)
-                raise
+        client = gateway_transport.get_client("apple", url, verify_ssl)
+        try:
+            response = await client.get(url, headers=headers, timeout=30.0)
+            response.raise_for_status()
+            data = response.json()
+            
+            logger.debug(f"Endor API response structure: {type(data)}, keys: {list(data.keys()) if isinstance(data, dict) else 'N/A'}")
+            
+            # Parse models from response
+            # Endor completions API expects model_id in payload. Prefer model_id over id
+            # (id may be UUID; model_id is the actual completions identifier).
+            models = []
+            models_list = None
+            if isinstance(data, dict):
+                if "models" in data:
+                    models_list = data["models"]
+                elif "data" in data and isinstance(data["data"], list):
+                    models_list = data["data"]
+                elif "model" in data:
+                    models_list = [data["model"]] if isinstance(data["model"], (dict, str)) else data["model"]
+            elif isinstance(data, list):
+                models_list = data
+
+            if models_list:
+                if models_list and isinstance(models_list[0], dict):
+                    logger.info(f"Endor first model payload keys: {list(models_list[0].keys())}")
+                for model in models_list:
+                    if isinstance(model, dict):
+                        # Prefer model_id (completions field) over id (may be UUID)
+                        model_id = model.get("model_id") or model.get("id") or model.get("name")
+                        if model_id:
+                            models.append(model_id)
+                    elif isinstance(model, str):
+                        models.append(model)
+            
+            logger.info(f"Endor API returned {len(models)} models: {models}")
+            if not models:
+                logger.warning(f"Endor API response parsed but no models found. Raw response: {data}")
+            return sorted(models) if models else []
+            
+        except httpx.HTTPStatusError as e:
+            error_text = e.response.text[:500] if hasattr(e.response, 'text') else str(e)
+            logger.error(f"Endor API returned error {e.response.status_code}: {error_text}")
+            logger.error(f"Request URL: {url}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to fetch Endor models: {type(e).__name__}: {e}", exc_info=True)
+            raise
     finally:
         if should_close:
             db.close()
@@ -19,6 +19,8 @@ TOKEN_BUFFER_SECONDS = 300  # 5 minute buffer before expiration
 class EndorAuthenticator:
     """Authenticator for Apple Endor A3 token authentication."""
     
+    provider_name = "endor"
+    
     def __init__(
         self,
         app_id: Optional[str] = None,
@@ -158,6 +160,28 @@ class EndorAuthenticator:
                 "expires_at": expires_at
             }
     
+    def token_identifier(self, context: Optional[ProviderContext] = None) -> str:
+        """Token cache identifier (the App ID)."""
+        return str(self.app_id) if self.app_id else "default"
+    
+    async def fetch_token(self) -> Dict[str, Any]:
+        """Request a new A3 token, bypassing the cache.
+        
+        Returns:
+            Dict with 'token', 'expires_at' and 'metadata'
+        """
+        logger.info("Generating new Endor A3 token")
+        token_data = await self._generate_a3_token()
+        return {
+            "token": token_data["token"],
+            "expires_at": token_data["expires_at"],
+            "metadata": {
+                "app_id": self.app_id,
+                "other_app": self.other_app,
+                "context": self.context
+            }
+        }
+    
     async def get_token(
         self,
         auth_header: Optional[str] = None,
@@ -190,35 +214,24 @@ class EndorAuthenticator:
             self._load_config_from_db(config_id)
         
         # Use app_id as cache identifier (ensure string)
-        identifier = str(self.app_id) if self.app_id else "default"
+        identifier = self.token_identifier(context)
         
         # Check cache first
-        cached = token_cache.get("endor", identifier)
+        cached = await token_cache.get("endor", identifier)
         if cached:
             logger.debug("Using cached Endor A3 token")
             return cached["token"]
         
         # Generate new token from app_id+app_password
-        logger.info("Generating new Endor A3 token")
-        token_data = await self._generate_a3_token()
-        
-        access_token = token_data["token"]
-        expires_at = token_data["expires_at"]
-        
-        # Cache token
-        token_cache.set(
+        token_data = await self.fetch_token()
+        await token_cache.set(
             provider="endor",
             identifier=identifier,
-            token=access_token,
-            expires_at=expires_at,
-            metadata={
-                "app_id": self.app_id,
-                "other_app": self.other_app,
-                "context": self.context
-            }
+            token=token_data["token"],
+            expires_at=token_data["expires_at"],
+            metadata=token_data["metadata"]
         )
-        
-        return access_token
+        return token_data["token"]
     
     async def refresh_token(
         self,
@@ -235,8 +248,7 @@ class EndorAuthenticator:
             New A3 token
         """
         # Clear cache and get new token
-        identifier = str(self.app_id) if self.app_id else "default"
-        token_cache.delete("endor", identifier)
+        await token_cache.delete("endor", self.token_identifier(context))
         return await self.get_token(auth_header, context)
     
     def get_app_id(self) -> Optional[str]:
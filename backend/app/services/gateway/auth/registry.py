@@ -0,0 +1,331 @@
+"""Process-level authenticator registry with proactive token refresh.
+
+Building a Salesforce, Vertex or Endor authenticator per completion re-reads
+key files and queries ProviderConfig, and any request that lands on an expired
+token waits for the OAuth round trip. The gateway instead takes long-lived
+authenticators from this registry, which:
+
+- keeps one authenticator per provider configuration, so parsed private keys
+  and service account credentials are reused;
+- holds a local copy of each token and shares tokens between processes
+  through TokenCache (Redis);
+- coalesces concurrent fetches of the same token into one call (single-flight);
+- refreshes tokens in the background shortly before they would enter
+  TokenCache's expiry buffer, so requests normally never wait for a fetch.
+
+Futures and refresh tasks are bound to the event loop that created them, so
+those entries are scoped to the running loop.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import ProviderConfig
+from app.services.gateway.auth.endor import EndorAuthenticator
+from app.services.gateway.auth.salesforce import SalesforceAuthenticator
+from app.services.gateway.auth.vertex import VertexAuthenticator
+from app.services.gateway.cache import TOKEN_BUFFER_MINUTES, token_cache
+from app.services.gateway.router import ProviderContext
+
+logger = logging.getLogger(__name__)
+
+# Minimum gap between background refresh attempts for one token
+REFRESH_RETRY_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class EndorConfig:
+    """Detached snapshot of the active apple_endor ProviderConfig."""
+    id: int
+    app_id: Optional[str]
+    app_password: Optional[str]
+    other_app: Optional[int]
+    context: Optional[str]
+    one_time_token: bool
+    verify_ssl: Optional[bool]
+    endpoint: Optional[str]
+
+    @classmethod
+    def from_model(cls, config: ProviderConfig) -> "EndorConfig":
+        return cls(
+            id=config.id,
+            app_id=config.apple_endor_app_id,
+            app_password=config.apple_endor_app_password,
+            other_app=config.apple_endor_other_app,
+            context=config.apple_endor_context,
+            one_time_token=config.apple_endor_one_time_token or False,
+            verify_ssl=getattr(config, "apple_endor_verify_ssl", None),
+            endpoint=config.apple_endor_endpoint,
+        )
+
+
+@dataclass
+class _Token:
+    token: str
+    expires_at: datetime
+    last_refresh_attempt: float = 0.0
+
+    def usable(self, now: datetime) -> bool:
+        """Same rule as TokenCache: unusable once inside the expiry buffer."""
+        return now < self.expires_at - timedelta(minutes=TOKEN_BUFFER_MINUTES)
+
+    def due_for_refresh(self, now: datetime) -> bool:
+        lead = timedelta(minutes=TOKEN_BUFFER_MINUTES, seconds=settings.GATEWAY_TOKEN_REFRESH_LEAD_SECONDS)
+        return now >= self.expires_at - lead
+
+
+# config key -> authenticator
+_authenticators: Dict[Tuple[Any, ...], Any] = {}
+# (provider, identifier) -> local token copy
+_tokens: Dict[Tuple[str, str], _Token] = {}
+# (loop, provider, identifier) -> in-flight fetch / background refresh
+_inflight: Dict[Tuple[Any, str, str], asyncio.Future] = {}
+_refresh_tasks: Dict[Tuple[Any, str, str], asyncio.Task] = {}
+# (loaded_at, snapshot) of the active Endor config
+_endor_config: Optional[Tuple[float, Optional[EndorConfig]]] = None
+_stats: Dict[str, int] = {
+    "local_hits": 0,
+    "shared_hits": 0,
+    "fetches": 0,
+    "coalesced": 0,
+    "background_refreshes": 0,
+    "refresh_failures": 0,
+}
+
+
+def get_endor_config(db: Optional[Session] = None) -> Optional[EndorConfig]:
+    """Active Endor config, re-read from the database at most every GATEWAY_PROVIDER_CONFIG_TTL seconds.
+
+    Args:
+        db: Optional session; a short-lived one is opened if omitted
+
+    Returns:
+        Config snapshot, or None if no active apple_endor config exists
+    """
+    global _endor_config
+    if _endor_config is not None and time.monotonic() - _endor_config[0] < settings.GATEWAY_PROVIDER_CONFIG_TTL:
+        return _endor_config[1]
+
+    owns_session = db is None
+    if owns_session:
+        from app.core.database import SessionLocal
+        db = SessionLocal()
+    try:
+        config = db.query(ProviderConfig).filter(
+            ProviderConfig.provider_type == "apple_endor",
+            ProviderConfig.is_active == True
+        ).first()
+        snapshot = EndorConfig.from_model(config) if config else None
+    finally:
+        if owns_session:
+            db.close()
+
+    _endor_config = (time.monotonic(), snapshot)
+    return snapshot
+
+
+def invalidate_provider_configs() -> None:
+    """Drop cached provider configs (call after ProviderConfig rows change)."""
+    global _endor_config
+    _endor_config = None
+
+
+def get_authenticator(context: ProviderContext, endor_config: Optional[EndorConfig] = None):
+    """Shared authenticator for a resolved provider context.
+
+    Args:
+        context: Resolved provider context (jwt_oauth, service_account or endor_a3)
+        endor_config: Endor config snapshot, required for endor_a3
+
+    Returns:
+        Authenticator instance owned by the registry
+
+    Raises:
+        ValueError: For unsupported auth types or missing configuration
+    """
+    if context.auth_type == "jwt_oauth":
+        key = ("jwt_oauth", context.client_id, context.private_key_path, context.username)
+        factory = lambda: SalesforceAuthenticator(
+            client_id=context.client_id,
+            private_key_path=context.private_key_path,
+            username=context.username
+        )
+    elif context.auth_type == "service_account":
+        key = ("service_account", context.project_id, context.location, context.credentials_path)
+        factory = lambda: VertexAuthenticator(
+            project_id=context.project_id,
+            location=context.location,
+            service_account_path=context.credentials_path
+        )
+    elif context.auth_type == "endor_a3":
+        if endor_config is None:
+            raise ValueError("Endor provider configuration not found")
+        key = ("endor_a3", endor_config)
+        factory = lambda: EndorAuthenticator(
+            app_id=endor_config.app_id,
+            app_password=endor_config.app_password,
+            other_app=endor_config.other_app,
+            context=endor_config.context,
+            one_time_token=endor_config.one_time_token,
+            verify_ssl=endor_config.verify_ssl
+        )
+    else:
+        raise ValueError(f"No shared authenticator for auth type: {context.auth_type}")
+
+    authenticator = _authenticators.get(key)
+    if authenticator is None:
+        authenticator = _authenticators[key] = factory()
+    return authenticator
+
+
+def _adopt(key: Tuple[str, str], token: str, expires_at: datetime) -> _Token:
+    entry = _tokens.get(key)
+    if entry is None or expires_at >= entry.expires_at:
+        entry = _tokens[key] = _Token(token, expires_at, entry.last_refresh_attempt if entry else 0.0)
+    return entry
+
+
+async def _fetch(authenticator, key: Tuple[str, str]) -> _Token:
+    """Call the provider and publish the new token to the shared cache."""
+    provider, identifier = key
+    _stats["fetches"] += 1
+    token_data = await authenticator.fetch_token()
+    await token_cache.set(
+        provider=provider,
+        identifier=identifier,
+        token=token_data["token"],
+        expires_at=token_data["expires_at"],
+        metadata=token_data.get("metadata")
+    )
+    return _adopt(key, token_data["token"], token_data["expires_at"])
+
+
+async def _from_shared(key: Tuple[str, str]) -> Optional[_Token]:
+    """Token another process (or an earlier run) stored in TokenCache, if still usable."""
+    cached = await token_cache.get(*key)
+    if not cached or not cached.get("expires_at"):
+        return None
+    return _adopt(key, cached["token"], datetime.fromisoformat(cached["expires_at"]))
+
+
+async def _load(authenticator, key: Tuple[str, str]) -> _Token:
+    entry = await _from_shared(key)
+    if entry is not None:
+        _stats["shared_hits"] += 1
+        return entry
+    return await _fetch(authenticator, key)
+
+
+async def _refresh(authenticator, key: Tuple[str, str]) -> None:
+    """Background refresh: adopt a newer shared token, else fetch one if no other process is."""
+    entry = _tokens[key]
+    try:
+        shared = await _from_shared(key)
+        if shared is not None and not shared.due_for_refresh(datetime.now(timezone.utc)):
+            return
+        if not await token_cache.acquire_refresh_lock(*key, ttl_seconds=REFRESH_RETRY_SECONDS * 3):
+            return
+        _stats["background_refreshes"] += 1
+        await _fetch(authenticator, key)
+        logger.debug(f"Refreshed {key[0]} token in the background, expires at {_tokens[key].expires_at}")
+    except Exception as e:
+        _stats["refresh_failures"] += 1
+        logger.warning(f"Background {key[0]} token refresh failed (current token expires at {entry.expires_at}): {e}")
+
+
+def _schedule_refresh(authenticator, key: Tuple[str, str], entry: _Token) -> None:
+    loop = asyncio.get_running_loop()
+    task_key = (loop, *key)
+    if task_key in _refresh_tasks or time.monotonic() - entry.last_refresh_attempt < REFRESH_RETRY_SECONDS:
+        return
+    entry.last_refresh_attempt = time.monotonic()
+    task = loop.create_task(_refresh(authenticator, key))
+    _refresh_tasks[task_key] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(task_key, None))
+
+
+async def get_token(authenticator, context: Optional[ProviderContext] = None) -> str:
+    """Token for a registry authenticator.
+
+    Served from the local copy while usable; once within
+    GATEWAY_TOKEN_REFRESH_LEAD_SECONDS of TokenCache's expiry buffer a
+    background refresh is started and the current token is still returned.
+    Only a missing or unusable token makes the caller wait, and concurrent
+    callers share a single fetch.
+
+    Args:
+        authenticator: Authenticator from get_authenticator()
+        context: Provider context
+
+    Returns:
+        Access token string
+    """
+    key = (authenticator.provider_name, authenticator.token_identifier(context))
+    flight_key = (asyncio.get_running_loop(), *key)
+    while True:
+        now = datetime.now(timezone.utc)
+        entry = _tokens.get(key)
+        if entry is not None and entry.usable(now):
+            _stats["local_hits"] += 1
+            if entry.due_for_refresh(now):
+                _schedule_refresh(authenticator, key, entry)
+            return entry.token
+
+        pending = _inflight.get(flight_key)
+        if pending is None:
+            break
+        _stats["coalesced"] += 1
+        try:
+            return (await asyncio.shield(pending)).token
+        except asyncio.CancelledError:
+            # Only the fetching caller was cancelled: fetch again
+            if not pending.cancelled() or asyncio.current_task().cancelling():
+                raise
+
+    pending = asyncio.get_running_loop().create_future()
+    _inflight[flight_key] = pending
+    try:
+        entry = await _load(authenticator, key)
+    except asyncio.CancelledError:
+        # Waiters did not ask for this cancellation; wake them to retry
+        pending.cancel()
+        raise
+    except Exception as e:
+        pending.set_exception(e)
+        pending.exception()  # Mark retrieved when nobody else was waiting
+        raise
+    else:
+        pending.set_result(entry)
+        return entry.token
+    finally:
+        _inflight.pop(flight_key, None)
+
+
+def get_stats() -> Dict[str, Any]:
+    """Registry counters and the expiry of each held token."""
+    return {
+        **_stats,
+        "authenticators": len(_authenticators),
+        "refreshing": len(_refresh_tasks),
+        "tokens": {f"{p}:{i}": t.expires_at.isoformat() for (p, i), t in _tokens.items()},
+    }
+
+
+def clear() -> None:
+    """Forget all authenticators, tokens and cached configs."""
+    for task in list(_refresh_tasks.values()):
+        if not task.get_loop().is_closed():
+            task.cancel()
+    _refresh_tasks.clear()
+    _authenticators.clear()
+    _tokens.clear()
+    _inflight.clear()
+    invalidate_provider_configs()
+    for name in _stats:
+        _stats[name] = 0
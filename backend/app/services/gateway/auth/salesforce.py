@@ -3,19 +3,25 @@ import json
 import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 import jwt
 import httpx
+from cryptography.hazmat.primitives import serialization
 from app.services.gateway.router import ProviderContext
 from app.services.gateway.cache import token_cache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Parsed private keys by (path, mtime), so each JWT does not re-read and re-parse the PEM
+_private_keys: Dict[Tuple[str, float], Any] = {}
+
 
 class SalesforceAuthenticator:
     """Authenticator for Salesforce JWT OAuth flow."""
     
+    provider_name = "salesforce"
+    
     def __init__(
         self,
         client_id: Optional[str] = None,
@@ -43,11 +49,11 @@ class SalesforceAuthenticator:
         if not self.username:
             raise ValueError("SALESFORCE_USERNAME is required")
     
-    def _load_private_key(self) -> str:
-        """Load private key from file.
+    def _load_private_key(self) -> Any:
+        """Load and parse the private key, reusing the parsed key until the file changes.
         
         Returns:
-            Private key content as string
+            Parsed private key object
             
         Raises:
             FileNotFoundError: If key file doesn't exist
@@ -58,16 +64,24 @@ class SalesforceAuthenticator:
         if not key_path.exists():
             raise FileNotFoundError(f"Private key file not found: {self.private_key_path}")
         
+        cache_key = (str(key_path), key_path.stat().st_mtime)
+        private_key = _private_keys.get(cache_key)
+        if private_key is not None:
+            return private_key
+        
         try:
-            with open(key_path, 'r') as f:
+            with open(key_path, 'rb') as f:
                 key_content = f.read()
             
             if not key_content.strip():
                 raise ValueError(f"Private key file is empty: {self.private_key_path}")
             
-            return key_content
+            private_key = serialization.load_pem_private_key(key_content, password=None)
         except Exception as e:
             raise ValueError(f"Failed to load private key: {e}")
+        
+        _private_keys[cache_key] = private_key
+        return private_key
     
     def _generate_jwt(self) -> str:
         """Generate JWT assertion for Salesforce OAuth.
@@ -125,6 +139,31 @@ class SalesforceAuthenticator:
             response.raise_for_status()
             return response.json()
     
+    def token_identifier(self, context: Optional[ProviderContext] = None) -> str:
+        """Token cache identifier (the Connected App client ID)."""
+        client_id = context.client_id if context else self.client_id
+        return client_id or self.client_id
+    
+    async def fetch_token(self) -> Dict[str, Any]:
+        """Request a new access token, bypassing the cache.
+        
+        Returns:
+            Dict with 'token', 'expires_at' and 'metadata'
+        """
+        logger.info("Generating new Salesforce OAuth token")
+        jwt_assertion = self._generate_jwt()
+        token_response = await self._exchange_jwt_for_token(jwt_assertion)
+        
+        expires_in = token_response.get("expires_in", 3600)  # Default 1 hour
+        return {
+            "token": token_response["access_token"],
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+            "metadata": {
+                "instance_url": token_response.get("instance_url"),
+                "token_type": token_response.get("token_type", "Bearer")
+            }
+        }
+    
     async def get_token(self, auth_header: Optional[str] = None, context: Optional[ProviderContext] = None) -> str:
         """Get OAuth access token (from cache or new request).
         
@@ -135,40 +174,23 @@ class SalesforceAuthenticator:
         Returns:
             OAuth access token string
         """
-        # Use context if provided, otherwise use instance config
-        client_id = context.client_id if context else self.client_id
-        identifier = client_id or self.client_id
+        identifier = self.token_identifier(context)
         
         # Check cache first
-        cached = token_cache.get("salesforce", identifier)
+        cached = await token_cache.get("salesforce", identifier)
         if cached:
             logger.debug("Using cached Salesforce token")
             return cached["token"]
         
-        # Generate new token
-        logger.info("Generating new Salesforce OAuth token")
-        jwt_assertion = self._generate_jwt()
-        token_response = await self._exchange_jwt_for_token(jwt_assertion)
-        
-        access_token = token_response["access_token"]
-        expires_in = token_response.get("expires_in", 3600)  # Default 1 hour
-        
-        # Calculate expiration time
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-        
-        # Cache token
-        token_cache.set(
+        token_data = await self.fetch_token()
+        await token_cache.set(
             provider="salesforce",
             identifier=identifier,
-            token=access_token,
-            expires_at=expires_at,
-            metadata={
-                "instance_url": token_response.get("instance_url"),
-                "token_type": token_response.get("token_type", "Bearer")
-            }
+            token=token_data["token"],
+            expires_at=token_data["expires_at"],
+            metadata=token_data["metadata"]
         )
-        
-        return access_token
+        return token_data["token"]
     
     async def refresh_token(self, auth_header: Optional[str] = None, context: Optional[ProviderContext] = None) -> str:
         """Refresh OAuth token (forces new token generation).
@@ -181,8 +203,5 @@ class SalesforceAuthenticator:
             New OAuth access token
         """
         # Clear cache and get new token
-        client_id = context.client_id if context else self.client_id
-        identifier = client_id or self.client_id
-        
-        token_cache.delete("salesforce", identifier)
+        await token_cache.delete("salesforce", self.token_identifier(context))
         return await self.get_token(auth_header, context)
@@ -1,9 +1,10 @@
 """Vertex AI service account authenticator."""
+import asyncio
 import json
 import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 from google.auth.transport.requests import Request
 from google.oauth2 import service_account
 from app.services.gateway.router import ProviderContext
@@ -20,6 +21,8 @@ VERTEX_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
 class VertexAuthenticator:
     """Authenticator for Vertex AI service account flow."""
     
+    provider_name = "vertex"
+    
     def __init__(
         self,
         project_id: Optional[str] = None,
@@ -41,6 +44,9 @@ class VertexAuthenticator:
             raise ValueError("VERTEX_PROJECT_ID is required")
         if not self.service_account_path:
             raise ValueError("VERTEX_SERVICE_ACCOUNT_PATH is required")
+        
+        # Built once from the JSON file; google-auth refreshes it in place
+        self._credentials: Optional[service_account.Credentials] = None
     
     def _load_service_account(self) -> dict:
         """Load service account credentials from JSON file.
@@ -74,11 +80,14 @@ class VertexAuthenticator:
             raise ValueError(f"Failed to load service account: {e}")
     
     def _create_service_account_credentials(self) -> service_account.Credentials:
-        """Create Google service account credentials object.
+        """Create (or reuse) the Google service account credentials object.
         
         Returns:
             Service account credentials
         """
+        if self._credentials is not None:
+            return self._credentials
+        
         sa_data = self._load_service_account()
         
         try:
@@ -86,54 +95,46 @@ class VertexAuthenticator:
                 sa_data,
                 scopes=[VERTEX_SCOPE]
             )
-            return credentials
         except Exception as e:
             raise ValueError(f"Failed to create service account credentials: {e}")
+        self._credentials = credentials
+        return credentials
     
-    async def _get_access_token(self, credentials: service_account.Credentials) -> dict:
+    async def _get_access_token(self, credentials: service_account.Credentials, force: bool = False) -> dict:
         """Get OAuth access token from Google.
         
         Args:
             credentials: Service account credentials
+            force: Refresh even if the current token is still valid
             
         Returns:
             Token dict with 'token' and 'expiry'
         """
-        # Refresh token if needed
-        if not credentials.valid:
-            credentials.refresh(Request())
+        # Refresh token if needed (blocking HTTP call, keep it off the event loop)
+        if force or not credentials.valid:
+            await asyncio.to_thread(credentials.refresh, Request())
         
         return {
             "token": credentials.token,
             "expiry": credentials.expiry
         }
     
-    async def get_token(self, auth_header: Optional[str] = None, context: Optional[ProviderContext] = None) -> str:
-        """Get OAuth access token (from cache or new request).
+    def token_identifier(self, context: Optional[ProviderContext] = None) -> str:
+        """Token cache identifier (the GCP project ID)."""
+        project_id = context.project_id if context else self.project_id
+        return project_id or self.project_id
+    
+    async def fetch_token(self) -> Dict[str, Any]:
+        """Request a new access token, bypassing the cache.
         
-        Args:
-            auth_header: Not used for Vertex AI (uses service account)
-            context: Provider context (optional, uses instance config if not provided)
-            
         Returns:
-            OAuth access token string
+            Dict with 'token', 'expires_at' and 'metadata'
         """
-        # Use context if provided, otherwise use instance config
-        project_id = context.project_id if context else self.project_id
-        identifier = project_id or self.project_id
-        
-        # Check cache first
-        cached = token_cache.get("vertex", identifier)
-        if cached:
-            logger.debug("Using cached Vertex AI token")
-            return cached["token"]
-        
-        # Generate new token
         logger.info("Generating new Vertex AI OAuth token")
         credentials = self._create_service_account_credentials()
-        token_data = await self._get_access_token(credentials)
+        # The reused credentials may still hold the token being replaced
+        token_data = await self._get_access_token(credentials, force=credentials.token is not None)
         
-        access_token = token_data["token"]
         expiry = token_data["expiry"]
         
         # Convert expiry datetime to UTC if needed
@@ -145,19 +146,42 @@ class VertexAuthenticator:
             # Fallback: assume 1 hour if expiry not provided
             expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         
-        # Cache token
-        token_cache.set(
+        return {
+            "token": token_data["token"],
+            "expires_at": expires_at,
+            "metadata": {"project_id": self.project_id, "location": self.location}
+        }
+    
+    async def get_token(self, auth_header: Optional[str] = None, context: Optional[ProviderContext] = None) -> str:
+        """Get OAuth access token (from cache or new request).
+        
+        Args:
+            auth_header: Not used for Vertex AI (uses service account)
+            context: Provider context (optional, uses instance config if not provided)
+            
+        Returns:
+            OAuth access token string
+        """
+        identifier = self.token_identifier(context)
+        
+        # Check cache first
+        cached = await token_cache.get("vertex", identifier)
+        if cached:
+            logger.debug("Using cached Vertex AI token")
+            return cached["token"]
+        
+        token_data = await self.fetch_token()
+        metadata = dict(token_data["metadata"])
+        if context:
+            metadata.update(project_id=identifier, location=context.location)
+        await token_cache.set(
             provider="vertex",
             identifier=identifier,
-            token=access_token,
-            expires_at=expires_at,
-            metadata={
-                "project_id": project_id,
-                "location": context.location if context else self.location
-            }
+            token=token_data["token"],
+            expires_at=token_data["expires_at"],
+            metadata=metadata
         )
-        
-        return access_token
+        return token_data["token"]
     
     async def refresh_token(self, auth_header: Optional[str] = None, context: Optional[ProviderContext] = None) -> str:
         """Refresh OAuth token (forces new token generation).
@@ -170,8 +194,5 @@ class VertexAuthenticator:
             New OAuth access token
         """
         # Clear cache and get new token
-        project_id = context.project_id if context else self.project_id
-        identifier = project_id or self.project_id
-        
-        token_cache.delete("vertex", identifier)
+        await token_cache.delete("vertex", self.token_identifier(context))
         return await self.get_token(auth_header, context)
@@ -1,9 +1,9 @@
-"""Token caching for OAuth tokens with TTL buffer."""
+"""Token caching for OAuth tokens with TTL buffer (async Redis)."""
 import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
-from app.core.cache import redis_client
+from app.core.cache import get_async_redis
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,12 +19,16 @@ class TokenCache:
         """Initialize token cache.
         
         Args:
-            redis_client_instance: Optional Redis client (defaults to global)
+            redis_client_instance: Optional async Redis client (defaults to get_async_redis())
         """
-        self.redis = redis_client_instance or redis_client
+        self._redis = redis_client_instance
         self.buffer_minutes = TOKEN_BUFFER_MINUTES
         self.default_ttl = settings.REDIS_TOKEN_TTL
     
+    @property
+    def redis(self):
+        return self._redis if self._redis is not None else get_async_redis()
+    
     def _make_key(self, provider: str, identifier: str) -> str:
         """Generate cache key for token.
         
@@ -37,7 +41,7 @@ class TokenCache:
         """
         return f"token:{provider}:{identifier}"
     
-    def get(self, provider: str, identifier: str) -> Optional[Dict[str, Any]]:
+    async def get(self, provider: str, identifier: str) -> Optional[Dict[str, Any]]:
         """Get cached token.
         
         Args:
@@ -49,7 +53,7 @@ class TokenCache:
         """
         try:
             key = self._make_key(provider, identifier)
-            cached_data = self.redis.get(key)
+            cached_data = await self.redis.get(key)
             
             if not cached_data:
                 return None
@@ -66,7 +70,7 @@ class TokenCache:
                 if datetime.now(timezone.utc) >= buffer_time:
                     # Token expired or within buffer window
                     logger.debug(f"Token expired or within buffer: {provider}:{identifier}")
-                    self.redis.delete(key)
+                    await self.redis.delete(key)
                     return None
             
             return data
@@ -74,7 +78,7 @@ class TokenCache:
             logger.warning(f"Error getting cached token for {provider}:{identifier}: {e}")
             return None
     
-    def set(
+    async def set(
         self,
         provider: str,
         identifier: str,
@@ -122,14 +126,14 @@ class TokenCache:
                 data.update(metadata)
             
             # Store in Redis
-            self.redis.setex(key, ttl_seconds, json.dumps(data))
+            await self.redis.setex(key, ttl_seconds, json.dumps(data))
             logger.debug(f"Cached token for {provider}:{identifier}, expires at {expires_at_utc}")
             return True
         except Exception as e:
             logger.error(f"Error caching token for {provider}:{identifier}: {e}")
             return False
     
-    def delete(self, provider: str, identifier: str) -> bool:
+    async def delete(self, provider: str, identifier: str) -> bool:
         """Delete cached token.
         
         Args:
@@ -141,14 +145,32 @@ class TokenCache:
         """
         try:
             key = self._make_key(provider, identifier)
-            self.redis.delete(key)
+            await self.redis.delete(key)
             logger.debug(f"Deleted cached token for {provider}:{identifier}")
             return True
         except Exception as e:
             logger.warning(f"Error deleting cached token for {provider}:{identifier}: {e}")
             return False
     
-    def clear_provider(self, provider: str) -> int:
+    async def acquire_refresh_lock(self, provider: str, identifier: str, ttl_seconds: int = 30) -> bool:
+        """Claim the right to refresh a token, so only one process calls the provider.
+        
+        Args:
+            provider: Provider name
+            identifier: Unique identifier
+            ttl_seconds: How long the claim is held if never released
+            
+        Returns:
+            True if this caller should refresh (also when Redis is unavailable)
+        """
+        try:
+            key = f"{self._make_key(provider, identifier)}:refresh"
+            return bool(await self.redis.set(key, "1", nx=True, ex=ttl_seconds))
+        except Exception as e:
+            logger.warning(f"Error acquiring refresh lock for {provider}:{identifier}: {e}")
+            return True
+    
+    async def clear_provider(self, provider: str) -> int:
         """Clear all tokens for a provider.
         
         Args:
@@ -159,9 +181,9 @@ class TokenCache:
         """
         try:
             pattern = self._make_key(provider, "*")
-            keys = list(self.redis.scan_iter(match=pattern))
+            keys = [key async for key in self.redis.scan_iter(match=pattern)]
             if keys:
-                deleted = self.redis.delete(*keys)
+                deleted = await self.redis.delete(*keys)
                 logger.info(f"Cleared {deleted} cached tokens for provider: {provider}")
                 return deleted
             return 0
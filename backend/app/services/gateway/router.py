@@ -196,26 +196,17 @@ def resolve_context(model_name: str, provider: str) -> ProviderContext:
         context.credentials_path = settings.VERTEX_SERVICE_ACCOUNT_PATH
         
     elif provider_lower == "apple":
-        # Load Endor config from database if available
+        # Load Endor config from database if available (cached by the auth registry)
         try:
-            from app.core.database import SessionLocal
-            from app.models.user import ProviderConfig
+            from app.services.gateway.auth.registry import get_endor_config
             
-            db = SessionLocal()
-            try:
-                endor_config = db.query(ProviderConfig).filter(
-                    ProviderConfig.provider_type == "apple_endor",
-                    ProviderConfig.is_active == True
-                ).first()
-                
-                if endor_config:
-                    context.endpoint = endor_config.apple_endor_endpoint or settings.APPLE_ENDOR_ENDPOINT
-                    # Store config_id for authenticator to use
-                    context.config_id = endor_config.id
-                else:
-                    context.endpoint = settings.APPLE_ENDOR_ENDPOINT
-            finally:
-                db.close()
+            endor_config = get_endor_config()
+            if endor_config:
+                context.endpoint = endor_config.endpoint or settings.APPLE_ENDOR_ENDPOINT
+                # Store config_id for authenticator to use
+                context.config_id = endor_config.id
+            else:
+                context.endpoint = settings.APPLE_ENDOR_ENDPOINT
         except Exception as e:
             logger.warning(f"Failed to load Endor config from database: {e}, using settings")
             context.endpoint = settings.APPLE_ENDOR_ENDPOINT
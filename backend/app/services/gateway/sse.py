@@ -0,0 +1,50 @@
+"""Server-sent event framing and JSON codec for streamed completion chunks.
+
+Each upstream chunk is parsed once and, when relayed over HTTP, encoded once.
+orjson is used when installed (it is several times faster than the standard
+library for small dicts); otherwise json is used with compact separators.
+"""
+import json
+import logging
+from typing import Any, Optional
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+DONE_EVENT = b"data: [DONE]\n\n"
+
+
+def loads(data: Any) -> Any:
+    """Parse a JSON chunk payload (str or bytes)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a chunk to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+def encode_event(chunk: Any) -> bytes:
+    """Frame a chunk as an SSE data event."""
+    return b"data: " + dumps(chunk) + b"\n\n"
+
+
+def data_payload(line: str) -> Optional[str]:
+    """Return the payload of an SSE "data:" line, or None for other lines."""
+    if not line.startswith("data:"):
+        return None
+    return line[5:].strip()
+
+
+def should_log_chunk(logger: logging.Logger, index: int) -> bool:
+    """Per-chunk debug logging, sampled every GATEWAY_STREAM_LOG_EVERY chunks (0 disables it)."""
+    every = settings.GATEWAY_STREAM_LOG_EVERY
+    return every > 0 and index % every == 0 and logger.isEnabledFor(logging.DEBUG)
@@ -0,0 +1,71 @@
+"""Process-wide pool of shared httpx clients for LLM provider APIs.
+
+Opening an httpx.AsyncClient per completion means a new TCP + TLS handshake to
+OpenAI, Vertex, Salesforce or Endor on every LLM call, which lands directly on
+time-to-first-token. The gateway instead borrows a long-lived client from this
+registry, keyed by (provider, endpoint host, verify setting). Borrowed clients
+are never closed by callers; the registry owns them until shutdown.
+
+Loop scoping, counters and shutdown live in app.core.http_pool; this module
+only decides the key and the gateway connection limits.
+"""
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_pool import HTTPClientPool
+
+_pool = HTTPClientPool("LLM gateway")
+
+
+def _http2_available() -> bool:
+    return _pool.http2_available(settings.GATEWAY_HTTP2)
+
+
+def get_client(provider: str, url: str, verify: Any = True) -> httpx.AsyncClient:
+    """
+    Borrow the shared httpx client for a provider endpoint.
+
+    Args:
+        provider: Provider name ("openai", "vertex", "salesforce", "apple", ...)
+        url: Request URL; its scheme and host pick the pool
+        verify: httpx verify value (Endor may disable verification for corp certs)
+
+    Returns:
+        Shared httpx.AsyncClient; callers must not close it
+    """
+    parts = urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+    verify_key = verify if isinstance(verify, (bool, str)) else "context"
+    return _pool.get_client(
+        (provider, host, verify_key),
+        provider,
+        verify=verify,
+        timeout=settings.GATEWAY_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.GATEWAY_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GATEWAY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GATEWAY_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2_available(),
+        label=f"{provider} at {host}",
+    )
+
+
+def get_stats() -> Dict[str, Any]:
+    """Get per-provider pool hit/miss and connection reuse counters."""
+    return {
+        "clients": _pool.client_count(),
+        "http2": _http2_available(),
+        "providers": {
+            provider: {"clients": _pool.client_count(provider), **_pool.group_stats(provider)}
+            for provider in _pool.groups()
+        },
+    }
+
+
+async def close_all() -> None:
+    """Close every shared client on the running loop (application shutdown)."""
+    await _pool.close_all()
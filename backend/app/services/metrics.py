@@ -50,11 +50,45 @@ class AgentMetrics:
         return self.total_time / self.total_executions if self.total_executions > 0 else 0.0
 
 
+@dataclass
+class GraphMetrics:
+    """Compile metrics for a cached agent graph."""
+    graph_key: str
+    compile_count: int = 0
+    total_compile_time: float = 0.0
+    last_compiled: Optional[datetime] = None
+    checkpointer: Any = field(default=None, repr=False)
+    
+    @property
+    def average_compile_time(self) -> float:
+        """Calculate average compile time."""
+        return self.total_compile_time / self.compile_count if self.compile_count > 0 else 0.0
+
+
+def _checkpointer_usage(checkpointer: Any) -> Dict[str, int]:
+    """Threads and approximate serialized bytes held by an in-memory checkpointer."""
+    storage = getattr(checkpointer, "storage", None) or {}
+    nbytes = 0
+    for namespaces in list(storage.values()):
+        for checkpoints in list(namespaces.values()):
+            for saved, metadata, _parent in list(checkpoints.values()):
+                nbytes += len(saved[1]) + len(metadata[1])
+    for typed in list((getattr(checkpointer, "blobs", None) or {}).values()):
+        nbytes += len(typed[1])
+    for writes in list((getattr(checkpointer, "writes", None) or {}).values()):
+        for write in list(writes.values()):
+            nbytes += len(write[2][1])
+    return {"threads": len(storage), "bytes": nbytes}
+
+
 class MetricsCollector:
     """Collects and tracks agent performance metrics."""
     
     def __init__(self):
         self.agent_metrics: Dict[str, AgentMetrics] = defaultdict(lambda: AgentMetrics(agent_type=""))
+        self.graph_metrics: Dict[str, GraphMetrics] = {}
+        # Agent selection decisions by source ("cache", "rules", "llm")
+        self.selection_metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "total_time": 0.0})
         self._lock = False  # Simple flag for thread safety (can be upgraded to threading.Lock if needed)
     
     def record_node_execution(
@@ -105,6 +139,50 @@ class MetricsCollector:
         
         logger.info(f"Recorded {agent_type} execution: {execution_time:.3f}s (success: {success})")
     
+    def record_agent_selection(self, source: str, execution_time: float) -> None:
+        """Record a meta-agent selection decision and where it came from."""
+        selection_metric = self.selection_metrics[source]
+        selection_metric["count"] += 1
+        selection_metric["total_time"] += execution_time
+        
+        logger.debug(f"Recorded agent selection from {source}: {execution_time:.4f}s")
+    
+    def record_graph_compile(
+        self,
+        graph_key: str,
+        compile_time: float,
+        checkpointer: Any = None
+    ) -> None:
+        """Record a graph compilation and the checkpointer it was compiled with."""
+        graph_metric = self.graph_metrics.setdefault(graph_key, GraphMetrics(graph_key=graph_key))
+        graph_metric.compile_count += 1
+        graph_metric.total_compile_time += compile_time
+        graph_metric.last_compiled = datetime.now()
+        graph_metric.checkpointer = checkpointer
+        
+        logger.info(f"Compiled graph {graph_key}: {compile_time:.3f}s")
+    
+    def get_graph_summary(self) -> Dict[str, Any]:
+        """Get compile times and checkpointer memory for cached graphs."""
+        graphs = {}
+        total_bytes = 0
+        for graph_key, graph_metric in self.graph_metrics.items():
+            usage = (
+                _checkpointer_usage(graph_metric.checkpointer)
+                if graph_metric.checkpointer is not None
+                else {"threads": 0, "bytes": 0}
+            )
+            total_bytes += usage["bytes"]
+            graphs[graph_key] = {
+                "compile_count": graph_metric.compile_count,
+                "total_compile_time": graph_metric.total_compile_time,
+                "average_compile_time": graph_metric.average_compile_time,
+                "checkpointing": graph_metric.checkpointer is not None,
+                "checkpoint_threads": usage["threads"],
+                "checkpoint_bytes": usage["bytes"],
+            }
+        return {"graphs": graphs, "checkpoint_bytes": total_bytes}
+    
     def get_agent_metrics(self, agent_type: str) -> Optional[AgentMetrics]:
         """Get metrics for a specific agent type."""
         return self.agent_metrics.get(agent_type)
@@ -155,11 +233,22 @@ class MetricsCollector:
                 summary["overall"]["total_executions"]
             )
         
+        total_selections = sum(m["count"] for m in self.selection_metrics.values())
+        summary["agent_selection"] = {
+            source: {
+                "count": metric["count"],
+                "share": metric["count"] / total_selections * 100,
+                "average_time": metric["total_time"] / metric["count"],
+            }
+            for source, metric in self.selection_metrics.items()
+        }
+        
         return summary
     
     def reset(self) -> None:
         """Reset all metrics."""
         self.agent_metrics.clear()
+        self.selection_metrics.clear()
         logger.info("Metrics reset")
 
 
@@ -1,11 +1,13 @@
 """Tableau REST API client with Connected Apps JWT authentication."""
 import asyncio
+import csv
 import jwt
 import uuid
 import logging
 import json
+import math
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 from urllib.parse import urljoin
 
 import httpx
@@ -13,6 +15,8 @@ import os
 import ssl
 from pathlib import Path
 from app.core.config import settings, PROJECT_ROOT
+from app.services.columnar import ColumnarBuilder, ColumnarResult, result_view
+from app.services.tableau import transport
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -33,6 +37,78 @@ class TableauAPIError(TableauClientError):
     pass
 
 
+# Per-server semaphores bounding concurrent view data fetches and listing page
+# fetches across all clients. Keyed by server URL; each entry remembers the
+# event loop it was created on.
+_view_fetch_semaphores: Dict[str, tuple] = {}
+_page_fetch_semaphores: Dict[str, tuple] = {}
+
+
+def _server_semaphore(semaphores: Dict[str, tuple], server_url: str, limit: int) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    entry = semaphores.get(server_url)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(max(1, limit)))
+        semaphores[server_url] = entry
+    return entry[1]
+
+
+def _get_view_fetch_semaphore(server_url: str) -> asyncio.Semaphore:
+    """Get (or create) the view fetch semaphore for a Tableau server on the running loop."""
+    return _server_semaphore(_view_fetch_semaphores, server_url, settings.TABLEAU_MAX_CONCURRENT_VIEW_FETCHES)
+
+
+def _get_page_fetch_semaphore(server_url: str) -> asyncio.Semaphore:
+    """Get (or create) the listing page fetch semaphore for a Tableau server on the running loop."""
+    return _server_semaphore(_page_fetch_semaphores, server_url, settings.TABLEAU_MAX_CONCURRENT_PAGE_FETCHES)
+
+
+def _matches_parent(obj: Dict[str, Any], kind: str, parent_id: str) -> bool:
+    """Check whether a listed item belongs to a project or workbook (response formats vary)."""
+    parent = obj.get(kind)
+    if isinstance(parent, dict):
+        return parent.get("id") == parent_id
+    elif isinstance(parent, str):
+        return parent == parent_id
+    # Try direct projectId/project_id (workbookId/workbook_id) fields
+    return obj.get(f"{kind}Id") == parent_id or obj.get(f"{kind}_id") == parent_id
+
+
+async def _aiter_csv_rows(text_chunks: AsyncIterator[str]) -> AsyncIterator[List[str]]:
+    """
+    Incrementally parse CSV rows from decoded text chunks.
+    
+    Lines are buffered until the record's quote count is balanced, so quoted
+    fields containing newlines are never split across parse calls.
+    """
+    buffer = ""
+    pending: List[str] = []
+    pending_quotes = 0
+    async for chunk in text_chunks:
+        buffer += chunk
+        lines = buffer.split("\n")
+        # Keep the trailing partial line (no newline yet) for the next chunk
+        buffer = lines.pop()
+        complete: List[str] = []
+        for line in lines:
+            line += "\n"
+            pending.append(line)
+            pending_quotes += line.count('"')
+            if pending_quotes % 2 == 0:
+                complete.extend(pending)
+                pending = []
+                pending_quotes = 0
+        if complete:
+            for row in csv.reader(complete):
+                yield row
+    pending.append(buffer)
+    tail = "".join(pending)
+    if tail:
+        # Keep line endings so a quoted field's newlines survive in the last record
+        for row in csv.reader(tail.splitlines(keepends=True)):
+            yield row
+
+
 class TableauClient:
     """Client for interacting with Tableau REST API using Connected Apps JWT authentication."""
     
@@ -53,7 +129,7 @@ class TableauClient:
         initial_token: Optional[str] = None,
         initial_site_id: Optional[str] = None,
         initial_site_content_url: Optional[str] = None,
-        on_401_invalidate: Optional[Callable[[], None]] = None,
+        on_401_invalidate: Optional[Callable[[], Awaitable[None]]] = None,
     ):
         """
         Initialize Tableau client.
@@ -100,7 +176,9 @@ class TableauClient:
         self._pat_auth: bool = False  # True when authenticated via PAT (no refresh)
         self._standard_auth: bool = False  # True when authenticated via username/password (no refresh)
         self._eas_oauth_auth: bool = False  # True when authenticated via EAS OAuth 2.0 Trust (no refresh)
-        self._on_401_invalidate: Optional[Callable[[], None]] = on_401_invalidate
+        self._on_401_invalidate: Optional[Callable[[], Awaitable[None]]] = on_401_invalidate
+        # (loop, client) borrowed from the transport pool, looked up once per loop
+        self._borrowed: Optional[tuple] = None
         # Pre-seeded from cache (avoids sign-in when token reuse)
         if initial_token:
             self.auth_token = initial_token
@@ -120,6 +198,7 @@ class TableauClient:
         # SSL verification setting
         # Priority: verify_ssl parameter > config ssl_cert_path > global TABLEAU_SSL_CERT_PATH > default
         # If verify_ssl=False (from config skip_ssl_verify), skip verification
+        self._ssl_cert_path: Optional[str] = None
         if verify_ssl is False:
             self.verify_ssl = False
         else:
@@ -135,6 +214,7 @@ class TableauClient:
                     ssl_context.check_hostname = False
                     ssl_context.verify_mode = ssl.CERT_REQUIRED
                     self.verify_ssl = ssl_context
+                    self._ssl_cert_path = str(cert_path)
                 else:
                     raise ValueError(
                         f"Tableau SSL certificate file not found: {cert_path} "
@@ -142,12 +222,22 @@ class TableauClient:
                     )
             else:
                 self.verify_ssl = settings.TABLEAU_VERIFY_SSL if verify_ssl is None else verify_ssl
-        
-        # HTTP client with SSL configuration
-        self._client = httpx.AsyncClient(
-            timeout=timeout,
-            verify=self.verify_ssl,
+    
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Shared, pooled HTTP client for this server (borrowed from the transport registry)."""
+        loop = asyncio.get_running_loop()
+        borrowed = self._borrowed
+        if borrowed is not None and borrowed[0] is loop and not borrowed[1].is_closed:
+            return borrowed[1]
+        client = transport.get_client(
+            self.server_url,
+            self.verify_ssl,
+            ssl_cert_path=self._ssl_cert_path,
+            timeout=self.timeout,
         )
+        self._borrowed = (loop, client)
+        return client
     
     def _generate_jwt(self, expires_in_minutes: int = 10) -> str:
         """
@@ -897,7 +987,7 @@ class TableauClient:
                 if response.status_code == 401 and retry_on_auth_error and auth_retries < max_auth_retries:
                     logger.info("Tableau returned 401 (token likely invalidated), re-authenticating...")
                     if self._on_401_invalidate:
-                        self._on_401_invalidate()
+                        await self._on_401_invalidate()
                     self.auth_token = None
                     self.token_expires_at = None
                     await self._ensure_authenticated()
@@ -1026,6 +1116,59 @@ class TableauClient:
             "pagination": pagination_info
         }
     
+    async def get_datasource(self, datasource_id: str) -> Dict[str, Any]:
+        """
+        Get a single datasource (including updatedAt and hasExtracts).
+        
+        Args:
+            datasource_id: Datasource LUID
+            
+        Returns:
+            Datasource dict as returned by the REST API
+        """
+        await self._ensure_authenticated()
+        site_id = self.site_id or ""
+        if not site_id:
+            raise ValueError("Site ID not available. Ensure authentication completed successfully.")
+        
+        response = await self._request("GET", f"sites/{site_id}/datasources/{datasource_id}")
+        return response.get("datasource", {}) or {}
+    
+    async def _get_views_page(
+        self,
+        datasource_id: Optional[str] = None,
+        page_size: int = 100,
+        page_number: int = 1,
+    ) -> Dict[str, Any]:
+        """Fetch one page of GET /views. Returns 'items' and 'pagination' like get_datasources."""
+        params = {
+            "pageSize": min(page_size, 1000),
+            "pageNumber": page_number,
+        }
+        if datasource_id:
+            params["filter"] = f"datasourceId:eq:{datasource_id}"
+        
+        await self._ensure_authenticated()
+        site_id = self.site_id or ""
+        
+        if not site_id:
+            raise ValueError("Site ID not available. Ensure authentication completed successfully.")
+        
+        response = await self._request("GET", f"sites/{site_id}/views", params=params)
+        pagination_info = self._parse_pagination(response)
+        
+        views = response.get("views", {}).get("view", [])
+        items = views if isinstance(views, list) else [views] if views else []
+        
+        # If totalAvailable not in pagination, use len(items) as fallback (single page)
+        if pagination_info["totalAvailable"] is None:
+            pagination_info["totalAvailable"] = len(items)
+        
+        return {
+            "items": items,
+            "pagination": pagination_info
+        }
+    
     async def get_views(
         self,
         datasource_id: Optional[str] = None,
@@ -1038,88 +1181,40 @@ class TableauClient:
         
         Args:
             datasource_id: Optional datasource ID to filter by
-            workbook_id: Optional workbook ID to filter by
+            workbook_id: Optional workbook ID to filter by (crawls every page, see below)
             page_size: Number of results per page (max 1000)
             page_number: Page number (1-indexed)
             
         Returns:
             List of view dictionaries
         """
-        params = {
-            "pageSize": min(page_size, 1000),
-            "pageNumber": page_number,
-        }
-        
-        filters = []
-        if datasource_id:
-            filters.append(f"datasourceId:eq:{datasource_id}")
-        # Note: workbookId filter is not supported by Tableau API, will filter client-side
-        
-        if filters:
-            params["filter"] = ",".join(filters)
-        
-        # Ensure authenticated first (this will call sign_in if needed)
-        await self._ensure_authenticated()
-        
-        # Use site_id (UUID) from auth response
-        site_id = self.site_id or ""
-        
         logger.info("-" * 80)
         logger.info("GET_VIEWS CALL")
-        logger.info(f"  Site ID being used: '{site_id}'")
         logger.info(f"  Datasource ID filter: '{datasource_id}'")
         logger.info(f"  Workbook ID filter: '{workbook_id}' (will filter client-side)")
         logger.info(f"  Page size: {page_size}, Page number: {page_number}")
-        
-        if not site_id:
-            logger.error(f"Site ID not available after authentication. Current site_id: '{self.site_id}'")
-            raise ValueError("Site ID not available. Ensure authentication completed successfully.")
-        
-        endpoint = f"sites/{site_id}/views"
-        logger.info(f"  Endpoint: {endpoint}")
         logger.info("-" * 80)
         
-        # If filtering by workbook_id, fetch all views and filter client-side
-        # (Tableau API doesn't support workbookId filter)
-        if workbook_id:
-            logger.info(f"Fetching all views and filtering by workbook_id: {workbook_id}")
-            # Fetch more views to ensure we get all relevant ones
-            params["pageSize"] = 1000
+        if not workbook_id:
+            result = await self._get_views_page(datasource_id, page_size=page_size, page_number=page_number)
+            return result["items"]
         
+        # Tableau API doesn't support a workbookId filter on /views: crawl every
+        # page and filter client-side (a single page would miss views on large sites)
+        logger.info(f"Fetching all views and filtering by workbook_id: {workbook_id}")
         try:
-            response = await self._request("GET", endpoint, params=params)
+            views_list = [view async for view in self.iter_views(datasource_id=datasource_id)]
         except TableauAPIError as e:
-            # If filter fails and we're not filtering by workbook_id, re-raise
-            if not workbook_id:
-                raise
-            # If filtering by workbook_id failed, try without filter and filter client-side
+            # If the filter failed, try without filter and filter client-side
             error_msg = str(e).lower()
             if "workbookid" in error_msg or "filter" in error_msg or "400065" in str(e):
                 logger.warning(f"Views API filter failed, fetching all views and filtering client-side: {e}")
-                params.pop("filter", None)  # Remove filter if present
-                response = await self._request("GET", endpoint, params=params)
+                views_list = [view async for view in self.iter_views()]
             else:
                 raise
         
-        views = response.get("views", {}).get("view", [])
-        views_list = views if isinstance(views, list) else [views] if views else []
-        
-        # Filter by workbook_id client-side if needed
-        if workbook_id:
-            def matches_workbook(view: Dict[str, Any], wb_id: str) -> bool:
-                """Check if view belongs to the specified workbook."""
-                # Try different response formats
-                workbook = view.get("workbook")
-                if isinstance(workbook, dict):
-                    return workbook.get("id") == wb_id
-                elif isinstance(workbook, str):
-                    return workbook == wb_id
-                # Try direct workbookId/workbook_id fields
-                return view.get("workbookId") == wb_id or view.get("workbook_id") == wb_id
-            
-            views_list = [v for v in views_list if matches_workbook(v, workbook_id)]
-            logger.info(f"Filtered to {len(views_list)} views in workbook {workbook_id}")
-        
+        views_list = [v for v in views_list if _matches_parent(v, "workbook", workbook_id)]
+        logger.info(f"Filtered to {len(views_list)} views in workbook {workbook_id}")
         return views_list
     
     async def query_datasource(
@@ -1409,6 +1504,107 @@ class TableauClient:
             "totalAvailable": total_available
         }
     
+    async def paginate(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[Dict[str, Any]]],
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Crawl every page of a REST listing, fetching pages concurrently.
+        
+        The first page's pagination.totalAvailable gives the page count; the
+        remaining pages are then requested in parallel, bounded per server by
+        TABLEAU_MAX_CONCURRENT_PAGE_FETCHES. Items are yielded in page order as
+        soon as each page (and every page before it) has arrived.
+        
+        Args:
+            fetch_page: Coroutine function (page_size, page_number) returning a dict
+                with 'items' and 'pagination' (the shape get_workbooks returns)
+            page_size: Number of results per page (max 1000)
+            
+        Yields:
+            Item dictionaries, across all pages
+        """
+        page_size = min(page_size, 1000)
+        semaphore = _get_page_fetch_semaphore(self.server_url)
+        
+        async def fetch(page_number: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await fetch_page(page_size, page_number)
+        
+        first = await fetch(1)
+        for item in first["items"]:
+            yield item
+        
+        # Without a pagination block the page helpers report totalAvailable as the
+        # number of items read (and pageSize as a default), so everything is here
+        per_page = len(first["items"])
+        total = first["pagination"].get("totalAvailable") or 0
+        if per_page == 0 or total <= per_page:
+            return
+        # More pages follow, so the first one is full: its length is the server's page size
+        page_count = math.ceil(total / per_page)
+        
+        logger.info(f"Crawling {page_count} pages ({total} items) with up to "
+                    f"{settings.TABLEAU_MAX_CONCURRENT_PAGE_FETCHES} concurrent requests")
+        tasks = [asyncio.ensure_future(fetch(number)) for number in range(2, page_count + 1)]
+        try:
+            for task in tasks:
+                page = await task
+                for item in page["items"]:
+                    yield item
+        finally:
+            # Consumer stopped early or a page failed: drop the remaining requests
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def iter_datasources(
+        self,
+        project_id: Optional[str] = None,
+        name_filter: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all datasources (every page), see get_datasources for filters."""
+        async def fetch_page(size: int, number: int) -> Dict[str, Any]:
+            return await self.get_datasources(
+                project_id=project_id, page_size=size, page_number=number, name_filter=name_filter
+            )
+        return self.paginate(fetch_page, page_size)
+    
+    def iter_workbooks(
+        self,
+        project_id: Optional[str] = None,
+        name_filter: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all workbooks (every page), see get_workbooks for filters."""
+        async def fetch_page(size: int, number: int) -> Dict[str, Any]:
+            return await self.get_workbooks(
+                project_id=project_id, page_size=size, page_number=number, name_filter=name_filter
+            )
+        return self.paginate(fetch_page, page_size)
+    
+    def iter_views(
+        self,
+        datasource_id: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all views on the site (every page), optionally for one datasource."""
+        async def fetch_page(size: int, number: int) -> Dict[str, Any]:
+            return await self._get_views_page(datasource_id, page_size=size, page_number=number)
+        return self.paginate(fetch_page, page_size)
+    
+    def iter_projects(
+        self,
+        parent_project_id: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all projects (every page), optionally under one parent project."""
+        async def fetch_page(size: int, number: int) -> Dict[str, Any]:
+            return await self._get_projects_page(parent_project_id, page_size=size, page_number=number)
+        return self.paginate(fetch_page, page_size)
+    
     async def get_projects(
         self,
         parent_project_id: Optional[str] = None,
@@ -1426,6 +1622,16 @@ class TableauClient:
         Returns:
             List of project dictionaries
         """
+        result = await self._get_projects_page(parent_project_id, page_size=page_size, page_number=page_number)
+        return result["items"]
+    
+    async def _get_projects_page(
+        self,
+        parent_project_id: Optional[str] = None,
+        page_size: int = 100,
+        page_number: int = 1,
+    ) -> Dict[str, Any]:
+        """Fetch one page of GET /projects. Returns 'items' and 'pagination' like get_workbooks."""
         params = {
             "pageSize": min(page_size, 1000),
             "pageNumber": page_number,
@@ -1452,6 +1658,8 @@ class TableauClient:
         logger.debug(f"  Full response: {response}")
         logger.info("-" * 80)
         
+        pagination_info = self._parse_pagination(response)
+        
         # Handle both XML (parsed to dict) and JSON response formats
         # According to Tableau REST API docs, response can be:
         # XML format: {"tsResponse": {"projects": {"project": [...]}}}
@@ -1465,7 +1673,7 @@ class TableauClient:
         # Extract projects data
         if "projects" not in response:
             logger.warning(f"  No 'projects' key found in response. Keys: {list(response.keys())}")
-            return []
+            return {"items": [], "pagination": pagination_info}
         
         projects_data = response["projects"]
         
@@ -1476,7 +1684,7 @@ class TableauClient:
             project_list = projects_data
         else:
             logger.warning(f"  Unexpected projects_data type: {type(projects_data)}")
-            return []
+            return {"items": [], "pagination": pagination_info}
         
         # Normalize to list (Tableau API can return single object or array)
         if isinstance(project_list, list):
@@ -1486,8 +1694,15 @@ class TableauClient:
         else:
             projects = []
         
+        # If totalAvailable not in pagination, use len(items) as fallback (single page)
+        if pagination_info["totalAvailable"] is None:
+            pagination_info["totalAvailable"] = len(projects)
+        
         logger.info(f"  Found {len(projects)} projects")
-        return projects
+        return {
+            "items": projects,
+            "pagination": pagination_info
+        }
     
     async def get_project_contents(
         self,
@@ -1508,44 +1723,35 @@ class TableauClient:
         if not site_id:
             raise ValueError("Site ID not available. Ensure authentication completed successfully.")
         
-        # Get all datasources and filter by project_id client-side
-        # (Some Tableau API versions don't support projectId filter for datasources)
-        logger.info(f"Fetching all datasources and filtering by project_id: {project_id}")
-        all_datasources_result = await self.get_datasources(page_size=1000)
-        all_datasources = all_datasources_result["items"]
-        
-        def matches_project(obj: Dict[str, Any], proj_id: str) -> bool:
-            """Check if object belongs to the specified project."""
-            # Try different response formats
-            project = obj.get("project")
-            if isinstance(project, dict):
-                return project.get("id") == proj_id
-            elif isinstance(project, str):
-                return project == proj_id
-            # Try direct projectId/project_id fields
-            return obj.get("projectId") == proj_id or obj.get("project_id") == proj_id
-        
-        datasources = [ds for ds in all_datasources if matches_project(ds, project_id)]
-        logger.info(f"Filtered to {len(datasources)} datasources in project {project_id}")
-        
-        # Get workbooks in project (workbooks API may support projectId filter)
-        try:
-            workbooks_result = await self.get_workbooks(project_id=project_id, page_size=1000)
-            workbooks = workbooks_result["items"]
-        except TableauAPIError as e:
-            # If workbooks filter fails, fetch all and filter client-side
-            error_msg = str(e).lower()
-            if "projectid" in error_msg or "filter" in error_msg or "400065" in str(e):
-                logger.warning(f"Workbooks API doesn't support projectId filter, filtering client-side: {e}")
-                all_workbooks_result = await self.get_workbooks(page_size=1000)
-                all_workbooks = all_workbooks_result["items"]
-                workbooks = [wb for wb in all_workbooks if matches_project(wb, project_id)]
-                logger.info(f"Filtered to {len(workbooks)} workbooks in project {project_id}")
-            else:
+        async def list_datasources() -> List[Dict[str, Any]]:
+            # Get all datasources and filter by project_id client-side
+            # (Some Tableau API versions don't support projectId filter for datasources)
+            logger.info(f"Fetching all datasources and filtering by project_id: {project_id}")
+            datasources = [ds async for ds in self.iter_datasources() if _matches_parent(ds, "project", project_id)]
+            logger.info(f"Filtered to {len(datasources)} datasources in project {project_id}")
+            return datasources
+        
+        async def list_workbooks() -> List[Dict[str, Any]]:
+            # Get workbooks in project (workbooks API may support projectId filter)
+            try:
+                return [wb async for wb in self.iter_workbooks(project_id=project_id)]
+            except TableauAPIError as e:
+                # If workbooks filter fails, fetch all and filter client-side
+                error_msg = str(e).lower()
+                if "projectid" in error_msg or "filter" in error_msg or "400065" in str(e):
+                    logger.warning(f"Workbooks API doesn't support projectId filter, filtering client-side: {e}")
+                    workbooks = [wb async for wb in self.iter_workbooks() if _matches_parent(wb, "project", project_id)]
+                    logger.info(f"Filtered to {len(workbooks)} workbooks in project {project_id}")
+                    return workbooks
                 raise
         
-        # Get nested projects
-        nested_projects = await self.get_projects(parent_project_id=project_id, page_size=1000)
+        async def list_projects() -> List[Dict[str, Any]]:
+            return [p async for p in self.iter_projects(parent_project_id=project_id)]
+        
+        # The three listings are independent; page fetches share the per-server limit
+        datasources, workbooks, nested_projects = await asyncio.gather(
+            list_datasources(), list_workbooks(), list_projects()
+        )
         
         return {
             "project_id": project_id,
@@ -1811,28 +2017,29 @@ class TableauClient:
             )
         return resp.content
     
-    async def get_view_data(
+    async def iter_view_data_rows(
         self,
         view_id: str,
-        max_rows: int = 1000,
+        max_rows: Optional[int] = None,
         filters: Optional[Dict[str, str | List[str]]] = None
-    ) -> Dict[str, Any]:
+    ) -> AsyncIterator[List[str]]:
         """
-        Get data from a view using Tableau Data API.
+        Stream rows from a view using Tableau Data API.
         
         Uses: GET /api/api-version/sites/site-id/views/view-id/data
         
-        Note: This endpoint returns CSV format, not JSON, so we need to handle it specially.
-        Supports view filters via vf_fieldname=value query params.
+        The CSV body is decoded and parsed incrementally; reading stops (and the
+        connection is released) once max_rows data rows have been yielded, so
+        memory is bounded by max_rows rather than view size.
         
         Args:
             view_id: View ID (LUID; commas/suffixes like ,1:1 are stripped)
-            max_rows: Maximum number of rows to return
+            max_rows: Maximum number of data rows to yield (None = all)
             filters: Optional dict of field_name -> value or list of values.
                      e.g. {"Region": "West"} or {"Category": ["Technology", "Furniture"]}
             
-        Returns:
-            Dictionary with columns and data
+        Yields:
+            The header row first, then data rows (values stripped, empty lines skipped)
         """
         await self._ensure_authenticated()
         site_id = self.site_id or ""
@@ -1862,56 +2069,63 @@ class TableauClient:
             url = f"{base_url}/{endpoint_clean}"
             headers = self._get_auth_headers()
             
-            logger.debug(f"Making GET request to view data endpoint: {url}")
-            response = await self._client.get(
-                url,
-                headers=headers,
-                params=params,
-            )
-            
-            response.raise_for_status()
-            
-            content_type = response.headers.get('content-type', 'unknown')
-            logger.debug(f"Response Content-Type: {content_type}")
-            
-            # Parse CSV response
-            # Tableau returns CSV format: "Column1,Column2\nValue1,Value2\n..."
-            csv_text = response.text
-            
-            if not csv_text or not csv_text.strip():
-                return {"columns": [], "data": [], "row_count": 0}
-            
-            # Parse CSV string
-            import csv
-            from io import StringIO
-            
-            # Use csv module to properly handle quoted values and commas within fields
-            csv_reader = csv.reader(StringIO(csv_text))
-            lines = list(csv_reader)
-            
-            if len(lines) < 1:
-                return {"columns": [], "data": [], "row_count": 0}
-            
-            # First line is headers
-            columns = [col.strip() for col in lines[0]]
-            
-            # Remaining lines are data (limit to max_rows)
-            data_rows = []
-            for line in lines[1:max_rows+1]:
-                if line:  # Skip empty lines
-                    data_rows.append([val.strip() if val else "" for val in line])
-            
-            logger.debug(f"Parsed CSV: {len(columns)} columns, {len(data_rows)} rows")
-            
-            return {
-                "columns": columns,
-                "data": data_rows,
-                "row_count": len(data_rows)
-            }
+            logger.debug(f"Streaming GET request to view data endpoint: {url}")
+            async with self._client.stream("GET", url, headers=headers, params=params) as response:
+                response.raise_for_status()
+                logger.debug(f"Response Content-Type: {response.headers.get('content-type', 'unknown')}")
+                
+                # Tableau returns CSV format: "Column1,Column2\nValue1,Value2\n..."
+                header_seen = False
+                row_count = 0
+                async for line in _aiter_csv_rows(response.aiter_text()):
+                    if not header_seen:
+                        header_seen = True
+                        yield [col.strip() for col in line]
+                        continue
+                    if max_rows is not None and row_count >= max_rows:
+                        break
+                    if line:  # Skip empty lines
+                        row_count += 1
+                        yield [val.strip() if val else "" for val in line]
         except Exception as e:
             logger.error(f"Error getting view data for {view_id}: {e}")
             raise TableauAPIError(f"Failed to get view data: {str(e)}")
     
+    async def get_view_data(
+        self,
+        view_id: str,
+        max_rows: int = 1000,
+        filters: Optional[Dict[str, str | List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get data from a view using Tableau Data API.
+        
+        Uses: GET /api/api-version/sites/site-id/views/view-id/data
+        
+        Note: This endpoint returns CSV format, not JSON. The body is streamed via
+        iter_view_data_rows and reading stops once max_rows rows are parsed.
+        Supports view filters via vf_fieldname=value query params.
+        
+        Args:
+            view_id: View ID (LUID; commas/suffixes like ,1:1 are stripped)
+            max_rows: Maximum number of rows to return
+            filters: Optional dict of field_name -> value or list of values.
+                     e.g. {"Region": "West"} or {"Category": ["Technology", "Furniture"]}
+            
+        Returns:
+            ColumnarResult (dict-like with columns, data and row_count)
+        """
+        builder: Optional[ColumnarBuilder] = None
+        async for row in self.iter_view_data_rows(view_id, max_rows=max_rows, filters=filters):
+            if builder is None:
+                builder = ColumnarBuilder(row)  # First row is the header
+            else:
+                builder.append(row)
+        
+        result = (builder or ColumnarBuilder([])).build()
+        logger.debug(f"Parsed CSV: {len(result['columns'])} columns, {result['row_count']} rows")
+        return result
+    
     async def get_datasource_schema(
         self,
         datasource_id: str,
@@ -2216,7 +2430,7 @@ class TableauClient:
             limit: Optional row limit (overrides query options if provided)
             
         Returns:
-            Dictionary with columns, data, and row_count
+            ColumnarResult (dict-like with columns, data, and row_count)
         """
         await self._ensure_authenticated()
         
@@ -2340,8 +2554,8 @@ class TableauClient:
         if "tsResponse" in response_data:
             response_data = response_data["tsResponse"]
         
-        # Parse query response
-        data_rows = []
+        # Parse query response into a columnar result
+        result: Optional[ColumnarResult] = None
         column_names = []
         
         # Apply limit client-side if provided (VDS API doesn't support limit in options)
@@ -2355,10 +2569,8 @@ class TableauClient:
                     # OBJECTS format - column names are in each row's keys
                     column_names = list(first_row.keys())
                     logger.debug(f"OBJECTS format: extracted {len(column_names)} columns: {column_names}")
-                    for row in raw_data:
-                        if isinstance(row, dict):
-                            row_array = [row.get(col_name) for col_name in column_names]
-                            data_rows.append(row_array)
+                    records = raw_data[:limit] if limit else raw_data
+                    result = ColumnarResult.from_records(records, column_names)
                 
                 elif isinstance(first_row, list):
                     # ARRAYS format - need to determine column order
@@ -2403,32 +2615,30 @@ class TableauClient:
                         )
                         column_names = [f"Column_{i+1}" for i in range(len(first_row))]
                     
-                    data_rows = raw_data
+                    rows = raw_data[:limit] if limit else raw_data
+
+                    # Validate column count matches data (ColumnarResult pads short rows
+                    # and drops extra values, which would otherwise go unnoticed)
+                    mismatched = sum(1 for row in rows if len(row) != len(column_names))
+                    if mismatched:
+                        logger.error(
+                            f"Column count mismatch: {len(column_names)} column names but {mismatched} "
+                            f"rows have a different number of values. This will cause data misalignment!"
+                        )
+
+                    result = ColumnarResult.from_rows(column_names, rows)
         
-        # Apply limit if specified
-        if limit and len(data_rows) > limit:
-            data_rows = data_rows[:limit]
+        if result is None:
+            result = ColumnarResult.from_rows(column_names, [])
         
-        logger.info(f"  Found {len(data_rows)} rows and {len(column_names)} columns")
+        logger.info(f"  Found {result['row_count']} rows and {len(column_names)} columns")
         logger.info(f"  Column names: {column_names}")
-        if data_rows and len(data_rows) > 0:
-            logger.debug(f"  First row sample: {data_rows[0][:3] if len(data_rows[0]) >= 3 else data_rows[0]}")
-            logger.debug(f"  First row full: {data_rows[0]}")
-        
-        # Validate column count matches data
-        if data_rows and len(data_rows) > 0:
-            expected_cols = len(data_rows[0])
-            if len(column_names) != expected_cols:
-                logger.error(
-                    f"Column count mismatch: {len(column_names)} column names but "
-                    f"{expected_cols} values per row. This will cause data misalignment!"
-                )
+        if result["row_count"] > 0:
+            first_row = result.head(1)[0]
+            logger.debug(f"  First row sample: {first_row[:3]}")
+            logger.debug(f"  First row full: {first_row}")
         
-        return {
-            "columns": column_names,
-            "data": data_rows,
-            "row_count": len(data_rows),
-        }
+        return result
     
     async def read_metadata(self, datasource_id: str) -> Dict[str, Any]:
         """
@@ -2787,6 +2997,9 @@ class TableauClient:
         Get summary data for view; if Dashboard, expand to containing Sheet objects via Metadata API.
         
         Uses Metadata API GraphQL to get Dashboard's sheets, then REST API to fetch data for each Sheet.
+        Sheets are fetched concurrently, bounded by the per-server TABLEAU_MAX_CONCURRENT_VIEW_FETCHES
+        limit. Missing sheet LUIDs are resolved via the workbook's views while sheets with known LUIDs
+        are already being fetched. Results keep dashboard sheet order; a failing sheet is skipped.
         Falls back to single-view REST fetch if Metadata API fails or view is a Sheet (not Dashboard).
         
         Args:
@@ -2804,30 +3017,34 @@ class TableauClient:
             dashboard = dashboards[0]
             sheets = dashboard["sheets"]
             # Fill in missing luids for hidden sheets via workbook views(path:"")
-            name_to_luid: Dict[str, str] = {}
+            luid_task: Optional[asyncio.Task] = None
             sheets_without_luid = [s for s in sheets if not s.get("luid") and s.get("name")]
             if sheets_without_luid:
                 wb = dashboard.get("workbook") or {}
                 wb_luid = wb.get("luid") if isinstance(wb, dict) else None
                 if wb_luid:
-                    name_to_luid = await self._rest_get_workbook_views_name_to_luid(wb_luid)
-            results = []
-            for sheet in sheets:
-                sid = sheet.get("luid") or (name_to_luid.get(sheet.get("name") or "") if name_to_luid else None)
+                    luid_task = asyncio.create_task(self._rest_get_workbook_views_name_to_luid(wb_luid))
+            
+            semaphore = _get_view_fetch_semaphore(self.server_url)
+            
+            async def fetch_sheet(sheet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                sid = sheet.get("luid")
+                if not sid and luid_task is not None:
+                    name_to_luid = await luid_task
+                    sid = name_to_luid.get(sheet.get("name") or "")
                 if not sid:
-                    continue
+                    return None
                 try:
-                    data = await self.get_view_data(sid, max_rows=max_rows_per_view)
-                    results.append({
-                        "view_id": sid,
-                        "name": sheet.get("name"),
-                        "columns": data["columns"],
-                        "data": data["data"],
-                        "row_count": data["row_count"]
-                    })
+                    async with semaphore:
+                        data = await self.get_view_data(sid, max_rows=max_rows_per_view)
                 except Exception as e:
                     logger.warning(f"Failed to get data for sheet {sid} ({sheet.get('name')}): {e}")
                     # Continue with other sheets even if one fails
+                    return None
+                return result_view(data, view_id=sid, name=sheet.get("name"))
+            
+            fetched = await asyncio.gather(*(fetch_sheet(sheet) for sheet in sheets))
+            results = [r for r in fetched if r is not None]
             if results:
                 return {
                     "views": results,
@@ -2838,13 +3055,7 @@ class TableauClient:
         try:
             data = await self.get_view_data(clean_id, max_rows=max_rows_per_view)
             return {
-                "views": [{
-                    "view_id": clean_id,
-                    "name": None,
-                    "columns": data["columns"],
-                    "data": data["data"],
-                    "row_count": data["row_count"]
-                }],
+                "views": [result_view(data, view_id=clean_id, name=None)],
                 "total_rows": data["row_count"]
             }
         except Exception as e:
@@ -3168,6 +3379,111 @@ class TableauClient:
         logger.debug(f"Statistics for {field_caption}: {stats}")
         return stats
 
+    async def _post_stats_query(self, datasource_id: str, fields: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run an aggregated OBJECTS query for statistics and return its rows."""
+        server_base = self.server_url.rstrip('/')
+        response = await self._client.post(
+            f"{server_base}/api/v1/vizql-data-service/query-datasource",
+            json={
+                "datasource": {"datasourceLuid": datasource_id},
+                "query": {"fields": fields},
+                "options": {"returnFormat": "OBJECTS", "disaggregate": False}
+            },
+            headers=self._get_auth_headers(),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json().get("data") or []
+        return [row for row in data if isinstance(row, dict)]
+    
+    async def get_row_count(self, datasource_id: str) -> Optional[int]:
+        """
+        Get total row count via SUM(Number of Records).
+        
+        Returns:
+            Row count, or None if the datasource has no Number of Records field
+        """
+        await self._ensure_authenticated()
+        try:
+            rows = await self._post_stats_query(
+                datasource_id,
+                [{"fieldCaption": "Number of Records", "function": "SUM", "fieldAlias": "total_rows"}]
+            )
+        except Exception as e:
+            logger.debug(f"Could not get row count (Number of Records not available): {e}")
+            return None
+        if not rows:
+            return None
+        value = rows[0].get("total_rows")
+        if value is None:
+            value = next(iter(rows[0].values()), None)
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return None
+    
+    async def get_measure_statistics(
+        self,
+        datasource_id: str,
+        field_captions: List[str],
+        total_rows: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get MIN/MAX/MEDIAN/null% for several numeric measures in one query.
+        
+        Each aggregate is aliased ("<index>:<function>") so results map back
+        to fields without parsing column names.
+        
+        Args:
+            datasource_id: Datasource LUID
+            field_captions: Numeric measure captions
+            total_rows: Row count for null_percentage (see get_row_count)
+            
+        Returns:
+            Dictionary of field caption -> statistics, same shape as get_field_statistics
+            
+        Raises:
+            httpx.HTTPError: If the query fails (e.g. one field is not queryable)
+            ValueError: If the response does not contain the aliased columns
+        """
+        await self._ensure_authenticated()
+        
+        functions = ("MIN", "MAX", "COUNT", "MEDIAN")
+        fields = [
+            {"fieldCaption": caption, "function": function, "fieldAlias": f"{i}:{function}"}
+            for i, caption in enumerate(field_captions)
+            for function in functions
+        ]
+        rows = await self._post_stats_query(datasource_id, fields)
+        row = rows[0] if rows else {}
+        if rows and not any(field["fieldAlias"] in row for field in fields):
+            raise ValueError("Statistics response does not contain aliased columns")
+        
+        def as_float(value: Any) -> Optional[float]:
+            if value is None or value == "":
+                return None
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                return None
+        
+        results = {}
+        for i, caption in enumerate(field_captions):
+            non_null_count = as_float(row.get(f"{i}:COUNT"))
+            null_percentage = None
+            if non_null_count is not None and total_rows:
+                null_percentage = (total_rows - int(non_null_count)) / total_rows * 100
+            results[caption] = {
+                "cardinality": None,
+                "sample_values": [],
+                "value_counts": [],
+                "min": as_float(row.get(f"{i}:MIN")),
+                "max": as_float(row.get(f"{i}:MAX")),
+                "median": as_float(row.get(f"{i}:MEDIAN")),
+                "null_percentage": null_percentage
+            }
+        return results
+
     async def list_supported_functions(self, datasource_id: str) -> List[Dict[str, Any]]:
         """
         List supported Tableau functions for a datasource.
@@ -3228,8 +3544,8 @@ class TableauClient:
             raise TableauAPIError(f"Error listing supported functions: {str(e)}")
     
     async def close(self) -> None:
-        """Close HTTP client."""
-        await self._client.aclose()
+        """Release the client. The shared HTTP connection pool stays open for reuse."""
+        return None
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -15,7 +15,7 @@ class TableauMemoryTokenStore:
     Uses the existing in-memory cache. Multiple tokens OK for Connected App.
     """
     
-    def get(self, user_id: int, config_id: int, auth_type: str) -> Optional[TokenEntry]:
+    async def get(self, user_id: int, config_id: int, auth_type: str) -> Optional[TokenEntry]:
         """Get cached token from in-memory cache."""
         cached = get_cached_token(user_id, config_id, auth_type)
         if not cached:
@@ -28,7 +28,7 @@ class TableauMemoryTokenStore:
             site_content_url=cached.get("site_content_url"),
         )
     
-    def set(self, user_id: int, config_id: int, auth_type: str, entry: TokenEntry) -> None:
+    async def set(self, user_id: int, config_id: int, auth_type: str, entry: TokenEntry) -> None:
         """Store token in in-memory cache."""
         set_cached_token(
             user_id,
@@ -40,7 +40,7 @@ class TableauMemoryTokenStore:
             entry.site_content_url,
         )
     
-    def invalidate(self, user_id: int, config_id: int, auth_type: str) -> None:
+    async def invalidate(self, user_id: int, config_id: int, auth_type: str) -> None:
         """Remove token from in-memory cache."""
         invalidate_cached_token(user_id, config_id, auth_type)
 
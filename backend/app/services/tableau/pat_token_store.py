@@ -4,7 +4,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from app.core.cache import redis_client
+from app.core.cache import get_async_redis
 from app.services.tableau.token_store import TableauTokenStore, TokenEntry
 
 logger = logging.getLogger(__name__)
@@ -24,14 +24,14 @@ class TableauPATTokenStore:
         """Generate Redis key for token."""
         return f"tableau:pat:{user_id}:{config_id}"
     
-    def get(self, user_id: int, config_id: int, auth_type: str) -> Optional[TokenEntry]:
+    async def get(self, user_id: int, config_id: int, auth_type: str) -> Optional[TokenEntry]:
         """Get cached PAT token if valid."""
         if auth_type != "pat":
             return None
         
         try:
             key = self._key(user_id, config_id)
-            data = redis_client.get(key)
+            data = await get_async_redis().get(key)
             if not data:
                 return None
             
@@ -41,7 +41,7 @@ class TableauPATTokenStore:
             
             # Check if expired (with 1 minute buffer)
             if datetime.now(timezone.utc) >= (expires_at - timedelta(minutes=1)):
-                redis_client.delete(key)
+                await get_async_redis().delete(key)
                 return None
             
             return TokenEntry(
@@ -54,7 +54,7 @@ class TableauPATTokenStore:
             logger.error(f"Error getting PAT token from Redis: {e}")
             return None
     
-    def set(self, user_id: int, config_id: int, auth_type: str, entry: TokenEntry) -> None:
+    async def set(self, user_id: int, config_id: int, auth_type: str, entry: TokenEntry) -> None:
         """Store PAT token in Redis."""
         if auth_type != "pat":
             return
@@ -67,7 +67,7 @@ class TableauPATTokenStore:
                 "site_id": entry.site_id,
                 "site_content_url": entry.site_content_url,
             }
-            redis_client.setex(
+            await get_async_redis().setex(
                 key,
                 PAT_TOKEN_TTL_SECONDS,
                 json.dumps(entry_dict)
@@ -76,14 +76,14 @@ class TableauPATTokenStore:
         except Exception as e:
             logger.error(f"Error storing PAT token in Redis: {e}")
     
-    def invalidate(self, user_id: int, config_id: int, auth_type: str) -> None:
+    async def invalidate(self, user_id: int, config_id: int, auth_type: str) -> None:
         """Remove PAT token from Redis."""
         if auth_type != "pat":
             return
         
         try:
             key = self._key(user_id, config_id)
-            redis_client.delete(key)
+            await get_async_redis().delete(key)
             logger.info(f"Invalidated PAT token in Redis for user={user_id} config={config_id}")
         except Exception as e:
             logger.error(f"Error invalidating PAT token in Redis: {e}")
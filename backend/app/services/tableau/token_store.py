@@ -17,16 +17,16 @@ class TokenEntry:
 
 
 class TableauTokenStore(Protocol):
-    """Protocol for Tableau token storage."""
+    """Protocol for Tableau token storage (async, so Redis-backed stores do not block the event loop)."""
     
-    def get(self, user_id: int, config_id: int, auth_type: str) -> Optional[TokenEntry]:
+    async def get(self, user_id: int, config_id: int, auth_type: str) -> Optional[TokenEntry]:
         """Get cached token if valid."""
         ...
     
-    def set(self, user_id: int, config_id: int, auth_type: str, entry: TokenEntry) -> None:
+    async def set(self, user_id: int, config_id: int, auth_type: str, entry: TokenEntry) -> None:
         """Store token."""
         ...
     
-    def invalidate(self, user_id: int, config_id: int, auth_type: str) -> None:
+    async def invalidate(self, user_id: int, config_id: int, auth_type: str) -> None:
         """Remove cached token."""
         ...
@@ -0,0 +1,72 @@
+"""Process-wide pool of shared httpx clients for Tableau servers.
+
+Creating an httpx.AsyncClient per TableauClient means a new TCP + TLS handshake
+to Tableau on every chat turn. TableauClient instances instead borrow a
+long-lived client from this registry, keyed by
+(server_url, verify_ssl, ssl_cert_path, timeout). Borrowed clients are never
+closed by TableauClient.close(); the registry owns them until shutdown.
+
+Loop scoping, counters and shutdown live in app.core.http_pool; this module
+only decides the key and the Tableau connection limits.
+"""
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_pool import HTTPClientPool
+
+_pool = HTTPClientPool("Tableau")
+_GROUP = "tableau"
+
+
+def _http2_available() -> bool:
+    return _pool.http2_available(settings.TABLEAU_HTTP2)
+
+
+def get_client(
+    server_url: str,
+    verify: Any,
+    ssl_cert_path: Optional[str] = None,
+    timeout: float = 30,
+) -> httpx.AsyncClient:
+    """
+    Borrow the shared httpx client for a Tableau server.
+
+    Args:
+        server_url: Tableau server URL
+        verify: httpx verify value (bool or ssl.SSLContext built from ssl_cert_path)
+        ssl_cert_path: Resolved CA certificate path used to build verify (part of the key)
+        timeout: Default request timeout in seconds
+
+    Returns:
+        Shared httpx.AsyncClient; callers must not close it
+    """
+    verify_key = verify if isinstance(verify, bool) else "context"
+    return _pool.get_client(
+        (server_url, verify_key, ssl_cert_path, timeout),
+        _GROUP,
+        verify=verify,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=settings.TABLEAU_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.TABLEAU_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.TABLEAU_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2_available(),
+        label=server_url,
+    )
+
+
+def get_stats() -> Dict[str, Any]:
+    """Get pool hit/miss and connection reuse counters."""
+    return {
+        "clients": _pool.client_count(),
+        **_pool.group_stats(_GROUP),
+        "http2": _http2_available(),
+    }
+
+
+async def close_all() -> None:
+    """Close every shared client on the running loop (application shutdown)."""
+    await _pool.close_all()
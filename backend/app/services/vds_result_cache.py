@@ -0,0 +1,350 @@
+"""Shared cache for VizQL Data Service query results.
+
+Results used to be cached per process under json.dumps(query), so hits were
+lost across workers, equivalent queries with fields or filters in a different
+order missed, and nothing scoped entries to a server or site. Here:
+
+- Keys are a SHA-256 of (server, site, datasource LUID, datasource refresh
+  stamp, canonical query). Fields and filters are sorted and options that do
+  not change the result (returnFormat, limit) are dropped.
+- Entries live in Redis as zlib-compressed JSON, shared by every worker, with
+  a small in-process L1 of decoded results in front.
+- The refresh stamp is the datasource's updatedAt from the REST API (re-read
+  every VDS_RESULT_CACHE_REFRESH_CHECK seconds), so an extract refresh moves
+  queries to new keys instead of serving stale rows until a fixed TTL runs
+  out. Extract entries are kept up to VDS_RESULT_CACHE_MAX_TTL; datasources
+  without extracts (live connections) use VDS_RESULT_CACHE_LIVE_TTL.
+- On a miss, rollup() can answer coarser queries from a finer-grained result
+  already in the L1 (see vds_rollup).
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.columnar import ColumnarResult, result_view
+from app.services.vds_rollup import apply_rollup, plan_rollup
+
+logger = logging.getLogger(__name__)
+
+# Options that do not change which rows come back (execute_vds_query forces OBJECTS and strips limit)
+_IGNORED_OPTIONS = ("returnFormat", "limit")
+# Option values execute_vds_query fills in when absent
+_DEFAULT_OPTIONS = {"disaggregate": False}
+# Seconds Redis is skipped after a connection error
+_REDIS_RETRY_INTERVAL = 30
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def canonical_query(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Order-insensitive form of a VDS query (fields, filters and other list entries are sorted)."""
+    body = query.get("query", {}) or {}
+    canonical = {
+        key: sorted(value, key=_canonical_json) if isinstance(value, list) else value
+        for key, value in body.items()
+    }
+    options = {
+        k: v for k, v in (query.get("options") or {}).items()
+        if k not in _IGNORED_OPTIONS and _DEFAULT_OPTIONS.get(k, object()) != v
+    }
+    return {"query": canonical, "options": options}
+
+
+def _datasource_luid(query: Dict[str, Any]) -> str:
+    return (query.get("datasource") or {}).get("datasourceLuid", "")
+
+
+class _Refresh:
+    """A datasource's last-refresh stamp as last read from the REST API."""
+
+    __slots__ = ("stamp", "has_extracts", "checked_at")
+
+    def __init__(self, stamp: str, has_extracts: bool):
+        self.stamp = stamp
+        self.has_extracts = has_extracts
+        self.checked_at = time.monotonic()
+
+
+class _Entry:
+    """A decoded result held in the L1, with the query it answers."""
+
+    __slots__ = ("expires_at", "fields", "result", "scope", "query")
+
+    def __init__(self, expires_at: float, fields: List[str], result: ColumnarResult, scope: Tuple, query: Dict[str, Any]):
+        self.expires_at = expires_at
+        # Canonical JSON of each field, in the stored column order
+        self.fields = fields
+        self.result = result
+        # (server, site, datasource LUID, refresh stamp)
+        self.scope = scope
+        self.query = query
+
+
+class VDSResultCache:
+    """Two-level (in-process L1 + Redis) cache of VDS query results."""
+
+    def __init__(self, redis_client: Any = None, l1_entries: Optional[int] = None):
+        """
+        Args:
+            redis_client: Async Redis client (defaults to app.core.cache.get_async_redis())
+            l1_entries: Decoded results kept in process (defaults to settings)
+        """
+        self._redis = redis_client
+        self.l1_entries = l1_entries if l1_entries is not None else settings.VDS_RESULT_CACHE_L1_ENTRIES
+        self._l1: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._refresh: Dict[Tuple[str, str, str], _Refresh] = {}
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+        self._stats = {
+            "l1_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "rollup_hits": 0,
+            "stores": 0,
+            "stored_bytes": 0,
+            "raw_bytes": 0,
+            "redis_errors": 0,
+        }
+
+    # --- Redis ---------------------------------------------------------------
+
+    def _redis_client(self) -> Optional[Any]:
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            from app.core.cache import get_async_redis
+            return get_async_redis()
+        return self._redis
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        self._stats["redis_errors"] += 1
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_INTERVAL
+        logger.warning(f"VDS result cache {action} failed, using local cache only for {_REDIS_RETRY_INTERVAL}s: {error}")
+
+    # --- keys ----------------------------------------------------------------
+
+    async def _refresh_info(self, tableau_client: Any, luid: str) -> _Refresh:
+        scope = (tableau_client.server_url, tableau_client.site_id or "", luid)
+        info = self._refresh.get(scope)
+        if info is not None and time.monotonic() - info.checked_at < settings.VDS_RESULT_CACHE_REFRESH_CHECK:
+            return info
+        try:
+            datasource = await tableau_client.get_datasource(luid)
+            info = _Refresh(
+                str(datasource.get("updatedAt") or ""),
+                str(datasource.get("hasExtracts", "")).lower() == "true",
+            )
+        except Exception as e:
+            logger.debug(f"Could not read refresh time for datasource {luid}: {e}")
+            if info is not None:
+                # Keep the known stamp so entries stay reachable while Tableau is failing
+                info.checked_at = time.monotonic()
+                return info
+            # Unknown refresh time: cache like a live connection
+            info = _Refresh("", False)
+        self._refresh[scope] = info
+        return info
+
+    async def _locate(self, tableau_client: Any, query: Dict[str, Any]) -> Tuple[str, int, Tuple, Dict[str, Any]]:
+        """Key, TTL, scope and canonical form of a query."""
+        luid = _datasource_luid(query)
+        info = await self._refresh_info(tableau_client, luid)
+        scope = (tableau_client.server_url, tableau_client.site_id or "", luid, info.stamp)
+        canonical = canonical_query(query)
+        digest = hashlib.sha256(_canonical_json([*scope, canonical]).encode()).hexdigest()
+        ttl = settings.VDS_RESULT_CACHE_MAX_TTL if info.has_extracts and info.stamp else settings.VDS_RESULT_CACHE_LIVE_TTL
+        return f"vds_result:{digest}", ttl, scope, canonical
+
+    async def key_for(self, tableau_client: Any, query: Dict[str, Any]) -> Tuple[str, int]:
+        """Cache key and TTL (seconds) for a query against the client's server and site."""
+        key, ttl, _, _ = await self._locate(tableau_client, query)
+        return key, ttl
+
+    # --- encoding ------------------------------------------------------------
+
+    @staticmethod
+    def _fields(query: Dict[str, Any]) -> List[str]:
+        return [_canonical_json(f) for f in (query.get("query", {}) or {}).get("fields", [])]
+
+    @staticmethod
+    def _in_field_order(result: ColumnarResult, stored_fields: List[str], fields: List[str]) -> Optional[ColumnarResult]:
+        """Reorder columns for a query that lists the same fields in another order.
+
+        Columns come back in query field order, so position i of the stored
+        result belongs to stored_fields[i]. Returns None if that cannot hold.
+        """
+        if stored_fields == fields:
+            return result.copy()
+        if len(result["columns"]) != len(stored_fields) or sorted(stored_fields) != sorted(fields):
+            return None
+        order = [stored_fields.index(f) for f in fields]
+        reordered = ColumnarResult(
+            [result["columns"][i] for i in order],
+            [result._columns[i] for i in order],
+            result["row_count"],
+        )
+        if "rollup" in result:
+            reordered["rollup"] = result["rollup"]
+        return reordered
+
+    @staticmethod
+    def _encode(fields: List[str], result: Dict[str, Any]) -> Tuple[bytes, int]:
+        """Compressed payload and its uncompressed size."""
+        payload = {"fields": fields, "columns": result.get("columns", []), "data": result.get("data", [])}
+        raw = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(raw, 6), len(raw)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Tuple[List[str], ColumnarResult]:
+        payload = json.loads(zlib.decompress(blob))
+        return payload["fields"], ColumnarResult.from_rows(payload["columns"], payload["data"])
+
+    # --- public API ----------------------------------------------------------
+
+    async def get(self, tableau_client: Any, query: Dict[str, Any]) -> Optional[ColumnarResult]:
+        """Cached result for a query, or None."""
+        key, _, scope, canonical = await self._locate(tableau_client, query)
+        fields = self._fields(query)
+
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._l1[key]
+                entry = None
+            if entry is not None:
+                self._l1.move_to_end(key)
+        if entry is not None:
+            result = self._in_field_order(entry.result, entry.fields, fields)
+            if result is not None:
+                self._stats["l1_hits"] += 1
+                return result
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.get(key)
+                pipe.ttl(key)
+                blob, ttl = await pipe.execute()
+            except Exception as e:
+                self._redis_failed("read", e)
+                blob = None
+            if blob is not None:
+                stored_fields, stored = self._decode(blob)
+                ttl = ttl if ttl and ttl > 0 else settings.VDS_RESULT_CACHE_LIVE_TTL
+                self._remember(key, _Entry(time.monotonic() + ttl, stored_fields, stored, scope, canonical))
+                result = self._in_field_order(stored, stored_fields, fields)
+                if result is not None:
+                    self._stats["redis_hits"] += 1
+                    return result
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, tableau_client: Any, query: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store a query result in Redis and the L1."""
+        key, ttl, scope, canonical = await self._locate(tableau_client, query)
+        fields = self._fields(query)
+        stored = result if isinstance(result, ColumnarResult) else ColumnarResult.from_rows(
+            result.get("columns", []), result.get("data", [])
+        )
+        self._remember(key, _Entry(time.monotonic() + ttl, fields, stored, scope, canonical))
+        self._stats["stores"] += 1
+
+        client = self._redis_client()
+        if client is None:
+            return
+        blob, raw_size = self._encode(fields, stored)
+        if len(blob) > settings.VDS_RESULT_CACHE_MAX_BYTES:
+            logger.debug(f"VDS result too large for the shared cache ({len(blob)} bytes compressed)")
+            return
+        try:
+            await client.setex(key, ttl, blob)
+        except Exception as e:
+            self._redis_failed("write", e)
+            return
+        self._stats["stored_bytes"] += len(blob)
+        self._stats["raw_bytes"] += raw_size
+
+    async def rollup(self, tableau_client: Any, query: Dict[str, Any]) -> Optional[ColumnarResult]:
+        """Answer a query by re-aggregating a finer-grained cached result, or None.
+
+        Only results decoded into this process's L1 are considered. The
+        smallest result that can answer the query is used, and the answer is
+        kept in the L1 (not Redis) until that result expires. Answers, and
+        later L1 hits on them, carry a "rollup" entry describing their source.
+        """
+        key, _, scope, canonical = await self._locate(tableau_client, query)
+        fields = (query.get("query", {}) or {}).get("fields", [])
+        requested = {"query": {**canonical["query"], "fields": fields}, "options": canonical["options"]}
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                e for e in self._l1.values()
+                if e.scope == scope and e.expires_at > now and len(e.result["columns"]) == len(e.fields)
+            ]
+        for source in sorted(candidates, key=lambda e: e.result["row_count"]):
+            cached = {
+                "query": {**source.query["query"], "fields": [json.loads(f) for f in source.fields]},
+                "options": source.query["options"],
+            }
+            plan = plan_rollup(requested, cached)
+            if plan is None:
+                continue
+            try:
+                answer = apply_rollup(source.result, plan)
+            except Exception as e:
+                logger.debug(f"Roll-up from a cached result failed: {e}")
+                continue
+            answer = result_view(answer, rollup={"source_rows": source.result["row_count"]})
+            self._remember(key, _Entry(source.expires_at, self._fields(query), answer, scope, canonical))
+            self._stats["rollup_hits"] += 1
+            logger.info(f"Rolled up {source.result['row_count']} cached rows into {answer['row_count']}")
+            return answer.copy()
+        return None
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._l1[key] = entry
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_entries:
+                self._l1.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and compression ratio."""
+        stats = dict(self._stats)
+        lookups = stats["l1_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["l1_entries"] = len(self._l1)
+        stats["hit_rate"] = ((stats["l1_hits"] + stats["redis_hits"]) / lookups * 100) if lookups > 0 else 0.0
+        stats["rollup_rate"] = (stats["rollup_hits"] / stats["misses"] * 100) if stats["misses"] else 0.0
+        stats["compression_ratio"] = (stats["raw_bytes"] / stats["stored_bytes"]) if stats["stored_bytes"] else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Clear the in-process L1, refresh stamps and counters (Redis entries expire on their own)."""
+        with self._lock:
+            self._l1.clear()
+            self._refresh.clear()
+        self._redis_down_until = 0.0
+        for name in self._stats:
+            self._stats[name] = 0
+
+
+# Global VDS result cache
+_vds_result_cache: Optional[VDSResultCache] = None
+
+
+def get_vds_result_cache() -> VDSResultCache:
+    """Get the global VDS result cache."""
+    global _vds_result_cache
+    if _vds_result_cache is None:
+        _vds_result_cache = VDSResultCache()
+    return _vds_result_cache
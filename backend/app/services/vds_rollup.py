@@ -0,0 +1,205 @@
+"""Answer coarser VDS queries from cached finer-grained results.
+
+Exploratory sessions tend to ask "sales by region and category", then "sales
+by region", then "total sales". When a cached result for the same datasource
+already holds every requested dimension, the coarser answer can be computed
+locally by grouping on the requested dimensions and re-aggregating the
+measures, instead of sending another query to VizQL Data Service.
+
+A cached result can answer a request when:
+
+- every requested field appears in the cached query unchanged (same caption,
+  function, alias and rounding; sort settings may differ and are applied
+  locally);
+- every measure re-aggregates: SUM, MIN and MAX with themselves, COUNT as a
+  sum of counts (AVG, COUNTD, MEDIAN and calculations do not);
+- the cached filters are all present in the request, none of them filters on
+  an aggregate, and any extra requested filters are SET filters on cached
+  dimensions, which are applied to the cached rows before grouping;
+- the query options are identical and the result is not disaggregated.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.services.columnar import ColumnarResult, as_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Measure function -> pandas aggregation used to roll it up
+REAGGREGATIONS = {"SUM": "sum", "MIN": "min", "MAX": "max", "COUNT": "sum"}
+
+# Date-part and truncation functions keep a field a dimension
+DIMENSION_FUNCTIONS = {
+    "YEAR", "QUARTER", "MONTH", "WEEK", "DAY",
+    "TRUNC_YEAR", "TRUNC_QUARTER", "TRUNC_MONTH", "TRUNC_WEEK", "TRUNC_DAY",
+}
+
+# Field keys that only affect ordering
+_SORT_KEYS = ("sortDirection", "sortPriority")
+
+
+def _identity(field: Dict[str, Any]) -> str:
+    return json.dumps({k: v for k, v in field.items() if k not in _SORT_KEYS}, sort_keys=True, default=str)
+
+
+def _filter_key(filter_: Dict[str, Any]) -> str:
+    return json.dumps(filter_, sort_keys=True, default=str)
+
+
+def _function(field: Dict[str, Any]) -> str:
+    return str(field.get("function") or "").upper()
+
+
+def _is_dimension(field: Dict[str, Any]) -> bool:
+    return "calculation" not in field and (not _function(field) or _function(field) in DIMENSION_FUNCTIONS)
+
+
+def plan_rollup(requested: Dict[str, Any], cached: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Work out how to answer one VDS query from another query's result.
+
+    Args:
+        requested: Query to answer (VDS query body with "query" and "options")
+        cached: Query the cached result was produced by
+
+    Returns:
+        Plan for apply_rollup(), or None if the cached result cannot answer the request
+    """
+    requested_body = requested.get("query", {}) or {}
+    cached_body = cached.get("query", {}) or {}
+    if (requested.get("options") or {}) != (cached.get("options") or {}):
+        return None
+    if (requested.get("options") or {}).get("disaggregate"):
+        return None
+    if set(requested_body) - {"fields", "filters"} or set(cached_body) - {"fields", "filters"}:
+        return None
+
+    cached_fields = cached_body.get("fields", [])
+    positions = {_identity(f): i for i, f in enumerate(cached_fields)}
+    fields = requested_body.get("fields", [])
+    if not fields:
+        return None
+
+    dimensions: List[int] = []
+    measures: List[Dict[str, Any]] = []
+    for field in fields:
+        position = positions.get(_identity(field))
+        if position is None:
+            return None
+        if _is_dimension(field):
+            dimensions.append(position)
+        elif "calculation" not in field and _function(field) in REAGGREGATIONS:
+            measures.append({"position": position, "how": REAGGREGATIONS[_function(field)]})
+        else:
+            return None
+
+    cached_filters = {_filter_key(f): f for f in cached_body.get("filters", [])}
+    requested_filters = {_filter_key(f): f for f in requested_body.get("filters", [])}
+    if not set(cached_filters) <= set(requested_filters):
+        return None
+    for filter_ in cached_filters.values():
+        target = filter_.get("field") or {}
+        if "calculation" in target or (_function(target) and _function(target) not in DIMENSION_FUNCTIONS):
+            # Aggregate filters depend on the cached query's level of detail
+            return None
+
+    dimension_positions = {
+        f["fieldCaption"]: i for i, f in enumerate(cached_fields)
+        if set(f) - set(_SORT_KEYS) == {"fieldCaption"}
+    }
+    local_filters = []
+    for key, filter_ in requested_filters.items():
+        if key in cached_filters:
+            continue
+        target = filter_.get("field") or {}
+        position = dimension_positions.get(target.get("fieldCaption"))
+        if (
+            filter_.get("filterType") != "SET"
+            or set(target) != {"fieldCaption"}
+            or position is None
+            or filter_.get("context")
+        ):
+            return None
+        local_filters.append({
+            "position": position,
+            "values": {str(v) for v in filter_.get("values", [])},
+            "exclude": bool(filter_.get("exclude")),
+        })
+    if local_filters and any(f.get("filterType") == "TOP" for f in cached_filters.values()):
+        # Tableau applies dimension filters before TOP filters
+        return None
+
+    sort = sorted(
+        (
+            (field["sortPriority"], i, str(field.get("sortDirection", "ASC")).upper() != "DESC")
+            for i, field in enumerate(fields)
+            if field.get("sortPriority") is not None
+        ),
+    )
+    return {
+        "positions": [positions[_identity(f)] for f in fields],
+        "dimensions": dimensions,
+        "measures": measures,
+        "filters": local_filters,
+        "sort": [(i, ascending) for _, i, ascending in sort],
+    }
+
+
+def _values(series: pd.Series) -> List[Any]:
+    return [None if isinstance(v, float) and v != v else v for v in series.tolist()]
+
+
+def _aggregate(values: Any, how: str) -> Any:
+    # Missing values stay missing (a plain sum of an empty group is 0)
+    return values.sum(min_count=1) if how == "sum" else getattr(values, how)()
+
+
+def apply_rollup(result: Dict[str, Any], plan: Dict[str, Any]) -> ColumnarResult:
+    """Compute a planned roll-up from a cached result.
+
+    Args:
+        result: Cached result, columns in its query's field order
+        plan: Plan from plan_rollup()
+
+    Returns:
+        Result with one column per requested field, in requested field order
+    """
+    df = as_dataframe(result)
+    names = list(df.columns)
+    df.columns = range(len(names))
+
+    for filter_ in plan["filters"]:
+        column = df[filter_["position"]]
+        matches = column.notna() & column.map(str).isin(filter_["values"])
+        df = df[~matches if filter_["exclude"] else matches]
+
+    keys = list(dict.fromkeys(plan["dimensions"]))
+    measures = {m["position"]: m["how"] for m in plan["measures"]}
+    if keys:
+        groups = df.groupby(keys, dropna=False, sort=False)
+        if measures:
+            grouped = pd.DataFrame({
+                position: _aggregate(groups[position], how) for position, how in measures.items()
+            }).reset_index()
+        else:
+            grouped = df[keys].drop_duplicates()
+    else:
+        grouped = pd.DataFrame({position: [_aggregate(df[position], how)] for position, how in measures.items()})
+
+    columns = [_values(grouped[position]) for position in plan["positions"]]
+    rows = [list(row) for row in zip(*columns)]
+    if plan["sort"]:
+        for index, ascending in reversed(plan["sort"]):
+            try:
+                # Missing values sort last either way
+                rows.sort(
+                    key=lambda row: (row[index] is None if ascending else row[index] is not None,
+                                     0 if row[index] is None else row[index]),
+                    reverse=not ascending,
+                )
+            except TypeError:
+                logger.debug("Mixed value types in a sort column, keeping group order")
+                break
+    return ColumnarResult.from_rows([names[p] for p in plan["positions"]], rows)
@@ -6,6 +6,8 @@ import csv
 import io
 
 from app.services.agents.summary_agent import SummaryAgent
+from app.services.crosstab import crosstab_from_rows
+from app.services import export_stream
 from app.services.tableau.client import TableauClient, TableauClientError
 
 logger = logging.getLogger(__name__)
@@ -108,81 +110,51 @@ async def tableau_export_crosstab(
     row_fields: List[str],
     col_fields: List[str],
     measure: str,
+    aggregation: str = "sum",
+    include_totals: bool = True,
 ) -> Dict[str, Any]:
     """
     Export data as a crosstab (pivot table).
     
+    The view is streamed and aggregated in chunks, so large views are pivoted
+    without loading every row. Duplicate cells are aggregated.
+    
     Args:
         view_id: View ID to export
         row_fields: List of field names for rows
         col_fields: List of field names for columns
         measure: Measure field name to aggregate
+        aggregation: Aggregation for cells and totals (sum, avg, count, min, max)
+        include_totals: Whether to include row, column and grand totals
     
     Returns:
-        Dictionary with 'crosstab' structure containing 'rows', 'columns', and 'data'
+        Dictionary with 'crosstab' structure containing 'rows', 'columns', 'data'
+        (a rows x columns matrix, None for empty cells) and the totals
     """
     try:
-        agent = get_summary_agent()
-        view_data = await agent._get_view_data(view_id)
-        
-        data = view_data.get("data", [])
-        columns = view_data.get("columns", [])
+        client = get_tableau_client()
+        result = await crosstab_from_rows(
+            client.iter_view_data_rows(view_id),
+            row_fields,
+            col_fields,
+            measure,
+            aggregation=aggregation,
+            include_totals=include_totals,
+        )
         
-        if not data or not columns:
+        if not result["row_count"]:
             return {
                 "error": "No data available",
-                "crosstab": {
-                    "rows": [],
-                    "columns": [],
-                    "data": {}
-                }
+                "crosstab": result["crosstab"],
             }
         
-        # Build crosstab structure
-        crosstab = {
-            "rows": [],
-            "columns": [],
-            "data": {}
-        }
-        
-        # Get column indices
-        row_indices = [columns.index(f) if f in columns else None for f in row_fields]
-        col_indices = [columns.index(f) if f in columns else None for f in col_fields]
-        measure_index = columns.index(measure) if measure in columns else None
-        
-        if measure_index is None:
-            return {
-                "error": f"Measure '{measure}' not found in columns",
-                "crosstab": crosstab
-            }
-        
-        # Build crosstab data
-        row_keys = set()
-        col_keys = set()
-        
-        for row in data:
-            if len(row) <= max([i for i in row_indices + col_indices + [measure_index] if i is not None]):
-                continue
-            
-            row_key = tuple(row[i] if i is not None else "" for i in row_indices)
-            col_key = tuple(row[i] if i is not None else "" for i in col_indices)
-            measure_value = row[measure_index] if measure_index is not None else 0
-            
-            row_keys.add(row_key)
-            col_keys.add(col_key)
-            
-            if row_key not in crosstab["data"]:
-                crosstab["data"][row_key] = {}
-            crosstab["data"][row_key][col_key] = measure_value
-        
-        crosstab["rows"] = [list(k) for k in sorted(row_keys)]
-        crosstab["columns"] = [list(k) for k in sorted(col_keys)]
-        
         return {
-            "crosstab": crosstab,
+            "crosstab": result["crosstab"],
             "row_fields": row_fields,
             "col_fields": col_fields,
             "measure": measure,
+            "aggregation": aggregation,
+            "row_count": result["row_count"],
         }
     except Exception as e:
         logger.error(f"Error exporting crosstab: {e}")
@@ -191,7 +163,7 @@ async def tableau_export_crosstab(
             "crosstab": {
                 "rows": [],
                 "columns": [],
-                "data": {}
+                "data": []
             }
         }
 
@@ -240,6 +212,9 @@ async def tableau_batch_export(
     """
     Export data from multiple views in batch.
     
+    Every row is returned in one response; use tableau_export_page for large
+    views.
+    
     Args:
         view_ids: List of view IDs to export
         format: Export format (json, csv, excel)
@@ -249,10 +224,11 @@ async def tableau_batch_export(
     """
     try:
         agent = get_summary_agent()
-        result = await agent.export_views(view_ids, format=format)
         
-        exports = []
-        for dataset in result.get("datasets", []):
+        # Format each view as soon as its export completes (views are fetched concurrently)
+        exports: List[Optional[Dict[str, Any]]] = [None] * len(view_ids)
+        total_rows = 0
+        async for dataset in agent.iter_view_exports(view_ids, format=format):
             export_data = {
                 "view_id": dataset.get("view_id"),
                 "row_count": dataset.get("row_count", 0),
@@ -268,11 +244,12 @@ async def tableau_batch_export(
                     dataset.get("columns", [])
                 )
             
-            exports.append(export_data)
+            exports[dataset["index"]] = export_data
+            total_rows += export_data["row_count"]
         
         return {
             "exports": exports,
-            "total_rows": result.get("total_rows", 0),
+            "total_rows": total_rows,
             "view_count": len(view_ids),
             "format": format,
         }
@@ -287,6 +264,46 @@ async def tableau_batch_export(
         }
 
 
+@mcp.tool()
+async def tableau_export_page(
+    view_ids: List[str],
+    format: str = "csv",
+    page_size: int = 5000,
+    continuation_token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Export views page by page, for views too large to return in one result.
+    
+    Call again with the returned next_token (and the same view_ids) until it is
+    null. A page holds rows from a single view.
+    
+    Args:
+        view_ids: List of view IDs to export
+        format: Page encoding (csv, ndjson, or arrow as a base64 Arrow IPC stream)
+        page_size: Maximum rows per page
+        continuation_token: next_token from the previous page (omit for the first page)
+    
+    Returns:
+        Dictionary with 'view_id', 'columns', 'row_count', 'content' and 'next_token'
+    """
+    try:
+        return await export_stream.read_page(
+            get_tableau_client(),
+            view_ids,
+            format=format,
+            page_size=max(1, min(page_size, 50_000)),
+            continuation_token=continuation_token,
+        )
+    except Exception as e:
+        logger.error(f"Error in paged export: {e}")
+        return {
+            "error": str(e),
+            "row_count": 0,
+            "content": "",
+            "next_token": None,
+        }
+
+
 def _format_as_csv(data: List[List[Any]], columns: List[str]) -> str:
     """Format data as CSV string."""
     output = io.StringIO()
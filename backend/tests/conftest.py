@@ -17,6 +17,33 @@ test_engine = None
 TestSessionLocal = None
 
 
+@pytest.fixture(autouse=True)
+def clear_compiled_graphs():
+    """Compile agent graphs per test so patched graph builders take effect."""
+    from app.services.agents.graph_factory import clear_graph_cache
+    clear_graph_cache()
+    yield
+    clear_graph_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_vds_result_cache():
+    """Start each test with an empty in-process VDS result cache."""
+    from app.services.vds_result_cache import get_vds_result_cache
+    get_vds_result_cache().clear()
+    yield
+    get_vds_result_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_gateway_auth():
+    """Start each test without shared gateway authenticators, tokens or cached provider configs."""
+    from app.services.gateway.auth import registry
+    registry.clear()
+    yield
+    registry.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a test database session with a unique database file."""
@@ -100,7 +127,23 @@ def client(db_session, test_user):
             # Just ensure any pending operations are flushed
             db_session.flush()
     
+    # Async chat/context/feedback endpoints get their own sessions on the same database file
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.core.database import get_async_db, get_async_database_url
+
+    async_engine = create_async_engine(
+        get_async_database_url(str(db_session.get_bind().url)),
+        poolclass=NullPool,
+    )
+    TestAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_current_user] = override_get_current_user
 
     test_client = TestClient(app)
@@ -92,15 +92,15 @@ def mock_tableau_client():
 
 @pytest.fixture
 def mock_ai_client():
-    """Mock UnifiedAIClient at the module level."""
+    """Mock the shared AI client at the module level."""
     # Mock at the import level for all agent nodes
-    with patch('app.services.agents.vizql.nodes.planner.UnifiedAIClient') as mock_class1, \
-         patch('app.services.agents.vizql.nodes.query_builder.UnifiedAIClient') as mock_class2, \
-         patch('app.services.agents.vizql.nodes.refiner.UnifiedAIClient') as mock_class3, \
-         patch('app.services.agents.vizql.nodes.formatter.UnifiedAIClient') as mock_class4, \
-         patch('app.services.agents.summary.nodes.summarizer.UnifiedAIClient') as mock_class5, \
-         patch('app.services.agents.summary.nodes.get_data.UnifiedAIClient') as mock_class6, \
-         patch('app.api.chat.UnifiedAIClient') as mock_class7:
+    with patch('app.services.agents.vizql.nodes.planner.get_ai_client') as mock_class1, \
+         patch('app.services.agents.vizql.nodes.query_builder.get_ai_client') as mock_class2, \
+         patch('app.services.agents.vizql.nodes.refiner.get_ai_client') as mock_class3, \
+         patch('app.services.agents.vizql.nodes.formatter.get_ai_client') as mock_class4, \
+         patch('app.services.agents.summary.nodes.summarizer.get_ai_client') as mock_class5, \
+         patch('app.services.agents.summary.nodes.get_data.get_ai_client') as mock_class6, \
+         patch('app.api.chat.get_ai_client') as mock_class7:
         mock_client = AsyncMock()
         mock_class1.return_value = mock_client
         mock_class2.return_value = mock_client
@@ -801,7 +801,7 @@ class TestChatAPIErrorHandling:
         from app.services.agents.summary.nodes.get_data import get_data_node
         from app.services.agents.summary.nodes.summarizer import summarize_node
 
-        def _create_no_checkpoint():
+        def _create_no_checkpoint(**kwargs):
             w = StateGraph(SummaryAgentState)
             w.add_node("get_data", get_data_node)
             w.add_node("summarizer", summarize_node)
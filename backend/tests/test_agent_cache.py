@@ -0,0 +1,112 @@
+"""Tests for the in-process agent cache."""
+import asyncio
+
+import pytest
+
+from app.services.cache import AgentCache, cached, get_cache
+
+
+def test_evicts_least_recently_used_by_count():
+    """Test the entry limit evicts the least recently used key."""
+    cache = AgentCache(max_entries=2, max_bytes=10_000_000)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_evicts_by_approximate_size():
+    """Test the byte budget bounds the cache and oversized values are skipped."""
+    cache = AgentCache(max_entries=100, max_bytes=3_000)
+    for i in range(5):
+        cache.set(f"k{i}", "x" * 1_000)
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 3_000
+    assert stats["size"] < 5
+    assert cache.get("k4") is not None
+
+    cache.set("huge", "x" * 10_000)
+    assert cache.get("huge") is None
+
+
+def test_expired_entries_are_swept():
+    """Test TTL expiry and cleanup_expired keep byte accounting in step."""
+    cache = AgentCache(max_entries=10, max_bytes=10_000_000)
+    cache.set("old", [1, 2, 3], ttl_seconds=-1)
+    cache.set("new", [1, 2, 3], ttl_seconds=60)
+
+    assert cache.cleanup_expired() == 1
+    stats = cache.get_stats()
+    assert stats["size"] == 1 and stats["expirations"] == 1
+    cache.delete("new")
+    assert cache.get_stats()["bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_single_flight():
+    """Test concurrent misses for one key share a single call."""
+    calls = 0
+
+    @cached("test_single_flight", ttl_seconds=60)
+    async def load(key: str):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"key": key}
+
+    try:
+        results = await asyncio.gather(*(load("a") for _ in range(5)), load("b"))
+    finally:
+        get_cache().clear()
+
+    assert calls == 2
+    assert results[:5] == [{"key": "a"}] * 5
+    assert results[5] == {"key": "b"}
+
+
+@pytest.mark.asyncio
+async def test_cached_single_flight_propagates_errors():
+    """Test waiters see the leader's error and nothing is cached."""
+    calls = 0
+
+    @cached("test_single_flight_error", ttl_seconds=60)
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(fail(), fail(), return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cached_single_flight_survives_leader_cancellation():
+    """Test a waiter recomputes instead of inheriting the first caller's cancellation."""
+    calls = 0
+
+    @cached("test_single_flight_cancel", ttl_seconds=60)
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    try:
+        leader = asyncio.create_task(load())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(load())
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await waiter == 2
+        assert leader.cancelled()
+    finally:
+        get_cache().clear()
@@ -15,7 +15,7 @@ from app.services.ai.models import ChatResponse, StreamChunk, FunctionCall
 @pytest.fixture
 def ai_client():
     """Create UnifiedAIClient instance for testing."""
-    return UnifiedAIClient(gateway_url="http://localhost:8001")
+    return UnifiedAIClient(gateway_url="http://localhost:8001", transport="http")
 
 
 @pytest.fixture
@@ -441,3 +441,119 @@ async def test_chat_additional_kwargs(ai_client, mock_httpx_client):
     payload = call_args.kwargs["json"]
     assert payload["top_k"] == 40
     assert payload["stop"] == ["END"]
+
+
+@pytest.fixture
+def inprocess_gateway(monkeypatch):
+    """Stub the gateway pipeline so the in-process transport runs without a provider."""
+    from app.services.gateway import api as gateway_api
+    from app.services.gateway.router import ProviderContext
+
+    calls = []
+
+    async def prepare(request, db, authorization=None, a3_token=None):
+        calls.append(request)
+        context = ProviderContext(provider="openai", model_name=request.model, auth_type="direct")
+        return gateway_api.PreparedCompletion(context=context, url="https://provider", payload={}, headers={})
+
+    async def complete(prepared):
+        return {
+            "choices": [{"message": {"content": "Hello"}, "finish_reason": "stop"}],
+            "usage": {"total_tokens": 5},
+            "model": prepared.context.model_name
+        }
+
+    async def stream(prepared):
+        yield {"choices": [{"delta": {"content": "Hel"}}]}
+        yield {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]}
+
+    monkeypatch.setattr(gateway_api, "prepare_completion", prepare)
+    monkeypatch.setattr(gateway_api, "complete", complete)
+    monkeypatch.setattr(gateway_api, "stream_completion", stream)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_inprocess_chat_skips_http(inprocess_gateway):
+    """Test the in-process transport calls the gateway pipeline directly."""
+    client = UnifiedAIClient(transport="inprocess")
+
+    response = await client.chat(model="gpt-4", provider="openai", messages=[{"role": "user", "content": "Hi"}], temperature=0.2)
+
+    assert client._client is None
+    assert response.content == "Hello" and response.model == "gpt-4"
+    assert inprocess_gateway[0].temperature == 0.2
+
+
+@pytest.mark.asyncio
+async def test_inprocess_stream_chat_yields_chunks(inprocess_gateway):
+    """Test in-process streaming yields chunks without SSE framing."""
+    client = UnifiedAIClient(transport="inprocess")
+
+    chunks = [c async for c in client.stream_chat(model="gpt-4", provider="openai", messages=[{"role": "user", "content": "Hi"}])]
+
+    assert [c.content for c in chunks] == ["Hel", "lo"]
+    assert chunks[-1].finish_reason == "stop"
+    assert inprocess_gateway[0].stream is True
+
+
+@pytest.mark.asyncio
+async def test_inprocess_client_error_is_not_retried(monkeypatch):
+    """Test gateway 4xx errors surface as AIGatewayError without retries."""
+    from fastapi import HTTPException
+    from app.services.gateway import api as gateway_api
+
+    calls = 0
+
+    async def prepare(request, db, authorization=None, a3_token=None):
+        nonlocal calls
+        calls += 1
+        raise HTTPException(status_code=400, detail="Endor provider configuration not found")
+
+    monkeypatch.setattr(gateway_api, "prepare_completion", prepare)
+    client = UnifiedAIClient(transport="inprocess")
+
+    with pytest.raises(AIGatewayError, match="Endor provider configuration not found"):
+        await client.chat(model="gpt-4", provider="apple", messages=[{"role": "user", "content": "Hi"}])
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_ai_client_is_shared_until_shutdown(monkeypatch):
+    """Test components share one client per timeout and only close_ai_clients closes it."""
+    from app.services.ai import client as client_module
+
+    monkeypatch.setattr(client_module.settings, "AI_GATEWAY_TRANSPORT", "http")
+    monkeypatch.setattr(client_module, "_shared_clients", {})
+
+    shared = client_module.get_ai_client()
+    assert client_module.get_ai_client() is shared
+    assert client_module.get_ai_client(timeout=120) is not shared
+
+    async with shared:
+        pass
+    assert not shared._client.is_closed
+    assert client_module.get_ai_client_stats()["clients"] == 2
+
+    await client_module.close_ai_clients()
+    assert shared._client.is_closed
+    assert client_module.get_ai_client_stats()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_are_counted(inprocess_gateway, monkeypatch):
+    """Test chat and stream requests are counted while in flight and released afterwards."""
+    from app.services.ai import client as client_module
+
+    monkeypatch.setattr(client_module, "_stats", {"requests": 0, "streams": 0, "in_flight": 0})
+    client = UnifiedAIClient(transport="inprocess")
+    messages = [{"role": "user", "content": "Hi"}]
+
+    stream = client.stream_chat(model="gpt-4", provider="openai", messages=messages)
+    await stream.__anext__()
+    assert client_module.get_ai_client_stats()["in_flight"] == 1
+    await stream.aclose()
+    await client.chat(model="gpt-4", provider="openai", messages=messages)
+
+    stats = client_module.get_ai_client_stats()
+    assert (stats["in_flight"], stats["requests"], stats["streams"]) == (0, 1, 1)
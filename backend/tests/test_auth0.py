@@ -0,0 +1,91 @@
+"""Tests for cached Auth0 token validation."""
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.core import auth
+
+DOMAIN = "tenant.auth0.test"
+AUDIENCE = "https://api.test"
+
+
+def _signing_key(kid):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public = jwk.construct(pem, algorithm="RS256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "use": "sig"}
+
+
+def _token(pem, kid, sub="auth0|user", exp_in=3600):
+    claims = {"sub": sub, "aud": AUDIENCE, "iss": f"https://{DOMAIN}/", "exp": int(time.time()) + exp_in}
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def jwks(monkeypatch):
+    """Serve a mutable JWKS and count fetches."""
+    auth.clear_auth0_caches()
+    served = {"keys": [], "fetches": 0}
+
+    def fetch(domain):
+        served["fetches"] += 1
+        return {"keys": list(served["keys"])}
+
+    monkeypatch.setattr(auth, "get_auth0_jwks", fetch)
+    yield served
+    auth.clear_auth0_caches()
+
+
+def test_keys_and_claims_are_cached(jwks):
+    """Test repeated validations reuse the parsed keys and skip verification for the same token."""
+    pem, public = _signing_key("k1")
+    jwks["keys"].append(public)
+
+    first = auth.validate_auth0_token(_token(pem, "k1"), DOMAIN, AUDIENCE)
+    token = _token(pem, "k1", sub="auth0|other")
+    assert auth.validate_auth0_token(token, DOMAIN, AUDIENCE)["sub"] == "auth0|other"
+    assert auth.validate_auth0_token(token, DOMAIN, AUDIENCE)["sub"] == "auth0|other"
+
+    assert first["sub"] == "auth0|user"
+    assert jwks["fetches"] == 1
+    stats = auth.get_auth0_cache_stats()
+    assert (stats["claims_hits"], stats["claims_misses"]) == (1, 2)
+    # Claims are scoped to the audience they were verified for
+    assert auth.validate_auth0_token(token, DOMAIN, "https://other.test") is None
+
+
+def test_unknown_kid_refetches_with_rate_limit(jwks, monkeypatch):
+    """Test a rotated key is picked up by a refetch, but unknown kids cannot force repeated fetches."""
+    pem1, public1 = _signing_key("k1")
+    pem2, public2 = _signing_key("k2")
+    jwks["keys"].append(public1)
+    assert auth.validate_auth0_token(_token(pem1, "k1"), DOMAIN, AUDIENCE)
+
+    monkeypatch.setattr(auth.settings, "AUTH0_JWKS_MIN_REFETCH_INTERVAL", 0)
+    jwks["keys"].append(public2)
+    assert auth.validate_auth0_token(_token(pem2, "k2"), DOMAIN, AUDIENCE)["sub"] == "auth0|user"
+    assert jwks["fetches"] == 2
+
+    monkeypatch.setattr(auth.settings, "AUTH0_JWKS_MIN_REFETCH_INTERVAL", 30)
+    assert auth.validate_auth0_token(_token(pem2, "bogus"), DOMAIN, AUDIENCE) is None
+    assert auth.validate_auth0_token(_token(pem2, "bogus2"), DOMAIN, AUDIENCE) is None
+    assert jwks["fetches"] == 2
+
+
+def test_stale_keys_refresh_in_background(jwks, monkeypatch):
+    """Test stale keys keep serving while a background refresh reloads them."""
+    pem, public = _signing_key("k1")
+    jwks["keys"].append(public)
+    assert auth.validate_auth0_token(_token(pem, "k1"), DOMAIN, AUDIENCE)
+
+    monkeypatch.setattr(auth.settings, "AUTH0_JWKS_REFRESH_INTERVAL", 0)
+    assert auth.validate_auth0_token(_token(pem, "k1", sub="auth0|fresh"), DOMAIN, AUDIENCE)
+    deadline = time.monotonic() + 2
+    while auth.get_auth0_cache_stats()["background_refreshes"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert jwks["fetches"] == 2
@@ -14,3 +14,40 @@ def test_redis_set_get():
     assert result == b"test_value"
     # Cleanup
     redis_client.delete("test_key")
+
+
+def test_latency_histogram_quantiles():
+    """Test latencies land in buckets and quantiles report bucket bounds."""
+    from app.core.cache import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    for elapsed_ms in [0.5] * 90 + [30.0] * 9 + [8000.0]:
+        histogram.observe(elapsed_ms)
+
+    summary = histogram.summary()
+    assert (summary["count"], summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (100, 1.0, 50.0, 50.0)
+    assert summary["buckets"]["le_1ms"] == 90 and summary["buckets"]["inf"] == 1
+    assert summary["max_ms"] == 8000.0
+
+
+async def test_async_client_records_command_latency():
+    """Test async commands and pipelines are timed whether or not Redis answers."""
+    from app.core.cache import close_async_redis, get_async_redis, get_cache_latency_stats, reset_cache_latency_stats
+
+    reset_cache_latency_stats()
+    client = get_async_redis()
+    assert get_async_redis() is client
+    try:
+        await client.get("test_key")
+        pipe = client.pipeline(transaction=False)
+        pipe.get("test_key")
+        pipe.ttl("test_key")
+        await pipe.execute()
+    except Exception:
+        pass  # Redis not running: the failed attempts are still recorded
+    finally:
+        await close_async_redis()
+
+    commands = get_cache_latency_stats()["commands"]
+    assert commands["get"]["count"] == 1
+    assert set(commands) <= {"get", "pipeline"}
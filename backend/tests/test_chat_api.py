@@ -0,0 +1,146 @@
+"""Tests for chat conversation and context endpoints (async session layer)."""
+import pytest
+
+from app.models.chat import Message
+
+
+def test_conversation_lifecycle(client, db_session):
+    """Test create, rename, list, read and delete through the async session."""
+    response = client.post("/api/v1/chat/conversations", params={"agent_type": "summary"})
+    assert response.status_code == 201
+    conversation = response.json()
+    assert conversation["message_count"] == 1  # Greeting
+    conversation_id = conversation["id"]
+
+    response = client.patch(f"/api/v1/chat/conversations/{conversation_id}/rename", json={"name": "Q3 review"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Q3 review"
+
+    listed = client.get("/api/v1/chat/conversations").json()
+    assert [c["id"] for c in listed] == [conversation_id]
+
+    messages = client.get(f"/api/v1/chat/conversations/{conversation_id}/messages").json()
+    assert messages[0]["role"] == "ASSISTANT"
+    assert messages[0]["extra_metadata"]["is_greeting"] is True
+
+    # Writes from the async session are visible to the sync session
+    assert db_session.query(Message).filter(Message.conversation_id == conversation_id).count() == 1
+
+    assert client.delete(f"/api/v1/chat/conversations/{conversation_id}").status_code == 204
+    assert client.get(f"/api/v1/chat/conversations/{conversation_id}").status_code == 404
+
+
+def test_context_add_get_remove(client):
+    """Test chat context endpoints."""
+    conversation_id = client.post("/api/v1/chat/conversations").json()["id"]
+
+    body = {"conversation_id": conversation_id, "object_id": "view-1", "object_type": "view", "object_name": "Sales"}
+    assert client.post("/api/v1/chat/context/add", json=body).status_code == 201
+    body["object_name"] = "Sales by Region"
+    assert client.post("/api/v1/chat/context/add", json=body).json()["object_name"] == "Sales by Region"
+
+    context = client.get(f"/api/v1/chat/context/{conversation_id}").json()
+    assert [(o["object_id"], o["object_name"]) for o in context["objects"]] == [("view-1", "Sales by Region")]
+
+    response = client.delete(
+        "/api/v1/chat/context/remove",
+        params={"conversation_id": conversation_id, "object_id": "view-1"},
+    )
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/chat/context/{conversation_id}").json()["objects"] == []
+
+
+def test_list_conversations_keyset_pagination(client):
+    """Test listing pages by cursor, newest first, with message counts."""
+    created = [client.post("/api/v1/chat/conversations").json()["id"] for _ in range(5)]
+
+    first = client.get("/api/v1/chat/conversations", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/api/v1/chat/conversations", params={"limit": 2, "cursor": cursor})
+    third = client.get("/api/v1/chat/conversations", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]})
+
+    pages = [first.json(), second.json(), third.json()]
+    assert [c["id"] for page in pages for c in page] == created[::-1]
+    assert all(c["message_count"] == 1 for page in pages for c in page)
+    assert "X-Next-Cursor" not in third.headers
+    # Older clients still page by offset
+    skipped = client.get("/api/v1/chat/conversations", params={"limit": 2, "skip": 2})
+    assert skipped.json() == second.json()
+
+    assert client.get("/api/v1/chat/conversations", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_chat_context_window_is_incremental(db_session, monkeypatch):
+    """Test the cached window keeps the newest messages and only reads new rows per turn."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.api import chat_helpers
+    from app.core.database import get_async_database_url
+    from app.models.chat import Conversation, MessageRole
+
+    monkeypatch.setattr(chat_helpers.settings, "CHAT_CONTEXT_WINDOW", 3)
+    conversation = Conversation()
+    db_session.add(conversation)
+    db_session.commit()
+    for i in range(5):
+        db_session.add(Message(conversation_id=conversation.id, role=MessageRole.USER, content=f"q{i}"))
+    db_session.commit()
+
+    engine = create_async_engine(get_async_database_url(str(db_session.get_bind().url)), poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            ctx = await chat_helpers.prepare_chat_context(db, conversation.id)
+            assert [m.content for m in ctx["history_messages"]] == ["q2", "q3", "q4"]
+            assert ctx["message_count"] == 5
+
+            db_session.add(Message(conversation_id=conversation.id, role=MessageRole.ASSISTANT, content="a4"))
+            db_session.commit()
+
+            # Cache hit: no full reload, just the new reply appended
+            async def no_reload(*args, **kwargs):
+                raise AssertionError("window was reloaded")
+            monkeypatch.setattr(chat_helpers, "_load_context_window", no_reload)
+            ctx = await chat_helpers.prepare_chat_context(db, conversation.id)
+            assert [m.content for m in ctx["history_messages"]] == ["q3", "q4", "a4"]
+            assert ctx["message_count"] == 6
+            assert ctx["messages"][-1] == {"role": "assistant", "content": "a4"}
+    finally:
+        chat_helpers.invalidate_chat_context(conversation.id)
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_chat_context_window_notices_deletes_from_other_workers(db_session, monkeypatch):
+    """Test a message deleted without invalidating this process's cache leaves the window."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.api import chat_helpers
+    from app.core.database import get_async_database_url
+    from app.models.chat import Conversation, MessageRole
+
+    monkeypatch.setattr(chat_helpers.settings, "CHAT_CONTEXT_WINDOW", 3)
+    conversation = Conversation()
+    db_session.add(conversation)
+    db_session.commit()
+    messages = [Message(conversation_id=conversation.id, role=MessageRole.USER, content=f"q{i}") for i in range(4)]
+    db_session.add_all(messages)
+    db_session.commit()
+
+    engine = create_async_engine(get_async_database_url(str(db_session.get_bind().url)), poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            ctx = await chat_helpers.prepare_chat_context(db, conversation.id)
+            assert [m.content for m in ctx["history_messages"]] == ["q1", "q2", "q3"]
+
+            # Another worker deletes a message and adds a reply
+            db_session.delete(messages[2])
+            db_session.add(Message(conversation_id=conversation.id, role=MessageRole.ASSISTANT, content="a3"))
+            db_session.commit()
+
+            ctx = await chat_helpers.prepare_chat_context(db, conversation.id)
+            assert [m.content for m in ctx["history_messages"]] == ["q1", "q3", "a3"]
+            assert ctx["message_count"] == 4
+    finally:
+        chat_helpers.invalidate_chat_context(conversation.id)
+        await engine.dispose()
@@ -0,0 +1,109 @@
+"""Tests for columnar query results."""
+import json
+
+import numpy as np
+import pytest
+
+from app.services.columnar import ColumnarResult, as_dataframe, count_rows, head_rows, result_view, to_plain
+
+
+@pytest.fixture
+def result():
+    """Small mixed-type result."""
+    return ColumnarResult.from_rows(
+        ["Region", "Sales", "Profit"],
+        [["West", 100, 1.5], ["East", None, 2.0], ["West", 300, None]],
+    )
+
+
+def test_behaves_like_result_dict(result):
+    """Test dict-style access, JSON and copies still expose row data."""
+    assert isinstance(result, dict)
+    assert result["columns"] == ["Region", "Sales", "Profit"]
+    assert result["row_count"] == 3
+    assert result["data"] == [["West", 100, 1.5], ["East", None, 2.0], ["West", 300, None]]
+    assert "data" in result and len(result) == 3
+    assert json.loads(json.dumps(result))["data"][1] == ["East", None, 2.0]
+    assert {**result}["data"] == result["data"]
+    assert result.copy()["data"] == result["data"]
+
+
+def test_rows_are_not_stored(result):
+    """Test "data" is built from the columns on access and never kept in dict storage."""
+    assert "data" not in dict.keys(result)
+    assert count_rows(result) == 3 and result._rows_ref is None
+    rows = result["data"]
+    assert result["data"] is rows  # shared while held
+    assert result.nbytes == sum(c.nbytes for c in result._columns)
+
+
+def test_to_plain_keeps_rows_for_storage_serializers(result):
+    """Test orjson and LangGraph checkpoint serialization see the rows after to_plain."""
+    orjson = pytest.importorskip("orjson")
+    from app.services.agents.graph_factory import memory_checkpointer
+
+    state = {"query_results": result, "messages": [{"role": "user"}]}
+    plain = to_plain(state)
+    assert orjson.loads(orjson.dumps(plain))["query_results"]["data"] == result["data"]
+    assert plain["messages"] is state["messages"]
+
+    serde = memory_checkpointer().serde
+    restored = serde.loads_typed(serde.dumps_typed(state))["query_results"]
+    assert restored["data"] == result["data"] and restored["row_count"] == 3
+
+
+def test_columns_are_typed_and_dictionary_encoded(result):
+    """Test numeric columns become arrays and strings are dictionary-encoded."""
+    assert result.column("Sales").dtype == np.float64  # ints with a missing value
+    assert result.column("Profit").dtype == np.float64
+    region = result._columns[0]
+    assert region.categories == ["West", "East"]
+    assert region.codes.tolist() == [0, 1, 0]
+
+
+def test_from_records_and_head():
+    """Test building from VDS OBJECTS rows and reading a prefix."""
+    records = [{"Category": f"C{i % 3}", "Qty": i} for i in range(1000)]
+    result = ColumnarResult.from_records(records)
+
+    assert result["columns"] == ["Category", "Qty"]
+    assert result.column("Qty").dtype == np.int64
+    assert result.head(2) == [["C0", 0], ["C1", 1]]
+    assert head_rows(result, 2) == head_rows({"data": [["C0", 0], ["C1", 1], ["C2", 2]]}, 2)
+
+
+def test_to_dataframe_without_rows(result):
+    """Test DataFrame conversion works from columns."""
+    df = as_dataframe(result)
+
+    assert list(df.columns) == ["Region", "Sales", "Profit"]
+    assert df["Sales"].isna().sum() == 1
+    assert df["Region"].tolist() == ["West", "East", "West"]
+
+
+def test_setting_data_reencodes(result):
+    """Test assigning rows to "data" rebuilds columns and row_count."""
+    result["data"] = [["North", 5, 0.5]]
+
+    assert result["data"] == [["North", 5, 0.5]]
+    assert result["row_count"] == 1
+
+
+def test_result_view_shares_columns(result):
+    """Test result_view adds fields without copying column storage."""
+    view = result_view(result, name="Sheet 1")
+
+    assert view["name"] == "Sheet 1"
+    assert view._columns[0] is result._columns[0]
+    assert view["data"] == result["data"]
+
+
+def test_to_arrow_ipc(result):
+    """Test Arrow IPC round trip."""
+    pa = pytest.importorskip("pyarrow")
+
+    table = pa.ipc.open_stream(result.to_arrow_ipc()).read_all()
+
+    assert table.column_names == ["Region", "Sales", "Profit"]
+    assert table.column("Region").to_pylist() == ["West", "East", "West"]
+    assert table.column("Sales").to_pylist() == [100, None, 300]
@@ -0,0 +1,65 @@
+"""Tests for the vectorised crosstab engine."""
+import json
+
+import pandas as pd
+import pytest
+
+from app.services.crosstab import CrosstabAccumulator, crosstab_from_rows
+
+COLUMNS = ["Region", "Year", "Sales"]
+ROWS = [
+    ["West", "2023", "10"],
+    ["West", "2023", "30"],  # Duplicate cell
+    ["East", "2024", "5"],
+    ["West", "2024", "n/a"],  # Non-numeric measure
+    ["East"],  # Short row
+]
+
+
+async def _stream(rows):
+    yield COLUMNS
+    for row in rows:
+        yield row
+
+
+@pytest.mark.parametrize("aggregation, data, row_totals, grand_total", [
+    ("sum", [[None, 5.0], [40.0, None]], [5.0, 40.0], 45.0),
+    ("avg", [[None, 5.0], [20.0, None]], [5.0, 20.0], 15.0),
+    ("count", [[0, 1], [2, 0]], [1, 2], 3),
+    ("min", [[None, 5.0], [10.0, None]], [5.0, 10.0], 5.0),
+    ("max", [[None, 5.0], [30.0, None]], [5.0, 30.0], 30.0),
+])
+def test_aggregates_duplicate_cells_and_totals(aggregation, data, row_totals, grand_total):
+    """Test every aggregation, including exact totals over the underlying rows."""
+    acc = CrosstabAccumulator(["Region"], ["Year"], "Sales", aggregation)
+    acc.add_rows(COLUMNS, ROWS)
+    crosstab = acc.result()
+
+    assert crosstab["rows"] == [["East"], ["West"]]
+    assert crosstab["columns"] == [["2023"], ["2024"]]
+    assert crosstab["data"] == data
+    assert crosstab["row_totals"] == row_totals
+    assert crosstab["grand_total"] == grand_total
+    json.dumps(crosstab)
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_match_single_pass():
+    """Test chunked aggregation merges partials into the same result as one DataFrame."""
+    rows = [[f"R{i % 7}", str(2000 + i % 5), str(i)] for i in range(1_000)]
+
+    streamed = await crosstab_from_rows(_stream(rows), ["Region"], ["Year"], "Sales", "avg", chunk_rows=37)
+    whole = CrosstabAccumulator(["Region"], ["Year"], "Sales", "avg")
+    whole.add_frame(pd.DataFrame(rows, columns=COLUMNS))
+
+    assert streamed["row_count"] == 1_000
+    assert streamed["crosstab"] == whole.result()
+
+
+@pytest.mark.asyncio
+async def test_missing_measure_and_unknown_aggregation():
+    """Test invalid requests fail clearly."""
+    with pytest.raises(ValueError, match="Measure 'Profit' not found"):
+        await crosstab_from_rows(_stream(ROWS), ["Region"], [], "Profit")
+    with pytest.raises(ValueError, match="Unsupported aggregation"):
+        CrosstabAccumulator(["Region"], [], "Sales", "median")
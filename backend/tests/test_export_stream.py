@@ -0,0 +1,105 @@
+"""Tests for streaming and paged view exports."""
+import base64
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pytest
+
+from app.services import export_stream
+
+
+class FakeTableauClient:
+    """Streams header-first rows per view and records how many streams were opened."""
+
+    def __init__(self, views):
+        self.views = views
+        self.opened = 0
+
+    async def iter_view_data_rows(self, view_id, max_rows=None, filters=None):
+        self.opened += 1
+        columns, rows = self.views[view_id]
+        yield columns
+        for row in rows:
+            yield row
+
+
+VIEWS = {
+    "v1": (["Region", "Sales"], [[f"R{i}", str(i)] for i in range(5)]),
+    "v2": (["Year"], [["2024"], ["2025"]]),
+    "empty": (["Region"], []),
+}
+
+
+async def _collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_and_ndjson_in_chunks():
+    """Test multi-view exports are encoded chunk by chunk in view order."""
+    client = FakeTableauClient(VIEWS)
+
+    chunks = [c async for c in export_stream.stream_export(client, ["v1", "v2"], "csv", chunk_rows=2)]
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert len(chunks) == 6  # Header + 3 chunks for v1, header + 1 chunk for v2
+    assert rows[0] == ["view_id", "Region", "Sales"] and rows[1] == ["v1", "R0", "0"]
+    assert rows[6] == ["view_id", "Year"] and rows[-1] == ["v2", "2025"]
+
+    ndjson = await _collect(export_stream.stream_export(client, ["v2"], "ndjson"))
+    assert [json.loads(line) for line in ndjson.splitlines()] == [
+        {"view_id": "v2", "Year": "2024"},
+        {"view_id": "v2", "Year": "2025"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_arrow_ipc():
+    """Test the Arrow stream is readable and limited to one view."""
+    data = await _collect(export_stream.stream_export(FakeTableauClient(VIEWS), ["v1"], "arrow", chunk_rows=2))
+    table = pa.ipc.open_stream(data).read_all()
+
+    assert table.column_names == ["Region", "Sales"]
+    assert table.num_rows == 5
+    with pytest.raises(ValueError, match="one view"):
+        export_stream.check_format("arrow", view_count=2)
+
+
+@pytest.mark.asyncio
+async def test_paged_export_resumes_with_tokens():
+    """Test pages follow tokens across views, reuse the open stream and survive a lost cursor."""
+    client = FakeTableauClient(VIEWS)
+    view_ids = ["v1", "empty", "v2"]
+
+    page = await export_stream.read_page(client, view_ids, "ndjson", page_size=2)
+    assert (page["view_id"], page["row_count"]) == ("v1", 2)
+    page = await export_stream.read_page(client, view_ids, "ndjson", page_size=2, continuation_token=page["next_token"])
+    assert client.opened == 1
+
+    # Cursor lost (expired or another process): the view is re-streamed from the token's offset
+    await export_stream.close_cursors()
+    page = await export_stream.read_page(client, view_ids, "csv", page_size=2, continuation_token=page["next_token"])
+    assert page["content"].splitlines() == ["Region,Sales", "R4,4"]
+
+    page = await export_stream.read_page(client, view_ids, "arrow", page_size=2, continuation_token=page["next_token"])
+    assert page["view_id"] == "v2"
+    assert pa.ipc.open_stream(base64.b64decode(page["content"])).read_all().num_rows == 2
+    assert page["next_token"] is None
+
+    with pytest.raises(ValueError, match="Invalid continuation token"):
+        await export_stream.read_page(client, view_ids, continuation_token="not-a-token")
+
+
+def test_stream_endpoint(client, monkeypatch):
+    """Test the chunked HTTP endpoint and its format validation."""
+    from app.api import agents
+
+    monkeypatch.setattr(agents, "get_tableau_client", lambda: FakeTableauClient(VIEWS))
+    response = client.post("/api/v1/agents/summary/export-views/stream", json={"view_ids": ["v2"], "format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 2
+    bad = client.post("/api/v1/agents/summary/export-views/stream", json={"view_ids": ["v1", "v2"], "format": "arrow"})
+    assert bad.status_code == 400
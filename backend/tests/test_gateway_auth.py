@@ -99,7 +99,7 @@ def mock_httpx_post():
 @pytest.mark.asyncio
 async def test_salesforce_auth_generate_jwt(salesforce_config, mock_httpx_post):
     """Test Salesforce auth generates JWT and exchanges for token."""
-    with patch("app.services.gateway.auth.salesforce.token_cache") as mock_cache:
+    with patch("app.services.gateway.auth.salesforce.token_cache", new_callable=AsyncMock) as mock_cache:
         mock_cache.get.return_value = None  # No cached token
         mock_cache.set.return_value = True
         
@@ -114,7 +114,7 @@ async def test_salesforce_auth_generate_jwt(salesforce_config, mock_httpx_post):
 @pytest.mark.asyncio
 async def test_salesforce_auth_uses_cache(salesforce_config, mock_httpx_post):
     """Test Salesforce auth uses cached token when available."""
-    with patch("app.services.gateway.auth.salesforce.token_cache") as mock_cache:
+    with patch("app.services.gateway.auth.salesforce.token_cache", new_callable=AsyncMock) as mock_cache:
         mock_cache.get.return_value = {
             "token": "cached-token-123",
             "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
@@ -131,7 +131,7 @@ async def test_salesforce_auth_uses_cache(salesforce_config, mock_httpx_post):
 @pytest.mark.asyncio
 async def test_salesforce_auth_refresh(salesforce_config, mock_httpx_post):
     """Test Salesforce auth refresh clears cache and gets new token."""
-    with patch("app.services.gateway.auth.salesforce.token_cache") as mock_cache:
+    with patch("app.services.gateway.auth.salesforce.token_cache", new_callable=AsyncMock) as mock_cache:
         mock_cache.get.return_value = None
         mock_cache.delete.return_value = True
         mock_cache.set.return_value = True
@@ -208,7 +208,7 @@ def mock_google_credentials():
 @pytest.mark.asyncio
 async def test_vertex_auth_get_token(vertex_config, mock_google_credentials):
     """Test Vertex auth gets token from service account."""
-    with patch("app.services.gateway.auth.vertex.token_cache") as mock_cache:
+    with patch("app.services.gateway.auth.vertex.token_cache", new_callable=AsyncMock) as mock_cache:
         mock_cache.get.return_value = None  # No cached token
         mock_cache.set.return_value = True
         
@@ -221,7 +221,7 @@ async def test_vertex_auth_get_token(vertex_config, mock_google_credentials):
 @pytest.mark.asyncio
 async def test_vertex_auth_uses_cache(vertex_config, mock_google_credentials):
     """Test Vertex auth uses cached token when available."""
-    with patch("app.services.gateway.auth.vertex.token_cache") as mock_cache:
+    with patch("app.services.gateway.auth.vertex.token_cache", new_callable=AsyncMock) as mock_cache:
         mock_cache.get.return_value = {
             "token": "cached-vertex-token",
             "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
@@ -236,7 +236,7 @@ async def test_vertex_auth_uses_cache(vertex_config, mock_google_credentials):
 @pytest.mark.asyncio
 async def test_vertex_auth_refresh(vertex_config, mock_google_credentials):
     """Test Vertex auth refresh clears cache and gets new token."""
-    with patch("app.services.gateway.auth.vertex.token_cache") as mock_cache:
+    with patch("app.services.gateway.auth.vertex.token_cache", new_callable=AsyncMock) as mock_cache:
         mock_cache.get.return_value = None
         mock_cache.delete.return_value = True
         mock_cache.set.return_value = True
@@ -271,24 +271,31 @@ async def test_vertex_auth_missing_sa_file(vertex_config):
 
 @pytest.fixture
 def mock_redis_client():
-    """Mock Redis client."""
+    """Mock async Redis client."""
     mock_redis = Mock()
-    mock_redis.get.return_value = None
-    mock_redis.setex.return_value = True
-    mock_redis.delete.return_value = True
-    mock_redis.scan_iter.return_value = []
+    mock_redis.get = AsyncMock(return_value=None)
+    mock_redis.setex = AsyncMock(return_value=True)
+    mock_redis.delete = AsyncMock(return_value=True)
+    mock_redis.scan_iter = Mock(side_effect=lambda match=None: _aiter([]))
     return mock_redis
 
 
-def test_token_cache_get_miss(mock_redis_client):
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_token_cache_get_miss(mock_redis_client):
     """Test token cache returns None on cache miss."""
     cache = TokenCache(mock_redis_client)
-    result = cache.get("test-provider", "test-id")
+    result = await cache.get("test-provider", "test-id")
     assert result is None
-    mock_redis_client.get.assert_called_once_with("token:test-provider:test-id")
+    mock_redis_client.get.assert_awaited_once_with("token:test-provider:test-id")
 
 
-def test_token_cache_get_hit(mock_redis_client):
+@pytest.mark.asyncio
+async def test_token_cache_get_hit(mock_redis_client):
     """Test token cache returns cached token."""
     expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
     cached_data = json.dumps({
@@ -299,13 +306,14 @@ def test_token_cache_get_hit(mock_redis_client):
     mock_redis_client.get.return_value = cached_data.encode()
     
     cache = TokenCache(mock_redis_client)
-    result = cache.get("test-provider", "test-id")
+    result = await cache.get("test-provider", "test-id")
     
     assert result is not None
     assert result["token"] == "test-token-123"
 
 
-def test_token_cache_get_expired(mock_redis_client):
+@pytest.mark.asyncio
+async def test_token_cache_get_expired(mock_redis_client):
     """Test token cache returns None for expired token."""
     # Token expired 10 minutes ago
     expires_at = datetime.now(timezone.utc) - timedelta(minutes=10)
@@ -316,19 +324,20 @@ def test_token_cache_get_expired(mock_redis_client):
     mock_redis_client.get.return_value = cached_data.encode()
     
     cache = TokenCache(mock_redis_client)
-    result = cache.get("test-provider", "test-id")
+    result = await cache.get("test-provider", "test-id")
     
     assert result is None
     # Should delete expired token
-    mock_redis_client.delete.assert_called_once_with("token:test-provider:test-id")
+    mock_redis_client.delete.assert_awaited_once_with("token:test-provider:test-id")
 
 
-def test_token_cache_set_with_expires_at(mock_redis_client):
+@pytest.mark.asyncio
+async def test_token_cache_set_with_expires_at(mock_redis_client):
     """Test token cache sets token with expiration datetime."""
     expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
     
     cache = TokenCache(mock_redis_client)
-    result = cache.set(
+    result = await cache.set(
         "test-provider",
         "test-id",
         "test-token",
@@ -337,16 +346,17 @@ def test_token_cache_set_with_expires_at(mock_redis_client):
     
     assert result is True
     # Verify setex was called with calculated TTL (1 hour - 5 min buffer = 55 min)
-    mock_redis_client.setex.assert_called_once()
+    mock_redis_client.setex.assert_awaited_once()
     call_args = mock_redis_client.setex.call_args
     assert call_args[0][0] == "token:test-provider:test-id"
     assert 3300 <= call_args[0][1] <= 3600  # TTL should be ~55 minutes
 
 
-def test_token_cache_set_with_expires_in(mock_redis_client):
+@pytest.mark.asyncio
+async def test_token_cache_set_with_expires_in(mock_redis_client):
     """Test token cache sets token with expiration seconds."""
     cache = TokenCache(mock_redis_client)
-    result = cache.set(
+    result = await cache.set(
         "test-provider",
         "test-id",
         "test-token",
@@ -354,30 +364,164 @@ def test_token_cache_set_with_expires_in(mock_redis_client):
     )
     
     assert result is True
-    mock_redis_client.setex.assert_called_once()
+    mock_redis_client.setex.assert_awaited_once()
 
 
-def test_token_cache_delete(mock_redis_client):
+@pytest.mark.asyncio
+async def test_token_cache_delete(mock_redis_client):
     """Test token cache deletes token."""
     cache = TokenCache(mock_redis_client)
-    result = cache.delete("test-provider", "test-id")
+    result = await cache.delete("test-provider", "test-id")
     
     assert result is True
-    mock_redis_client.delete.assert_called_once_with("token:test-provider:test-id")
+    mock_redis_client.delete.assert_awaited_once_with("token:test-provider:test-id")
 
 
-def test_token_cache_clear_provider(mock_redis_client):
+@pytest.mark.asyncio
+async def test_token_cache_clear_provider(mock_redis_client):
     """Test token cache clears all tokens for provider."""
-    mock_redis_client.scan_iter.return_value = [
+    mock_redis_client.scan_iter.side_effect = lambda match=None: _aiter([
         b"token:test-provider:id1",
         b"token:test-provider:id2"
-    ]
+    ])
     
     cache = TokenCache(mock_redis_client)
-    deleted = cache.clear_provider("test-provider")
+    deleted = await cache.clear_provider("test-provider")
     
     assert deleted == 2
-    mock_redis_client.delete.assert_called_once_with(
+    mock_redis_client.delete.assert_awaited_once_with(
         b"token:test-provider:id1",
         b"token:test-provider:id2"
     )
+
+
+# ===== Authenticator Registry Tests =====
+
+class FakeTokenAuthenticator:
+    """Counts provider fetches; tokens expire after `lifetime`."""
+
+    provider_name = "fake"
+
+    def __init__(self, lifetime=timedelta(hours=1)):
+        self.lifetime = lifetime
+        self.fetches = 0
+
+    def token_identifier(self, context=None):
+        return "app-1"
+
+    async def fetch_token(self):
+        import asyncio
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        return {
+            "token": f"token-{self.fetches}",
+            "expires_at": datetime.now(timezone.utc) + self.lifetime,
+            "metadata": {},
+        }
+
+
+@pytest.fixture
+def shared_token_cache(monkeypatch):
+    """Registry token cache backed by an in-memory dict standing in for Redis."""
+    from app.services.gateway.auth import registry
+
+    store = {}
+    redis = Mock()
+    redis.get = AsyncMock(side_effect=store.get)
+    redis.setex = AsyncMock(side_effect=lambda key, ttl, value: store.__setitem__(key, value))
+    redis.set = AsyncMock(side_effect=lambda key, value, nx=False, ex=None: store.setdefault(key, value) == value)
+    redis.delete = AsyncMock(side_effect=lambda key: store.pop(key, None))
+    cache = TokenCache(redis)
+    monkeypatch.setattr(registry, "token_cache", cache)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_registry_coalesces_fetches_and_shares_tokens(shared_token_cache):
+    """Test concurrent requests share one fetch and other processes reuse the shared token."""
+    import asyncio
+    from app.services.gateway.auth import registry
+
+    auth = FakeTokenAuthenticator()
+    tokens = await asyncio.gather(*(registry.get_token(auth) for _ in range(5)))
+
+    assert tokens == ["token-1"] * 5
+    assert auth.fetches == 1
+    assert "token:fake:app-1" in shared_token_cache
+
+    # A fresh process (empty registry) picks the token up from the shared cache
+    registry.clear()
+    other = FakeTokenAuthenticator()
+    assert await registry.get_token(other) == "token-1"
+    assert other.fetches == 0
+    assert registry.get_stats()["shared_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_waiters_refetch_when_first_caller_is_cancelled(shared_token_cache):
+    """Test cancelling the fetching request does not fail requests waiting on the same token."""
+    import asyncio
+    from app.services.gateway.auth import registry
+
+    auth = FakeTokenAuthenticator()
+    first = asyncio.create_task(registry.get_token(auth))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(registry.get_token(auth))
+    await asyncio.sleep(0.001)
+    first.cancel()
+
+    assert await waiter == "token-2"
+    assert first.cancelled()
+    assert auth.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_registry_refreshes_tokens_in_background(shared_token_cache):
+    """Test a token close to expiry is still served while a replacement is fetched."""
+    import asyncio
+    from app.services.gateway.auth import registry
+
+    auth = FakeTokenAuthenticator(lifetime=timedelta(minutes=8))  # Inside the refresh lead window
+    assert await registry.get_token(auth) == "token-1"
+
+    assert await registry.get_token(auth) == "token-1"
+    assert registry.get_stats()["refreshing"] == 1
+    await asyncio.sleep(0.05)
+
+    assert auth.fetches == 2
+    assert await registry.get_token(auth) == "token-2"
+    assert registry.get_stats()["background_refreshes"] == 1
+
+
+def test_registry_reuses_authenticators():
+    """Test the same provider configuration maps to one authenticator instance."""
+    from app.services.gateway.auth import registry
+
+    ctx = ProviderContext(provider="vertex", auth_type="service_account", model_name="gemini",
+                          project_id="p1", location="us-central1", credentials_path="/sa.json")
+    first = registry.get_authenticator(ctx)
+
+    assert registry.get_authenticator(ctx) is first
+    ctx.project_id = "p2"
+    assert registry.get_authenticator(ctx) is not first
+
+
+def test_salesforce_private_key_parsed_once(salesforce_config, tmp_path):
+    """Test the PEM is parsed once and reused for later JWTs."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_file = tmp_path / "real-key.pem"
+    key_file.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ))
+    auth = SalesforceAuthenticator(**{**salesforce_config, "private_key_path": str(key_file)})
+
+    with patch("app.services.gateway.auth.salesforce.open", side_effect=open) as mock_open:
+        auth._generate_jwt()
+        auth._generate_jwt()
+
+    assert mock_open.call_count == 1
@@ -0,0 +1,99 @@
+"""Tests for shared LLM provider HTTP clients."""
+import pytest
+
+from app.services.gateway import transport
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_provider_host_and_verify():
+    """Test completions to the same provider host reuse one client."""
+    try:
+        client = transport.get_client("openai", "https://api.openai.com/v1/chat/completions")
+
+        assert transport.get_client("openai", "https://api.openai.com/v1/models") is client
+        assert transport.get_client("apple", "https://endor.example.com/v1/completions", False) is not client
+        assert transport.get_client("apple", "https://endor.example.com/v1/completions", True) is not \
+            transport.get_client("apple", "https://endor.example.com/v1/completions", False)
+
+        stats = transport.get_stats()
+        assert stats["providers"]["openai"]["hits"] >= 1
+        assert stats["providers"]["apple"]["clients"] == 2
+    finally:
+        await transport.close_all()
+
+    assert client.is_closed
+    assert transport.get_stats()["clients"] == 0
+
+
+def test_sse_codec_round_trip():
+    """Test chunks are framed once and parsed back from data lines."""
+    from app.services.gateway import sse
+
+    chunk = {"choices": [{"delta": {"content": "héllo"}, "finish_reason": None}]}
+    event = sse.encode_event(chunk)
+
+    assert event.startswith(b"data: ") and event.endswith(b"\n\n")
+    line = event.decode().strip()
+    assert sse.loads(sse.data_payload(line)) == chunk
+    assert sse.data_payload("data:[DONE]") == "[DONE]"
+    assert sse.data_payload(": keep-alive") is None
+
+
+@pytest.mark.asyncio
+async def test_stream_completion_parses_each_chunk_once(monkeypatch):
+    """Test provider SSE lines become normalized chunks and stop at [DONE]."""
+    import httpx
+    from app.services.gateway import api as gateway_api
+    from app.services.gateway.router import ProviderContext
+    from app.services.gateway.translators import get_translator
+
+    body = (
+        b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+        b": keep-alive\n\n"
+        b'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+        b"data: [DONE]\n\n"
+        b'data: {"choices": [{"delta": {"content": "ignored"}}]}\n\n'
+    )
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+    monkeypatch.setattr(gateway_api.gateway_transport, "get_client", lambda *args: client)
+    context = ProviderContext(provider="openai", auth_type="direct", model_name="gpt-4")
+    prepared = gateway_api.PreparedCompletion(
+        context=context, url="https://api.openai.com/v1/chat/completions", payload={}, headers={},
+        translator=get_translator("openai", context)
+    )
+
+    chunks = [c async for c in gateway_api.stream_completion(prepared)]
+    await client.aclose()
+
+    assert [c["choices"][0]["delta"]["content"] for c in chunks] == ["Hel", "lo"]
+
+
+@pytest.mark.asyncio
+async def test_pooled_clients_do_not_replay_cookies(monkeypatch):
+    """Test a sign-in's Set-Cookie is not sent on a later request through the shared client."""
+    import httpx
+    from app.core.http_pool import HTTPClientPool
+
+    sent_cookies = []
+
+    def handler(request):
+        sent_cookies.append(request.headers.get("cookie"))
+        if request.url.path.endswith("/auth/signin"):
+            return httpx.Response(200, headers={"Set-Cookie": "workgroup_session_id=tenant-a; Path=/"})
+        return httpx.Response(200)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+    pool = HTTPClientPool("test")
+    client = pool.get_client(
+        ("https://tableau.test",), "tableau",
+        verify=True, timeout=5, limits=httpx.Limits(), http2=False,
+    )
+    try:
+        await client.post("https://tableau.test/api/3.21/auth/signin")
+        await client.get("https://tableau.test/api/3.21/sites/site-b/views")
+    finally:
+        await pool.close_all()
+
+    assert sent_cookies == [None, None]
+    assert len(client.cookies) == 0
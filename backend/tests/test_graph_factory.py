@@ -0,0 +1,40 @@
+"""Tests for compiled agent graph reuse."""
+from app.services.agents.graph_factory import AgentGraphFactory
+from app.services.metrics import get_metrics
+
+
+def test_graphs_compile_once_per_settings():
+    """Test graphs are reused per (version, retry settings) and compile time is recorded."""
+    graph = AgentGraphFactory.create_vizql_graph(version="v3", max_build_retries=2, max_execution_retries=2)
+
+    assert AgentGraphFactory.create_graph("vizql", "v3", 2, 2) is graph
+    assert AgentGraphFactory.create_vizql_graph(version="v3", max_build_retries=4, max_execution_retries=2) is not graph
+    assert AgentGraphFactory.create_summary_graph() is AgentGraphFactory.create_summary_graph()
+
+    graphs = get_metrics().get_graph_summary()["graphs"]
+    assert graphs["vizql:v3:2:2:False"]["compile_count"] == 1
+    assert graphs["summary:False"]["checkpointing"] is False
+
+
+def test_thread_config_is_unique_and_bounded(monkeypatch):
+    """Test each run gets its own thread and old checkpoints are dropped."""
+    from app.services.agents import graph_factory
+
+    monkeypatch.setattr(graph_factory.settings, "AGENT_GRAPH_CHECKPOINTING", True)
+    monkeypatch.setattr(graph_factory.settings, "AGENT_GRAPH_CHECKPOINT_THREADS", 2)
+    graph = AgentGraphFactory.create_summary_graph()
+    configs = [AgentGraphFactory.thread_config(graph, "summary-1", tableau_client=None) for _ in range(3)]
+
+    thread_ids = [c["configurable"]["thread_id"] for c in configs]
+    assert len(set(thread_ids)) == 3
+    assert all(t.startswith("summary-1-") for t in thread_ids)
+    assert configs[0]["configurable"]["tableau_client"] is None
+    assert list(graph_factory._checkpoint_threads) == thread_ids[1:]
+
+
+def test_checkpointing_is_off_by_default():
+    """Test graphs compile without a checkpointer unless checkpointing is enabled."""
+    graph = AgentGraphFactory.create_summary_graph()
+
+    assert graph.checkpointer is None
+    assert "thread_id" in AgentGraphFactory.thread_config(graph, "summary-1")["configurable"]
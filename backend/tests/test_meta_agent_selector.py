@@ -0,0 +1,60 @@
+"""Tests for meta-agent selection with the fast local classifier."""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.agents.meta_agent import FastAgentClassifier, MetaAgentSelector
+from app.services.ai.models import ChatResponse
+from app.services.metrics import get_metrics
+
+
+@pytest.mark.parametrize("query, agent, confident", [
+    ("Total sales by region for 2024?", "vizql", True),
+    ("what fields are available", "vizql", True),
+    ("Show sales by region and then summarize the results", "multi_agent", True),
+    ("query and summarize profit trends", "multi_agent", True),
+    ("Export this dashboard", "summary", True),
+    ("summarize sales by region", "summary", False),
+    ("hello there", "vizql", False),
+])
+def test_fast_classifier(query, agent, confident):
+    """Test clear queries are classified locally and ambiguous ones are flagged as unsure."""
+    selection = FastAgentClassifier().classify(query)
+
+    assert selection["selected_agent"] == agent
+    assert (selection["confidence"] >= 0.8) is confident
+    assert selection["requires_multi_agent"] is (agent == "multi_agent")
+
+
+@pytest.fixture
+def selector():
+    selector = MetaAgentSelector()
+    selector.ai_client = AsyncMock()
+    selector.ai_client.chat.return_value = ChatResponse(
+        content="Agent: multi_agent\nConfidence: 0.9\nReasoning: two steps\nAlternatives: none\nMulti-Agent: yes",
+        model="gpt-4",
+        tokens_used=20,
+        prompt_tokens=15,
+        completion_tokens=5,
+        finish_reason="stop",
+    )
+    get_metrics().reset()
+    yield selector
+    get_metrics().reset()
+
+
+@pytest.mark.asyncio
+async def test_select_agent_skips_llm_and_caches_decisions(selector):
+    """Test local and LLM decisions are cached per conversation and recorded by source."""
+    first = await selector.select_agent("Total sales by region?", conversation_id=101)
+    again = await selector.select_agent("  total SALES by region ", conversation_id=101)
+    assert (first["decision_source"], again["decision_source"]) == ("rules", "cache")
+    assert again["selected_agent"] == "vizql"
+    selector.ai_client.chat.assert_not_called()
+
+    unsure = await selector.select_agent("summarize sales by region", conversation_id=101)
+    await selector.select_agent("summarize sales by region", conversation_id=102)
+    assert unsure["decision_source"] == "llm" and unsure["requires_multi_agent"]
+    assert selector.ai_client.chat.await_count == 2
+
+    sources = get_metrics().get_summary()["agent_selection"]
+    assert {source: m["count"] for source, m in sources.items()} == {"rules": 1, "cache": 1, "llm": 2}
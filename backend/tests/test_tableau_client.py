@@ -1,11 +1,13 @@
 """Tests for Tableau REST API client."""
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timezone, timedelta
 import jwt
 import httpx
 
 from app.services.tableau.client import (
+    _aiter_csv_rows,
     TableauClient,
     TableauClientError,
     TableauAuthenticationError,
@@ -34,6 +36,27 @@ def mock_httpx_client():
         yield client_instance
 
 
+def mock_csv_stream(chunks):
+    """Build a mock for httpx.AsyncClient.stream yielding CSV text chunks."""
+    response = Mock()
+    response.headers = {"content-type": "text/csv"}
+    response.raise_for_status = Mock()
+    response.chunks_read = 0
+
+    async def aiter_text():
+        for chunk in chunks:
+            response.chunks_read += 1
+            yield chunk
+
+    response.aiter_text = aiter_text
+
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        yield response
+
+    return Mock(side_effect=stream), response
+
+
 @pytest.fixture
 def tableau_client(tableau_config, mock_httpx_client):
     """Create TableauClient instance for testing."""
@@ -359,6 +382,21 @@ async def test_query_datasource_success(tableau_client, mock_httpx_client):
     assert result["columns"][0] == "Year"
 
 
+@pytest.mark.parametrize("chunks", [
+    ['a,b\n1,"x\n', 'y"'],
+    ['a,b\n1,"x\n', 'y"\n'],
+    ['a,b\r\n1,"x\n', 'y"\r\n'],
+])
+@pytest.mark.asyncio
+async def test_csv_rows_keep_newlines_in_quoted_fields(chunks):
+    """Test quoted newlines survive chunk boundaries, with or without a final line break."""
+    async def text():
+        for chunk in chunks:
+            yield chunk
+
+    assert [row async for row in _aiter_csv_rows(text())] == [["a", "b"], ["1", "x\ny"]]
+
+
 @pytest.mark.asyncio
 async def test_get_view_data_with_filters(tableau_client, mock_httpx_client):
     """Test get_view_data passes vf_ params for filters."""
@@ -366,17 +404,13 @@ async def test_get_view_data_with_filters(tableau_client, mock_httpx_client):
     tableau_client.token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
     tableau_client.site_content_url = "test-site"
 
-    csv_response = Mock()
-    csv_response.text = "Region,Sales\nWest,100\n"
-    csv_response.headers = {"content-type": "text/csv"}
-    csv_response.raise_for_status = Mock()
-    mock_httpx_client.get = AsyncMock(return_value=csv_response)
+    mock_httpx_client.stream, _ = mock_csv_stream(["Region,Sales\nWest,100\n"])
 
     result = await tableau_client.get_view_data("v-123", filters={"Region": "West"})
 
     assert result["columns"] == ["Region", "Sales"]
     assert result["row_count"] == 1
-    call_args = mock_httpx_client.get.call_args
+    call_args = mock_httpx_client.stream.call_args
     assert call_args.kwargs["params"]["vf_Region"] == "West"
 
 
@@ -387,21 +421,34 @@ async def test_get_view_data_with_multi_value_filters(tableau_client, mock_httpx
     tableau_client.token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
     tableau_client.site_content_url = "test-site"
 
-    csv_response = Mock()
-    csv_response.text = "Category,Sales\nTechnology,500\n"
-    csv_response.headers = {"content-type": "text/csv"}
-    csv_response.raise_for_status = Mock()
-    mock_httpx_client.get = AsyncMock(return_value=csv_response)
+    mock_httpx_client.stream, _ = mock_csv_stream(["Category,Sales\nTechnology,500\n"])
 
     await tableau_client.get_view_data(
         "v-456",
         filters={"Category": ["Technology", "Furniture"]},
     )
 
-    call_args = mock_httpx_client.get.call_args
+    call_args = mock_httpx_client.stream.call_args
     assert call_args.kwargs["params"]["vf_Category"] == "Technology,Furniture"
 
 
+@pytest.mark.asyncio
+async def test_get_view_data_stops_reading_at_max_rows(tableau_client, mock_httpx_client):
+    """Test get_view_data parses chunked CSV and stops reading once max_rows is reached."""
+    tableau_client.auth_token = "test-token"
+    tableau_client.token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+    tableau_client.site_content_url = "test-site"
+
+    chunks = ['Name,Note\nA,"multi\nline"\nB,', 'plain\r\n'] + [f"R{i},x\n" for i in range(100)]
+    mock_httpx_client.stream, response = mock_csv_stream(chunks)
+
+    result = await tableau_client.get_view_data("v-789", max_rows=2)
+
+    assert result["columns"] == ["Name", "Note"]
+    assert result["data"] == [["A", "multi\nline"], ["B", "plain"]]
+    assert response.chunks_read < len(chunks)
+
+
 @pytest.mark.asyncio
 async def test_get_view_embed_url_success(tableau_client, mock_httpx_client):
     """Test successful get_view_embed_url call."""
@@ -500,12 +547,159 @@ async def test_context_manager(tableau_client, mock_httpx_client):
     async with tableau_client:
         assert tableau_client._client is not None
     
-    # Verify close was called
-    mock_httpx_client.aclose.assert_called_once()
+    # Shared pool is not torn down on exit
+    mock_httpx_client.aclose.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_close(tableau_client, mock_httpx_client):
-    """Test close method."""
+    """Test close method leaves the shared HTTP client open."""
     await tableau_client.close()
-    mock_httpx_client.aclose.assert_called_once()
+    mock_httpx_client.aclose.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_pooled_transport(tableau_config):
+    """Test clients for the same server borrow one pooled httpx client."""
+    from app.services.tableau import transport
+
+    first = TableauClient(**tableau_config)
+    second = TableauClient(**tableau_config)
+    other = TableauClient(**{**tableau_config, "server_url": "https://other.test.com"})
+
+    assert first._client is second._client
+    assert other._client is not first._client
+    # One pool lookup per client, however often the client is used
+    stats = transport.get_stats()
+    for _ in range(3):
+        assert second._client is first._client
+    assert (transport.get_stats()["hits"], transport.get_stats()["misses"]) == (stats["hits"], stats["misses"])
+
+    await first.close()
+    assert not second._client.is_closed
+
+    await transport.close_all()
+    assert transport.get_stats()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_view_summary_expanded_fetches_sheets_concurrently(tableau_client):
+    """Test dashboard sheets are fetched in parallel, in order, with per-sheet error isolation."""
+    import asyncio
+
+    tableau_client._metadata_query_dashboard_sheets = AsyncMock(return_value=[{
+        "name": "Dash",
+        "workbook": {"luid": "wb-1"},
+        "sheets": [
+            {"luid": "s-1", "name": "Sheet 1"},
+            {"luid": "", "name": "Hidden"},
+            {"luid": "s-bad", "name": "Broken"},
+            {"luid": "s-3", "name": "Sheet 3"},
+        ],
+    }])
+    tableau_client._rest_get_workbook_views_name_to_luid = AsyncMock(return_value={"Hidden": "s-2"})
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_get_view_data(view_id, max_rows=1000, filters=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if view_id == "s-bad":
+            raise TableauAPIError("boom")
+        return {"columns": ["A"], "data": [[view_id]], "row_count": 1}
+
+    tableau_client.get_view_data = fake_get_view_data
+
+    with patch("app.services.tableau.client.settings.TABLEAU_MAX_CONCURRENT_VIEW_FETCHES", 2):
+        result = await tableau_client.get_view_summary_expanded("dash-1")
+
+    assert [v["view_id"] for v in result["views"]] == ["s-1", "s-2", "s-3"]
+    assert result["total_rows"] == 3
+    assert max_in_flight == 2
+    tableau_client._rest_get_workbook_views_name_to_luid.assert_awaited_once_with("wb-1")
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetches_remaining_pages_concurrently(tableau_client):
+    """Test totalAvailable drives a bounded, in-order concurrent crawl of every page."""
+    import asyncio
+    from app.services.tableau import client as client_module
+
+    in_flight = 0
+    max_in_flight = 0
+    requested = []
+
+    async def fetch_page(size, number):
+        nonlocal in_flight, max_in_flight
+        requested.append(number)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later pages answer first; items must still come out in page order
+        await asyncio.sleep(0.01 * (6 - number))
+        in_flight -= 1
+        items = [{"id": f"p{number}-{i}"} for i in range(size)][: 11 - (number - 1) * size]
+        return {"items": items, "pagination": {"pageNumber": number, "pageSize": size, "totalAvailable": 11}}
+
+    with patch.object(client_module, "_page_fetch_semaphores", {}), \
+            patch("app.services.tableau.client.settings.TABLEAU_MAX_CONCURRENT_PAGE_FETCHES", 2):
+        items = [item async for item in tableau_client.paginate(fetch_page, page_size=3)]
+
+    assert [item["id"] for item in items] == [f"p{n}-{i}" for n in range(1, 5) for i in range(3)][:11]
+    assert sorted(requested) == [1, 2, 3, 4]
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_paginate_stops_after_a_page_without_pagination(tableau_client, mock_httpx_client):
+    """Test a response without a pagination block is not re-requested as more pages."""
+    tableau_client.auth_token = "test-token"
+    tableau_client.token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+    tableau_client.site_id = "site-1"
+
+    mock_response = Mock()
+    mock_response.json.return_value = {"workbooks": {"workbook": [{"id": f"wb-{i}"} for i in range(1000)]}}
+    mock_response.raise_for_status = Mock()
+    mock_httpx_client.request.return_value = mock_response
+
+    workbooks = [wb async for wb in tableau_client.iter_workbooks()]
+
+    assert len(workbooks) == 1000
+    assert mock_httpx_client.request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_project_contents_crawls_listings_in_parallel(tableau_client):
+    """Test project contents come from every page of each listing, fetched concurrently."""
+    import asyncio
+
+    tableau_client._ensure_authenticated = AsyncMock()
+    tableau_client.site_id = "site-1"
+    started = []
+
+    def listing(name, pages):
+        async def get_page(*args, page_size=100, page_number=1, **kwargs):
+            started.append(name)
+            await asyncio.sleep(0.01)
+            return {
+                "items": pages[page_number - 1],
+                "pagination": {"pageNumber": page_number, "pageSize": 1, "totalAvailable": len(pages)},
+            }
+        return get_page
+
+    tableau_client.get_datasources = listing("datasources", [
+        [{"id": "ds-1", "project": {"id": "proj-1"}}], [{"id": "ds-2", "project": {"id": "other"}}],
+    ])
+    tableau_client.get_workbooks = listing("workbooks", [[{"id": "wb-1"}], [{"id": "wb-2"}]])
+    tableau_client._get_projects_page = listing("projects", [[{"id": "child-1"}]])
+
+    contents = await tableau_client.get_project_contents("proj-1")
+
+    assert [ds["id"] for ds in contents["datasources"]] == ["ds-1"]
+    assert [wb["id"] for wb in contents["workbooks"]] == ["wb-1", "wb-2"]
+    assert [p["id"] for p in contents["projects"]] == ["child-1"]
+    # Every listing's first page was requested before any listing moved on
+    assert set(started[:3]) == {"datasources", "workbooks", "projects"}
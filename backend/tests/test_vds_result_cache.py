@@ -0,0 +1,141 @@
+"""Tests for the shared VDS query result cache."""
+import zlib
+
+import pytest
+
+from app.services.columnar import ColumnarResult
+from app.services.vds_result_cache import VDSResultCache
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the async Redis calls the cache makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = (value, ttl)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def get(self, key):
+        self.commands.append(lambda: self.redis.store.get(key, (None,))[0])
+
+    def ttl(self, key):
+        self.commands.append(lambda: self.redis.store[key][1] if key in self.redis.store else -2)
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+class FakeTableauClient:
+    server_url = "https://tableau.test"
+    site_id = "site-1"
+
+    def __init__(self, updated_at="2026-01-01T00:00:00Z", has_extracts=True):
+        self.datasource = {"updatedAt": updated_at, "hasExtracts": str(has_extracts).lower()}
+        self.vds_calls = 0
+
+    async def get_datasource(self, datasource_id):
+        return self.datasource
+
+    async def execute_vds_query(self, query):
+        self.vds_calls += 1
+        query.setdefault("options", {"returnFormat": "OBJECTS", "disaggregate": False})
+        return ColumnarResult.from_rows(["Region", "SUM(Sales)"], [["East", 10.0], ["West", 20.0]])
+
+
+REGION = {"fieldCaption": "Region"}
+SALES = {"fieldCaption": "Sales", "function": "SUM"}
+FILTERS = [
+    {"field": {"fieldCaption": "Year"}, "filterType": "SET", "values": [2025]},
+    {"field": {"fieldCaption": "Segment"}, "filterType": "SET", "values": ["Consumer"]},
+]
+
+
+def _query(fields, filters, luid="ds-1"):
+    return {"datasource": {"datasourceLuid": luid}, "query": {"fields": fields, "filters": filters}}
+
+
+@pytest.mark.asyncio
+async def test_equivalent_queries_share_entries_across_workers():
+    """Test field/filter order does not change the key and another worker reads the compressed entry."""
+    redis = FakeRedis()
+    client = FakeTableauClient()
+    result = ColumnarResult.from_rows(["Region", "SUM(Sales)"], [["East", 10.0], ["West", 20.0]])
+    await VDSResultCache(redis).set(client, _query([REGION, SALES], FILTERS), result)
+
+    (key, (blob, ttl)), = redis.store.items()
+    assert key.startswith("vds_result:") and b"East" in zlib.decompress(blob)
+
+    other_worker = VDSResultCache(redis)
+    reordered = await other_worker.get(client, _query([SALES, REGION], FILTERS[::-1]))
+    assert reordered["columns"] == ["SUM(Sales)", "Region"]
+    assert reordered["data"] == [[10.0, "East"], [20.0, "West"]]
+    assert other_worker.get_stats()["redis_hits"] == 1
+    # Different datasource or site: separate entries
+    assert await other_worker.get(client, _query([REGION, SALES], FILTERS, luid="ds-2")) is None
+    client.site_id = "site-2"
+    assert await other_worker.get(client, _query([REGION, SALES], FILTERS)) is None
+
+
+@pytest.mark.asyncio
+async def test_datasource_refresh_moves_keys_and_sets_ttl(monkeypatch):
+    """Test extract entries live until the datasource refreshes and live connections get the short TTL."""
+    from app.services import vds_result_cache
+
+    monkeypatch.setattr(vds_result_cache.settings, "VDS_RESULT_CACHE_REFRESH_CHECK", 0)
+    cache = VDSResultCache(FakeRedis())
+    client = FakeTableauClient()
+    query = _query([REGION, SALES], FILTERS)
+
+    key, ttl = await cache.key_for(client, query)
+    assert ttl == vds_result_cache.settings.VDS_RESULT_CACHE_MAX_TTL
+    await cache.set(client, query, await client.execute_vds_query(dict(query)))
+    assert await cache.get(client, query) is not None
+
+    client.datasource["updatedAt"] = "2026-01-02T00:00:00Z"
+    assert await cache.get(client, query) is None
+    assert (await cache.key_for(FakeTableauClient(has_extracts=False), query))[1] == vds_result_cache.settings.VDS_RESULT_CACHE_LIVE_TTL
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_check_keeps_known_stamp(monkeypatch):
+    """Test entries stay reachable when the datasource lookup fails (the executor fallback case)."""
+    from app.services import vds_result_cache
+
+    monkeypatch.setattr(vds_result_cache.settings, "VDS_RESULT_CACHE_REFRESH_CHECK", 0)
+    cache = VDSResultCache(FakeRedis())
+    client = FakeTableauClient()
+    query = _query([REGION, SALES], FILTERS)
+    await cache.set(client, query, await client.execute_vds_query(dict(query)))
+
+    async def unavailable(datasource_id):
+        raise ConnectionError("Tableau is down")
+
+    client.get_datasource = unavailable
+    assert (await cache.get(client, query))["data"] == [["East", 10.0], ["West", 20.0]]
+    assert (await cache.key_for(client, query))[1] == vds_result_cache.settings.VDS_RESULT_CACHE_MAX_TTL
+
+
+@pytest.mark.asyncio
+async def test_executor_serves_repeat_queries_from_cache(monkeypatch):
+    """Test execute_query_with_retry only reaches Tableau once for a repeated query."""
+    from app.services.agents.query_executor import execute_query_with_retry
+    from app.services.vds_result_cache import get_vds_result_cache
+
+    monkeypatch.setattr(get_vds_result_cache(), "_redis", FakeRedis())
+    client = FakeTableauClient()
+
+    first = await execute_query_with_retry(client, _query([REGION, SALES], FILTERS))
+    second = await execute_query_with_retry(client, _query([REGION, SALES], FILTERS[::-1]))
+
+    assert client.vds_calls == 1
+    assert second["data"] == first["data"]
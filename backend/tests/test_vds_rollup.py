@@ -0,0 +1,94 @@
+"""Tests for answering VDS queries by rolling up cached results."""
+import pytest
+
+from app.services.agents.query_executor import execute_query_with_retry
+from app.services.columnar import ColumnarResult
+from app.services.vds_result_cache import get_vds_result_cache
+from app.services.vds_rollup import apply_rollup, plan_rollup
+
+REGION = {"fieldCaption": "Region"}
+CATEGORY = {"fieldCaption": "Category"}
+SALES = {"fieldCaption": "Sales", "function": "SUM"}
+ORDERS = {"fieldCaption": "Order ID", "function": "COUNT"}
+EAST = {"field": {"fieldCaption": "Region"}, "filterType": "SET", "values": ["East"]}
+TOP_REGION = {"field": {"fieldCaption": "Region"}, "filterType": "TOP", "howMany": 1, "fieldToMeasure": SALES}
+YEAR = {"field": {"fieldCaption": "Year"}, "filterType": "SET", "values": [2025]}
+
+FINE_COLUMNS = ["Region", "Category", "SUM(Sales)", "COUNT(Order ID)"]
+FINE_ROWS = [
+    ["East", "Tech", 10.0, 2],
+    ["East", "Office", 5.0, 1],
+    ["West", "Tech", 20.0, 4],
+    ["West", "Office", None, None],
+]
+
+
+def _body(fields, filters=None):
+    return {"query": {"fields": fields, "filters": filters or []}, "options": {}}
+
+
+def _query(fields, filters=None):
+    return {"datasource": {"datasourceLuid": "ds-1"}, **_body(fields, filters)}
+
+
+class FakeTableauClient:
+    """Serves the region x category result and counts VDS calls."""
+
+    server_url = "https://tableau.test"
+    site_id = "site-1"
+
+    def __init__(self):
+        self.vds_calls = 0
+
+    async def get_datasource(self, datasource_id):
+        return {"updatedAt": "2026-01-01T00:00:00Z", "hasExtracts": "true"}
+
+    async def execute_vds_query(self, query):
+        self.vds_calls += 1
+        return ColumnarResult.from_rows(FINE_COLUMNS, FINE_ROWS)
+
+
+@pytest.mark.parametrize("requested, cached", [
+    (_body([{"fieldCaption": "Sales", "function": "AVG"}]), _body([REGION, {"fieldCaption": "Sales", "function": "AVG"}])),
+    (_body([{"fieldCaption": "Customer", "function": "COUNTD"}]), _body([REGION, {"fieldCaption": "Customer", "function": "COUNTD"}])),
+    (_body([REGION, SALES]), _body([CATEGORY, SALES])),
+    (_body([SALES]), _body([REGION, SALES], [YEAR])),
+    (_body([SALES], [{"field": SALES, "filterType": "QUANTITATIVE_NUMERICAL", "min": 1}]), _body([REGION, SALES])),
+    (_body([SALES], [TOP_REGION, YEAR]), _body([REGION, SALES, {"fieldCaption": "Year"}], [TOP_REGION])),
+])
+def test_plan_rejects_incompatible_results(requested, cached):
+    """Test non-additive measures, missing dimensions and incompatible filters are not rolled up."""
+    assert plan_rollup(requested, cached) is None
+
+
+def test_rollup_regroups_filters_and_sorts():
+    """Test measures re-aggregate per dimension, SET filters apply locally and sorting is honored."""
+    fine = ColumnarResult.from_rows(FINE_COLUMNS, FINE_ROWS)
+    cached = _body([REGION, CATEGORY, SALES, ORDERS])
+
+    by_region = apply_rollup(fine, plan_rollup(_body([{**SALES, "sortPriority": 1, "sortDirection": "DESC"}, REGION]), cached))
+    assert by_region["columns"] == ["SUM(Sales)", "Region"]
+    assert by_region["data"] == [[20.0, "West"], [15.0, "East"]]
+
+    east = apply_rollup(fine, plan_rollup(_body([CATEGORY, ORDERS], [EAST]), cached))
+    assert east["data"] == [["Tech", 2], ["Office", 1]]
+
+    west = apply_rollup(fine, plan_rollup(_body([SALES], [{**EAST, "values": ["West"]}]), cached))
+    assert west["data"] == [[20.0]]
+
+
+@pytest.mark.asyncio
+async def test_executor_answers_coarser_queries_from_cache():
+    """Test follow-up roll-ups skip VDS and are marked as roll-ups."""
+    client = FakeTableauClient()
+
+    fine = await execute_query_with_retry(client, _query([REGION, CATEGORY, SALES, ORDERS]))
+    total = await execute_query_with_retry(client, _query([SALES, ORDERS]))
+    again = await execute_query_with_retry(client, _query([ORDERS, SALES]))
+
+    assert "rollup" not in fine
+    assert client.vds_calls == 1
+    assert total["data"] == [[35.0, 7]]
+    assert total["rollup"] == {"source_rows": 4}
+    assert again["data"] == [[7, 35.0]] and "rollup" in again
+    assert get_vds_result_cache().get_stats()["rollup_hits"] == 1
@@ -7,7 +7,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from app.services.agents.summary.state import SummaryAgentState
+from app.services.agents.summary.nodes import analyzer
 from app.services.agents.summary.nodes.analyzer import analyze_data_node
+from app.services.columnar import ColumnarResult, as_dataframe
 
 
 @pytest.mark.asyncio
@@ -100,3 +102,28 @@ async def test_analyzer_node_empty_data():
     assert "error" in result or result["column_stats"] is None
     assert isinstance(result["trends"], list)
     assert isinstance(result["outliers"], list)
+
+
+def test_analyze_single_view_parses_formatted_numbers(monkeypatch):
+    """Test currency, percent and thousands separators parse in bulk and the parse is cached."""
+    result = ColumnarResult.from_rows(
+        ["Sales", "Margin", "Region"],
+        [["$1,000", "10%", "North"], ["$1,200", "12%", "South"], ["$1,500", None, "East"],
+         ["$1,100", "11%", "West"], ["n/a", "13%", "North"]],
+    )
+    df = as_dataframe(result, categorical=True)
+    
+    column_stats, trends, _, _ = analyzer._analyze_single_view(df, "view-fmt", "Formatted")
+    
+    assert set(column_stats) == {"Sales", "Margin"}
+    assert column_stats["Sales"]["count"] == 4
+    assert column_stats["Sales"]["missing"] == 1
+    assert column_stats["Sales"]["median"] == 1150.0
+    assert column_stats["Margin"]["max"] == 13.0
+    assert {t["column"]: t["trend"] for t in trends} == {"Sales": "increasing", "Margin": "increasing"}
+    
+    # Same data again: the parsed frame comes from the cache
+    def fail(_df):
+        raise AssertionError("frame was re-parsed")
+    monkeypatch.setattr(analyzer, "_convert_to_numeric", fail)
+    assert analyzer._analyze_single_view(df, "view-fmt", "Formatted")[0] == column_stats
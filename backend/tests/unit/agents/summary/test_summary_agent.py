@@ -0,0 +1,84 @@
+"""Unit tests for concurrent multi-view export in SummaryAgent."""
+import asyncio
+
+import pytest
+
+from app.services.agents.summary_agent import SummaryAgent
+
+
+class FakeTableauClient:
+    """Serves view data after a per-view delay and tracks concurrency."""
+
+    server_url = "https://tableau.test"
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+        self.sign_ins = 0
+
+    async def _ensure_authenticated(self):
+        self.sign_ins += 1
+
+    async def get_view_data(self, view_id):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays[view_id])
+        finally:
+            self.active -= 1
+        return {"data": [[1], [2]], "columns": ["Sales"], "row_count": 2}
+
+    async def get_view_embed_url(self, view_id):
+        return {"url": f"https://tableau.test/views/{view_id}"}
+
+
+def _agent(client):
+    agent = SummaryAgent(tableau_client=client)
+    agent._get_view_data = client.get_view_data
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_export_views_is_concurrent_bounded_and_ordered(monkeypatch):
+    """Test views export in parallel up to the per-server cap and keep input order."""
+    from app.services.tableau import client as tableau_client_module
+
+    monkeypatch.setattr(tableau_client_module.settings, "TABLEAU_MAX_CONCURRENT_VIEW_FETCHES", 2)
+    monkeypatch.setattr(tableau_client_module, "_view_fetch_semaphores", {})
+    client = FakeTableauClient({"v1": 0.03, "v2": 0.01, "v3": 0.01, "v4": 0.01})
+
+    result = await _agent(client).export_views(["v1", "v2", "v3", "v4"])
+
+    assert [d["view_id"] for d in result["datasets"]] == ["v1", "v2", "v3", "v4"]
+    assert result["total_rows"] == 8
+    assert client.peak == 2
+    assert client.sign_ins == 1
+
+
+@pytest.mark.asyncio
+async def test_datasets_stream_in_completion_order_and_slow_views_time_out():
+    """Test finished views are yielded first and a stuck view becomes an error entry."""
+    client = FakeTableauClient({"slow": 5, "fast": 0})
+
+    arrived = [d async for d in _agent(client).iter_view_exports(["slow", "fast"], timeout=0.05)]
+
+    assert [d["view_id"] for d in arrived] == ["fast", "slow"]
+    assert arrived[1]["index"] == 0
+    assert "timed out" in arrived[1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_across_views_folds_each_view():
+    """Test totals are accumulated per view, skipping failed views."""
+    client = FakeTableauClient({"v1": 0.02, "v2": 0, "stuck": 5})
+    agent = _agent(client)
+    agent._is_numeric_column = lambda column, data: True
+    original = agent.iter_view_exports
+    agent.iter_view_exports = lambda view_ids: original(view_ids, timeout=0.05)
+
+    result = await agent.aggregate_across_views(["v1", "stuck", "v2"], aggregation_type="sum")
+
+    assert result["by_view"] == {"v1": 3, "v2": 3}
+    assert list(result["by_view"]) == ["v1", "v2"]
+    assert result["total"] == 6
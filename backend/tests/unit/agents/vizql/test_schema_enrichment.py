@@ -0,0 +1,142 @@
+"""Unit tests for batched schema statistics enrichment."""
+import pytest
+
+from app.services.agents.vizql import schema_enrichment
+from app.services.agents.vizql.schema_enrichment import SchemaEnrichmentService
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis calls enrichment uses."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, value))
+
+    async def execute(self):
+        for key, value in self.commands:
+            self.redis.store[key] = value
+        return [True] * len(self.commands)
+
+
+class FakeTableauClient:
+    """Records which stats queries were issued."""
+
+    def __init__(self, fail_batch_with=None):
+        self.batches = []
+        self.single = []
+        self.fail_batch_with = fail_batch_with
+
+    async def get_row_count(self, datasource_id):
+        return 100
+
+    async def get_measure_statistics(self, datasource_id, field_captions, total_rows=None):
+        self.batches.append(list(field_captions))
+        if self.fail_batch_with in field_captions:
+            raise ValueError("unknown field")
+        return {
+            cap: {"min": 0.0, "max": 10.0, "median": 5.0, "null_percentage": 10.0 if total_rows else None}
+            for cap in field_captions
+        }
+
+    async def get_field_statistics(self, datasource_id, field_caption, data_type, is_measure):
+        self.single.append(field_caption)
+        return {"cardinality": 3, "sample_values": ["a"], "value_counts": [{"value": "a", "count": 2}]}
+
+
+def _schema(measures, dimensions):
+    fields = [{"fieldCaption": m, "fieldRole": "MEASURE", "dataType": "REAL"} for m in measures]
+    fields += [{"fieldCaption": d, "fieldRole": "DIMENSION", "dataType": "STRING"} for d in dimensions]
+    return {"fields": fields, "measures": list(measures), "dimensions": list(dimensions)}
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(schema_enrichment, "get_async_redis", lambda: redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_measures_are_batched_and_dimensions_queried_per_field(fake_redis, monkeypatch):
+    """Test measure stats are packed into few queries."""
+    monkeypatch.setattr(schema_enrichment, "STATS_MEASURES_PER_QUERY", 2)
+    client = FakeTableauClient()
+    service = SchemaEnrichmentService(client)
+
+    enriched = await service._enrich_schema_with_stats("ds-1", _schema(["M1", "M2", "M3"], ["D1", "D2"]))
+
+    assert sorted(map(sorted, client.batches)) == [["M1", "M2"], ["M3"]]
+    assert sorted(client.single) == ["D1", "D2"]
+    by_caption = {f["fieldCaption"]: f for f in enriched["fields"]}
+    assert by_caption["M3"]["median"] == 5.0 and by_caption["M3"]["null_percentage"] == 10.0
+    assert by_caption["D1"]["cardinality"] == 3 and by_caption["D1"]["min"] is None
+
+
+@pytest.mark.asyncio
+async def test_only_new_fields_are_profiled(fake_redis):
+    """Test per-field cached stats are reused when the schema gains a field."""
+    client = FakeTableauClient()
+    service = SchemaEnrichmentService(client)
+    await service._enrich_schema_with_stats("ds-1", _schema(["M1"], ["D1"]))
+    fake_redis.store.pop("enriched_schema:ds-1")
+
+    client.batches, client.single = [], []
+    enriched = await service._enrich_schema_with_stats("ds-1", _schema(["M1", "M2"], ["D1"]))
+
+    assert client.batches == [["M2"]]
+    assert client.single == []
+    assert all(f["min"] == 0.0 for f in enriched["fields"] if f["fieldRole"] == "MEASURE")
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_field_queries(fake_redis):
+    """Test one unqueryable measure does not lose stats for its batch."""
+    client = FakeTableauClient(fail_batch_with="Bad")
+    service = SchemaEnrichmentService(client)
+
+    await service._enrich_schema_with_stats("ds-1", _schema(["M1", "Bad"], []))
+
+    assert sorted(client.single) == ["Bad", "M1"]
+
+
+@pytest.mark.asyncio
+async def test_cached_enriched_schema_is_read_in_one_round_trip(fake_redis, monkeypatch):
+    """Test the enriched and core schema keys are fetched together and a hit skips Tableau."""
+    import json
+
+    reads = []
+    mget = fake_redis.mget
+
+    async def recording_mget(keys):
+        reads.append(list(keys))
+        return await mget(keys)
+
+    monkeypatch.setattr(fake_redis, "mget", recording_mget)
+    fake_redis.store["enriched_schema:ds-1"] = json.dumps(_schema(["M1"], ["D1"]))
+    client = FakeTableauClient()
+
+    enriched = await SchemaEnrichmentService(client).enrich_datasource_schema("ds-1")
+
+    assert enriched["measures"] == ["M1"]
+    assert reads == [["enriched_schema:ds-1", "schema:ds-1"]]
+    assert client.batches == [] and client.single == []
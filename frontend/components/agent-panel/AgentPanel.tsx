@@ -51,6 +51,8 @@ export function AgentPanel({ isOpen, onClose, onAddToContext, onAddToContextRef,
   const [provider, setProvider] = useState('openai');
   const [model, setModel] = useState('gpt-4');
   const [threads, setThreads] = useState<ConversationResponse[]>([]);
+  const [threadsCursor, setThreadsCursor] = useState<string | null>(null);
+  const [loadingMoreThreads, setLoadingMoreThreads] = useState(false);
   const [activeThreadId, setActiveThreadId] = useState<number | null>(null);
   const [context, setContext] = useState<ChatContextObject[]>([]);
   const [loading, setLoading] = useState(false);
@@ -109,31 +111,56 @@ export function AgentPanel({ isOpen, onClose, onAddToContext, onAddToContextRef,
     onActiveThreadChange?.(activeThreadId);
   }, [activeThreadId, onActiveThreadChange]);
 
+  // Load the newest page of threads; older pages are fetched on demand by loadMoreThreads
   const loadThreads = async () => {
     try {
-      const threadList = await chatApi.listConversations();
-      setThreads(threadList);
-      if (threadList.length > 0 && !activeThreadId) {
-        setActiveThreadId(threadList[0].id);
+      const page = await chatApi.listConversations();
+      setThreads(page.items);
+      setThreadsCursor(page.nextCursor);
+      if (page.items.length > 0 && !activeThreadId) {
+        setActiveThreadId(page.items[0].id);
       }
     } catch (err) {
       console.error('Failed to load threads:', err);
     }
   };
+
+  const loadMoreThreads = async () => {
+    if (!threadsCursor || loadingMoreThreads) {
+      return;
+    }
+    setLoadingMoreThreads(true);
+    try {
+      const page = await chatApi.listConversations(threadsCursor);
+      setThreads((prev) => {
+        const loadedIds = new Set(prev.map((t) => t.id));
+        return [...prev, ...page.items.filter((t) => !loadedIds.has(t.id))];
+      });
+      setThreadsCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Failed to load more threads:', err);
+    } finally {
+      setLoadingMoreThreads(false);
+    }
+  };
   
   const handleThreadsChange = () => {
     loadThreads();
   };
 
-  const handleDeleteThread = async (threadId: number) => {
-    // Reload threads to get updated list
-    const updatedThreads = await chatApi.listConversations();
-    setThreads(updatedThreads);
+  const handleRenameThread = (updatedThread: ConversationResponse) => {
+    setThreads((prev) => prev.map((t) => (t.id === updatedThread.id ? updatedThread : t)));
+  };
+
+  const handleDeleteThread = (threadId: number) => {
+    // Drop the thread locally instead of re-reading the list
+    const remainingThreads = threads.filter((t) => t.id !== threadId);
+    setThreads(remainingThreads);
     
     // If the deleted thread was active, switch to another thread or clear active
     if (activeThreadId === threadId) {
-      if (updatedThreads.length > 0) {
-        setActiveThreadId(updatedThreads[0].id);
+      if (remainingThreads.length > 0) {
+        setActiveThreadId(remainingThreads[0].id);
       } else {
         setActiveThreadId(null);
         setContext([]);
@@ -403,7 +430,11 @@ export function AgentPanel({ isOpen, onClose, onAddToContext, onAddToContextRef,
             onSelectThread={setActiveThreadId}
             onCreateThread={handleCreateThread}
             onThreadsChange={handleThreadsChange}
+            onRenameThread={handleRenameThread}
             onDeleteThread={handleDeleteThread}
+            hasMore={threadsCursor !== null}
+            loadingMore={loadingMoreThreads}
+            onLoadMore={loadMoreThreads}
           />
         </div>
       </div>
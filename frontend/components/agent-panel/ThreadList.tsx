@@ -28,7 +28,11 @@ interface ThreadListProps {
   onSelectThread: (threadId: number) => void;
   onCreateThread: () => void;
   onThreadsChange?: () => void;
+  onRenameThread?: (thread: ConversationResponse) => void;
   onDeleteThread?: (threadId: number) => void;
+  hasMore?: boolean; // More (older) threads can be loaded
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 export function ThreadList({
@@ -37,7 +41,11 @@ export function ThreadList({
   onSelectThread,
   onCreateThread,
   onThreadsChange,
+  onRenameThread,
   onDeleteThread,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
 }: ThreadListProps) {
   const [expanded, setExpanded] = useState(false);
   const [editingThreadId, setEditingThreadId] = useState<number | null>(null);
@@ -69,11 +77,13 @@ export function ThreadList({
 
     setIsRenaming(true);
     try {
-      await chatApi.renameConversation(threadId, editName.trim());
+      const updatedThread = await chatApi.renameConversation(threadId, editName.trim());
       setEditingThreadId(null);
       setEditName('');
-      // Refresh threads list
-      if (onThreadsChange) {
+      // Update the thread in place, or refresh the list if the parent doesn't track renames
+      if (onRenameThread) {
+        onRenameThread(updatedThread);
+      } else if (onThreadsChange) {
         onThreadsChange();
       }
     } catch (err) {
@@ -101,12 +111,10 @@ export function ThreadList({
     setDeletingThreadId(threadId);
     try {
       await chatApi.deleteConversation(threadId);
-      // Notify parent component about deletion
+      // Notify parent component about deletion, or refresh the list if it doesn't handle it
       if (onDeleteThread) {
         onDeleteThread(threadId);
-      }
-      // Refresh threads list
-      if (onThreadsChange) {
+      } else if (onThreadsChange) {
         onThreadsChange();
       }
     } catch (err) {
@@ -117,13 +125,23 @@ export function ThreadList({
     }
   };
 
+  // Fetch the next page when the history list is scrolled near its end
+  const handleScroll = (e: React.UIEvent<HTMLDivElement>) => {
+    const el = e.currentTarget;
+    if (hasMore && !loadingMore && el.scrollHeight - el.scrollTop - el.clientHeight < 48) {
+      onLoadMore?.();
+    }
+  };
+
   const handleDeleteAll = async () => {
     if (threads.length === 0) {
       return;
     }
 
     const confirmed = confirm(
-      `Are you sure you want to delete all ${threads.length} chat thread(s)? This action cannot be undone.`
+      hasMore
+        ? 'Are you sure you want to delete all chat threads? This action cannot be undone.'
+        : `Are you sure you want to delete all ${threads.length} chat thread(s)? This action cannot be undone.`
     );
     
     if (!confirmed) {
@@ -166,7 +184,7 @@ export function ThreadList({
           onClick={() => setExpanded(!expanded)}
           className="flex-1 justify-between"
         >
-          <span className="text-sm font-medium">History ({threads.length})</span>
+          <span className="text-sm font-medium">History ({threads.length}{hasMore ? '+' : ''})</span>
           {expanded ? <ChevronUp className="h-4 w-4" /> : <ChevronDown className="h-4 w-4" />}
         </Button>
       </div>
@@ -185,11 +203,11 @@ export function ThreadList({
                   disabled={isDeletingAll}
                 >
                   <Trash2 className="h-3 w-3 mr-2" />
-                  {isDeletingAll ? 'Deleting...' : `Delete All (${threads.length})`}
+                  {isDeletingAll ? 'Deleting...' : hasMore ? 'Delete All' : `Delete All (${threads.length})`}
                 </Button>
               </div>
             )}
-            <div className="space-y-1 max-h-96 overflow-y-auto">
+            <div className="space-y-1 max-h-96 overflow-y-auto" onScroll={handleScroll}>
               {threads.map((thread) => {
               const isEditing = editingThreadId === thread.id;
               const displayName = getDisplayName(thread);
@@ -278,6 +296,17 @@ export function ThreadList({
                 </Card>
               );
             })}
+              {hasMore && (
+                <Button
+                  variant="ghost"
+                  size="sm"
+                  className="w-full text-xs"
+                  onClick={onLoadMore}
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </Button>
+              )}
             </div>
           </div>
         )}
@@ -229,6 +229,11 @@ export interface ConversationResponse {
   message_count: number;
 }
 
+export interface ConversationPage {
+  items: ConversationResponse[];
+  nextCursor: string | null;
+}
+
 export interface MessageResponse {
   vizql_query?: Record<string, any> | null;  // VizQL query used to generate the answer (for vizql agent)
   id: number;
@@ -277,12 +282,15 @@ export const chatApi = {
     return response.data;
   },
 
-  // List all conversations
-  listConversations: async (skip = 0, limit = 50): Promise<ConversationResponse[]> => {
+  // List one page of conversations, newest first (pass nextCursor back to get the following page)
+  listConversations: async (cursor?: string, limit = 50): Promise<ConversationPage> => {
     const response = await apiClient.get<ConversationResponse[]>('/api/v1/chat/conversations', {
-      params: { skip, limit },
+      params: { cursor, limit },
     });
-    return response.data;
+    return {
+      items: response.data,
+      nextCursor: (response.headers['x-next-cursor'] as string | undefined) ?? null,
+    };
   },
 
   // Get a conversation by ID